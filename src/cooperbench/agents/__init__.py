@@ -10,6 +10,8 @@ Usage:
     result = runner.run(task="...", image="...", model_name="gpt-4o")
 """
 
+import asyncio
+import inspect
 from dataclasses import dataclass, field
 from typing import Any, Protocol, runtime_checkable
 
@@ -80,6 +82,45 @@ class AgentRunner(Protocol):
         ...
 
 
+@runtime_checkable
+class AsyncAgentRunner(Protocol):
+    """Optional interface for adapters that can run natively on an asyncio loop.
+
+    Adapters implementing ``arun`` (same arguments as ``AgentRunner.run``) are
+    awaited directly by the async scheduler; all others run in a worker thread.
+    """
+
+    async def arun(self, task: str, image: str, **kwargs: Any) -> AgentResult:
+        """Run agent on a task without blocking the event loop."""
+        ...
+
+
+async def arun_agent(runner: AgentRunner, task: str, image: str, **kwargs: Any) -> AgentResult:
+    """Run an agent from async code, natively if the adapter supports it.
+
+    Args:
+        runner: Agent runner instance from get_runner()
+        task: The task description (feature spec)
+        image: Docker image with the codebase
+        **kwargs: Keyword arguments accepted by AgentRunner.run
+
+    Returns:
+        AgentResult from the adapter
+    """
+    if isinstance(runner, AsyncAgentRunner):
+        return await runner.arun(task=task, image=image, **kwargs)
+    return await asyncio.to_thread(runner.run, task=task, image=image, **kwargs)
+
+
+def accepts_message_callback(runner: AgentRunner) -> bool:
+    """Whether an adapter can stream its messages.
+
+    Adapters whose ``run`` (and ``arun``) take an ``on_message`` keyword call it
+    with every message as it is added to the trajectory.
+    """
+    return "on_message" in inspect.signature(runner.run).parameters
+
+
 # Import registry functions for convenience (must be after class definitions to avoid circular imports)
 from cooperbench.agents.registry import get_runner, list_agents, register  # noqa: E402, I001
 
@@ -108,6 +149,9 @@ def get_agent_shorthand(agent_name: str) -> str:
 __all__ = [
     "AgentResult",
     "AgentRunner",
+    "AsyncAgentRunner",
+    "arun_agent",
+    "accepts_message_callback",
     "get_runner",
     "list_agents",
     "register",
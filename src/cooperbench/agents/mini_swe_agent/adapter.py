@@ -4,6 +4,8 @@ This adapter wraps the mini-swe-agent framework to conform to the
 AgentRunner interface used by CooperBench.
 """
 
+import asyncio
+from collections.abc import Callable
 from typing import TYPE_CHECKING
 
 import yaml
@@ -38,6 +40,7 @@ class MiniSweAgentRunner:
         git_enabled: bool = False,
         messaging_enabled: bool = True,
         config: dict | None = None,
+        on_message: Callable[[dict], None] | None = None,
     ) -> AgentResult:
         """Run mini-swe-agent on a task.
 
@@ -52,10 +55,90 @@ class MiniSweAgentRunner:
             git_enabled: Whether git collaboration is enabled
             messaging_enabled: Whether messaging is enabled
             config: Agent configuration (loaded from mini.yaml if not provided)
+            on_message: Called with every trajectory message as it is added (optional)
 
         Returns:
             AgentResult with status, patch, cost, steps, messages
         """
+        agent, env, model, base_commit = self._setup(
+            image=image,
+            agent_id=agent_id,
+            model_name=model_name,
+            agents=agents,
+            comm_url=comm_url,
+            git_server_url=git_server_url,
+            git_enabled=git_enabled,
+            messaging_enabled=messaging_enabled,
+            config=config,
+        )
+        agent.on_message = on_message
+
+        # Run agent
+        error_msg = None
+        try:
+            status, _ = agent.run(task=task)
+        except Exception as e:
+            status = "Error"
+            error_msg = str(e)
+
+        return self._finish(agent, env, model, base_commit, status, error_msg)
+
+    async def arun(
+        self,
+        task: str,
+        image: str,
+        *,
+        agent_id: str = "agent",
+        model_name: str = "gpt-4o",
+        agents: list[str] | None = None,
+        comm_url: str | None = None,
+        git_server_url: str | None = None,
+        git_enabled: bool = False,
+        messaging_enabled: bool = True,
+        config: dict | None = None,
+        on_message: Callable[[dict], None] | None = None,
+    ) -> AgentResult:
+        """Async variant of run() used by the asyncio scheduler.
+
+        Sandbox setup and teardown run in a worker thread; the agent loop itself
+        awaits the model and (on Modal) the sandbox without holding a thread.
+        """
+        agent, env, model, base_commit = await asyncio.to_thread(
+            self._setup,
+            image=image,
+            agent_id=agent_id,
+            model_name=model_name,
+            agents=agents,
+            comm_url=comm_url,
+            git_server_url=git_server_url,
+            git_enabled=git_enabled,
+            messaging_enabled=messaging_enabled,
+            config=config,
+        )
+        agent.on_message = on_message
+
+        error_msg = None
+        try:
+            status, _ = await agent.arun(task=task)
+        except Exception as e:
+            status = "Error"
+            error_msg = str(e)
+
+        return await asyncio.to_thread(self._finish, agent, env, model, base_commit, status, error_msg)
+
+    def _setup(
+        self,
+        image: str,
+        agent_id: str,
+        model_name: str,
+        agents: list[str] | None,
+        comm_url: str | None,
+        git_server_url: str | None,
+        git_enabled: bool,
+        messaging_enabled: bool,
+        config: dict | None,
+    ) -> tuple[DefaultAgent, "ModalEnvironment | DockerEnvironment", LitellmModel, str]:
+        """Create the sandbox, model, connectors and agent for a run."""
         # Always load default config, then merge with any overrides
         config_path = get_config_path("mini")
         with open(config_path) as f:
@@ -85,6 +168,7 @@ class MiniSweAgentRunner:
         elif backend == "gcp":
             # Lazy import to avoid requiring google-cloud-compute package when not used
             from cooperbench.agents.mini_swe_agent.environments.gcp import GCPEnvironment
+            from cooperbench.agents.mini_swe_agent.environments.gcp_pool import vm_pool_enabled
 
             env_kwargs = {
                 "image": image,
@@ -99,10 +183,16 @@ class MiniSweAgentRunner:
                     env_kwargs["zone"] = config["zone"]
                 if config.get("machine_type"):
                     env_kwargs["machine_type"] = config["machine_type"]
-                if config.get("git_network"):
-                    env_kwargs["network"] = config["git_network"]
                 if config.get("vm_image_family"):
                     env_kwargs["vm_image_family"] = config["vm_image_family"]
+                if vm_pool_enabled():
+                    # Agents of a run share a VM; the git server is a sidecar on it
+                    env_kwargs["vm_group"] = config.get("git_network") or config.get("run_id")
+                    env_kwargs["vm_group_size"] = len(agents) if agents else 1
+                    if config.get("git_network"):
+                        env_kwargs["git_sidecar"] = config["git_network"]
+                elif config.get("git_network"):
+                    env_kwargs["network"] = config["git_network"]
             env = GCPEnvironment(**env_kwargs)
         else:
             env = ModalEnvironment(
@@ -115,8 +205,9 @@ class MiniSweAgentRunner:
         base_commit_result = env.execute("git rev-parse HEAD", timeout=10)
         base_commit = base_commit_result.get("output", "").strip()
 
-        # Create LLM model
-        model = LitellmModel(model_name=model_name)
+        # Create LLM model (raw responses go to a sidecar file when the runner provides one)
+        model_kwargs = {k: default_config[k] for k in ("response_storage", "response_log") if default_config.get(k)}
+        model = LitellmModel(model_name=model_name, **model_kwargs)
 
         # Setup messaging connector if enabled
         comm = None
@@ -149,19 +240,24 @@ class MiniSweAgentRunner:
         )
         agent.extra_template_vars.update(extra_vars)
 
-        # Run agent
-        error_msg = None
-        try:
-            status, _ = agent.run(task=task)
-        except Exception as e:
-            status = "Error"
-            error_msg = str(e)
+        return agent, env, model, base_commit
 
+    def _finish(
+        self,
+        agent: DefaultAgent,
+        env: "ModalEnvironment | DockerEnvironment",
+        model: LitellmModel,
+        base_commit: str,
+        status: str,
+        error_msg: str | None,
+    ) -> AgentResult:
+        """Extract the patch, tear down the sandbox and build the result."""
         # Extract patch (committed + uncommitted changes)
         patch = self._get_patch(env, base_commit)
 
         # Cleanup
         env.cleanup()
+        model.close()
 
         return AgentResult(
             status=status,
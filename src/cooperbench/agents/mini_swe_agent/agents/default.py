@@ -1,9 +1,13 @@
 """Basic agent class. See https://mini-swe-agent.com/latest/advanced/control_flow/ for visual explanation."""
 
+import asyncio
 import re
 import subprocess
+import threading
 import time
+from collections.abc import Callable
 
+from jinja2 import Environment as JinjaEnvironment
 from jinja2 import StrictUndefined, Template
 from pydantic import BaseModel
 
@@ -11,6 +15,22 @@ from cooperbench.agents.mini_swe_agent import Environment, Model
 from cooperbench.agents.mini_swe_agent.connectors.messaging import MessagingConnector
 from cooperbench.agents.mini_swe_agent.utils.log import logger
 
+# Compiled templates, shared by every agent in the process
+_jinja_env = JinjaEnvironment(undefined=StrictUndefined)
+_templates: dict[str, Template] = {}
+_templates_lock = threading.Lock()
+
+
+def get_template(template: str) -> Template:
+    """Get the compiled template for a template string (thread-safe, compiled once)."""
+    compiled = _templates.get(template)
+    if compiled is None:
+        with _templates_lock:
+            compiled = _templates.get(template)
+            if compiled is None:
+                compiled = _templates[template] = _jinja_env.from_string(template)
+    return compiled
+
 
 class AgentConfig(BaseModel):
     # Check the config files in cooperbench/agents/mini_swe_agent/config for example settings
@@ -67,27 +87,36 @@ class DefaultAgent:
         self.agent_id = agent_id
         self.step_num = 0
         self.extra_template_vars = {}
+        self._static_template_vars: dict | None = None
+        self.on_message: Callable[[dict], None] | None = None  # Called with every message as it is added
 
     def log(self, msg: str):
         """Log message with agent prefix."""
         logger.debug(f"[{self.agent_id}] {msg}")
 
     def render_template(self, template: str, **kwargs) -> str:
-        template_vars = self.config.model_dump() | self.env.get_template_vars() | self.model.get_template_vars()
-        return Template(template, undefined=StrictUndefined).render(
-            **kwargs, **template_vars, **self.extra_template_vars
-        )
+        if self._static_template_vars is None:
+            # Agent config and environment vars don't change during a run; only the model's do
+            self._static_template_vars = self.config.model_dump() | self.env.get_template_vars()
+        template_vars = self._static_template_vars | self.model.get_template_vars()
+        return get_template(template).render(**kwargs, **template_vars, **self.extra_template_vars)
 
     def add_message(self, role: str, content: str, **kwargs):
-        self.messages.append({"role": role, "content": content, "timestamp": time.time(), **kwargs})
+        message = {"role": role, "content": content, "timestamp": time.time(), **kwargs}
+        self.messages.append(message)
+        if self.on_message is not None:
+            self.on_message(message)
+
+    async def aadd_message(self, role: str, content: str, **kwargs):
+        """Async variant of add_message(); on_message callbacks (e.g. trajectory writes) run in a worker thread."""
+        if self.on_message is None:
+            self.add_message(role, content, **kwargs)
+        else:
+            await asyncio.to_thread(self.add_message, role, content, **kwargs)
 
     def run(self, task: str, **kwargs) -> tuple[str, str]:
         """Run step() until agent is finished. Return exit status & message"""
-        self.extra_template_vars |= {"task": task, **kwargs}
-        self.messages = []
-        self.add_message("system", self.render_template(self.config.system_template))
-        self.add_message("user", self.render_template(self.config.instance_template))
-        self.step_num = 0
+        self._start(task, **kwargs)
         while True:
             self.step_num += 1
             self.log(f"Step {self.step_num}")
@@ -101,27 +130,79 @@ class DefaultAgent:
                 self.add_message("user", str(e))
                 return type(e).__name__, str(e)
 
+    async def arun(self, task: str, **kwargs) -> tuple[str, str]:
+        """Async variant of run(): awaits the model and environment instead of blocking.
+
+        Blocking I/O outside the model and environment (messaging round-trips,
+        on_message callbacks) runs in worker threads so it doesn't stall the
+        event loop shared with other agents.
+        """
+        await asyncio.to_thread(self._start, task, **kwargs)
+        while True:
+            self.step_num += 1
+            self.log(f"Step {self.step_num}")
+            try:
+                await self.astep()
+            except NonTerminatingException as e:
+                self.log(f"Error: {type(e).__name__}")
+                await self.aadd_message("user", str(e))
+            except TerminatingException as e:
+                self.log(f"Finished: {type(e).__name__}")
+                await self.aadd_message("user", str(e))
+                return type(e).__name__, str(e)
+
+    def _start(self, task: str, **kwargs) -> None:
+        self.extra_template_vars |= {"task": task, **kwargs}
+        self.messages = []
+        self.add_message("system", self.render_template(self.config.system_template))
+        self.add_message("user", self.render_template(self.config.instance_template))
+        self.step_num = 0
+
     def step(self) -> dict:
         """Query the LM, execute the action, return the observation."""
-        # Check for inter-agent messages before querying LLM
+        self._receive_messages()
+        return self.get_observation(self.query())
+
+    async def astep(self) -> dict:
+        """Async variant of step()."""
+        if self.comm:
+            await asyncio.to_thread(self._receive_messages)
+        return await self.aget_observation(await self.aquery())
+
+    def _receive_messages(self) -> None:
+        """Check for inter-agent messages before querying LLM."""
         if self.comm:
             messages = self.comm.receive()
             for msg in messages:
                 ts = msg.get("timestamp", "")[:19].replace("T", " ")
                 self.log(f"INBOX: [{msg['from']} @ {ts}] {msg['content']}")
                 self.add_message("user", f"[Message from {msg['from']}]: {msg['content']}")
-        return self.get_observation(self.query())
 
     def query(self) -> dict:
         """Query the model and return the response."""
-        if 0 < self.config.step_limit <= self.model.n_calls or 0 < self.config.cost_limit <= self.model.cost:
-            raise LimitsExceeded()
+        self._check_limits()
         logger.debug(f"Querying LLM (call #{self.model.n_calls + 1})...")
         response = self.model.query(self.messages)
         logger.debug(f"Got response ({len(response.get('content', ''))} chars)")
         self.add_message("assistant", **response)
         return response
 
+    async def aquery(self) -> dict:
+        """Async variant of query(); models without aquery() run in a worker thread."""
+        self._check_limits()
+        logger.debug(f"Querying LLM (call #{self.model.n_calls + 1})...")
+        if aquery := getattr(self.model, "aquery", None):
+            response = await aquery(self.messages)
+        else:
+            response = await asyncio.to_thread(self.model.query, self.messages)
+        logger.debug(f"Got response ({len(response.get('content', ''))} chars)")
+        await self.aadd_message("assistant", **response)
+        return response
+
+    def _check_limits(self) -> None:
+        if 0 < self.config.step_limit <= self.model.n_calls or 0 < self.config.cost_limit <= self.model.cost:
+            raise LimitsExceeded()
+
     def get_observation(self, response: dict) -> dict:
         """Execute the action and return the observation."""
         output = self.execute_action(self.parse_action(response))
@@ -129,6 +210,13 @@ class DefaultAgent:
         self.add_message("user", observation)
         return output
 
+    async def aget_observation(self, response: dict) -> dict:
+        """Async variant of get_observation()."""
+        output = await self.aexecute_action(self.parse_action(response))
+        observation = self.render_template(self.config.action_observation_template, output=output)
+        await self.aadd_message("user", observation)
+        return output
+
     def parse_action(self, response: dict) -> dict:
         """Parse the action from the message. Returns the action."""
         actions = re.findall(self.config.action_regex, response["content"], re.DOTALL)
@@ -137,6 +225,39 @@ class DefaultAgent:
         raise FormatError(self.render_template(self.config.format_error_template, actions=actions))
 
     def execute_action(self, action: dict) -> dict:
+        command, sent_output = self._prepare_action(action)
+        if sent_output is not None and not command.strip():
+            return {"output": sent_output, "returncode": 0, "action": action["action"]}
+        try:
+            output = self.env.execute(command)
+        except Exception as e:
+            return self._finish_action(action, e, sent_output)
+        return self._finish_action(action, output, sent_output)
+
+    async def aexecute_action(self, action: dict) -> dict:
+        """Async variant of execute_action(); environments without aexecute() run in a worker thread."""
+        if self.comm:
+            command, sent_output = await asyncio.to_thread(self._prepare_action, action)
+        else:
+            command, sent_output = self._prepare_action(action)
+        if sent_output is not None and not command.strip():
+            return {"output": sent_output, "returncode": 0, "action": action["action"]}
+        try:
+            if aexecute := getattr(self.env, "aexecute", None):
+                output = await aexecute(command)
+            else:
+                output = await asyncio.to_thread(self.env.execute, command)
+        except Exception as e:
+            return self._finish_action(action, e, sent_output)
+        return self._finish_action(action, output, sent_output)
+
+    def _prepare_action(self, action: dict) -> tuple[str, str | None]:
+        """Send any send_message calls in the action.
+
+        Returns:
+            Tuple of (command left to execute, combined send output or None if
+            the action contained no send_message calls)
+        """
         cmd = action["action"]
         self.log(f"> {cmd}")
 
@@ -158,43 +279,43 @@ class DefaultAgent:
 
                 # Strip ALL send_message calls and execute remaining command
                 remaining_cmd = self._strip_send_message(cmd)
-                combined_output = "\n".join(outputs)
-
-                if not remaining_cmd.strip():
-                    return {"output": combined_output, "returncode": 0, "action": cmd}
-
-                # Execute remaining command and combine outputs
-                self.log(f"> {remaining_cmd}")
-                try:
-                    env_output = self.env.execute(remaining_cmd)
-                    combined_output += "\n" + env_output.get("output", "")
-                    output = {"output": combined_output, "returncode": env_output.get("returncode", 0), "action": cmd}
-                except Exception as e:
-                    output = {
-                        "output": combined_output + f"\n(remaining command failed: {e})",
-                        "returncode": 1,
-                        "action": cmd,
-                    }
-
-                self.log(f"(exit {output.get('returncode', '?')})")
-                self.log(output.get("output", ""))
-                self.has_finished(output)
-                return output
+                if remaining_cmd.strip():
+                    self.log(f"> {remaining_cmd}")
+                return remaining_cmd, "\n".join(outputs)
 
-        try:
-            output = self.env.execute(cmd)
-        except (TimeoutError, subprocess.TimeoutExpired) as e:
-            output_str = e.output.decode("utf-8", errors="replace") if getattr(e, "output", None) else ""
+        return cmd, None
+
+    def _finish_action(self, action: dict, output: dict | Exception, sent_output: str | None) -> dict:
+        """Turn the environment output (or the exception it raised) into the action's output."""
+        cmd = action["action"]
+
+        if sent_output is not None:
+            # Combine send_message outputs with the remaining command's output
+            if isinstance(output, Exception):
+                output = {
+                    "output": sent_output + f"\n(remaining command failed: {output})",
+                    "returncode": 1,
+                    "action": cmd,
+                }
+            else:
+                combined_output = sent_output + "\n" + output.get("output", "")
+                output = {"output": combined_output, "returncode": output.get("returncode", 0), "action": cmd}
+            self.log(f"(exit {output.get('returncode', '?')})")
+            self.log(output.get("output", ""))
+            self.has_finished(output)
+            return output
+
+        if isinstance(output, (TimeoutError, subprocess.TimeoutExpired)):
+            output_str = output.output.decode("utf-8", errors="replace") if getattr(output, "output", None) else ""
             self.log("(timeout)")
             self.log(output_str)
             raise ExecutionTimeoutError(
                 self.render_template(self.config.timeout_template, action=action, output=output_str)
             )
-        except Exception as e:
+        if isinstance(output, Exception):
             # Handle unexpected errors (e.g., encoding issues) gracefully
-            self.log(f"(error: {e})")
-            output = {"output": f"Command execution error: {e}", "returncode": 1, "action": cmd}
-            return output
+            self.log(f"(error: {output})")
+            return {"output": f"Command execution error: {output}", "returncode": 1, "action": cmd}
 
         self.log(f"(exit {output.get('returncode', '?')})")
         self.log(output.get("output", ""))
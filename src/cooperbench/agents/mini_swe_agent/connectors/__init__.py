@@ -4,6 +4,7 @@ from cooperbench.agents.mini_swe_agent.connectors.git import GitConnector
 from cooperbench.agents.mini_swe_agent.connectors.git_servers import (
     DockerGitServer,
     GCPGitServer,
+    GCPSidecarGitServer,
     GitServer,
     ModalGitServer,
     create_git_server,
@@ -13,6 +14,7 @@ from cooperbench.agents.mini_swe_agent.connectors.messaging import MessagingConn
 __all__ = [
     "DockerGitServer",
     "GCPGitServer",
+    "GCPSidecarGitServer",
     "GitConnector",
     "GitServer",
     "MessagingConnector",
@@ -3,7 +3,7 @@
 Provides pluggable backends for hosting shared git repositories:
 - Modal: Cloud-based sandboxes (default)
 - Docker: Local containers
-- GCP: Google Cloud Platform VMs
+- GCP: Google Cloud Platform VMs (or a sidecar container on pooled agent VMs)
 """
 
 from __future__ import annotations
@@ -12,13 +12,21 @@ from typing import TYPE_CHECKING
 
 from cooperbench.agents.mini_swe_agent.connectors.git_servers.base import GitServer
 from cooperbench.agents.mini_swe_agent.connectors.git_servers.docker import DockerGitServer
-from cooperbench.agents.mini_swe_agent.connectors.git_servers.gcp import GCPGitServer
+from cooperbench.agents.mini_swe_agent.connectors.git_servers.gcp import GCPGitServer, GCPSidecarGitServer
 from cooperbench.agents.mini_swe_agent.connectors.git_servers.modal import ModalGitServer
+from cooperbench.agents.mini_swe_agent.environments.gcp_pool import vm_pool_enabled
 
 if TYPE_CHECKING:
     import modal
 
-__all__ = ["GitServer", "ModalGitServer", "DockerGitServer", "GCPGitServer", "create_git_server"]
+__all__ = [
+    "GitServer",
+    "ModalGitServer",
+    "DockerGitServer",
+    "GCPGitServer",
+    "GCPSidecarGitServer",
+    "create_git_server",
+]
 
 
 def create_git_server(
@@ -32,9 +40,12 @@ def create_git_server(
     zone: str = "us-central1-a",
     machine_type: str = "e2-micro",
     network: str | None = None,
-) -> ModalGitServer | DockerGitServer | GCPGitServer:
+) -> ModalGitServer | DockerGitServer | GCPGitServer | GCPSidecarGitServer:
     """Create a git server for the specified backend.
 
+    With COOPERBENCH_GCP_VM_POOL set, the gcp backend runs the server as a
+    sidecar container next to the agents instead of on its own VM.
+
     Args:
         backend: Backend name ("modal", "docker", or "gcp")
         run_id: Unique run identifier
@@ -76,6 +87,8 @@ def create_git_server(
             raise ValueError("Modal backend requires 'app' parameter")
         return ModalGitServer.create(app=app, run_id=run_id, timeout=timeout)
     elif backend == "gcp":
+        if vm_pool_enabled():
+            return GCPSidecarGitServer.create(run_id=run_id)
         return GCPGitServer.create(
             run_id=run_id,
             project_id=project_id,
@@ -7,6 +7,9 @@ import subprocess
 import time
 import uuid
 
+from cooperbench.agents.mini_swe_agent.environments.gcp_pool import git_sidecar_name
+from cooperbench.infra.ssh import SSHSession
+
 
 class GCPGitServer:
     """Shared git server on GCP VM for code collaboration.
@@ -47,6 +50,7 @@ class GCPGitServer:
         self._vm_created = False
         self._firewall_created = False
         self._compute_client = None
+        self._ssh: SSHSession | None = None
         self._logger = logging.getLogger("cooperbench.agents.mini_swe_agent.git_server.gcp")
 
     @classmethod
@@ -332,6 +336,7 @@ echo "Git daemon started"
                 )
                 if result.returncode == 0 and "ready" in result.stdout:
                     self._logger.debug("SSH is ready")
+                    self._open_ssh_session()
                     # Wait a bit more for startup script to complete
                     self._wait_for_git_daemon()
                     return
@@ -344,6 +349,40 @@ echo "Git daemon started"
 
         raise TimeoutError(f"SSH not available on {self._vm_name} after {timeout}s")
 
+    def _open_ssh_session(self):
+        """Open the multiplexed SSH session (falls back to gcloud per command)."""
+        try:
+            self._ssh = SSHSession.from_gcloud(self._vm_name, self._zone, self._project_id)
+        except Exception as e:
+            self._logger.debug(f"SSH multiplexing unavailable, using gcloud per command: {e}")
+
+    def _ssh_exec(self, command: str, timeout: int = 30) -> int:
+        """Run a command on the VM, over the multiplexed session once it is open.
+
+        Returns:
+            Exit status of the command
+        """
+        if self._ssh is not None:
+            return self._ssh.run(command, timeout=timeout)["returncode"]
+
+        result = subprocess.run(
+            [
+                "gcloud",
+                "compute",
+                "ssh",
+                self._vm_name,
+                f"--zone={self._zone}",
+                f"--project={self._project_id}",
+                f"--command={command}",
+                "--quiet",
+                "--strict-host-key-checking=no",
+            ],
+            capture_output=True,
+            text=True,
+            timeout=timeout,
+        )
+        return result.returncode
+
     def _wait_for_git_daemon(self, timeout: int = 120):
         """Wait for git-daemon to start on the VM."""
         self._logger.debug("Waiting for git-daemon to start...")
@@ -351,23 +390,7 @@ echo "Git daemon started"
 
         while time.time() - start_time < timeout:
             try:
-                result = subprocess.run(
-                    [
-                        "gcloud",
-                        "compute",
-                        "ssh",
-                        self._vm_name,
-                        f"--zone={self._zone}",
-                        f"--project={self._project_id}",
-                        "--command=pgrep -f git-daemon",
-                        "--quiet",
-                        "--strict-host-key-checking=no",
-                    ],
-                    capture_output=True,
-                    text=True,
-                    timeout=30,
-                )
-                if result.returncode == 0:
+                if self._ssh_exec("pgrep -f git-daemon") == 0:
                     self._logger.debug("git-daemon is running")
                     return
             except Exception as e:
@@ -475,6 +498,10 @@ echo "Git daemon started"
 
     def cleanup(self) -> None:
         """Delete the VM and firewall rule."""
+        if self._ssh is not None:
+            self._ssh.close()
+            self._ssh = None
+
         # Delete firewall rule first
         if self._firewall_created:
             self._delete_firewall_rule()
@@ -542,3 +569,44 @@ echo "Git daemon started"
             self.cleanup()
         except Exception:
             pass
+
+
+class GCPSidecarGitServer:
+    """Git server running as a sidecar container on a pooled agent VM.
+
+    With shared VMs (COOPERBENCH_GCP_VM_POOL), the agents of a run are placed on
+    the same VM and the first of them starts git-daemon there in a container
+    named after the run, on a Docker network of the same name (see
+    GCPEnvironment's ``git_sidecar``). Nothing is created here: this only tells
+    the agents where the server will be, and the last agent removes it.
+
+    Example:
+        server = GCPSidecarGitServer.create(run_id="my-run")
+        print(server.url)  # git://cooperbench-git-my-run:9418/repo.git
+        print(server.network_name)  # cooperbench-git-my-run
+    """
+
+    def __init__(self, name: str):
+        """Initialize with the sidecar's container name.
+
+        Use GCPSidecarGitServer.create() to create a new server.
+        """
+        self._name = name
+
+    @classmethod
+    def create(cls, run_id: str) -> GCPSidecarGitServer:
+        """Describe the sidecar git server of a run."""
+        return cls(git_sidecar_name(run_id))
+
+    @property
+    def url(self) -> str:
+        """Git URL for agents to use as remote (resolved on the sidecar's network)."""
+        return f"git://{self._name}:9418/repo.git"
+
+    @property
+    def network_name(self) -> str:
+        """Docker network (on the pooled VM) that agents join."""
+        return self._name
+
+    def cleanup(self) -> None:
+        """Nothing to do: the sidecar is removed with the run's last agent."""
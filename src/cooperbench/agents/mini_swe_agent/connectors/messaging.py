@@ -16,6 +16,9 @@ Example:
     # Receive pending messages
     messages = connector.receive()
 
+    # Or block (up to 30s) until a teammate sends something
+    messages = connector.wait_for_message(timeout=30)
+
     # Broadcast to all
     connector.broadcast("I'm starting on the API changes")
 """
@@ -24,7 +27,7 @@ import json
 from datetime import datetime
 from typing import Any
 
-import redis
+from cooperbench.infra.redis import RedisNamespace
 
 
 class MessagingConnector:
@@ -41,15 +44,10 @@ class MessagingConnector:
         self.agent_id = agent_id
         self.agents = agents
 
-        # Parse optional namespace prefix from URL (format: url#prefix)
-        if "#" in url:
-            url, self._prefix = url.split("#", 1)
-            self._prefix += ":"
-        else:
-            self._prefix = ""
-
-        self._client = redis.from_url(url)
-        self._inbox_key = f"{self._prefix}{agent_id}:inbox"
+        # Connections come from the process-wide pool for this server
+        self._namespace = RedisNamespace(url)
+        self._client = self._namespace.client
+        self._inbox_key = self._namespace.key(f"{agent_id}:inbox")
 
         # Clear stale messages from previous runs
         self._client.delete(self._inbox_key)
@@ -78,21 +76,41 @@ class MessagingConnector:
             "content": content,
             "timestamp": datetime.now().isoformat(),
         }
-        self._client.rpush(f"{self._prefix}{recipient}:inbox", json.dumps(message))
+        self._client.rpush(self._namespace.key(f"{recipient}:inbox"), json.dumps(message))
 
     def receive(self) -> list[dict]:
         """Get all pending messages from inbox (empties the inbox).
 
+        The inbox is read and cleared in a single MULTI/EXEC round-trip,
+        regardless of how many messages are queued.
+
         Returns:
             List of message dicts with from, to, content, timestamp
         """
-        messages = []
-        while True:
-            msg = self._client.lpop(self._inbox_key)
-            if msg is None:
-                break
-            messages.append(json.loads(msg))
-        return messages
+        pipe = self._client.pipeline(transaction=True)
+        pipe.lrange(self._inbox_key, 0, -1)
+        pipe.delete(self._inbox_key)
+        raw, _ = pipe.execute()
+        return [json.loads(msg) for msg in raw]
+
+    def wait_for_message(self, timeout: float) -> list[dict]:
+        """Block until at least one message arrives, then drain the inbox.
+
+        Lets an idle agent wait on a teammate without polling. The built-in
+        agent loops don't call this: they drain the inbox with receive() once
+        per step and never idle. Note that the BLPOP holds one pooled
+        connection for up to ``timeout`` seconds.
+
+        Args:
+            timeout: Max seconds to wait (0 blocks indefinitely)
+
+        Returns:
+            List of message dicts (empty if the timeout expired)
+        """
+        popped = self._client.blpop([self._inbox_key], timeout=timeout)
+        if popped is None:
+            return []
+        return [json.loads(popped[1]), *self.receive()]
 
     def broadcast(self, content: str) -> None:
         """Send a message to all other agents.
@@ -2,14 +2,121 @@
 
 import logging
 import platform
-from concurrent.futures import ThreadPoolExecutor
-from concurrent.futures import TimeoutError as FuturesTimeoutError
+import socket
+import struct
+import threading
+import time
+import uuid
 from typing import Any
 
 import docker
 from docker.models.containers import Container
 from pydantic import BaseModel
 
+# Shell function run by the persistent worker: executes one command in its own process
+# group under `timeout` (which signals the whole group), then prints an end marker
+_WORKER_PRELUDE = """
+__cb_run() {
+    local cmd rc
+    cmd=$(cat)
+    if command -v timeout >/dev/null 2>&1; then
+        timeout -k 5 "$2" bash -lc "$cmd" </dev/null 2>&1
+    else
+        bash -lc "$cmd" </dev/null 2>&1
+    fi
+    rc=$?
+    printf '\\n%s %s\\n' "$1" "$rc"
+}
+"""
+
+# Exit code of `timeout` when the command was killed
+_TIMEOUT_EXIT_CODE = 124
+
+# Extra seconds to wait for the in-container timeout before giving up on the worker
+_HOST_TIMEOUT_GRACE = 15
+
+
+class _ShellWorker:
+    """Long-lived bash process in a container, driven over an attached exec socket.
+
+    Each command costs one write and the reads of its output, instead of the
+    exec_create/exec_start/exec_inspect round-trips of ``exec_run``.
+    """
+
+    def __init__(self, sock: socket.socket, logger: logging.Logger):
+        self._sock = sock
+        self._logger = logger
+        self._buffer = bytearray()  # Raw bytes not yet parsed into frames
+        self._output = bytearray()  # Demultiplexed stdout/stderr payload
+        sock.sendall(_WORKER_PRELUDE.encode())
+
+    def send(self, command: str, timeout: int) -> str:
+        """Send a command to the worker and return the token marking its end.
+
+        Raises:
+            OSError: If the command could not be written (e.g., the worker exited)
+        """
+        token = f"__CB_DONE_{uuid.uuid4().hex}"
+        self._output.clear()
+        self._sock.sendall(f"__cb_run {token} {timeout} <<'{token}'\n{command}\n{token}\n".encode())
+        return token
+
+    def wait(self, token: str, timeout: int) -> tuple[int, str]:
+        """Wait for a sent command and return (exit code, combined output).
+
+        Raises:
+            TimeoutError: If no result arrived within the timeout plus grace period
+            ConnectionError: If the worker exited
+        """
+        marker = f"\n{token} ".encode()
+        deadline = time.monotonic() + timeout + _HOST_TIMEOUT_GRACE
+        searched = 0
+        while True:
+            start = self._output.find(marker, searched)
+            if start != -1:
+                end = self._output.find(b"\n", start + len(marker))
+                if end != -1:
+                    exit_code = int(self._output[start + len(marker) : end])
+                    output = self._output[:start].decode("utf-8", errors="replace")
+                    self._output.clear()
+                    return exit_code, output
+            else:
+                # Only re-scan the tail that could hold a partial marker
+                searched = max(0, len(self._output) - len(marker))
+            self._read(deadline)
+
+    def _read(self, deadline: float) -> None:
+        """Read from the socket and demultiplex complete frames into the output buffer."""
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise TimeoutError("Timed out waiting for command output")
+        self._sock.settimeout(remaining)
+        try:
+            chunk = self._sock.recv(65536)
+        except TimeoutError:
+            raise TimeoutError("Timed out waiting for command output") from None
+        if not chunk:
+            raise ConnectionError("Shell worker exited")
+        self._buffer += chunk
+
+        # Frame format: [stream, 0, 0, 0, size (4 bytes, big-endian)] + payload
+        offset = 0
+        while len(self._buffer) - offset >= 8:
+            _, size = struct.unpack_from(">BxxxL", self._buffer, offset)
+            if len(self._buffer) - offset < 8 + size:
+                break
+            payload = self._buffer[offset + 8 : offset + 8 + size]
+            offset += 8 + size
+            self._logger.debug(payload.decode("utf-8", errors="replace").rstrip())
+            self._output += payload
+        del self._buffer[:offset]
+
+    def close(self) -> None:
+        try:
+            self._sock.close()
+        except OSError:
+            pass
+
 
 class DockerEnvironmentConfig(BaseModel):
     image: str
@@ -37,6 +144,8 @@ class DockerEnvironment:
         self.config = config_class(**kwargs)
         self.container = None
         self._client: docker.DockerClient | None = None
+        self._worker: _ShellWorker | None = None
+        self._worker_lock = threading.Lock()
         self._start_container()
 
     def _get_client(self) -> docker.DockerClient:
@@ -78,47 +187,81 @@ class DockerEnvironment:
             "machine": platform.machine(),
         }
 
+    def _start_worker(self) -> _ShellWorker:
+        """Attach a persistent bash process to the container."""
+        api = self._get_client().api
+        exec_id = api.exec_create(
+            self.container.id,
+            ["bash", "--noprofile", "--norc"],
+            stdin=True,
+            stdout=True,
+            stderr=True,
+            tty=False,
+            environment=self.config.env,
+            workdir=self.config.cwd,
+        )
+        sock = api.exec_start(exec_id, socket=True)
+        return _ShellWorker(getattr(sock, "_sock", sock), self.logger)
+
     def execute(self, command: str, cwd: str = "", *, timeout: int | None = None) -> dict[str, Any]:
-        """Execute a command in the Docker container with timeout support."""
+        """Execute a command in the Docker container with timeout support.
+
+        Commands run through a persistent shell worker; a command exceeding the
+        timeout has its whole process group killed inside the container.
+        """
         cwd = cwd or self.config.cwd
         exec_timeout = timeout or self.config.timeout
 
         if self.container is None:
             raise RuntimeError("Container not initialized")
 
-        # Refresh container state
-        self.container.reload()
-
         # Build the command with cd
         full_command = f"cd {cwd} && {command}"
 
-        def _run_exec():
-            return self.container.exec_run(
-                cmd=["bash", "-lc", full_command],
-                workdir=cwd,
-                demux=False,
-                environment=self.config.env,
-            )
-
-        try:
-            # Use ThreadPoolExecutor to enforce timeout on exec_run
-            with ThreadPoolExecutor(max_workers=1) as executor:
-                future = executor.submit(_run_exec)
+        with self._worker_lock:
+            for attempt in range(2):
+                if self._worker is None:
+                    self._worker = self._start_worker()
                 try:
-                    exit_code, output = future.result(timeout=exec_timeout)
-                except FuturesTimeoutError:
-                    self.logger.warning(f"Command timed out after {exec_timeout}s: {command[:100]}")
-                    return {"output": f"Command timed out after {exec_timeout} seconds", "returncode": -1}
+                    token = self._worker.send(full_command, exec_timeout)
+                    break
+                except OSError as e:
+                    # The command never reached the worker (e.g., it exited after the last one); restart once
+                    self._close_worker()
+                    if attempt == 1:
+                        self.logger.error(f"Command execution failed: {e}")
+                        raise
+
+            start = time.monotonic()
+            try:
+                exit_code, output = self._worker.wait(token, exec_timeout)
+            except TimeoutError:
+                # The worker is stuck on this command; replace it on the next call
+                self._close_worker()
+                self.logger.warning(f"Command timed out after {exec_timeout}s: {command[:100]}")
+                return {"output": f"Command timed out after {exec_timeout} seconds", "returncode": -1}
+            except OSError as e:
+                # The worker died mid-command (e.g., the command killed it); the command may
+                # have partly run, so report it instead of running it again
+                self._close_worker()
+                self.logger.error(f"Shell worker exited while running command: {command[:100]}")
+                return {"output": f"Command failed: shell worker exited ({e})", "returncode": -1}
+
+        if exit_code == _TIMEOUT_EXIT_CODE and time.monotonic() - start >= exec_timeout:
+            self.logger.warning(f"Command timed out after {exec_timeout}s: {command[:100]}")
+            return {"output": f"{output}Command timed out after {exec_timeout} seconds", "returncode": -1}
 
-            output_str = output.decode("utf-8", errors="replace") if output else ""
-            return {"output": output_str, "returncode": exit_code}
+        return {"output": output, "returncode": exit_code}
 
-        except Exception as e:
-            self.logger.error(f"Command execution failed: {e}")
-            raise
+    def _close_worker(self) -> None:
+        if self._worker is not None:
+            self._worker.close()
+            self._worker = None
 
     def cleanup(self):
         """Stop and remove the Docker container."""
+        if getattr(self, "_worker", None) is not None:
+            self._close_worker()
         if hasattr(self, "container") and self.container:
             try:
                 self.container.stop(timeout=5)
@@ -2,6 +2,7 @@
 
 Creates a GCP Compute Engine VM with Container-Optimized OS,
 runs the specified Docker image, and executes commands via SSH.
+With vm_pool enabled, containers share pooled VMs instead (see gcp_pool).
 """
 
 from __future__ import annotations
@@ -14,7 +15,19 @@ import time
 import uuid
 from typing import Any
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+
+from cooperbench.agents.mini_swe_agent.environments.gcp_pool import (
+    GIT_DAEMON_SCRIPT,
+    GIT_SIDECAR_IMAGE,
+    SYSTEM_RESERVE_GB,
+    VMHost,
+    VMPool,
+    get_vm_pool,
+    machine_memory_gb,
+    vm_pool_enabled,
+)
+from cooperbench.infra.ssh import SSHSession
 
 
 class GCPEnvironmentConfig(BaseModel):
@@ -32,13 +45,27 @@ class GCPEnvironmentConfig(BaseModel):
     network: str | None = None  # VPC network for git server connectivity
     vm_image_family: str | None = None  # Custom image family (e.g., "cooperbench-eval")
     vm_image_project: str | None = None  # Project for custom image (defaults to project_id)
+    ssh_multiplexing: bool = True  # Reuse one SSH connection for all commands
+    # Shared VMs (defaults to $COOPERBENCH_GCP_VM_POOL)
+    vm_pool: bool = Field(default_factory=vm_pool_enabled)
+    vm_memory_gb: float | None = None  # Defaults to the machine type's memory
+    container_memory_gb: float = 2.0  # Memory limit of the container (pooled only)
+    vm_idle_timeout: float = 300  # Seconds an empty pooled VM is kept for reuse
+    vm_group: str | None = None  # Containers of a group share a VM (e.g. a coop run)
+    vm_group_size: int = 1  # Containers expected in the group
+    git_sidecar: str | None = None  # Git server container (and network) of the group
 
 
 class GCPEnvironment:
     """GCP VM environment for running agent commands.
 
     Creates a Container-Optimized OS VM, starts a Docker container,
-    and executes commands via SSH + docker exec.
+    and executes commands via SSH + docker exec. Once the VM accepts SSH,
+    commands share one multiplexed connection (see cooperbench.infra.ssh)
+    instead of starting ``gcloud compute ssh`` each time.
+
+    With ``vm_pool`` the container is placed on a shared VM instead, next to
+    the other containers of its ``vm_group`` and the group's git sidecar.
 
     Example:
         env = GCPEnvironment(
@@ -57,8 +84,22 @@ class GCPEnvironment:
         logger: logging.Logger | None = None,
         **kwargs,
     ):
+        self._setup(config_class(**kwargs), logger, "cooperbench-agent")
+
+        if self.config.vm_pool:
+            self._start_pooled()
+            return
+
+        # Create VM and start container
+        self._create_vm()
+        self._wait_for_ssh()
+        self._open_ssh_session()
+        self._start_container()
+
+    def _setup(self, config: GCPEnvironmentConfig, logger: logging.Logger | None, name_prefix: str):
+        """Resolve the project and initialize state (no VM is created yet)."""
         self.logger = logger or logging.getLogger("cooperbench.agents.mini_swe_agent.gcp")
-        self.config = config_class(**kwargs)
+        self.config = config
 
         # Resolve project ID
         self._project_id = self.config.project_id or self._get_default_project()
@@ -69,18 +110,102 @@ class GCPEnvironment:
             )
 
         # Generate unique VM name
-        self._vm_name = f"cooperbench-agent-{uuid.uuid4().hex[:12]}"
+        self._vm_name = f"{name_prefix}-{uuid.uuid4().hex[:12]}"
         self._zone = self.config.zone
 
         # State
         self._vm_created = False
         self._container_started = False
+        self._container_name = "agent"
         self._compute_client = None
+        self._ssh: SSHSession | None = None
+        self._pool: VMPool | None = None
+        self._host: VMHost | None = None
+
+    @classmethod
+    def _boot_pool_vm(cls, config: GCPEnvironmentConfig, logger: logging.Logger, host: VMHost) -> None:
+        """Create a bare VM for a pool and attach it to the pool's host."""
+        vm = cls.__new__(cls)
+        vm._setup(config, logger, "cooperbench-pool")
+        host.name = vm._vm_name
+        try:
+            vm._create_vm()
+            vm._wait_for_ssh()
+            vm._open_ssh_session()
+        except Exception:
+            vm.cleanup()
+            raise
+        host.attach(vm._ssh_exec, vm.cleanup)
+
+    def _get_pool(self) -> VMPool:
+        """Get the pool of VMs matching this environment's VM configuration."""
+        config = self.config
+        capacity = (config.vm_memory_gb or machine_memory_gb(config.machine_type)) - SYSTEM_RESERVE_GB
+        key = (
+            self._project_id,
+            self._zone,
+            config.machine_type,
+            config.network,
+            config.vm_image_family,
+            config.vm_image_project,
+            capacity,
+        )
+        vm_config = config.model_copy(update={"project_id": self._project_id})
+
+        def provider(host: VMHost) -> None:
+            type(self)._boot_pool_vm(vm_config, self.logger, host)
+
+        return get_vm_pool(key, lambda: VMPool(provider, capacity, idle_timeout=config.vm_idle_timeout))
+
+    def _start_pooled(self):
+        """Place the container on a pooled VM and start it there."""
+        config = self.config
+        self._pool = self._get_pool()
+        self._host = self._pool.acquire(
+            config.image,
+            config.container_memory_gb,
+            group=config.vm_group,
+            group_memory_gb=config.container_memory_gb * config.vm_group_size,
+        )
+        self._vm_name = self._host.name
+        self._container_name = f"agent-{uuid.uuid4().hex[:12]}"
+        self.logger.debug(f"Placed container {self._container_name} on pooled VM {self._vm_name}")
 
-        # Create VM and start container
-        self._create_vm()
-        self._wait_for_ssh()
-        self._start_container()
+        try:
+            if config.git_sidecar:
+                self._ensure_git_sidecar(config.git_sidecar)
+            self._start_container()
+        except Exception:
+            self.cleanup()
+            raise
+        self._pool.mark_pulled(self._host, config.image)
+
+    def _ensure_git_sidecar(self, name: str, timeout: int = 120):
+        """Start the group's git server next to the containers, unless a member already did."""
+        assert self._host is not None
+        quoted = shlex.quote(name)
+        with self._host.lock:
+            running = self._ssh_exec(f"docker inspect -f '{{{{.State.Running}}}}' {quoted}")
+            if running["returncode"] == 0 and "true" in running["output"].lower():
+                return
+
+            self.logger.debug(f"Starting git sidecar {name} on {self._vm_name}")
+            self._ssh_exec(f"docker rm -f {quoted} >/dev/null 2>&1; docker network create {quoted} >/dev/null 2>&1")
+            result = self._ssh_exec(
+                f"docker run -d --name {quoted} --hostname {quoted} --network {quoted} "
+                f"{GIT_SIDECAR_IMAGE} bash -c {shlex.quote(GIT_DAEMON_SCRIPT)}"
+            )
+            if result["returncode"] != 0:
+                raise RuntimeError(f"Failed to start git sidecar: {result['output']}")
+
+            # PID 1 becomes git daemon once the repository is initialized
+            start_time = time.time()
+            while time.time() - start_time < timeout:
+                check = self._ssh_exec(f"docker exec {quoted} cat /proc/1/cmdline", timeout=30)
+                if check["returncode"] == 0 and "daemon" in check["output"]:
+                    return
+                time.sleep(2)
+            raise TimeoutError(f"Git sidecar {name} not ready after {timeout}s")
 
     def _get_default_project(self) -> str | None:
         """Get default GCP project from environment or gcloud config."""
@@ -261,6 +386,15 @@ class GCPEnvironment:
 
         raise TimeoutError(f"SSH not available on {self._vm_name} after {timeout}s")
 
+    def _open_ssh_session(self):
+        """Open the multiplexed SSH session (falls back to gcloud per command)."""
+        if not self.config.ssh_multiplexing:
+            return
+        try:
+            self._ssh = SSHSession.from_gcloud(self._vm_name, self._zone, self._project_id)
+        except Exception as e:
+            self.logger.debug(f"SSH multiplexing unavailable, using gcloud per command: {e}")
+
     def _start_container(self):
         """Start the Docker container on the VM."""
         self.logger.debug(f"Starting container with image: {self.config.image}")
@@ -281,8 +415,14 @@ class GCPEnvironment:
         # --entrypoint "" clears any entrypoint in the image (matches Modal's .entrypoint([]))
         # -w sets working directory (quoted to handle paths with spaces/special chars)
         quoted_cwd = shlex.quote(self.config.cwd)
+        name = self._container_name
+        # Pooled containers share the VM, so each gets a memory limit
+        if self._host is not None:
+            env_args += f" --memory {self.config.container_memory_gb * 1024:.0f}m"
+            if self.config.git_sidecar:
+                env_args += f" --network {shlex.quote(self.config.git_sidecar)}"
         start_cmd = (
-            f"docker run -d --name agent --entrypoint '' -w {quoted_cwd}{env_args} {self.config.image} sleep infinity"
+            f"docker run -d --name {name} --entrypoint '' -w {quoted_cwd}{env_args} {self.config.image} sleep infinity"
         )
         start_result = self._ssh_exec(start_cmd)
 
@@ -291,7 +431,7 @@ class GCPEnvironment:
 
         # Wait for container to be running
         for _ in range(30):  # 30 seconds max
-            check_result = self._ssh_exec("docker inspect -f '{{.State.Running}}' agent")
+            check_result = self._ssh_exec(f"docker inspect -f '{{{{.State.Running}}}}' {name}")
             if check_result["returncode"] == 0 and "true" in check_result["output"].lower():
                 break
             time.sleep(1)
@@ -300,7 +440,7 @@ class GCPEnvironment:
 
         # Create working directory if it doesn't exist
         if self.config.cwd != "/":
-            mkdir_result = self._ssh_exec(f"docker exec agent mkdir -p {quoted_cwd}")
+            mkdir_result = self._ssh_exec(f"docker exec {name} mkdir -p {quoted_cwd}")
             if mkdir_result["returncode"] != 0:
                 self.logger.warning(f"Failed to create working directory: {mkdir_result['output']}")
 
@@ -311,6 +451,11 @@ class GCPEnvironment:
         """Execute a command on the VM via SSH."""
         exec_timeout = timeout or self.config.timeout
 
+        if self._host is not None:
+            return self._host.run(command, timeout=exec_timeout)
+        if self._ssh is not None:
+            return self._ssh.run(command, timeout=exec_timeout)
+
         try:
             result = subprocess.run(
                 [
@@ -369,12 +514,20 @@ class GCPEnvironment:
         escaped_command = command.replace("'", "'\\''")
         # Use docker exec -w to set working directory (handles paths with spaces/special chars)
         quoted_cwd = shlex.quote(cwd)
-        docker_cmd = f"docker exec -w {quoted_cwd} agent bash -lc '{escaped_command}'"
+        docker_cmd = f"docker exec -w {quoted_cwd} {self._container_name} bash -lc '{escaped_command}'"
 
         return self._ssh_exec(docker_cmd, timeout=exec_timeout)
 
     def cleanup(self) -> None:
-        """Delete the VM and clean up resources."""
+        """Delete the VM and clean up resources (pooled: remove the container, keep the VM)."""
+        if self._host is not None:
+            self._cleanup_pooled()
+            return
+
+        if self._ssh is not None:
+            self._ssh.close()
+            self._ssh = None
+
         if not self._vm_created:
             return
 
@@ -404,6 +557,25 @@ class GCPEnvironment:
         except Exception as e:
             self.logger.warning(f"Failed to delete VM {self._vm_name}: {e}")
 
+    def _cleanup_pooled(self) -> None:
+        """Remove the container and give its slot back to the pool."""
+        host, pool, self._host = self._host, self._pool, None
+        assert host is not None and pool is not None
+        config = self.config
+        try:
+            host.run(f"docker rm -f {self._container_name}", timeout=60)
+        except Exception as e:
+            self.logger.warning(f"Failed to remove container {self._container_name}: {e}")
+        self._container_started = False
+
+        last = pool.release(host, config.container_memory_gb, config.vm_group)
+        if (last or not config.vm_group) and config.git_sidecar:
+            quoted = shlex.quote(config.git_sidecar)
+            try:
+                host.run(f"docker rm -f {quoted}; docker network rm {quoted}", timeout=60)
+            except Exception as e:
+                self.logger.warning(f"Failed to remove git sidecar {config.git_sidecar}: {e}")
+
     def __del__(self):
         """Ensure cleanup on garbage collection."""
         try:
@@ -0,0 +1,320 @@
+"""Shared GCP VMs for agent containers.
+
+By default every GCPEnvironment boots its own VM, so a coop pair pays for two
+VM boots and two image pulls (plus a third VM for the git server). With
+``COOPERBENCH_GCP_VM_POOL=1`` agents are bin-packed onto shared VMs instead:
+
+- each VM offers the memory of its machine type (minus a system reserve), and
+  each container takes ``container_memory_gb`` of it (``docker run --memory``);
+- new containers prefer VMs that already pulled their image, then the
+  fullest VM they fit on, and only then boot a new VM;
+- the agents of a group (a coop run) reserve their memory together on one VM,
+  so they can reach a git server running next to them as a sidecar container;
+- VMs left empty for ``idle_timeout`` seconds are deleted, and the remaining
+  ones when the process exits.
+
+The pool does not know how VMs are created: a provider callable boots one and
+attaches it to a :class:`VMHost`. GCPEnvironment provides bare Compute Engine
+VMs; tests use the local Docker daemon.
+"""
+
+from __future__ import annotations
+
+import atexit
+import logging
+import os
+import threading
+import time
+from collections.abc import Callable, Hashable
+from typing import Any
+
+POOL_ENV = "COOPERBENCH_GCP_VM_POOL"
+
+# Memory (GB) of common machine types; others need vm_memory_gb in the config
+MACHINE_MEMORY_GB = {
+    "e2-medium": 4,
+    "e2-standard-2": 8,
+    "e2-standard-4": 16,
+    "e2-standard-8": 32,
+    "e2-standard-16": 64,
+    "e2-standard-32": 128,
+    "e2-highmem-2": 16,
+    "e2-highmem-4": 32,
+    "e2-highmem-8": 64,
+    "e2-highmem-16": 128,
+    "n2-standard-2": 8,
+    "n2-standard-4": 16,
+    "n2-standard-8": 32,
+    "n2-standard-16": 64,
+    "n2-standard-32": 128,
+}
+
+# Memory kept free for the OS, Docker and git sidecars
+SYSTEM_RESERVE_GB = 1.0
+
+# Sidecar git server (one per group, on the group's VM)
+GIT_SIDECAR_IMAGE = "debian:bookworm-slim"
+GIT_DAEMON_SCRIPT = """set -e
+apt-get update -qq
+apt-get install -y -qq git > /dev/null 2>&1
+mkdir -p /git/repo.git
+cd /git/repo.git
+git init --bare
+git config receive.denyCurrentBranch ignore
+touch git-daemon-export-ok
+exec git daemon --reuseaddr --export-all --enable=receive-pack --base-path=/git --listen=0.0.0.0 /git
+"""
+
+logger = logging.getLogger("cooperbench.agents.mini_swe_agent.gcp_pool")
+
+
+def vm_pool_enabled() -> bool:
+    """Whether agents share pooled VMs ($COOPERBENCH_GCP_VM_POOL)."""
+    return os.environ.get(POOL_ENV, "").lower() in {"1", "true", "yes"}
+
+
+def git_sidecar_name(group: str) -> str:
+    """Container name (and hostname) of a group's sidecar git server."""
+    return f"cooperbench-git-{group}"
+
+
+def machine_memory_gb(machine_type: str) -> float:
+    """Memory of a machine type, from the table or a custom type's name (e.g. e2-custom-4-8192)."""
+    if machine_type in MACHINE_MEMORY_GB:
+        return MACHINE_MEMORY_GB[machine_type]
+    parts = machine_type.split("-")
+    if "custom" in parts and parts[-1].isdigit():
+        return int(parts[-1]) / 1024
+    raise ValueError(f"Unknown memory for machine type {machine_type!r}; set vm_memory_gb")
+
+
+class VMHost:
+    """A pooled VM: runs shell commands and tracks what is placed on it."""
+
+    def __init__(self, name: str, capacity_gb: float):
+        self.name = name
+        self.capacity_gb = capacity_gb
+        self.used_gb = 0.0
+        self.images: set[str] = set()  # Images already pulled
+        self.idle_since: float | None = None
+        self.lock = threading.Lock()  # Serializes setup commands (e.g. sidecars)
+        self._run: Callable[..., dict[str, Any]] | None = None
+        self._close: Callable[[], None] | None = None
+        self._ready = threading.Event()
+        self._error: BaseException | None = None
+
+    @property
+    def free_gb(self) -> float:
+        return self.capacity_gb - self.used_gb
+
+    def attach(self, run: Callable[..., dict[str, Any]], close: Callable[[], None]) -> None:
+        """Connect the booted VM: run(command, timeout=...) executes on it, close() deletes it."""
+        self._run, self._close = run, close
+        self._ready.set()
+
+    def fail(self, error: BaseException) -> None:
+        self._error = error
+        self._ready.set()
+
+    def wait_ready(self) -> None:
+        """Block until the VM has booted; re-raises its boot error."""
+        self._ready.wait()
+        if self._error is not None:
+            raise RuntimeError(f"VM {self.name} failed to start: {self._error}") from self._error
+
+    def run(self, command: str, timeout: int | None = None) -> dict[str, Any]:
+        """Run a shell command on the VM (same result format as GCPEnvironment._ssh_exec)."""
+        self.wait_ready()
+        assert self._run is not None
+        return self._run(command, timeout=timeout)
+
+    def close(self) -> None:
+        if self._close is not None:
+            try:
+                self._close()
+            except Exception as e:
+                logger.warning(f"Failed to delete pooled VM {self.name}: {e}")
+
+
+class _Group:
+    """Memory a group reserved on its VM."""
+
+    def __init__(self, host: VMHost, reserved_gb: float):
+        self.host = host
+        self.reserved_gb = reserved_gb
+        self.free_gb = reserved_gb
+        self.members = 0
+
+
+class VMPool:
+    """Bin-packing scheduler of containers onto shared VMs (thread-safe)."""
+
+    def __init__(
+        self,
+        provider: Callable[[VMHost], None],
+        capacity_gb: float,
+        idle_timeout: float = 300,
+    ):
+        """Initialize an empty pool.
+
+        Args:
+            provider: Boots a VM for a new host and calls host.attach() (or raises)
+            capacity_gb: Memory available to containers on each VM
+            idle_timeout: Seconds an empty VM is kept for reuse before it is deleted
+        """
+        self.provider = provider
+        self.capacity_gb = capacity_gb
+        self.idle_timeout = idle_timeout
+        self.hosts: list[VMHost] = []
+        self._groups: dict[str, _Group] = {}
+        self._lock = threading.Lock()
+        self._counter = 0
+
+    def acquire(
+        self,
+        image: str,
+        memory_gb: float,
+        group: str | None = None,
+        group_memory_gb: float = 0.0,
+    ) -> VMHost:
+        """Place a container, booting a VM if none has room. Blocks until the VM is up.
+
+        Args:
+            image: Image of the container (VMs that pulled it are preferred)
+            memory_gb: Memory of the container
+            group: Containers of the same group are co-located
+            group_memory_gb: Memory to reserve for the whole group (first member)
+
+        Returns:
+            The VM to run the container on; pass it back to release()
+        """
+        if memory_gb > self.capacity_gb:
+            raise ValueError(f"Container needs {memory_gb} GB but pooled VMs offer {self.capacity_gb} GB")
+
+        boot = None
+        with self._lock:
+            self._reap_idle()
+            host = self._join_group(group, memory_gb) if group else None
+            if host is None:
+                need = max(memory_gb, min(group_memory_gb, self.capacity_gb)) if group else memory_gb
+                host = self._best_fit(image, need)
+                if host is None:
+                    self._counter += 1
+                    host = boot = VMHost(f"pool-{self._counter}", self.capacity_gb)
+                    self.hosts.append(host)
+                host.used_gb += need
+                host.idle_since = None
+                if group:
+                    self._groups[group] = _Group(host, need)
+                    self._join_group(group, memory_gb)
+
+        if boot is not None:
+            try:
+                self.provider(boot)
+            except BaseException as e:
+                boot.fail(e)
+        try:
+            host.wait_ready()
+        except Exception:
+            with self._lock:
+                if host in self.hosts:
+                    self.hosts.remove(host)
+                self._groups = {k: g for k, g in self._groups.items() if g.host is not host}
+            raise
+        return host
+
+    def _join_group(self, group: str, memory_gb: float) -> VMHost | None:
+        """Draw a member's memory from its group's reservation (caller holds the lock)."""
+        g = self._groups.get(group)
+        if g is None:
+            return None
+        if g.free_gb < memory_gb:
+            # Grow the reservation if the group's VM still has room
+            if g.host.free_gb < memory_gb:
+                logger.warning(f"VM {g.host.name} is full; group {group} cannot be co-located")
+                return None
+            g.host.used_gb += memory_gb
+            g.reserved_gb += memory_gb
+            g.free_gb += memory_gb
+        g.free_gb -= memory_gb
+        g.members += 1
+        return g.host
+
+    def _best_fit(self, image: str, need: float) -> VMHost | None:
+        """VM to place on: one that has the image, then the fullest that fits."""
+        candidates = [h for h in self.hosts if h.free_gb >= need and h._error is None]
+        if not candidates:
+            return None
+        return min(candidates, key=lambda h: (image not in h.images, h.free_gb))
+
+    def mark_pulled(self, host: VMHost, image: str) -> None:
+        """Record that a VM has an image, so later containers of it go there."""
+        with self._lock:
+            host.images.add(image)
+
+    def release(self, host: VMHost, memory_gb: float, group: str | None = None) -> bool:
+        """Give back a container's memory.
+
+        Returns:
+            True if this was the last member of its group (so its sidecars can go)
+        """
+        with self._lock:
+            last = False
+            g = self._groups.get(group) if group else None
+            if g is not None and g.host is host:
+                g.members -= 1
+                g.free_gb += memory_gb
+                if g.members <= 0:
+                    host.used_gb -= g.reserved_gb
+                    del self._groups[group]  # type: ignore[arg-type]
+                    last = True
+            else:
+                host.used_gb -= memory_gb
+            if host.used_gb <= 1e-9:
+                host.used_gb = 0.0
+                host.idle_since = time.monotonic()
+            self._reap_idle()
+            return last
+
+    def _reap_idle(self) -> None:
+        """Delete VMs that stayed empty past the idle timeout (caller holds the lock)."""
+        now = time.monotonic()
+        for host in list(self.hosts):
+            if host.idle_since is not None and now - host.idle_since >= self.idle_timeout:
+                self.hosts.remove(host)
+                threading.Thread(target=host.close, daemon=True).start()
+
+    def shutdown(self) -> None:
+        """Delete all VMs of the pool."""
+        with self._lock:
+            hosts, self.hosts = self.hosts, []
+            self._groups.clear()
+        for host in hosts:
+            host.close()
+
+
+# Process-wide pools, one per VM configuration
+_pools: dict[Hashable, VMPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_vm_pool(key: Hashable, factory: Callable[[], VMPool]) -> VMPool:
+    """Get the pool for a VM configuration, creating it on first use (thread-safe).
+
+    Args:
+        key: Identifies VMs that are interchangeable (project, zone, machine type, ...)
+        factory: Creates the pool if there is none for the key yet
+    """
+    with _pools_lock:
+        if key not in _pools:
+            _pools[key] = factory()
+        return _pools[key]
+
+
+@atexit.register
+def _shutdown_pools() -> None:
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.shutdown()
@@ -1,14 +1,21 @@
 """Modal Sandbox environment for cloud execution."""
 
+import asyncio
+import json
 import logging
+import os
 import platform
 import threading
 import time
+from pathlib import Path
 from typing import Any
 
 import modal
+from platformdirs import user_cache_dir
 from pydantic import BaseModel
 
+from cooperbench.infra.limiter import get_limiter
+
 # Retryable error patterns
 _RETRYABLE_PATTERNS = [
     "Image build",  # Image build failures
@@ -27,9 +34,13 @@ _RETRYABLE_PATTERNS = [
 
 # Global thread-safe image cache to prevent duplicate builds
 _image_cache: dict[str, modal.Image] = {}
+_manifest_images: dict[str, modal.Image] = {}  # Cached images that were loaded by manifest ID
 _image_locks: dict[str, threading.Lock] = {}
 _cache_lock = threading.Lock()
 
+# Image definition version; part of the image hash, so bumping it rebuilds every image
+IMAGE_SPEC_VERSION = "v6"
+
 # Global Modal app (shared across all environments)
 _global_app: modal.App | None = None
 _app_lock = threading.Lock()
@@ -51,8 +62,75 @@ def _reset_global_app() -> None:
         _global_app = None
 
 
+class ImageManifest:
+    """On-disk map of registry image names to hydrated Modal image IDs.
+
+    Entries are written once an image has been built (by ``cooperbench prewarm``
+    or by the first sandbox that uses it), so later processes load images by ID
+    instead of resolving them against the registry again. The manifest is
+    discarded when ``IMAGE_SPEC_VERSION`` changes.
+    """
+
+    def __init__(self, path: Path | None = None):
+        self.path = path or Path(user_cache_dir("cooperbench", appauthor=False)) / "modal_images.json"
+        self._lock = threading.Lock()
+        self._images: dict[str, str] | None = None
+
+    def _load(self) -> dict[str, str]:
+        if self._images is None:
+            try:
+                data = json.loads(self.path.read_text())
+            except (OSError, ValueError):
+                data = {}
+            self._images = data.get("images", {}) if data.get("spec") == IMAGE_SPEC_VERSION else {}
+        return self._images
+
+    def _save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps({"spec": IMAGE_SPEC_VERSION, "images": self._images}, indent=2, sort_keys=True))
+        tmp.replace(self.path)
+
+    def get(self, image_name: str) -> str | None:
+        """Return the recorded image ID for ``image_name``, if any."""
+        with self._lock:
+            return self._load().get(image_name)
+
+    def put(self, image_name: str, image_id: str) -> None:
+        """Record the hydrated image ID for ``image_name``."""
+        with self._lock:
+            images = self._load()
+            if images.get(image_name) == image_id:
+                return
+            images[image_name] = image_id
+            self._save()
+
+    def discard(self, image_name: str) -> None:
+        """Forget ``image_name`` (e.g., after its image ID stopped resolving)."""
+        with self._lock:
+            if self._load().pop(image_name, None) is not None:
+                self._save()
+
+
+_manifest: ImageManifest | None = None
+
+
+def get_image_manifest() -> ImageManifest:
+    """Get the process-wide image manifest (thread-safe)."""
+    global _manifest
+    with _cache_lock:
+        if _manifest is None:
+            _manifest = ImageManifest()
+        return _manifest
+
+
 def _get_or_build_image(image_name: str) -> modal.Image:
-    """Get cached image or build it (thread-safe, only one build per image)."""
+    """Get cached image or build it (thread-safe, only one build per image).
+
+    Images recorded in the manifest are loaded by ID. ``modal.Image.from_id``
+    is lazy, so a stale ID only fails once the image is used; callers then
+    call ``_invalidate_image`` and retry, which resolves it from the registry.
+    """
     # Fast path: image already cached
     if image_name in _image_cache:
         return _image_cache[image_name]
@@ -69,16 +147,72 @@ def _get_or_build_image(image_name: str) -> modal.Image:
         if image_name in _image_cache:
             return _image_cache[image_name]
 
+        # Reuse an image hydrated by an earlier process (e.g., cooperbench prewarm)
+        manifest = get_image_manifest()
+        image_id = manifest.get(image_name)
+        if image_id:
+            image = modal.Image.from_id(image_id)
+            _image_cache[image_name] = _manifest_images[image_name] = image
+            return image
+
         # Build and cache (CACHE_BUST env forces new image hash) TODO: @arpan remove this after testing
-        image = modal.Image.from_registry(image_name).entrypoint([]).env({"COOPERBENCH_CACHE": "v6"})
+        image = modal.Image.from_registry(image_name).entrypoint([]).env({"COOPERBENCH_CACHE": IMAGE_SPEC_VERSION})
         _image_cache[image_name] = image
         return image
 
 
+def _record_image(image_name: str, image: modal.Image) -> None:
+    """Record a hydrated image's ID in the manifest for later processes."""
+    try:
+        image_id = image.object_id
+    except Exception:
+        return
+    if image_id:
+        get_image_manifest().put(image_name, image_id)
+
+
+def _is_manifest_image(image_name: str, image: modal.Image) -> bool:
+    """Whether ``image`` was loaded from a manifest ID rather than built from the registry."""
+    return _manifest_images.get(image_name) is image
+
+
+def hydrate_image(image_name: str, force: bool = False) -> str:
+    """Build (or look up) the sandbox image for ``image_name`` ahead of time.
+
+    Args:
+        image_name: Registry image name of the task
+        force: Resolve the image from the registry even if the manifest has an ID for it
+
+    Returns:
+        Hydrated Modal image ID, also recorded in the image manifest
+    """
+    if force:
+        _invalidate_image(image_name)
+    image = _get_or_build_image(image_name)
+    try:
+        image.build(_get_global_app())
+    except Exception:
+        stale = _is_manifest_image(image_name, image)
+        _invalidate_image(image_name)
+        if not stale:
+            raise
+        # The recorded ID no longer resolves; build from the registry instead
+        image = _get_or_build_image(image_name)
+        try:
+            image.build(_get_global_app())
+        except Exception:
+            _invalidate_image(image_name)
+            raise
+    _record_image(image_name, image)
+    return image.object_id
+
+
 def _invalidate_image(image_name: str) -> None:
-    """Remove an image from cache (e.g., after build failure)."""
+    """Remove an image from cache and manifest (e.g., after build failure)."""
     with _cache_lock:
         _image_cache.pop(image_name, None)
+        _manifest_images.pop(image_name, None)
+    get_image_manifest().discard(image_name)
 
 
 class ModalEnvironmentConfig(BaseModel):
@@ -123,14 +257,29 @@ class ModalEnvironment:
         """Create and start the Modal Sandbox (single attempt)."""
         self.logger.debug(f"Creating Modal Sandbox with image: {self.config.image}")
         image = self._build_image()
-        self.sb = modal.Sandbox.create(
-            image=image,
-            timeout=self.config.timeout,
-            workdir=self.config.cwd,
-            app=_get_global_app(),
-        )
+        try:
+            self._create_sandbox(image)
+        except Exception as e:
+            if not _is_manifest_image(self.config.image, image):
+                raise
+            # A recorded image ID that no longer resolves only fails here (from_id is lazy)
+            self.logger.warning(f"Manifest image for {self.config.image} unusable ({e}), rebuilding from registry")
+            _invalidate_image(self.config.image)
+            image = self._build_image()
+            self._create_sandbox(image)
+        _record_image(self.config.image, image)
         self.logger.debug(f"Sandbox created: {self.sb.object_id}")
 
+    def _create_sandbox(self, image: modal.Image) -> None:
+        # Sandbox creation shares an adaptive limit with every other Modal caller in the process
+        with get_limiter("modal").slot():
+            self.sb = modal.Sandbox.create(
+                image=image,
+                timeout=self.config.timeout,
+                workdir=self.config.cwd,
+                app=_get_global_app(),
+            )
+
     def _start_sandbox_with_retry(self):
         """Create sandbox with retry logic for transient failures."""
         last_error = None
@@ -224,6 +373,34 @@ class ModalEnvironment:
             raise last_error
         raise RuntimeError("No retries attempted")
 
+    async def aexecute(self, command: str, cwd: str = "", *, timeout: int | None = None) -> dict[str, Any]:
+        """Async variant of execute() using Modal's native async API (no thread per command)."""
+        cwd = cwd or self.config.cwd
+        last_error: Exception | None = None
+
+        for attempt in range(self.config.max_retries):
+            try:
+                if self.sb is None:
+                    raise RuntimeError("Sandbox not initialized")
+                proc = await self.sb.exec.aio("bash", "-lc", f"cd {cwd} && {command}")
+                stdout, stderr = await asyncio.gather(proc.stdout.read.aio(), proc.stderr.read.aio())
+                await proc.wait.aio()
+                output = stdout + stderr if stderr else stdout
+                return {"output": output, "returncode": proc.returncode}
+            except Exception as e:
+                last_error = e
+                if self._is_sandbox_dead(e) and attempt < self.config.max_retries - 1:
+                    self.logger.warning(
+                        f"Sandbox died during execution (attempt {attempt + 1}/{self.config.max_retries}): {e}"
+                    )
+                    await asyncio.to_thread(self._reconnect_sandbox)
+                else:
+                    raise
+
+        if last_error is not None:
+            raise last_error
+        raise RuntimeError("No retries attempted")
+
     def cleanup(self):
         """Terminate the Modal Sandbox."""
         if hasattr(self, "sb") and self.sb:
@@ -15,7 +15,9 @@ from tenacity import (
 )
 
 from cooperbench.agents.mini_swe_agent.models import GLOBAL_MODEL_STATS
-from cooperbench.agents.mini_swe_agent.models.utils.cache_control import set_cache_control
+from cooperbench.agents.mini_swe_agent.models.utils.cache_control import MessageProjector
+from cooperbench.agents.mini_swe_agent.models.utils.response_log import ResponseLog
+from cooperbench.infra.limiter import get_limiter
 
 logger = logging.getLogger("litellm_model")
 
@@ -23,6 +25,25 @@ logger = logging.getLogger("litellm_model")
 # litellm._turn_on_debug()
 
 
+# Retry policy shared by the sync and async query paths
+_retry_query = retry(
+    reraise=True,
+    stop=stop_after_attempt(int(os.getenv("MSWEA_MODEL_RETRY_STOP_AFTER_ATTEMPT", "10"))),
+    wait=wait_exponential(multiplier=1, min=4, max=60),
+    retry=retry_if_not_exception_type(
+        (
+            litellm.exceptions.UnsupportedParamsError,
+            litellm.exceptions.NotFoundError,
+            litellm.exceptions.PermissionDeniedError,
+            litellm.exceptions.ContextWindowExceededError,
+            litellm.exceptions.APIError,
+            litellm.exceptions.AuthenticationError,
+            KeyboardInterrupt,
+        )
+    ),
+)
+
+
 class LitellmModelConfig(BaseModel):
     model_name: str
     model_kwargs: dict[str, Any] = {}
@@ -31,6 +52,11 @@ class LitellmModelConfig(BaseModel):
     """Set explicit cache control markers, for example for Anthropic models"""
     cost_tracking: Literal["default", "ignore_errors"] = os.getenv("MSWEA_COST_TRACKING", "default")
     """Cost tracking mode for this model. Can be "default" or "ignore_errors" (ignore errors/missing cost info)"""
+    response_storage: Literal["inline", "sidecar", "drop"] = os.getenv("MSWEA_RESPONSE_STORAGE", "sidecar")
+    """Where raw responses go: "inline" keeps them in the messages, "sidecar" writes them to response_log
+    (inline if unset) and keeps a reference, "drop" discards them"""
+    response_log: str | None = None
+    """Path of the compressed sidecar file for raw responses (.jsonl.gz)"""
 
 
 class LitellmModel:
@@ -42,40 +68,53 @@ class LitellmModel:
             kwargs.setdefault("model_kwargs", {})["api_key"] = api_key
 
         self.config = config_class(**kwargs)
+        # In-flight completions per model adapt to rate limits seen by every agent in the process
+        self._limiter = get_limiter(f"llm:{self.config.model_name}")
+        self._config_vars = self.config.model_dump()
+        self._projector = MessageProjector(mode=self.config.set_cache_control)
+        self._response_log = None
+        if self.config.response_storage == "sidecar" and self.config.response_log:
+            self._response_log = ResponseLog(self.config.response_log)
         self.cost = 0.0
         self.n_calls = 0
         if self.config.litellm_model_registry and Path(self.config.litellm_model_registry).is_file():
             litellm.utils.register_model(json.loads(Path(self.config.litellm_model_registry).read_text()))
 
-    @retry(
-        reraise=True,
-        stop=stop_after_attempt(int(os.getenv("MSWEA_MODEL_RETRY_STOP_AFTER_ATTEMPT", "10"))),
-        wait=wait_exponential(multiplier=1, min=4, max=60),
-        retry=retry_if_not_exception_type(
-            (
-                litellm.exceptions.UnsupportedParamsError,
-                litellm.exceptions.NotFoundError,
-                litellm.exceptions.PermissionDeniedError,
-                litellm.exceptions.ContextWindowExceededError,
-                litellm.exceptions.APIError,
-                litellm.exceptions.AuthenticationError,
-                KeyboardInterrupt,
-            )
-        ),
-    )
+    @_retry_query
     def _query(self, messages: list[dict[str, str]], **kwargs):
         try:
-            return litellm.completion(
-                model=self.config.model_name, messages=messages, **(self.config.model_kwargs | kwargs)
-            )
+            with self._limiter.slot():
+                return litellm.completion(
+                    model=self.config.model_name, messages=messages, **(self.config.model_kwargs | kwargs)
+                )
+        except litellm.exceptions.AuthenticationError as e:
+            e.message += " You can permanently set your API key with `mini-extra config set KEY VALUE`."
+            raise e
+
+    @_retry_query
+    async def _aquery(self, messages: list[dict[str, str]], **kwargs):
+        try:
+            async with self._limiter.aslot():
+                return await litellm.acompletion(
+                    model=self.config.model_name, messages=messages, **(self.config.model_kwargs | kwargs)
+                )
         except litellm.exceptions.AuthenticationError as e:
             e.message += " You can permanently set your API key with `mini-extra config set KEY VALUE`."
             raise e
 
     def query(self, messages: list[dict[str, str]], **kwargs) -> dict:
-        if self.config.set_cache_control:
-            messages = set_cache_control(messages, mode=self.config.set_cache_control)
-        response = self._query([{"role": msg["role"], "content": msg["content"]} for msg in messages], **kwargs)
+        response = self._query(self._prepare_messages(messages), **kwargs)
+        return self._process_response(response)
+
+    async def aquery(self, messages: list[dict[str, str]], **kwargs) -> dict:
+        """Async variant of query() using litellm.acompletion (for the asyncio scheduler)."""
+        response = await self._aquery(self._prepare_messages(messages), **kwargs)
+        return self._process_response(response)
+
+    def _prepare_messages(self, messages: list[dict[str, str]]) -> list[dict[str, str]]:
+        return self._projector(messages)
+
+    def _process_response(self, response) -> dict:
         try:
             cost = litellm.cost_calculator.completion_cost(response, model=self.config.model_name)
             if cost <= 0.0:
@@ -98,10 +137,21 @@ class LitellmModel:
         GLOBAL_MODEL_STATS.add(cost)
         return {
             "content": response.choices[0].message.content or "",  # type: ignore
-            "extra": {
-                "response": response.model_dump(),
-            },
+            "extra": self._store_response(response),
         }
 
+    def _store_response(self, response) -> dict:
+        """Return the message extras for a raw response, spilling it to the sidecar if configured."""
+        if self.config.response_storage == "drop":
+            return {}
+        if self._response_log is not None:
+            return {"response_ref": self._response_log.append(response.model_dump())}
+        return {"response": response.model_dump()}
+
+    def close(self) -> None:
+        """Close the response sidecar file (if any)."""
+        if self._response_log is not None:
+            self._response_log.close()
+
     def get_template_vars(self) -> dict[str, Any]:
-        return self.config.model_dump() | {"n_model_calls": self.n_calls, "model_cost": self.cost}
+        return self._config_vars | {"n_model_calls": self.n_calls, "model_cost": self.cost}
@@ -1,4 +1,3 @@
-import copy
 import warnings
 from typing import Literal
 
@@ -17,6 +16,13 @@ def _clear_cache_control(entry: dict) -> None:
     entry.pop("cache_control", None)
 
 
+def _copy_entry(entry: dict) -> dict:
+    """Copy the parts of an entry that the cache control helpers modify."""
+    if isinstance(entry["content"], list):
+        return entry | {"content": [dict(item) for item in entry["content"]]}
+    return dict(entry)
+
+
 def _set_cache_control(entry: dict) -> None:
     if not isinstance(entry["content"], list):
         entry["content"] = [  # type: ignore
@@ -44,7 +50,7 @@ def set_cache_control(
     if last_n_messages_offset:
         warnings.warn("last_n_messages_offset is deprecated and will be removed in the future. It has no effect.")
 
-    messages = copy.deepcopy(messages)
+    messages = [_copy_entry(entry) for entry in messages]
     new_messages = []
     for i_entry, entry in enumerate(reversed(messages)):
         _clear_cache_control(entry)
@@ -52,3 +58,48 @@ def set_cache_control(
             _set_cache_control(entry)
         new_messages.append(entry)
     return list(reversed(new_messages))
+
+
+class MessageProjector:
+    """Builds the outbound ``{"role", "content"}`` messages for a conversation.
+
+    Agents only ever append to their message history, so the projection of every
+    message but the last is computed once and reused by later queries. Only the
+    last message, which carries the cache control mark, is rebuilt per query;
+    the history itself is never copied.
+    """
+
+    def __init__(self, mode: Literal["default_end"] | None = None):
+        if mode not in ("default_end", None):
+            raise ValueError(f"Invalid mode: {mode}")
+        self.mode = mode
+        self._sources: list[dict] = []
+        self._projected: list[dict] = []
+
+    def __call__(self, messages: list[dict]) -> list[dict]:
+        # Reuse the projections of the messages we have seen before
+        n_reused = 0
+        for source, seen in zip(messages, self._sources):
+            if source is not seen:
+                break
+            n_reused += 1
+        del self._sources[n_reused:], self._projected[n_reused:]
+        for entry in messages[n_reused:]:
+            self._sources.append(entry)
+            self._projected.append(self._project(entry))
+
+        if self.mode is None or not messages:
+            return list(self._projected)
+        return self._projected[:-1] + [self._project_marked(messages[-1])]
+
+    def _project(self, entry: dict) -> dict:
+        if self.mode is not None and isinstance(entry["content"], list):
+            entry = _copy_entry(entry)
+            _clear_cache_control(entry)
+        return {"role": entry["role"], "content": entry["content"]}
+
+    def _project_marked(self, entry: dict) -> dict:
+        entry = _copy_entry(entry)
+        _clear_cache_control(entry)
+        _set_cache_control(entry)
+        return {"role": entry["role"], "content": entry["content"]}
@@ -0,0 +1,59 @@
+"""Compressed sidecar file for raw LLM responses.
+
+Keeping every ``response.model_dump()`` in the agent's messages duplicates
+megabytes of JSON per agent in memory and in the trajectory file. A
+``ResponseLog`` appends each response to a gzipped JSONL file as it arrives and
+hands back a small reference to store in the message instead.
+"""
+
+import gzip
+import json
+from pathlib import Path
+from typing import Any
+
+
+class ResponseLog:
+    def __init__(self, path: Path | str):
+        """Initialize the log; the file is (re)created on the first append.
+
+        Args:
+            path: Path of the ``.jsonl.gz`` sidecar file
+        """
+        self.path = Path(path)
+        self._file: gzip.GzipFile | None = None
+        self._count = 0
+
+    def append(self, response: dict[str, Any]) -> dict[str, Any]:
+        """Write a response and return the reference to keep in its message."""
+        if self._file is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = gzip.GzipFile(self.path, "wb")
+        self._file.write(json.dumps(response, default=str).encode() + b"\n")
+        # Sync flush: everything written so far stays readable if the process dies
+        self._file.flush()
+        ref = {"file": self.path.name, "index": self._count}
+        self._count += 1
+        return ref
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def read_responses(path: Path | str) -> list[dict[str, Any]]:
+    """Read the responses of a sidecar file, in order (``ref["index"]`` indexes this list).
+
+    A file whose writer died before closing it is read up to the last complete response.
+    """
+    responses = []
+    with gzip.open(path, "rt") as f:
+        try:
+            for line in f:
+                try:
+                    responses.append(json.loads(line))
+                except json.JSONDecodeError:
+                    break
+        except EOFError:
+            pass
+    return responses
@@ -17,6 +17,7 @@ from typing import Any
 import modal
 from cooperbench.agents import AgentResult
 from cooperbench.agents.registry import register
+from cooperbench.infra.redis import RedisNamespace, close_redis_pool
 from cooperbench.agents.openhands_agent_sdk.utils import wait_for_git_server, git_push_with_retry
 
 logger = logging.getLogger(__name__)
@@ -84,6 +85,7 @@ def _release_redis() -> None:
         _redis_refcount -= 1
         
         if _redis_refcount <= 0 and _shared_redis is not None:
+            close_redis_pool(_shared_redis.url)
             try:
                 _shared_redis.cleanup()
             except Exception:
@@ -155,21 +157,6 @@ def _needs_modal_redis(comm_url: str | None) -> bool:
     return "localhost" in comm_url or "127.0.0.1" in comm_url
 
 
-def _parse_redis_url(redis_url: str) -> tuple[str, str]:
-    """Parse Redis URL and extract namespace prefix.
-    
-    Args:
-        redis_url: URL like "redis://host:port" or "redis://host:port#run:abc123"
-        
-    Returns:
-        Tuple of (clean_url, prefix) where prefix includes trailing colon if present
-    """
-    if "#" in redis_url:
-        url, prefix = redis_url.split("#", 1)
-        return url, prefix + ":"
-    return redis_url, ""
-
-
 def _retrieve_sent_messages(redis_url: str, agent_id: str) -> list[dict]:
     """Retrieve sent messages from Redis for conversation extraction.
     
@@ -178,10 +165,9 @@ def _retrieve_sent_messages(redis_url: str, agent_id: str) -> list[dict]:
     """
     import json
     try:
-        import redis
-        url, prefix = _parse_redis_url(redis_url)
-        client = redis.from_url(url)
-        log_key = f"{prefix}{agent_id}:sent_messages"
+        namespace = RedisNamespace(redis_url)
+        client = namespace.client
+        log_key = namespace.key(f"{agent_id}:sent_messages")
         
         messages = []
         raw_messages = client.lrange(log_key, 0, -1)
@@ -593,7 +579,11 @@ class ModalSandboxContext:
         ]:
             if value := os.environ.get(key):
                 creds[key] = value
-        
+
+        # Event log layout for the agent-server ("segmented" opts into JSONL segments)
+        if value := os.environ.get("OPENHANDS_EVENT_LOG_FORMAT"):
+            creds["OPENHANDS_EVENT_LOG_FORMAT"] = value
+
         # Read Google Cloud credentials JSON if available
         gcp_creds_path = os.environ.get("GOOGLE_APPLICATION_CREDENTIALS")
         
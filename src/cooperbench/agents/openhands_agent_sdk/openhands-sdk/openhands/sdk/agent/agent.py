@@ -45,7 +45,7 @@ from openhands.sdk.llm.exceptions import (
     FunctionCallValidationError,
     LLMContextWindowExceedError,
 )
-from openhands.sdk.logger import get_logger
+from openhands.sdk.logger import Lazy, capture_payload, get_logger
 from openhands.sdk.observability.laminar import (
     maybe_init_laminar,
     observe,
@@ -221,9 +221,10 @@ class Agent(AgentBase):
         on_token: ConversationTokenCallbackType | None = None,
     ) -> None:
         state = conversation.state
+        view_index = state.view_index
         # Check for pending actions (implicit confirmation)
         # and execute them before sampling new actions.
-        pending_actions = ConversationState.get_unmatched_actions(state.events)
+        pending_actions = view_index.unmatched_actions()
         if pending_actions:
             logger.info(
                 "Confirmation mode: Executing %d pending action(s)",
@@ -233,19 +234,22 @@ class Agent(AgentBase):
             return
 
         # Check if the last user message was blocked by a UserPromptSubmit hook
-        # If so, skip processing and mark conversation as finished
-        for event in reversed(list(state.events)):
-            if isinstance(event, MessageEvent) and event.source == "user":
-                reason = state.pop_blocked_message(event.id)
-                if reason is not None:
-                    logger.info(f"User message blocked by hook: {reason}")
-                    state.execution_status = ConversationExecutionStatus.FINISHED
-                    return
-                break  # Only check the most recent user message
+        # If so, skip processing and mark conversation as finished.
+        # Only the most recent user message is checked.
+        last_user_message = view_index.last_user_message()
+        if last_user_message is not None:
+            reason = state.pop_blocked_message(last_user_message.id)
+            if reason is not None:
+                logger.info(f"User message blocked by hook: {reason}")
+                state.execution_status = ConversationExecutionStatus.FINISHED
+                return
 
         # Prepare LLM messages using the utility function
         _messages_or_condensation = prepare_llm_messages(
-            state.events, condenser=self.condenser, llm=self.llm
+            state.events,
+            condenser=self.condenser,
+            llm=self.llm,
+            view_index=view_index,
         )
 
         # Process condensation event before agent sampels another action
@@ -256,8 +260,11 @@ class Agent(AgentBase):
         _messages = _messages_or_condensation
 
         logger.debug(
-            "Sending messages to LLM: "
-            f"{json.dumps([m.model_dump() for m in _messages[1:]], indent=2)}"
+            "Sending messages to LLM: %s",
+            Lazy(lambda: json.dumps([m.model_dump() for m in _messages[1:]], indent=2)),
+        )
+        capture_payload(
+            "prompt", lambda: [m.model_dump(mode="json") for m in _messages]
         )
 
         try:
@@ -295,6 +302,7 @@ class Agent(AgentBase):
 
         # LLMResponse already contains the converted message and metrics snapshot
         message: Message = llm_response.message
+        capture_payload("response", lambda: message.model_dump(mode="json"))
 
         # Check if this is a reasoning-only response (e.g., from reasoning models)
         # or a message-only response without tool calls
@@ -11,7 +11,7 @@ from typing import (
 )
 
 from openhands.sdk.context.condenser.base import CondenserBase
-from openhands.sdk.context.view import View
+from openhands.sdk.context.view import View, ViewIndex
 from openhands.sdk.conversation.types import ConversationTokenCallbackType
 from openhands.sdk.event.base import Event, LLMConvertibleEvent
 from openhands.sdk.event.condenser import Condensation
@@ -118,6 +118,7 @@ def prepare_llm_messages(
     condenser: None = None,
     additional_messages: list[Message] | None = None,
     llm: LLM | None = None,
+    view_index: ViewIndex | None = None,
 ) -> list[Message]: ...
 
 
@@ -127,6 +128,7 @@ def prepare_llm_messages(
     condenser: CondenserBase,
     additional_messages: list[Message] | None = None,
     llm: LLM | None = None,
+    view_index: ViewIndex | None = None,
 ) -> list[Message] | Condensation: ...
 
 
@@ -135,6 +137,7 @@ def prepare_llm_messages(
     condenser: CondenserBase | None = None,
     additional_messages: list[Message] | None = None,
     llm: LLM | None = None,
+    view_index: ViewIndex | None = None,
 ) -> list[Message] | Condensation:
     """Prepare LLM messages from conversation context.
 
@@ -148,6 +151,9 @@ def prepare_llm_messages(
         additional_messages: Optional additional messages to append
         llm: Optional LLM instance from the agent, passed to condenser for
             token counting or other LLM features
+        view_index: Optional incremental index over ``events`` (usually
+            ``state.view_index``); reuses its view and converted messages
+            instead of rebuilding them from the whole history
 
     Returns:
         List of messages ready for LLM completion, or a Condensation event
@@ -157,7 +163,7 @@ def prepare_llm_messages(
         RuntimeError: If condensation is needed but no callback is provided
     """
 
-    view = View.from_events(events)
+    view = view_index.view() if view_index is not None else View.from_events(events)
     llm_convertible_events: list[LLMConvertibleEvent] = view.events
 
     # If a condenser is registered, we need to give it an
@@ -175,7 +181,10 @@ def prepare_llm_messages(
                 return condensation_result
 
     # Convert events to messages
-    messages = LLMConvertibleEvent.events_to_messages(llm_convertible_events)
+    if view_index is not None:
+        messages = view_index.to_messages(llm_convertible_events)
+    else:
+        messages = LLMConvertibleEvent.events_to_messages(llm_convertible_events)
 
     # Add any additional messages (e.g., user question for ask_agent)
     if additional_messages:
@@ -1,9 +1,93 @@
-from collections.abc import Sequence
+import threading
+from bisect import bisect_left
+from collections.abc import Callable, Hashable, Sequence
+from itertools import accumulate
 
+from cachetools import LRUCache
+
+from openhands.sdk.context.view import message_groups
 from openhands.sdk.event.base import LLMConvertibleEvent
 from openhands.sdk.llm import LLM
 
 
+# Token counts of individual LLM messages, keyed by tokenizer and event IDs.
+# Events are immutable, so a count never goes stale; adding an event to a
+# conversation only tokenizes the message it produces.
+TOKEN_COUNT_CACHE_SIZE = 100_000
+
+_token_counts: LRUCache = LRUCache(maxsize=TOKEN_COUNT_CACHE_SIZE)
+_token_counts_lock = threading.Lock()
+
+
+def _tokenizer_key(llm: LLM) -> Hashable:
+    """Identify everything about an LLM that affects its token counts."""
+    return (llm.model, llm.custom_tokenizer, llm.native_tool_calling)
+
+
+def _cached_count(key: Hashable, count_fn: Callable[[], tuple[int, bool]]) -> int:
+    """Return a cached count, or compute it and cache it if count_fn says it's valid."""
+    with _token_counts_lock:
+        count = _token_counts.get(key)
+    if count is None:
+        count, valid = count_fn()
+        if valid:
+            with _token_counts_lock:
+                _token_counts[key] = count
+    return count
+
+
+def _group_token_count(group: Sequence[LLMConvertibleEvent], llm: LLM) -> int:
+    """Tokens a message group adds to a conversation (excluding fixed overhead)."""
+
+    def count() -> tuple[int, bool]:
+        messages = LLMConvertibleEvent.events_to_messages(list(group))
+        total = llm.get_token_count(messages)
+        tokens = total - _base_token_count(llm)
+        # get_token_count returns 0 when the tokenizer fails (e.g. it could not
+        # be downloaded); such a count must not stick for the process lifetime
+        return max(tokens, 0), total > 0 and tokens >= 0
+
+    return _cached_count((_tokenizer_key(llm), tuple(e.id for e in group)), count)
+
+
+def _base_token_count(llm: LLM) -> int:
+    """Fixed per-request token overhead (e.g. reply priming) of the tokenizer."""
+
+    def count() -> tuple[int, bool]:
+        # Zero is also what a failed count returns; recounting it is cheap
+        tokens = llm.get_token_count([])
+        return tokens, tokens > 0
+
+    return _cached_count((_tokenizer_key(llm), ()), count)
+
+
+class _PrefixTokenCounter:
+    """Token counts of event prefixes from cached per-message counts."""
+
+    def __init__(self, events: Sequence[LLMConvertibleEvent], llm: LLM) -> None:
+        self.events = events
+        self.llm = llm
+        self.groups = message_groups(events)
+        # ends[g] is the number of events up to and including group g
+        self.ends = list(accumulate(len(group) for group in self.groups))
+        self.sums = list(
+            accumulate(_group_token_count(group, llm) for group in self.groups)
+        )
+        self.base = _base_token_count(llm)
+
+    def count(self, length: int) -> int:
+        """Token count of events[:length]."""
+        if length <= 0:
+            return self.base
+        g = bisect_left(self.ends, length)
+        if self.ends[g] == length:
+            return self.base + self.sums[g]
+        # The prefix ends inside a batch of parallel actions
+        start, before = (self.ends[g - 1], self.sums[g - 1]) if g else (0, 0)
+        partial = _group_token_count(self.events[start:length], self.llm)
+        return self.base + before + partial
+
+
 def get_total_token_count(
     events: Sequence[LLMConvertibleEvent],
     llm: LLM,
@@ -33,9 +117,13 @@ def get_total_token_count(
         ... ]
         >>> token_count = get_total_token_count(events, llm)
         >>> print(f"Total tokens: {token_count}")
+
+    Note:
+        Token counts are computed per LLM message and cached by event ID, so only
+        messages that were not counted before are tokenized.
     """
-    messages = LLMConvertibleEvent.events_to_messages(list(events))
-    return llm.get_token_count(messages)
+    counter = _PrefixTokenCounter(events, llm)
+    return counter.count(len(events))
 
 
 def get_shortest_prefix_above_token_count(
@@ -76,8 +164,10 @@ def get_shortest_prefix_above_token_count(
     if not events:
         return 0
 
+    counter = _PrefixTokenCounter(events, llm)
+
     # Check if all events combined don't exceed the token count
-    total_tokens = get_total_token_count(events, llm)
+    total_tokens = counter.count(len(events))
     if total_tokens <= token_count:
         return len(events)
 
@@ -86,7 +176,7 @@ def get_shortest_prefix_above_token_count(
 
     while left < right:
         mid = (left + right) // 2
-        prefix_tokens = get_total_token_count(events[:mid], llm)
+        prefix_tokens = counter.count(mid)
 
         if prefix_tokens > token_count:
             # This prefix exceeds the count, try to find a shorter one
@@ -1,10 +1,11 @@
 from __future__ import annotations
 
+import threading
 from collections import defaultdict
 from collections.abc import Sequence
 from functools import cached_property
 from logging import getLogger
-from typing import overload
+from typing import TYPE_CHECKING, overload
 
 from pydantic import BaseModel, computed_field
 
@@ -16,11 +17,18 @@ from openhands.sdk.event import (
 from openhands.sdk.event.base import Event, EventID
 from openhands.sdk.event.llm_convertible import (
     ActionEvent,
+    MessageEvent,
     ObservationBaseEvent,
+    ObservationEvent,
+    UserRejectObservation,
 )
 from openhands.sdk.event.types import ToolCallID
 
 
+if TYPE_CHECKING:
+    from openhands.sdk.llm import Message
+
+
 logger = getLogger(__name__)
 
 
@@ -484,3 +492,257 @@ class View(BaseModel):
             ),
             condensations=condensations,
         )
+
+
+def message_groups(
+    events: Sequence[LLMConvertibleEvent],
+) -> list[Sequence[LLMConvertibleEvent]]:
+    """Split events into the groups that each become one LLM message.
+
+    Mirrors LLMConvertibleEvent.events_to_messages: consecutive ActionEvents
+    from the same LLM response are combined into a single message.
+    """
+    groups: list[Sequence[LLMConvertibleEvent]] = []
+    i = 0
+    while i < len(events):
+        first = events[i]
+        j = i + 1
+        while isinstance(first, ActionEvent) and j < len(events):
+            event = events[j]
+            if not isinstance(event, ActionEvent):
+                break
+            if event.llm_response_id != first.llm_response_id:
+                break
+            j += 1
+        groups.append(events[i:j])
+        i = j
+    return groups
+
+
+class ViewIndex:
+    """Incrementally maintained view of a conversation's event log.
+
+    ``View.from_events``, ``ConversationState.get_unmatched_actions`` and the
+    search for the latest user message each rescan the whole history, and the
+    agent needs all three on every step. A ViewIndex observes each event once,
+    as it is appended, and keeps:
+
+    - the condensed event list and the tool-call pairing / batch bookkeeping
+      needed to filter it exactly like ``View.from_events``;
+    - the actions still waiting for an observation;
+    - the latest user ``MessageEvent``;
+    - the LLM message of each event group, so messages are converted once.
+
+    The index catches up with the log lazily, so it also covers events loaded
+    when a conversation is resumed. Only a Condensation (which rewrites the
+    condensed list) costs time proportional to the history.
+    """
+
+    def __init__(self, events: Sequence[Event]) -> None:
+        self.events = events
+        self._lock = threading.Lock()
+        self._clear()
+
+    def _clear(self) -> None:
+        self._seen = 0
+
+        # Condensed history (View.from_events before filtering)
+        self._output: list[LLMConvertibleEvent] = []
+        self._output_ids: set[EventID] = set()
+        self._condensations: list[Condensation] = []
+        self._unhandled_condensation_request = False
+
+        # Action batches over all events (as in ActionBatch.from_events)
+        self._batches: dict[EventID, list[EventID]] = defaultdict(list)
+        self._action_tool_call: dict[EventID, ToolCallID] = {}
+
+        # Tool-call pairing within the condensed history
+        self._output_actions: dict[ToolCallID, list[ActionEvent]] = defaultdict(list)
+        self._output_observations: dict[ToolCallID, list[ObservationBaseEvent]] = (
+            defaultdict(list)
+        )
+        self._unpaired: set[ToolCallID] = set()
+        self._broken_batches: set[EventID] = set()  # Batches with forgotten actions
+        self._forgotten_tool_calls: set[ToolCallID] = set()
+
+        self._pending: dict[EventID, ActionEvent] = {}
+        self._last_user_message: MessageEvent | None = None
+
+        self._view: View | None = None
+        self._messages: dict[tuple[EventID, ...], Message] = {}
+
+    def view(self) -> View:
+        """The View of the events (same result as ``View.from_events``)."""
+        with self._lock:
+            self._catch_up()
+            if self._view is None:
+                excluded = self._excluded_ids()
+                events = [e for e in self._output if e.id not in excluded]
+                self._view = View.model_construct(
+                    events=events,
+                    unhandled_condensation_request=self._unhandled_condensation_request,
+                    condensations=list(self._condensations),
+                )
+            return self._view
+
+    def unmatched_actions(self) -> list[ActionEvent]:
+        """Actions without an observation (as ``get_unmatched_actions``)."""
+        with self._lock:
+            self._catch_up()
+            return list(self._pending.values())
+
+    def last_user_message(self) -> MessageEvent | None:
+        """The most recent MessageEvent sent by the user, if any."""
+        with self._lock:
+            self._catch_up()
+            return self._last_user_message
+
+    def to_messages(self, events: Sequence[LLMConvertibleEvent]) -> list[Message]:
+        """Convert events to LLM messages (as ``events_to_messages``), reusing
+        the message of every event group converted before."""
+        messages = []
+        for group in message_groups(events):
+            key = tuple(e.id for e in group)
+            message = self._messages.get(key)
+            if message is None:
+                message = LLMConvertibleEvent.events_to_messages(list(group))[0]
+                self._messages[key] = message
+            messages.append(message)
+        return messages
+
+    def _catch_up(self) -> None:
+        """Observe the events appended since the last call (caller holds the lock)."""
+        if len(self.events) < self._seen:
+            # Event logs only grow; start over if this one didn't
+            self._clear()
+        new = self.events[self._seen :]
+        for event in new:
+            self._observe(event)
+        self._seen += len(new)
+        if new:
+            self._view = None
+
+    def _observe(self, event: Event) -> None:
+        if isinstance(event, ActionEvent):
+            self._batches[event.llm_response_id].append(event.id)
+            self._action_tool_call[event.id] = event.tool_call_id
+            # Only executable actions (validated) are considered pending
+            if event.action is not None:
+                self._pending[event.id] = event
+        elif isinstance(event, (ObservationEvent, UserRejectObservation)):
+            self._pending.pop(event.action_id, None)
+        elif isinstance(event, MessageEvent) and event.source == "user":
+            self._last_user_message = event
+
+        if isinstance(event, Condensation):
+            self._condensations.append(event)
+            self._unhandled_condensation_request = False
+            self._rebuild(event.apply(self._output))
+        elif isinstance(event, CondensationRequest):
+            self._unhandled_condensation_request = True
+        elif isinstance(event, LLMConvertibleEvent):
+            self._add_output(event)
+
+    def _add_output(self, event: LLMConvertibleEvent) -> None:
+        self._output.append(event)
+        self._output_ids.add(event.id)
+        if isinstance(event, ActionEvent):
+            self._output_actions[event.tool_call_id].append(event)
+            self._update_pairing(event.tool_call_id)
+        elif isinstance(event, ObservationBaseEvent):
+            self._output_observations[event.tool_call_id].append(event)
+            self._update_pairing(event.tool_call_id)
+
+    def _update_pairing(self, tool_call_id: ToolCallID) -> None:
+        paired = bool(self._output_actions.get(tool_call_id)) and bool(
+            self._output_observations.get(tool_call_id)
+        )
+        if paired:
+            self._unpaired.discard(tool_call_id)
+        else:
+            self._unpaired.add(tool_call_id)
+
+    def _rebuild(self, output: list[LLMConvertibleEvent]) -> None:
+        """Re-derive the bookkeeping of the condensed history after a Condensation."""
+        self._output = []
+        self._output_ids = set()
+        self._output_actions = defaultdict(list)
+        self._output_observations = defaultdict(list)
+        self._unpaired = set()
+        for event in output:
+            self._add_output(event)
+
+        self._broken_batches = {
+            response_id
+            for response_id, action_ids in self._batches.items()
+            if any(a not in self._output_ids for a in action_ids)
+        }
+        self._forgotten_tool_calls = {
+            tool_call_id
+            for action_id, tool_call_id in self._action_tool_call.items()
+            if action_id not in self._output_ids
+        }
+        self._messages = {
+            key: message
+            for key, message in self._messages.items()
+            if all(event_id in self._output_ids for event_id in key)
+        }
+
+    def _excluded_ids(self) -> set[EventID]:
+        """IDs of condensed events that View.from_events filters out.
+
+        Follows the passes of ``_enforce_batch_atomicity`` and
+        ``_filter_unmatched_tool_calls``, starting from the (few) batches and
+        tool calls that are broken or unpaired instead of scanning all events.
+        """
+        excluded: set[EventID] = set()
+        excluded_actions: list[ActionEvent] = []
+
+        def exclude_batch(response_id: EventID) -> None:
+            for action_id in self._batches[response_id]:
+                if action_id in self._output_ids and action_id not in excluded:
+                    excluded.add(action_id)
+                    tool_call_id = self._action_tool_call[action_id]
+                    for action in self._output_actions[tool_call_id]:
+                        if action.id == action_id:
+                            excluded_actions.append(action)
+
+        # Batches with forgotten actions are dropped entirely
+        for response_id in self._broken_batches:
+            exclude_batch(response_id)
+
+        # Tool calls that lost all their actions to that, or were never paired
+        unpaired = set(self._unpaired)
+        for action in excluded_actions:
+            tool_call_id = action.tool_call_id
+            if all(a.id in excluded for a in self._output_actions[tool_call_id]):
+                unpaired.add(tool_call_id)
+
+        for tool_call_id in unpaired:
+            has_action = any(
+                a.id not in excluded for a in self._output_actions.get(tool_call_id, [])
+            )
+            has_observation = bool(self._output_observations.get(tool_call_id))
+            if not has_observation:
+                for action in self._output_actions.get(tool_call_id, []):
+                    if action.id not in excluded:
+                        excluded.add(action.id)
+                        excluded_actions.append(action)
+            if not has_action:
+                excluded.update(
+                    o.id for o in self._output_observations.get(tool_call_id, [])
+                )
+
+        # An unpaired action takes the rest of its batch with it
+        for action in list(excluded_actions):
+            exclude_batch(action.llm_response_id)
+
+        # Observations of every action that didn't make it into the view
+        removed_tool_calls = self._forgotten_tool_calls | {
+            a.tool_call_id for a in excluded_actions
+        }
+        for tool_call_id in removed_tool_calls:
+            excluded.update(
+                o.id for o in self._output_observations.get(tool_call_id, [])
+            )
+        return excluded
@@ -1,6 +1,10 @@
 from openhands.sdk.conversation.base import BaseConversation
 from openhands.sdk.conversation.conversation import Conversation
-from openhands.sdk.conversation.event_store import EventLog
+from openhands.sdk.conversation.event_store import (
+    EventLog,
+    SegmentedEventLog,
+    open_event_log,
+)
 from openhands.sdk.conversation.events_list_base import EventsListBase
 from openhands.sdk.conversation.exceptions import WebSocketConnectionError
 from openhands.sdk.conversation.impl.local_conversation import LocalConversation
@@ -34,6 +38,8 @@ __all__ = [
     "SecretRegistry",
     "StuckDetector",
     "EventLog",
+    "SegmentedEventLog",
+    "open_event_log",
     "LocalConversation",
     "RemoteConversation",
     "EventsListBase",
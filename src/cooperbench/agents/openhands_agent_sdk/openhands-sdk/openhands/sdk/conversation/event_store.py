@@ -1,5 +1,9 @@
 # state.py
+import json
 import operator
+import os
+import threading
+from collections import OrderedDict
 from collections.abc import Iterator
 from typing import SupportsIndex, overload
 
@@ -8,6 +12,10 @@ from openhands.sdk.conversation.persistence_const import (
     EVENT_FILE_PATTERN,
     EVENT_NAME_RE,
     EVENTS_DIR,
+    SEGMENT_FILE_PATTERN,
+    SEGMENT_FILE_RE,
+    SEGMENT_INDEX_PATTERN,
+    SEGMENT_INDEX_RE,
 )
 from openhands.sdk.event import Event, EventID
 from openhands.sdk.io import FileStore
@@ -19,6 +27,44 @@ logger = get_logger(__name__)
 LOCK_FILE_NAME = ".eventlog.lock"
 LOCK_TIMEOUT_SECONDS = 30
 
+# Events per segment file in the segmented layout
+SEGMENT_SIZE = 256
+
+# Layout for new event logs: "files" (one file per event) or "segmented"
+EVENT_LOG_FORMAT_ENV = "OPENHANDS_EVENT_LOG_FORMAT"
+
+# Parsed events kept in memory per event log
+EVENT_CACHE_SIZE = 1024
+
+
+class ParsedEventCache:
+    """Bounded LRU of deserialized events, keyed by their index in the log.
+
+    Events are immutable and never move once appended, so a cached event stays
+    valid for the lifetime of the log.
+    """
+
+    def __init__(self, max_size: int = EVENT_CACHE_SIZE) -> None:
+        self.max_size = max_size
+        self._events: OrderedDict[int, Event] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, idx: int) -> Event | None:
+        with self._lock:
+            event = self._events.get(idx)
+            if event is not None:
+                self._events.move_to_end(idx)
+            return event
+
+    def put(self, idx: int, event: Event) -> None:
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._events[idx] = event
+            self._events.move_to_end(idx)
+            while len(self._events) > self.max_size:
+                self._events.popitem(last=False)
+
 
 class EventLog(EventsListBase):
     """Persistent event log with locking for concurrent writes.
@@ -38,12 +84,18 @@ class EventLog(EventsListBase):
     _length: int
     _lock_path: str
 
-    def __init__(self, fs: FileStore, dir_path: str = EVENTS_DIR) -> None:
+    def __init__(
+        self,
+        fs: FileStore,
+        dir_path: str = EVENTS_DIR,
+        cache_size: int = EVENT_CACHE_SIZE,
+    ) -> None:
         self._fs = fs
         self._dir = dir_path
         self._id_to_idx: dict[EventID, int] = {}
         self._idx_to_id: dict[int, EventID] = {}
         self._lock_path = f"{dir_path}/{LOCK_FILE_NAME}"
+        self._cache = ParsedEventCache(cache_size)
         self._length = self._scan_and_build_index()
 
     def get_index(self, event_id: EventID) -> int:
@@ -79,17 +131,25 @@ class EventLog(EventsListBase):
             i += self._length
         if i < 0 or i >= self._length:
             raise IndexError("Event index out of range")
+        if (cached := self._cache.get(i)) is not None:
+            return cached
         txt = self._fs.read(self._path(i))
         if not txt:
             raise FileNotFoundError(f"Missing event file: {self._path(i)}")
-        return Event.model_validate_json(txt)
+        evt = Event.model_validate_json(txt)
+        self._cache.put(i, evt)
+        return evt
 
     def __iter__(self) -> Iterator[Event]:
         for i in range(self._length):
+            if (cached := self._cache.get(i)) is not None:
+                yield cached
+                continue
             txt = self._fs.read(self._path(i))
             if not txt:
                 continue
             evt = Event.model_validate_json(txt)
+            self._cache.put(i, evt)
             evt_id = evt.id
             if i not in self._idx_to_id:
                 self._idx_to_id[i] = evt_id
@@ -123,6 +183,7 @@ class EventLog(EventsListBase):
                 self._fs.write(target_path, event.model_dump_json(exclude_none=True))
                 self._idx_to_id[self._length] = evt_id
                 self._id_to_idx[evt_id] = self._length
+                self._cache.put(self._length, event)
                 self._length += 1
         except TimeoutError:
             logger.error(
@@ -227,3 +288,299 @@ class EventLog(EventsListBase):
             else:
                 self._id_to_idx[evt_id] = i
         return n
+
+
+class SegmentedEventLog(EventsListBase):
+    """Persistent event log stored as segmented, append-only JSONL files.
+
+    Events are appended to ``segment-NNNNN.jsonl`` files of up to
+    ``segment_size`` events each, one JSON document per line. A sibling
+    ``segment-NNNNN.idx`` file lists the segment's event IDs, one per line, so
+    opening a log reads only the small index files, an append writes one line
+    to each file, and random access reads a single segment.
+
+    Note:
+        Appends are serialized with the FileStore lock, but unlike EventLog the
+        directory is not re-scanned on append: one process is assumed to write
+        a given conversation (as the agent-server does).
+    """
+
+    _fs: FileStore
+    _dir: str
+    _lock_path: str
+    _segment_size: int
+
+    def __init__(
+        self,
+        fs: FileStore,
+        dir_path: str = EVENTS_DIR,
+        segment_size: int = SEGMENT_SIZE,
+        cache_size: int = EVENT_CACHE_SIZE,
+    ) -> None:
+        self._fs = fs
+        self._dir = dir_path
+        self._lock_path = f"{dir_path}/{LOCK_FILE_NAME}"
+        self._segment_size = segment_size
+        self._cache = ParsedEventCache(cache_size)
+        self._ids: list[EventID] = []
+        self._id_to_idx: dict[EventID, int] = {}
+        # Lines of the most recently read segment (usually the one being appended to)
+        self._cached_segment: tuple[int, list[str]] | None = None
+        self._load_index()
+
+    def get_index(self, event_id: EventID) -> int:
+        """Return the integer index for a given event_id."""
+        try:
+            return self._id_to_idx[event_id]
+        except KeyError:
+            raise KeyError(f"Unknown event_id: {event_id}")
+
+    def get_id(self, idx: int) -> EventID:
+        """Return the event_id for a given index."""
+        if idx < 0:
+            idx += len(self._ids)
+        if idx < 0 or idx >= len(self._ids):
+            raise IndexError("Event index out of range")
+        return self._ids[idx]
+
+    @overload
+    def __getitem__(self, idx: int) -> Event: ...
+
+    @overload
+    def __getitem__(self, idx: slice) -> list[Event]: ...
+
+    def __getitem__(self, idx: SupportsIndex | slice) -> Event | list[Event]:
+        if isinstance(idx, slice):
+            start, stop, step = idx.indices(len(self._ids))
+            return [self._get_single_item(i) for i in range(start, stop, step)]
+        return self._get_single_item(idx)
+
+    def _get_single_item(self, idx: SupportsIndex) -> Event:
+        i = operator.index(idx)
+        if i < 0:
+            i += len(self._ids)
+        if i < 0 or i >= len(self._ids):
+            raise IndexError("Event index out of range")
+        if (cached := self._cache.get(i)) is not None:
+            return cached
+        seg, line = divmod(i, self._segment_size)
+        evt = Event.model_validate_json(self._segment_lines(seg)[line])
+        self._cache.put(i, evt)
+        return evt
+
+    def __iter__(self) -> Iterator[Event]:
+        for i in range(len(self._ids)):
+            yield self._get_single_item(i)
+
+    def append(self, event: Event) -> None:
+        """Append an event with locking for thread safety.
+
+        Raises:
+            TimeoutError: If the lock cannot be acquired within LOCK_TIMEOUT_SECONDS.
+            ValueError: If an event with the same ID already exists.
+        """
+        evt_id = event.id
+
+        try:
+            with self._fs.lock(self._lock_path, timeout=LOCK_TIMEOUT_SECONDS):
+                if evt_id in self._id_to_idx:
+                    existing_idx = self._id_to_idx[evt_id]
+                    raise ValueError(
+                        f"Event with ID '{evt_id}' already exists at index "
+                        f"{existing_idx}"
+                    )
+
+                idx = len(self._ids)
+                seg = idx // self._segment_size
+                line = event.model_dump_json(exclude_none=True)
+                # Event line first: the index is what a reopened log trusts
+                self._fs.append(_segment_path(self._dir, seg), line + "\n")
+                self._fs.append(_segment_index_path(self._dir, seg), f"{evt_id}\n")
+                self._ids.append(evt_id)
+                self._id_to_idx[evt_id] = idx
+                self._cache.put(idx, event)
+                if self._cached_segment is not None and self._cached_segment[0] == seg:
+                    self._cached_segment[1].append(line)
+        except TimeoutError:
+            logger.error(
+                f"Failed to acquire EventLog lock within {LOCK_TIMEOUT_SECONDS}s "
+                f"for event {evt_id}"
+            )
+            raise
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def _segment_lines(self, seg: int) -> list[str]:
+        if self._cached_segment is None or self._cached_segment[0] != seg:
+            txt = self._fs.read(_segment_path(self._dir, seg))
+            self._cached_segment = (seg, _split_lines(txt))
+        return self._cached_segment[1]
+
+    def _load_index(self) -> None:
+        """Read the per-segment ID lists and repair a torn final append."""
+        try:
+            paths = self._fs.list(self._dir)
+        except Exception:
+            paths = []
+
+        names = [p.rsplit("/", 1)[-1] for p in paths]
+        segments = sorted(
+            int(m.group("seg")) for name in names if (m := SEGMENT_INDEX_RE.match(name))
+        )
+        id_lists: list[list[EventID]] = []
+        for expected, seg in enumerate(segments):
+            if seg != expected:
+                logger.warning(
+                    f"Event segment gap detected: expect segment {expected} "
+                    f"but got {segments}"
+                )
+                break
+            id_lists.append(self._fs.read(_segment_index_path(self._dir, seg)).split())
+
+        # A crash on the first append to a segment leaves its event line but no
+        # index file; later appends to that segment would land after it
+        for name in names:
+            m = SEGMENT_FILE_RE.match(name)
+            seg = int(m.group("seg")) if m else -1
+            if seg >= len(id_lists) and seg not in segments:
+                logger.warning(f"Truncating unindexed event segment {seg}")
+                self._fs.write(_segment_path(self._dir, seg), "")
+        if not id_lists:
+            return
+
+        # Existing logs keep the segment size they were written with
+        if len(id_lists) > 1:
+            self._segment_size = len(id_lists[0])
+        else:
+            self._segment_size = max(self._segment_size, len(id_lists[0]))
+
+        # A crash between the two appends leaves an event line without an index entry
+        last = len(id_lists) - 1
+        try:
+            lines = _split_lines(self._fs.read(_segment_path(self._dir, last)))
+        except FileNotFoundError:
+            lines = []
+        if len(lines) != len(id_lists[last]):
+            n = min(len(lines), len(id_lists[last]))
+            logger.warning(
+                f"Repairing event segment {last}: {len(lines)} events, "
+                f"{len(id_lists[last])} index entries; keeping {n}"
+            )
+            lines, id_lists[last] = lines[:n], id_lists[last][:n]
+            self._fs.write(
+                _segment_path(self._dir, last), "".join(f"{x}\n" for x in lines)
+            )
+            self._fs.write(
+                _segment_index_path(self._dir, last),
+                "".join(f"{x}\n" for x in id_lists[last]),
+            )
+        self._cached_segment = (last, lines)
+
+        for ids in id_lists:
+            for evt_id in ids:
+                if evt_id in self._id_to_idx:
+                    logger.warning(
+                        f"Duplicate event ID '{evt_id}' found during scan. "
+                        f"Keeping first occurrence at index {self._id_to_idx[evt_id]}"
+                    )
+                else:
+                    self._id_to_idx[evt_id] = len(self._ids)
+                self._ids.append(evt_id)
+
+
+def _split_lines(txt: str) -> list[str]:
+    """Split a segment into its event lines.
+
+    Only newline characters end a line: str.splitlines() would also split on
+    characters such as U+2028 that JSON leaves unescaped inside strings.
+    """
+    lines = txt.split("\n")
+    if lines[-1] == "":
+        lines.pop()
+    return lines
+
+
+def _segment_path(dir_path: str, seg: int) -> str:
+    return f"{dir_path}/{SEGMENT_FILE_PATTERN.format(seg=seg)}"
+
+
+def _segment_index_path(dir_path: str, seg: int) -> str:
+    return f"{dir_path}/{SEGMENT_INDEX_PATTERN.format(seg=seg)}"
+
+
+def migrate_event_log(
+    fs: FileStore, dir_path: str = EVENTS_DIR, segment_size: int = SEGMENT_SIZE
+) -> int:
+    """Convert a one-file-per-event log into the segmented layout.
+
+    Segments are written before the per-event files are deleted, so an
+    interrupted migration is redone from the per-event files next time.
+
+    Returns:
+        Number of migrated events.
+    """
+    with fs.lock(f"{dir_path}/{LOCK_FILE_NAME}", timeout=LOCK_TIMEOUT_SECONDS):
+        old = EventLog(fs, dir_path)
+        event_paths = [old._path(i) for i in range(len(old))]
+
+        # Leftovers of an interrupted migration
+        for p in fs.list(dir_path):
+            name = p.rsplit("/", 1)[-1]
+            if name.startswith("segment-"):
+                fs.delete(p)
+
+        n_segments = 0
+        for start in range(0, len(event_paths), segment_size):
+            chunk = event_paths[start : start + segment_size]
+            # Normalize to one line per event
+            lines = [
+                json.dumps(json.loads(fs.read(p)), ensure_ascii=False) for p in chunk
+            ]
+            fs.write(
+                _segment_path(dir_path, n_segments), "".join(f"{x}\n" for x in lines)
+            )
+            n_segments += 1
+
+        # Index files last: their presence marks a complete segment
+        for seg in range(n_segments):
+            ids = [
+                old.get_id(i)
+                for i in range(
+                    seg * segment_size, min((seg + 1) * segment_size, len(old))
+                )
+            ]
+            fs.write(_segment_index_path(dir_path, seg), "".join(f"{x}\n" for x in ids))
+
+        for p in event_paths:
+            fs.delete(p)
+
+    logger.info(f"Migrated {len(event_paths)} events in {dir_path} to segmented log")
+    return len(event_paths)
+
+
+def open_event_log(
+    fs: FileStore, dir_path: str = EVENTS_DIR
+) -> EventLog | SegmentedEventLog:
+    """Open the event log in dir_path in the layout it was written with.
+
+    New logs use the layout named by the OPENHANDS_EVENT_LOG_FORMAT environment
+    variable ("files", the default, or "segmented"). With "segmented", existing
+    one-file-per-event logs are migrated when opened.
+    """
+    segmented = os.environ.get(EVENT_LOG_FORMAT_ENV, "files").lower() == "segmented"
+    try:
+        names = [p.rsplit("/", 1)[-1] for p in fs.list(dir_path)]
+    except Exception:
+        names = []
+
+    # Per-event files are only deleted once a migration completed
+    if any(EVENT_NAME_RE.match(name) for name in names):
+        if not segmented:
+            return EventLog(fs, dir_path)
+        migrate_event_log(fs, dir_path)
+        return SegmentedEventLog(fs, dir_path)
+
+    if segmented or any(SEGMENT_INDEX_RE.match(name) for name in names):
+        return SegmentedEventLog(fs, dir_path)
+    return EventLog(fs, dir_path)
@@ -34,7 +34,7 @@ from openhands.sdk.event.conversation_error import ConversationErrorEvent
 from openhands.sdk.hooks import HookConfig, HookEventProcessor, create_hook_callback
 from openhands.sdk.llm import LLM, Message, TextContent
 from openhands.sdk.llm.llm_registry import LLMRegistry
-from openhands.sdk.logger import get_logger
+from openhands.sdk.logger import capture_payload, get_logger
 from openhands.sdk.observability.laminar import observe
 from openhands.sdk.plugin import (
     Plugin,
@@ -175,6 +175,7 @@ class LocalConversation(BaseConversation):
         # Default callback: persist every event to state
         def _default_callback(e):
             self._state.events.append(e)
+            capture_payload("event", lambda: e.model_dump(mode="json"))
 
         callback_list = list(callbacks) if callbacks else []
         composed_list = callback_list + [_default_callback]
@@ -463,8 +464,10 @@ class LocalConversation(BaseConversation):
                 if ctx:
                     content, activated_skill_names = ctx
                     logger.debug(
-                        f"Got augmented user message content: {content}, "
-                        f"activated skills: {activated_skill_names}"
+                        "Got augmented user message content: %s, "
+                        "activated skills: %s",
+                        content,
+                        activated_skill_names,
                     )
                     extended_content.append(content)
                     self._state.activated_knowledge_skills.extend(activated_skill_names)
@@ -508,13 +511,14 @@ class LocalConversation(BaseConversation):
             client = redis.from_url(redis_url, socket_timeout=2)
             inbox_key = f"{prefix}{agent_id}:inbox"
             
-            # Pop all pending messages
+            # Read and clear all pending messages in one MULTI/EXEC round-trip
+            pipe = client.pipeline(transaction=True)
+            pipe.lrange(inbox_key, 0, -1)
+            pipe.delete(inbox_key)
+            raws, _ = pipe.execute()
+            
             messages_injected = 0
-            while True:
-                raw = client.lpop(inbox_key)
-                if raw is None:
-                    break
-                
+            for raw in raws:
                 try:
                     msg = json.loads(raw.decode() if isinstance(raw, bytes) else raw)
                     sender = msg.get("from", "unknown")
@@ -695,7 +699,7 @@ class LocalConversation(BaseConversation):
         This is a non-invasive method to reject actions between run() calls.
         Also clears the agent_waiting_for_confirmation flag.
         """
-        pending_actions = ConversationState.get_unmatched_actions(self._state.events)
+        pending_actions = self._state.view_index.unmatched_actions()
 
         with self._state:
             # Always clear the agent_waiting_for_confirmation flag
@@ -7,3 +7,9 @@ EVENT_NAME_RE = re.compile(
     r"^event-(?P<idx>\d{5})-(?P<event_id>[0-9a-fA-F\-]{8,})\.json$"
 )
 EVENT_FILE_PATTERN = "event-{idx:05d}-{event_id}.json"
+
+# Segmented event log layout (see SegmentedEventLog)
+SEGMENT_FILE_PATTERN = "segment-{seg:05d}.jsonl"
+SEGMENT_INDEX_PATTERN = "segment-{seg:05d}.idx"
+SEGMENT_FILE_RE = re.compile(r"^segment-(?P<seg>\d{5})\.jsonl$")
+SEGMENT_INDEX_RE = re.compile(r"^segment-(?P<seg>\d{5})\.idx$")
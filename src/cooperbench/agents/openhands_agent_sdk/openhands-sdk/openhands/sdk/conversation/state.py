@@ -8,8 +8,13 @@ from typing import Any, Self
 from pydantic import Field, PrivateAttr, model_validator
 
 from openhands.sdk.agent.base import AgentBase
+from openhands.sdk.context.view import ViewIndex
 from openhands.sdk.conversation.conversation_stats import ConversationStats
-from openhands.sdk.conversation.event_store import EventLog
+from openhands.sdk.conversation.event_store import (
+    EventLog,
+    SegmentedEventLog,
+    open_event_log,
+)
 from openhands.sdk.conversation.fifo_lock import FIFOLock
 from openhands.sdk.conversation.persistence_const import BASE_STATE, EVENTS_DIR
 from openhands.sdk.conversation.secret_registry import SecretRegistry
@@ -124,7 +129,9 @@ class ConversationState(OpenHandsModel):
 
     # ===== Private attrs (NOT Fields) =====
     _fs: FileStore = PrivateAttr()  # filestore for persistence
-    _events: EventLog = PrivateAttr()  # now the storage for events
+    # now the storage for events
+    _events: EventLog | SegmentedEventLog = PrivateAttr()
+    _view_index: ViewIndex | None = PrivateAttr(default=None)  # incremental view
     _cipher: Cipher | None = PrivateAttr(default=None)  # cipher for secret encryption
     _autosave_enabled: bool = PrivateAttr(
         default=False
@@ -145,9 +152,16 @@ class ConversationState(OpenHandsModel):
         return data
 
     @property
-    def events(self) -> EventLog:
+    def events(self) -> EventLog | SegmentedEventLog:
         return self._events
 
+    @property
+    def view_index(self) -> ViewIndex:
+        """Incrementally maintained view of the events, for the agent's step loop."""
+        if self._view_index is None or self._view_index.events is not self._events:
+            self._view_index = ViewIndex(self._events)
+        return self._view_index
+
     @property
     def env_observation_persistence_dir(self) -> str | None:
         """Directory for persisting environment observation files."""
@@ -256,7 +270,7 @@ class ConversationState(OpenHandsModel):
 
             # Attach event log early so we can read history for tool verification
             state._fs = file_store
-            state._events = EventLog(file_store, dir_path=EVENTS_DIR)
+            state._events = open_event_log(file_store, dir_path=EVENTS_DIR)
             state._cipher = cipher
 
             # Verify compatibility (agent class + tools)
@@ -293,7 +307,7 @@ class ConversationState(OpenHandsModel):
             stuck_detection=stuck_detection,
         )
         state._fs = file_store
-        state._events = EventLog(file_store, dir_path=EVENTS_DIR)
+        state._events = open_event_log(file_store, dir_path=EVENTS_DIR)
         state._cipher = cipher
         state.stats = ConversationStats()
 
@@ -1,3 +1,6 @@
+from collections import deque
+
+from openhands.sdk.conversation.events_list_base import EventsListBase
 from openhands.sdk.conversation.state import ConversationState
 from openhands.sdk.conversation.types import StuckDetectionThresholds
 from openhands.sdk.event import (
@@ -24,6 +27,11 @@ class StuckDetector:
     3. Agent monologue (repeated messages without user input)
     4. Repeating alternating action-observation patterns
     5. Context window errors indicating memory issues
+
+    The detector consumes the event log incrementally: each check only looks at
+    the events appended since the previous one and keeps the few recent events
+    every pattern needs, so a check costs O(1) amortized instead of re-reading
+    the whole history.
     """
 
     state: ConversationState
@@ -36,6 +44,63 @@ class StuckDetector:
     ):
         self.state = state
         self.thresholds = thresholds or StuckDetectionThresholds()
+        self._reset()
+
+    def _reset(self) -> None:
+        """Forget all rolling state and re-read the history on the next check."""
+        self._events_list: EventsListBase | None = None
+        self._seen = 0
+        self._has_user_message = False
+        self._start_new_turn()
+
+    def _start_new_turn(self) -> None:
+        """Reset the pattern state; only history after a user message counts."""
+        max_needed = max(self.action_observation_threshold, self.action_error_threshold)
+        # Most recent last
+        self._last_actions: deque[Event] = deque(maxlen=max_needed)
+        self._last_observations: deque[Event] = deque(maxlen=max_needed)
+        self._alt_actions: deque[Event] = deque(
+            maxlen=self.alternating_pattern_threshold
+        )
+        self._alt_observations: deque[Event] = deque(
+            maxlen=self.alternating_pattern_threshold
+        )
+        self._agent_message_count = 0
+        self._turn_length = 0
+
+    def _observe(self, event: Event) -> None:
+        """Fold one newly appended event into the rolling pattern state."""
+        if isinstance(event, MessageEvent) and event.source == "user":
+            self._has_user_message = True
+            self._start_new_turn()
+            return
+
+        self._turn_length += 1
+        if isinstance(event, ActionEvent):
+            self._last_actions.append(event)
+            self._alt_actions.append(event)
+        elif isinstance(event, ObservationBaseEvent):
+            self._last_observations.append(event)
+            if isinstance(event, (ObservationEvent, AgentErrorEvent)):
+                self._alt_observations.append(event)
+
+        # Consecutive agent messages; condensation summaries don't break the run
+        if isinstance(event, MessageEvent):
+            if event.source == "agent":
+                self._agent_message_count += 1
+        elif not isinstance(event, CondensationSummaryEvent):
+            self._agent_message_count = 0
+
+    def _catch_up(self) -> None:
+        """Observe the events appended since the last check."""
+        events = self.state.events
+        if events is not self._events_list or len(events) < self._seen:
+            # Event log replaced (e.g. state reloaded): start over
+            self._reset()
+            self._events_list = events
+        for event in events[self._seen :]:
+            self._observe(event)
+        self._seen = len(events)
 
     @property
     def action_observation_threshold(self) -> int:
@@ -55,53 +120,30 @@ class StuckDetector:
 
     def is_stuck(self) -> bool:
         """Check if the agent is currently stuck."""
-        events = list(self.state.events)
+        self._catch_up()
 
         # Only look at history after the last user message
-        last_user_msg_index = next(
-            (
-                i
-                for i in reversed(range(len(events)))
-                if isinstance(events[i], MessageEvent) and events[i].source == "user"
-            ),
-            -1,  # Default to -1 if no user message found
-        )
-        if last_user_msg_index == -1:
+        if not self._has_user_message:
             logger.warning("No user message found in history, skipping stuck detection")
             return False
 
-        events = events[last_user_msg_index + 1 :]
-
         # Determine minimum events needed
         min_threshold = min(
             self.action_observation_threshold,
             self.action_error_threshold,
             self.monologue_threshold,
         )
-        if len(events) < min_threshold:
+        if self._turn_length < min_threshold:
             return False
 
-        logger.debug(f"Checking for stuck patterns in {len(events)} events")
         logger.debug(
-            f"Events after last user message: {[type(e).__name__ for e in events]}"
+            f"Checking for stuck patterns in {self._turn_length} events "
+            "after the last user message"
         )
 
-        # Collect enough actions and observations for detection
-        max_needed = max(self.action_observation_threshold, self.action_error_threshold)
-        last_actions: list[Event] = []
-        last_observations: list[Event] = []
-
-        # Retrieve the last N actions and observations from the end of history
-        for event in reversed(events):
-            if isinstance(event, ActionEvent) and len(last_actions) < max_needed:
-                last_actions.append(event)
-            elif (
-                isinstance(event, ObservationBaseEvent)
-                and len(last_observations) < max_needed
-            ):
-                last_observations.append(event)
-            if len(last_actions) >= max_needed and len(last_observations) >= max_needed:
-                break
+        # Most recent first
+        last_actions = list(reversed(self._last_actions))
+        last_observations = list(reversed(self._last_observations))
 
         # Check all stuck patterns
         # scenario 1: same action, same observation
@@ -113,17 +155,17 @@ class StuckDetector:
             return True
 
         # scenario 3: monologue
-        if self._is_stuck_monologue(events):
+        if self._is_stuck_monologue():
             return True
 
         # scenario 4: action, observation alternating pattern
-        if len(events) >= self.alternating_pattern_threshold:
-            if self._is_stuck_alternating_action_observation(events):
+        if self._turn_length >= self.alternating_pattern_threshold:
+            if self._is_stuck_alternating_action_observation():
                 return True
 
         # scenario 5: context window error loop
-        if len(events) >= 10:
-            if self._is_stuck_context_window_error(events):
+        if self._turn_length >= 10:
+            if self._is_stuck_context_window_error():
                 return True
 
         return False
@@ -188,52 +230,20 @@ class StuckDetector:
         # Check if observations are errors
         return False
 
-    def _is_stuck_monologue(self, events: list[Event]) -> bool:
+    def _is_stuck_monologue(self) -> bool:
         # scenario 3: monologue
         # check for repeated MessageActions with source=AGENT
         # see if the agent is engaged in a good old monologue, telling
         # itself the same thing over and over
-        threshold = self.monologue_threshold
-        if len(events) < threshold:
-            return False
+        return self._agent_message_count >= self.monologue_threshold
 
-        # Look for N consecutive agent messages without user interruption
-        agent_message_count = 0
-
-        for event in reversed(events):
-            if isinstance(event, MessageEvent):
-                if event.source == "agent":
-                    agent_message_count += 1
-                elif event.source == "user":
-                    break  # User interrupted, not a monologue
-            elif isinstance(event, CondensationSummaryEvent):
-                # Condensation events don't break the monologue pattern
-                continue
-            else:
-                # Other events (actions/observations) don't count as monologue
-                break
-
-        return agent_message_count >= threshold
-
-    def _is_stuck_alternating_action_observation(self, events: list[Event]) -> bool:
+    def _is_stuck_alternating_action_observation(self) -> bool:
         # scenario 4: alternating action-observation loop
         threshold = self.alternating_pattern_threshold
 
-        last_actions: list[Event] = []
-        last_observations: list[Event] = []
-
-        # collect most recent N actions and N observations
-        for event in reversed(events):
-            if isinstance(event, ActionEvent) and len(last_actions) < threshold:
-                last_actions.append(event)
-            elif (
-                isinstance(event, (ObservationEvent, AgentErrorEvent))
-                and len(last_observations) < threshold
-            ):
-                last_observations.append(event)
-
-            if len(last_actions) == threshold and len(last_observations) == threshold:
-                break
+        # most recent N actions and N observations
+        last_actions = list(reversed(self._alt_actions))
+        last_observations = list(reversed(self._alt_observations))
 
         if len(last_actions) == threshold and len(last_observations) == threshold:
             # Check alternating pattern: [A, B, A, B, A, B] where even/odd match
@@ -252,7 +262,7 @@ class StuckDetector:
 
         return False
 
-    def _is_stuck_context_window_error(self, _events: list[Event]) -> bool:
+    def _is_stuck_context_window_error(self) -> bool:
         """Detects if we're stuck in a loop of context window errors.
 
         This happens when we repeatedly get context window errors and try to trim,
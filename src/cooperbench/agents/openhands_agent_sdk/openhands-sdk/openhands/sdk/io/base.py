@@ -33,6 +33,22 @@ class FileStore(ABC):
             The file contents as a string.
         """
 
+    def append(self, path: str, contents: str) -> None:
+        """Append contents to a file, creating it if it does not exist.
+
+        The default implementation rewrites the whole file; backends that can
+        append in place should override it.
+
+        Args:
+            path: The file path to append to.
+            contents: The text to append.
+        """
+        try:
+            existing = self.read(path)
+        except FileNotFoundError:
+            existing = ""
+        self.write(path, existing + contents)
+
     @abstractmethod
     def list(self, path: str) -> list[str]:
         """List all files and directories at the specified path.
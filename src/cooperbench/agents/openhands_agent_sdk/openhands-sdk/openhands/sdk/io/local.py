@@ -72,6 +72,14 @@ class LocalFileStore(FileStore):
             # Don't cache binary content - LocalFileStore is meant for JSON data
             # If binary data is written and then read, it will error on read
 
+    def append(self, path: str, contents: str) -> None:
+        full_path = self.get_full_path(path)
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        with open(full_path, "a", encoding="utf-8") as f:
+            f.write(contents)
+        if full_path in self.cache:
+            del self.cache[full_path]
+
     def read(self, path: str) -> str:
         full_path = self.get_full_path(path)
 
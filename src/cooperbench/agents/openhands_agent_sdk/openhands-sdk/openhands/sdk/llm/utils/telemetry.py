@@ -365,10 +365,9 @@ class Telemetry(BaseModel):
             ):
                 data["kwargs"].pop("tools")
 
-            log_data = json.dumps(data, default=_safe_json, ensure_ascii=False)
-
             # Use callback if set (for remote execution), otherwise write to file
             if self._log_completions_callback:
+                log_data = json.dumps(data, default=_safe_json, ensure_ascii=False)
                 self._log_completions_callback(filename, log_data)
             elif self.log_dir:
                 # Create log directory if it doesn't exist
@@ -376,8 +375,9 @@ class Telemetry(BaseModel):
                 if not os.access(self.log_dir, os.W_OK):
                     raise PermissionError(f"log_dir is not writable: {self.log_dir}")
                 fname = os.path.join(self.log_dir, filename)
+                # Stream to the file rather than building the whole string first
                 with open(fname, "w", encoding="utf-8") as f:
-                    f.write(log_data)
+                    json.dump(data, f, default=_safe_json, ensure_ascii=False)
         except Exception as e:
             warnings.warn(f"Telemetry logging failed: {e}")
 
@@ -7,6 +7,7 @@ from .logger import (
     get_logger,
     setup_logging,
 )
+from .payload import Lazy, capture_payload, configure_payload_capture
 from .rolling import rolling_log_view
 
 
@@ -19,4 +20,7 @@ __all__ = [
     "ENV_LOG_DIR",
     "IN_CI",
     "rolling_log_view",
+    "Lazy",
+    "capture_payload",
+    "configure_payload_capture",
 ]
@@ -0,0 +1,121 @@
+# payload.py
+"""Lazy formatting and sampled capture of large log payloads.
+
+Prompts, LLM responses and events grow with the conversation, so formatting
+them for a log line is O(context). ``Lazy`` defers that work until a handler
+actually formats the record, i.e. never when the level is disabled::
+
+    logger.debug("Sending messages: %s", Lazy(lambda: json.dumps(dump())))
+
+``capture_payload`` keeps a sample of such payloads for offline inspection
+without turning on debug logging. With ``LOG_PAYLOAD_SAMPLE_RATE`` set (0-1,
+default 0 = off), that fraction of payloads is appended to a gzip-compressed
+JSONL sidecar (``LOG_PAYLOAD_FILE``, default
+``$LOG_DIR/payloads-<pid>.jsonl.gz``). Each record is its own gzip member, so
+the file is readable up to the last complete record even if the process dies.
+"""
+
+import gzip
+import json
+import math
+import os
+import random
+import threading
+import time
+from collections.abc import Callable
+from typing import Any
+
+from .logger import ENV_LOG_DIR, get_logger
+
+
+logger = get_logger(__name__)
+
+
+def _parse_sample_rate(value: str) -> float:
+    """Parse LOG_PAYLOAD_SAMPLE_RATE; a malformed value turns capture off."""
+    try:
+        rate = float(value)
+    except ValueError:
+        rate = math.nan
+    if math.isnan(rate):
+        logger.warning(
+            f"Invalid LOG_PAYLOAD_SAMPLE_RATE {value!r}, payload capture disabled"
+        )
+        return 0.0
+    return rate
+
+
+ENV_PAYLOAD_SAMPLE_RATE = _parse_sample_rate(os.getenv("LOG_PAYLOAD_SAMPLE_RATE", "0"))
+ENV_PAYLOAD_FILE = os.getenv("LOG_PAYLOAD_FILE")
+
+
+class Lazy:
+    """A log argument whose (expensive) string is only built when formatted."""
+
+    __slots__ = ("_fn", "_value")
+
+    def __init__(self, fn: Callable[[], Any]):
+        self._fn = fn
+        self._value: str | None = None
+
+    def __str__(self) -> str:
+        if self._value is None:
+            self._value = str(self._fn())
+        return self._value
+
+    __repr__ = __str__
+
+
+_lock = threading.Lock()
+_sample_rate = ENV_PAYLOAD_SAMPLE_RATE
+_path = ENV_PAYLOAD_FILE
+
+
+def configure_payload_capture(sample_rate: float, path: str | None = None) -> None:
+    """Override the sample rate (and sidecar path) set by the environment."""
+    global _sample_rate, _path
+    with _lock:
+        _sample_rate = sample_rate
+        if path is not None:
+            _path = path
+
+
+def payload_file() -> str:
+    """Path of the payload sidecar of this process."""
+    return _path or os.path.join(ENV_LOG_DIR, f"payloads-{os.getpid()}.jsonl.gz")
+
+
+def capture_payload(kind: str, payload: Callable[[], Any]) -> None:
+    """Append a sampled payload to the sidecar.
+
+    Args:
+        kind: Payload type, e.g. "prompt", "response" or "event"
+        payload: Builds the JSON-serializable payload; only called when sampled
+    """
+    if _sample_rate <= 0 or random.random() >= _sample_rate:
+        return
+    try:
+        record = {"kind": kind, "timestamp": time.time(), "payload": payload()}
+        data = gzip.compress(
+            json.dumps(record, default=str, ensure_ascii=False).encode() + b"\n"
+        )
+        path = payload_file()
+        with _lock:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            with open(path, "ab") as f:
+                f.write(data)
+    except Exception:
+        # Payload capture is diagnostics only; never break the caller
+        pass
+
+
+def read_payloads(path: str) -> list[dict[str, Any]]:
+    """Read the records of a payload sidecar, ignoring a truncated last one."""
+    records = []
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        try:
+            for line in f:
+                records.append(json.loads(line))
+        except (EOFError, gzip.BadGzipFile, ValueError):
+            pass
+    return records
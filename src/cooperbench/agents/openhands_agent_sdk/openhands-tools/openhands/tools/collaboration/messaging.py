@@ -263,11 +263,12 @@ class ReceiveMessageExecutor(ToolExecutor[ReceiveMessageAction, ReceiveMessageOb
             inbox_key = f"{self._prefix}{self.agent_id}:inbox"
             messages = []
             
-            # Pop all messages from inbox
-            while True:
-                raw = self._client.lpop(inbox_key)
-                if raw is None:
-                    break
+            # Read and clear the whole inbox in one MULTI/EXEC round-trip
+            pipe = self._client.pipeline(transaction=True)
+            pipe.lrange(inbox_key, 0, -1)
+            pipe.delete(inbox_key)
+            raws, _ = pipe.execute()
+            for raw in raws:
                 try:
                     msg = json.loads(raw.decode() if isinstance(raw, bytes) else raw)
                     messages.append(msg)
@@ -5,7 +5,7 @@ from datetime import datetime
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
-from openhands.sdk.conversation.event_store import EventLog
+from openhands.sdk.conversation.event_store import EventLog, open_event_log
 from openhands.sdk.conversation.events_list_base import EventsListBase
 from openhands.sdk.event import (
     ActionEvent,
@@ -347,7 +347,7 @@ class TomConsultExecutor(
 
         # Load events from the session using file_store
         events_dir = f"{self.conversations_dir}/{session_id}/events"
-        events = EventLog(self.file_store, events_dir)
+        events = open_event_log(self.file_store, events_dir)
 
         # Format events into messages
         formatted_messages = self._format_events(events, conversation)
@@ -17,6 +17,45 @@ from pathlib import Path
 
 from cooperbench.agents import AgentResult
 from cooperbench.agents.registry import register
+from cooperbench.agents.swe_agent.utils.trajectory_log import find_trajectory_log, load_trajectory_log
+
+
+def _trajectory_messages(trajectory: list) -> list[dict]:
+    """Convert SWE-agent trajectory steps to assistant/user messages."""
+    messages: list[dict] = []
+    for step in trajectory:
+        if isinstance(step, dict):
+            # Assistant message: combine thought + action (response may be empty with function_calling)
+            thought = step.get("thought", "")
+            action = step.get("action", "")
+            response = step.get("response", "")
+            assistant_content = response or f"{thought}\n{action}".strip()
+            if assistant_content:
+                messages.append({"role": "assistant", "content": assistant_content})
+            # User message: observation
+            if "observation" in step:
+                messages.append({"role": "user", "content": str(step["observation"])})
+        else:
+            thought = getattr(step, "thought", "")
+            action = getattr(step, "action", "")
+            response = getattr(step, "response", "")
+            assistant_content = response or f"{thought}\n{action}".strip()
+            if assistant_content:
+                messages.append({"role": "assistant", "content": assistant_content})
+            if hasattr(step, "observation"):
+                messages.append({"role": "user", "content": str(step.observation)})
+    return messages
+
+
+def _load_partial_trajectory(traj_dir: Path) -> dict | None:
+    """Rebuild the trajectory of an attempt that raised before writing its .traj file."""
+    traj_path = find_trajectory_log(traj_dir)
+    if traj_path is None:
+        return None
+    try:
+        return load_trajectory_log(traj_path)
+    except OSError:
+        return None
 
 
 @register("swe_agent")
@@ -259,32 +298,18 @@ class SweAgentRunner:
                     steps = getattr(model_stats, "api_calls", 0)
 
                 # Get trajectory for messages
-                trajectory = getattr(result, "trajectory", []) or []
-                for step in trajectory:
-                    if isinstance(step, dict):
-                        # Assistant message: combine thought + action (response may be empty with function_calling)
-                        thought = step.get("thought", "")
-                        action = step.get("action", "")
-                        response = step.get("response", "")
-                        assistant_content = response or f"{thought}\n{action}".strip()
-                        if assistant_content:
-                            messages.append({"role": "assistant", "content": assistant_content})
-                        # User message: observation
-                        if "observation" in step:
-                            messages.append({"role": "user", "content": str(step["observation"])})
-                    else:
-                        thought = getattr(step, "thought", "")
-                        action = getattr(step, "action", "")
-                        response = getattr(step, "response", "")
-                        assistant_content = response or f"{thought}\n{action}".strip()
-                        if assistant_content:
-                            messages.append({"role": "assistant", "content": assistant_content})
-                        if hasattr(step, "observation"):
-                            messages.append({"role": "user", "content": str(step.observation)})
+                messages = _trajectory_messages(getattr(result, "trajectory", []) or [])
 
             except Exception as e:
                 status = "Error"
                 error_msg = str(e)
+                # Keep what the agent did before failing, from its unfinished step log
+                partial = _load_partial_trajectory(Path(traj_dir))
+                if partial is not None and not messages:
+                    messages = _trajectory_messages(partial["trajectory"])
+                    model_stats = partial["info"].get("model_stats", {})
+                    cost = model_stats.get("instance_cost", 0.0)
+                    steps = model_stats.get("api_calls", 0)
 
             finally:
                 # Cleanup
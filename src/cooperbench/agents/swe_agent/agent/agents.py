@@ -56,6 +56,7 @@ from cooperbench.agents.swe_agent.utils.config import _convert_paths_to_abspath,
 from cooperbench.agents.swe_agent.utils.jinja_warnings import _warn_probably_wrong_jinja_syntax
 from cooperbench.agents.swe_agent.utils.log import get_logger
 from cooperbench.agents.swe_agent.utils.patch_formatter import PatchFormatter
+from cooperbench.agents.swe_agent.utils.trajectory_log import TrajectoryLog
 
 
 class TemplateConfig(BaseModel):
@@ -363,7 +364,7 @@ class RetryAgent(AbstractAgent):
     def _finalize_agent_run(self) -> None:
         """Add the agent results to our list of results"""
         assert self._agent is not None
-        self._agent.save_trajectory()
+        self._agent.finalize_trajectory()
         self._attempt_data.append(self._agent.get_trajectory_data())
         self._total_instance_attempt_stats += self._agent.model.stats
 
@@ -422,9 +423,11 @@ class RetryAgent(AbstractAgent):
         step_output = StepOutput()
         self._setup_agent()
         assert self._agent is not None
+        self.save_trajectory(choose=False)
         while not step_output.done:
             step_output = self.step()
-            self.save_trajectory(choose=False)
+            # The attempt's steps go to its own log; our .traj only changes between attempts
+            self._agent.save_trajectory_step()
             if step_output.done:
                 self._rloop.on_submit(
                     ReviewSubmission(
@@ -491,6 +494,7 @@ class DefaultAgent(AbstractAgent):
         self._env: SWEEnv | None = None
         self._problem_statement: ProblemStatement | ProblemStatementConfig | None = None
         self.traj_path: Path | None = None
+        self._traj_log: TrajectoryLog | None = None
 
         #: The following three attributes collect the information about how the agent
         #: solved the problem.
@@ -628,6 +632,7 @@ class DefaultAgent(AbstractAgent):
 
         # Save/reset some attributes
         self.traj_path = output_dir / (self._problem_statement.id + ".traj")
+        self._traj_log = TrajectoryLog(self.traj_path)
         self.logger.info("Trajectory will be saved to %s", self.traj_path)
 
         self._chook.on_tools_installation_started()
@@ -832,6 +837,28 @@ class DefaultAgent(AbstractAgent):
         assert self.traj_path is not None
         self.traj_path.write_text(json.dumps(data, indent=2))
 
+    def save_trajectory_step(self) -> None:
+        """Append what changed since the last call to the trajectory log.
+
+        Unlike `save_trajectory`, this only writes the new history entries and
+        trajectory steps, so it is cheap enough to call after every step.
+        """
+        assert self._env is not None
+        assert self._traj_log is not None
+        self._traj_log.append(
+            history=self.history,
+            trajectory=self.trajectory,
+            info=self.info,
+            environment=self._env.name,
+            replay_config=self.replay_config.model_dump_json() if self.replay_config is not None else None,
+        )
+
+    def finalize_trajectory(self) -> None:
+        """Write the complete .traj file and remove the trajectory log it supersedes."""
+        self.save_trajectory()
+        if self._traj_log is not None:
+            self._traj_log.delete()
+
     def get_model_requery_history(
         self, error_template: str, *, output: str, **kwargs: str | int | float | bool | None
     ) -> list[dict[str, str]]:
@@ -1420,7 +1447,8 @@ class DefaultAgent(AbstractAgent):
         step_output = StepOutput()
         while not step_output.done:
             step_output = self.step()
-            self.save_trajectory()
+            self.save_trajectory_step()
+        self.finalize_trajectory()
         self._chook.on_run_done(trajectory=self.trajectory, info=self.info)
 
         self.logger.info("Trajectory saved to %s", self.traj_path)
@@ -0,0 +1,126 @@
+"""Append-only log of an in-progress trajectory.
+
+Rewriting the whole ``.traj`` file after every step makes I/O grow quadratically
+with the number of steps. Instead, after every step only the new history entries
+and trajectory steps (and the info, if it changed) are appended as JSON lines to
+``<instance>.traj.jsonl``. The ``.traj`` file is written once, when the attempt
+is finalized, and the log is removed.
+
+If a run dies before that, the log is left behind: ``find_trajectory_log`` locates
+it and ``load_trajectory_log`` rebuilds the ``.traj`` data from it. The CooperBench
+adapter uses this to report the steps of a run that raised.
+"""
+
+import json
+from pathlib import Path
+from typing import Any
+
+LOG_SUFFIX = ".jsonl"
+
+
+def get_trajectory_log_path(traj_path: Path) -> Path:
+    """Return the path of the step log that belongs to a ``.traj`` file."""
+    return traj_path.with_name(traj_path.name + LOG_SUFFIX)
+
+
+class TrajectoryLog:
+    def __init__(self, traj_path: Path):
+        """Start an empty step log for a new attempt.
+
+        Args:
+            traj_path: Path of the ``.traj`` file the log will be finalized into.
+        """
+        self.path = get_trajectory_log_path(traj_path)
+        self._n_history = 0
+        self._n_steps = 0
+        self._last_info: str | None = None
+        self._last_meta: str | None = None
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text("")
+
+    def append(
+        self,
+        *,
+        history: list[dict[str, Any]],
+        trajectory: list[dict[str, Any]],
+        info: dict[str, Any],
+        environment: str,
+        replay_config: str | None,
+    ) -> None:
+        """Append everything that changed since the last call.
+
+        History and trajectory are append-only, so only their new entries are
+        written. Info and metadata are small and written whenever they change.
+        """
+        records: list[str] = []
+        meta = json.dumps({"type": "meta", "environment": environment, "replay_config": replay_config})
+        if meta != self._last_meta:
+            records.append(meta)
+            self._last_meta = meta
+        for item in history[self._n_history :]:
+            records.append(json.dumps({"type": "history", "item": item}))
+        for step in trajectory[self._n_steps :]:
+            records.append(json.dumps({"type": "step", "step": step}))
+        info_record = json.dumps({"type": "info", "info": info})
+        if info_record != self._last_info:
+            records.append(info_record)
+            self._last_info = info_record
+        self._n_history = len(history)
+        self._n_steps = len(trajectory)
+
+        if records:
+            with open(self.path, "a") as f:
+                f.write("\n".join(records) + "\n")
+
+    def delete(self) -> None:
+        """Remove the log once the full ``.traj`` file has been written."""
+        self.path.unlink(missing_ok=True)
+
+
+def find_trajectory_log(output_dir: Path) -> Path | None:
+    """Find the ``.traj`` path of the most recently written step log under a directory.
+
+    Logs are removed when an attempt is finalized, so a log that is still there
+    belongs to an attempt that never finished.
+
+    Args:
+        output_dir: Directory the agent wrote its trajectories to (searched recursively,
+            since each retry attempt has its own subdirectory).
+
+    Returns:
+        Path of the ``.traj`` file to pass to ``load_trajectory_log``, or None.
+    """
+    logs = list(output_dir.rglob("*.traj" + LOG_SUFFIX))
+    if not logs:
+        return None
+    latest = max(logs, key=lambda path: path.stat().st_mtime)
+    return latest.with_name(latest.name.removesuffix(LOG_SUFFIX))
+
+
+def load_trajectory_log(traj_path: Path) -> dict[str, Any]:
+    """Rebuild ``.traj`` data from the step log of an unfinished attempt.
+
+    Args:
+        traj_path: Path of the ``.traj`` file (the log is found next to it).
+
+    Returns:
+        Dict with the same keys as the ``.traj`` file: trajectory, history, info,
+        replay_config and environment. A partially written last line is ignored.
+    """
+    data: dict[str, Any] = {"trajectory": [], "history": [], "info": {}, "replay_config": None, "environment": None}
+    for line in get_trajectory_log_path(traj_path).read_text().splitlines():
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            break
+        match record.get("type"):
+            case "history":
+                data["history"].append(record["item"])
+            case "step":
+                data["trajectory"].append(record["step"])
+            case "info":
+                data["info"] = record["info"]
+            case "meta":
+                data["environment"] = record["environment"]
+                data["replay_config"] = record["replay_config"]
+    return data
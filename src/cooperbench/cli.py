@@ -4,6 +4,8 @@ Usage:
     cooperbench run -n my-experiment --setting solo -r llama_index_task
     cooperbench run --setting solo -s lite  # auto-generates name: solo-lite-gemini-3-flash
     cooperbench eval -n my-experiment --force
+    cooperbench prewarm -s lite
+    cooperbench reindex -n my-experiment
 """
 
 import argparse
@@ -182,6 +184,23 @@ def main():
         "--agent-config",
         help="Path to agent-specific configuration file (format determined by agent)",
     )
+    run_parser.add_argument(
+        "--scheduler",
+        choices=["threads", "async"],
+        default="threads",
+        help="Task scheduler: threads (thread per task) or async (single asyncio event loop) (default: threads)",
+    )
+    run_parser.add_argument(
+        "--image-concurrency",
+        type=int,
+        default=0,
+        help="Max parallel tasks per task image with --scheduler async (default: 0 = unlimited)",
+    )
+    run_parser.add_argument(
+        "--speculative-eval",
+        action="store_true",
+        help="Start each coop pair's eval sandbox when its first agent finishes (modal/docker only)",
+    )
 
     # === eval command ===
     eval_parser = subparsers.add_parser(
@@ -233,6 +252,78 @@ def main():
         default="modal",
         help="Execution backend: modal (cloud), docker (local), or gcp (GCP Batch) (default: modal)",
     )
+    eval_parser.add_argument(
+        "--pool",
+        action="store_true",
+        help="Reuse warm sandboxes across runs that share a task image (modal/docker only)",
+    )
+    eval_parser.add_argument(
+        "--bundle",
+        action="store_true",
+        help="Run each coop merge evaluation as a single sandbox exec (modal/docker only)",
+    )
+    eval_parser.add_argument(
+        "--parallel-tests",
+        action="store_true",
+        help=(
+            "Run both feature test suites of a coop pair concurrently in separate git worktrees. "
+            "Only applies when the task's runner.sh installs no packages (e.g. go_chi, react_hook_form); "
+            "most Python tasks, including huggingface_datasets and llama_index, still run their suites "
+            "one at a time"
+        ),
+    )
+    eval_parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Don't reuse cached results of identical patch/test inputs",
+    )
+
+    # === prewarm command ===
+    prewarm_parser = subparsers.add_parser(
+        "prewarm",
+        help="Pre-build Modal task images",
+        description="Hydrate the Modal image of every selected task before a run",
+    )
+    prewarm_parser.add_argument(
+        "-s",
+        "--subset",
+        help="Use a predefined subset (e.g., lite). See dataset/subsets/",
+    )
+    prewarm_parser.add_argument(
+        "-r",
+        "--repo",
+        help="Filter by repository name",
+    )
+    prewarm_parser.add_argument(
+        "-t",
+        "--task",
+        type=int,
+        help="Filter by task ID",
+    )
+    prewarm_parser.add_argument(
+        "-c",
+        "--concurrency",
+        type=int,
+        default=10,
+        help="Number of parallel image builds (default: 10)",
+    )
+    prewarm_parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Re-hydrate images already recorded in the local manifest",
+    )
+
+    # === reindex command ===
+    reindex_parser = subparsers.add_parser(
+        "reindex",
+        help="Rebuild run indexes from logs/",
+        description="Rebuild logs/<name>/index.jsonl from the result.json and eval.json files on disk",
+    )
+    reindex_parser.add_argument(
+        "-n",
+        "--name",
+        help="Experiment name to reindex (default: all runs)",
+    )
 
     args = parser.parse_args()
 
@@ -242,6 +333,10 @@ def main():
         _run_command(args)
     elif args.command == "eval":
         _eval_command(args)
+    elif args.command == "prewarm":
+        _prewarm_command(args)
+    elif args.command == "reindex":
+        _reindex_command(args)
 
 
 def _config_command(args):
@@ -292,6 +387,9 @@ def _run_command(args):
         eval_concurrency=args.eval_concurrency,
         backend=args.backend,
         agent_config=args.agent_config if hasattr(args, "agent_config") else None,
+        scheduler=args.scheduler,
+        image_concurrency=args.image_concurrency,
+        speculative_eval=args.speculative_eval,
     )
 
 
@@ -316,8 +414,32 @@ def _eval_command(args):
         concurrency=args.concurrency,
         force=args.force,
         backend=args.backend,
+        pool=args.pool,
+        bundle=args.bundle,
+        parallel_tests=args.parallel_tests,
+        cache=not args.no_cache,
     )
 
 
+def _prewarm_command(args):
+    """Handle the 'prewarm' subcommand."""
+    from cooperbench.runner.prewarm import prewarm
+
+    prewarm(
+        subset=args.subset,
+        repo=args.repo,
+        task_id=args.task,
+        concurrency=args.concurrency,
+        force=args.force,
+    )
+
+
+def _reindex_command(args):
+    """Handle the 'reindex' subcommand."""
+    from cooperbench.runner.index import reindex
+
+    reindex(run_name=args.name)
+
+
 if __name__ == "__main__":
     main()
@@ -2,13 +2,16 @@
 
 from cooperbench.eval.backends.base import EvalBackend, ExecResult, Sandbox
 from cooperbench.eval.backends.modal import ModalBackend
+from cooperbench.eval.backends.pool import PooledBackend, get_pooled_backend
 
 __all__ = [
     "EvalBackend",
     "Sandbox",
     "ExecResult",
     "ModalBackend",
+    "PooledBackend",
     "get_backend",
+    "get_pooled_backend",
     "get_batch_evaluator",
 ]
 
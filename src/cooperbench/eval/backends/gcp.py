@@ -13,10 +13,12 @@ from __future__ import annotations
 
 import json
 import logging
+import math
 import os
 import time
 import uuid
 from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from typing import TYPE_CHECKING
 
@@ -25,6 +27,13 @@ if TYPE_CHECKING:
 
 from cooperbench.eval.backends.base import ExecResult, Sandbox
 
+# Shards per parallel slot when tasks_per_shard is not given: more shards than
+# slots keeps VMs busy when shards take different times
+SHARDS_PER_SLOT = 4
+
+# Concurrent GCS requests when collecting results and cleaning up
+DEFAULT_TRANSFER_WORKERS = 16
+
 # =============================================================================
 # Data Classes for Batch Evaluation
 # =============================================================================
@@ -68,6 +77,70 @@ class EvalResult:
     feature2_output: str = ""
 
 
+def _ensure_newline(content: str) -> str:
+    """Ensure patch content ends with newline (required by git)."""
+    if content and not content.endswith("\n"):
+        return content + "\n"
+    return content
+
+
+def _pack_manifest(tasks: list[EvalTask], tasks_per_shard: int) -> tuple[bytes, list[str]]:
+    """Serialize tasks and their patches as JSONL, one line per task.
+
+    Returns:
+        The manifest and, per shard of tasks_per_shard lines, its inclusive byte range
+    """
+    from cooperbench.utils import get_image_name
+
+    lines = []
+    for index, task in enumerate(tasks):
+        entry = {
+            "index": index,
+            "task_index": task.task_index,
+            "repo_name": task.repo_name,
+            "task_id": task.task_id,
+            "feature1_id": task.feature1_id,
+            "feature2_id": task.feature2_id,
+            "setting": task.setting,
+            "image": get_image_name(task.repo_name, task.task_id),
+            "patch1": _ensure_newline(task.patch1 or ""),
+            "patch2": _ensure_newline(task.patch2 or ""),
+            "tests1": _ensure_newline(task.tests1_patch),
+            "tests2": _ensure_newline(task.tests2_patch),
+        }
+        lines.append((json.dumps(entry) + "\n").encode())
+
+    shard_ranges = []
+    offset = 0
+    for start in range(0, len(lines), tasks_per_shard):
+        size = sum(len(line) for line in lines[start : start + tasks_per_shard])
+        shard_ranges.append(f"{offset}-{offset + size - 1}")
+        offset += size
+    return b"".join(lines), shard_ranges
+
+
+def _task_result(task: EvalTask, data: dict | None = None, error: str | None = None) -> EvalResult:
+    """Build a task's EvalResult from its result data (or an error)."""
+    data = data or {}
+    feature1_passed = data.get("feature1_passed", False)
+    feature2_passed = data.get("feature2_passed", False)
+    return EvalResult(
+        task_index=task.task_index,
+        repo_name=task.repo_name,
+        task_id=task.task_id,
+        features=[task.feature1_id, task.feature2_id],
+        setting=task.setting,
+        feature1_passed=feature1_passed,
+        feature2_passed=feature2_passed,
+        both_passed=feature1_passed and feature2_passed,
+        merge_status=data.get("merge_status"),
+        merge_strategy=data.get("merge_strategy"),
+        error=error or data.get("error"),
+        feature1_output=data.get("feature1_output", ""),
+        feature2_output=data.get("feature2_output", ""),
+    )
+
+
 # =============================================================================
 # GCPBatchEvaluator - Batch mode for large-scale evaluation
 # =============================================================================
@@ -79,6 +152,11 @@ class GCPBatchEvaluator:
     Submits ALL evaluation tasks as a single Batch job with parallel tasks.
     Each task runs the complete evaluation pipeline (apply patches, run tests).
 
+    GCS traffic is kept to a few objects per job: tasks and their patches go
+    into one JSONL manifest, Batch tasks evaluate shards of consecutive tasks
+    and write one results object per shard, and results are downloaded and
+    deleted by a bounded thread pool.
+
     This is much more efficient than GCPBatchBackend for large-scale evaluation
     because it amortizes the ~90s VM startup across all tasks.
 
@@ -96,76 +174,61 @@ class GCPBatchEvaluator:
         results = evaluator.run_batch(tasks, parallelism=50)
     """
 
-    # The eval script that runs inside each Batch task
+    # The eval script that runs inside each Batch task. Each Batch task evaluates
+    # one shard (consecutive lines of the JSONL manifest): it reads only its byte
+    # range of the manifest and uploads one aggregate of its results.
     EVAL_SCRIPT = """#!/bin/bash
 set -e
 
-# Task index from Batch
-TASK_INDEX=$BATCH_TASK_INDEX
+# Shard index from Batch
+SHARD=$BATCH_TASK_INDEX
 
-echo "Task $TASK_INDEX starting..."
+echo "Shard $SHARD starting..."
 
 # Use cloud-sdk container for gsutil (faster than installing SDK)
 # NOTE: COS root filesystem is read-only, so we use /home/workspace which is writable
-WORKSPACE_ROOT=/home/workspace
+WORKSPACE_ROOT=${WORKSPACE_ROOT:-/home/workspace}
 mkdir -p $WORKSPACE_ROOT
+
+# Max seconds per task (set by the evaluator)
+TASK_TIMEOUT=${TASK_TIMEOUT:-1800}
 GSUTIL="docker run --rm -v $WORKSPACE_ROOT:$WORKSPACE_ROOT -v /tmp:/tmp gcr.io/google.com/cloudsdktool/cloud-sdk:slim gsutil"
 
 # Pull cloud-sdk image first (will be cached for subsequent tasks on same VM)
 docker pull gcr.io/google.com/cloudsdktool/cloud-sdk:slim
 
-# Download manifest
-$GSUTIL cp gs://$BUCKET_NAME/$MANIFEST_PATH /tmp/manifest.json
-
-# Extract job_id from manifest path (format: {job_id}/manifest.json)
+# Extract job_id from manifest path (format: {job_id}/manifest.jsonl)
 JOB_ID=$(dirname $MANIFEST_PATH)
 
-# Extract this task's config using Python
-CONFIG=$(python3 -c "
-import json
-import sys
-with open('/tmp/manifest.json') as f:
-    manifest = json.load(f)
-task = manifest['tasks'][$TASK_INDEX]
-print(json.dumps(task))
-")
-
-echo "Task config: $CONFIG"
+SHARD_DIR=$WORKSPACE_ROOT/shard_$SHARD
+mkdir -p $SHARD_DIR
+RESULTS=$SHARD_DIR/results.jsonl
+: > $RESULTS
 
-# Parse config
-REPO_NAME=$(echo $CONFIG | python3 -c "import json,sys; print(json.load(sys.stdin)['repo_name'])")
-TASK_ID=$(echo $CONFIG | python3 -c "import json,sys; print(json.load(sys.stdin)['task_id'])")
-FEATURE1_ID=$(echo $CONFIG | python3 -c "import json,sys; print(json.load(sys.stdin)['feature1_id'])")
-FEATURE2_ID=$(echo $CONFIG | python3 -c "import json,sys; print(json.load(sys.stdin)['feature2_id'])")
-SETTING=$(echo $CONFIG | python3 -c "import json,sys; print(json.load(sys.stdin)['setting'])")
-IMAGE=$(echo $CONFIG | python3 -c "import json,sys; print(json.load(sys.stdin)['image'])")
+# Download this shard's lines of the manifest (MANIFEST_RANGE is set per Batch task)
+$GSUTIL cat -r $MANIFEST_RANGE gs://$BUCKET_NAME/$MANIFEST_PATH > $SHARD_DIR/manifest.jsonl
 
-echo "Repo: $REPO_NAME, Task: $TASK_ID, Features: $FEATURE1_ID,$FEATURE2_ID, Setting: $SETTING"
-
-# Pull the task image (skip if already cached on this VM)
-if ! docker image inspect $IMAGE &> /dev/null; then
-    echo "Pulling image: $IMAGE"
-    docker pull $IMAGE
-else
-    echo "Image already cached: $IMAGE"
-fi
-
-# Create workspace in writable path
-WORKSPACE=$WORKSPACE_ROOT/eval_$TASK_INDEX
-mkdir -p $WORKSPACE
-cd $WORKSPACE
-
-# Download patches from GCS (path includes job_id)
-$GSUTIL cp gs://$BUCKET_NAME/$JOB_ID/tasks/$TASK_INDEX/patch1.patch $WORKSPACE/ 2>/dev/null || touch $WORKSPACE/patch1.patch
-$GSUTIL cp gs://$BUCKET_NAME/$JOB_ID/tasks/$TASK_INDEX/patch2.patch $WORKSPACE/ 2>/dev/null || touch $WORKSPACE/patch2.patch
-$GSUTIL cp gs://$BUCKET_NAME/$JOB_ID/tasks/$TASK_INDEX/tests1.patch $WORKSPACE/
-$GSUTIL cp gs://$BUCKET_NAME/$JOB_ID/tasks/$TASK_INDEX/tests2.patch $WORKSPACE/
-
-# Run evaluation in Docker container
-echo "Running evaluation in Docker..."
+# Unpack each task's config and patches into its workspace, printing the task indices
+INDICES=$(python3 -c "
+import json
+import os
+with open('$SHARD_DIR/manifest.jsonl') as manifest:
+    for line in manifest:
+        if not line.strip():
+            continue
+        task = json.loads(line)
+        workspace = '$WORKSPACE_ROOT/eval_%d' % task['index']
+        os.makedirs(workspace, exist_ok=True)
+        for name in ('patch1', 'patch2', 'tests1', 'tests2'):
+            with open(os.path.join(workspace, name + '.patch'), 'w') as f:
+                f.write(task.pop(name))
+        with open(os.path.join(workspace, 'config.json'), 'w') as f:
+            json.dump(task, f)
+        print(task['index'])
+")
 
-# Create the eval script to run inside container
-cat > $WORKSPACE/run_eval.sh << 'EVALSCRIPT'
+# Create the eval script to run inside containers
+cat > $WORKSPACE_ROOT/run_eval.sh << 'EVALSCRIPT'
 #!/bin/bash
 set -e
 cd /workspace/repo
@@ -273,25 +336,74 @@ with open('$RESULT_FILE', 'w') as f:
 "
 EVALSCRIPT
 
-chmod +x $WORKSPACE/run_eval.sh
-
-# Run in Docker
-# NOTE: CooperBench images have ENTRYPOINT set to runner.sh, so we must override it
-docker run --rm \
-    --entrypoint /bin/bash \
-    -v $WORKSPACE/patch1.patch:/patches/patch1.patch \
-    -v $WORKSPACE/patch2.patch:/patches/patch2.patch \
-    -v $WORKSPACE/tests1.patch:/patches/tests1.patch \
-    -v $WORKSPACE/tests2.patch:/patches/tests2.patch \
-    -v $WORKSPACE/run_eval.sh:/run_eval.sh \
-    -v $WORKSPACE:/output \
-    $IMAGE \
-    /run_eval.sh "$SETTING" /output/result.json
-
-# Upload result to GCS (path includes job_id)
-$GSUTIL cp $WORKSPACE/result.json gs://$BUCKET_NAME/$JOB_ID/results/$TASK_INDEX/result.json
-
-echo "Task $TASK_INDEX completed"
+chmod +x $WORKSPACE_ROOT/run_eval.sh
+
+for TASK_INDEX in $INDICES; do
+    WORKSPACE=$WORKSPACE_ROOT/eval_$TASK_INDEX
+    cd $WORKSPACE
+
+    SETTING=$(python3 -c "import json; print(json.load(open('config.json'))['setting'])")
+    IMAGE=$(python3 -c "import json; print(json.load(open('config.json'))['image'])")
+    echo "Task $TASK_INDEX config: $(cat config.json)"
+
+    # Pull the task image (skip if already cached on this VM)
+    if ! docker image inspect $IMAGE &> /dev/null; then
+        echo "Pulling image: $IMAGE"
+        docker pull $IMAGE || echo "Failed to pull image: $IMAGE"
+    else
+        echo "Image already cached: $IMAGE"
+    fi
+
+    # Run in Docker (a failed task must not stop the rest of the shard), bounded by
+    # TASK_TIMEOUT so one hung test suite can't use up the time of the whole shard
+    # NOTE: CooperBench images have ENTRYPOINT set to runner.sh, so we must override it
+    rm -f $WORKSPACE/result.json
+    CONTAINER=cooperbench_eval_$TASK_INDEX
+    STATUS=0
+    START=$SECONDS
+    timeout -k 30 $TASK_TIMEOUT docker run --rm --name $CONTAINER \
+        --entrypoint /bin/bash \
+        -v $WORKSPACE/patch1.patch:/patches/patch1.patch \
+        -v $WORKSPACE/patch2.patch:/patches/patch2.patch \
+        -v $WORKSPACE/tests1.patch:/patches/tests1.patch \
+        -v $WORKSPACE/tests2.patch:/patches/tests2.patch \
+        -v $WORKSPACE_ROOT/run_eval.sh:/run_eval.sh \
+        -v $WORKSPACE:/output \
+        $IMAGE \
+        /run_eval.sh "$SETTING" /output/result.json || STATUS=$?
+    # Stopping the docker client on timeout doesn't stop the container
+    docker rm -f $CONTAINER &> /dev/null || true
+    # 124: stopped by SIGTERM; 137 past the deadline: SIGKILL (rather than e.g. out of memory)
+    TIMED_OUT=False
+    if [ $STATUS -eq 124 ] || { [ $STATUS -eq 137 ] && [ $((SECONDS - START)) -ge $TASK_TIMEOUT ]; }; then
+        TIMED_OUT=True
+        echo "Task $TASK_INDEX timed out after ${TASK_TIMEOUT}s"
+    elif [ $STATUS -ne 0 ]; then
+        echo "Task $TASK_INDEX evaluation failed (exit status $STATUS)"
+    fi
+
+    # Append the result to the shard's aggregate
+    python3 -c "
+import json
+try:
+    with open('$WORKSPACE/result.json') as f:
+        result = json.load(f)
+except Exception as e:
+    result = {'feature1_passed': False, 'feature2_passed': False, 'error': 'No result: %s' % e}
+if $TIMED_OUT:
+    result = {'feature1_passed': False, 'feature2_passed': False, 'error': 'Timed out after ${TASK_TIMEOUT}s'}
+result['index'] = $TASK_INDEX
+with open('$RESULTS', 'a') as f:
+    f.write(json.dumps(result) + chr(10))
+"
+
+    # Upload the aggregate so far (results of finished tasks survive a shard timeout)
+    $GSUTIL cp $RESULTS gs://$BUCKET_NAME/$JOB_ID/results/shard_$SHARD.jsonl
+
+    echo "Task $TASK_INDEX completed"
+done
+
+echo "Shard $SHARD completed"
 """
 
     def __init__(
@@ -300,6 +412,7 @@ echo "Task $TASK_INDEX completed"
         region: str = "us-central1",
         bucket_name: str | None = None,
         vm_image: str | None = None,
+        transfer_workers: int = DEFAULT_TRANSFER_WORKERS,
     ) -> None:
         """Initialize GCP Batch evaluator.
 
@@ -313,10 +426,12 @@ echo "Task $TASK_INDEX completed"
                 - "cooperbench-eval": Use image from cooperbench-eval family
                 - "projects/PROJECT/global/images/IMAGE": Full image path
                 Defaults to COOPERBENCH_VM_IMAGE env var if set.
+            transfer_workers: Concurrent GCS requests for downloads and cleanup
 
         Environment variables:
             GOOGLE_CLOUD_PROJECT: Default project ID
             COOPERBENCH_VM_IMAGE: Default VM image (e.g., "cooperbench-eval")
+            STORAGE_EMULATOR_HOST: GCS emulator to use instead of GCS (for testing)
         """
         self._project_id = project_id or os.environ.get("GOOGLE_CLOUD_PROJECT")
 
@@ -336,6 +451,7 @@ echo "Task $TASK_INDEX completed"
         self._region = region
         self._bucket_name = bucket_name or f"cooperbench-eval-{self._project_id}"
         self._vm_image = vm_image or os.environ.get("COOPERBENCH_VM_IMAGE")
+        self._transfer_workers = transfer_workers
         self._logger = logging.getLogger("cooperbench.eval.backends.gcp_batch")
         self._storage_client = None
         self._batch_client = None
@@ -371,6 +487,7 @@ echo "Task $TASK_INDEX completed"
         timeout: int = 1800,
         on_progress: Callable | None = None,
         group_by_image: bool = True,
+        tasks_per_shard: int | None = None,
     ) -> list[EvalResult]:
         """Submit all tasks as Batch job(s) and wait for results.
 
@@ -381,6 +498,8 @@ echo "Task $TASK_INDEX completed"
             on_progress: Optional callback(status: str, completed: int, total: int)
             group_by_image: If True, group tasks by Docker image into separate
                 jobs for optimal caching (default: True)
+            tasks_per_shard: Tasks evaluated one after another by each Batch task
+                (default: enough for SHARDS_PER_SLOT shards per parallel slot)
 
         Returns:
             List of EvalResult for each task
@@ -399,10 +518,10 @@ echo "Task $TASK_INDEX completed"
 
             if len(tasks_by_image) > 1:
                 self._logger.info(f"Grouping {len(tasks)} tasks into {len(tasks_by_image)} jobs by image")
-                return self._run_multiple_jobs(tasks_by_image, parallelism, timeout, on_progress)
+                return self._run_multiple_jobs(tasks_by_image, parallelism, timeout, on_progress, tasks_per_shard)
 
         # Single image or grouping disabled - run as single job
-        return self._run_single_job(tasks, parallelism, timeout, on_progress)
+        return self._run_single_job(tasks, parallelism, timeout, on_progress, tasks_per_shard)
 
     def _run_single_job(
         self,
@@ -410,26 +529,31 @@ echo "Task $TASK_INDEX completed"
         parallelism: int,
         timeout: int,
         on_progress: Callable | None,
+        tasks_per_shard: int | None = None,
     ) -> list[EvalResult]:
         """Run tasks as a single Batch job."""
         from google.cloud import batch_v1
 
         job_id = f"eval-batch-{uuid.uuid4().hex[:12]}"
-        self._logger.info(f"Submitting batch job {job_id} with {len(tasks)} tasks")
+        if tasks_per_shard is None:
+            tasks_per_shard = math.ceil(len(tasks) / (parallelism * SHARDS_PER_SLOT))
+        tasks_per_shard = max(1, tasks_per_shard)
+        self._logger.info(f"Submitting batch job {job_id} with {len(tasks)} tasks ({tasks_per_shard} per shard)")
 
         if on_progress:
             on_progress("submitting", 0, len(tasks))
 
-        # Upload manifest and patches to GCS
+        # Upload manifest (with patches) to GCS
         bucket = self._ensure_bucket()
-        manifest_path = self._upload_manifest(bucket, job_id, tasks)
+        manifest_path, shard_ranges = self._upload_manifest(bucket, job_id, tasks, tasks_per_shard)
 
         # Create Batch job
         job = self._create_batch_job(
             job_id=job_id,
-            task_count=len(tasks),
+            shard_ranges=shard_ranges,
             parallelism=parallelism,
-            timeout=timeout,
+            timeout=timeout * tasks_per_shard,
+            task_timeout=timeout,
             manifest_path=manifest_path,
         )
 
@@ -447,7 +571,9 @@ echo "Task $TASK_INDEX completed"
 
         # Wait for completion
         job_name = f"{parent}/jobs/{job_id}"
-        self._wait_for_job(job_name, timeout * len(tasks) // parallelism + 300, len(tasks), on_progress)
+        self._wait_for_job(
+            job_name, timeout * len(tasks) // parallelism + 300, len(tasks), on_progress, tasks_per_shard
+        )
 
         # Collect results
         if on_progress:
@@ -465,6 +591,7 @@ echo "Task $TASK_INDEX completed"
         parallelism: int,
         timeout: int,
         on_progress: Callable | None,
+        tasks_per_shard: int | None = None,
     ) -> list[EvalResult]:
         """Run tasks grouped by image as separate parallel jobs.
 
@@ -486,7 +613,7 @@ echo "Task $TASK_INDEX completed"
             for image, tasks in tasks_by_image.items():
                 # Each job gets parallelism proportional to its task count
                 job_parallelism = min(parallelism, len(tasks))
-                future = executor.submit(self._run_single_job, tasks, job_parallelism, timeout, None)
+                future = executor.submit(self._run_single_job, tasks, job_parallelism, timeout, None, tasks_per_shard)
                 futures[future] = (image, tasks)
 
             # Collect results as jobs complete
@@ -522,56 +649,30 @@ echo "Task $TASK_INDEX completed"
 
         return all_results
 
-    def _upload_manifest(self, bucket, job_id: str, tasks: list[EvalTask]) -> str:
-        """Upload manifest and patches to GCS."""
-        from cooperbench.utils import get_image_name
-
-        manifest = {
-            "job_id": job_id,
-            "task_count": len(tasks),
-            "tasks": [],
-        }
-
-        for task in tasks:
-            image = get_image_name(task.repo_name, task.task_id)
-            manifest["tasks"].append(
-                {
-                    "task_index": task.task_index,
-                    "repo_name": task.repo_name,
-                    "task_id": task.task_id,
-                    "feature1_id": task.feature1_id,
-                    "feature2_id": task.feature2_id,
-                    "setting": task.setting,
-                    "image": image,
-                }
-            )
-
-            # Upload patches (ensure proper newline endings)
-            prefix = f"{job_id}/tasks/{task.task_index}"
+    def _upload_manifest(
+        self, bucket, job_id: str, tasks: list[EvalTask], tasks_per_shard: int = 1
+    ) -> tuple[str, list[str]]:
+        """Upload the job's tasks and patches to GCS as one JSONL object.
 
-            def ensure_newline(content: str) -> str:
-                """Ensure patch content ends with newline (required by git)."""
-                if content and not content.endswith("\n"):
-                    return content + "\n"
-                return content
+        Line i holds the task at position i (its index in the job, which is what
+        results refer to). Shards are runs of tasks_per_shard consecutive lines.
 
-            bucket.blob(f"{prefix}/patch1.patch").upload_from_string(ensure_newline(task.patch1 or ""))
-            bucket.blob(f"{prefix}/patch2.patch").upload_from_string(ensure_newline(task.patch2 or ""))
-            bucket.blob(f"{prefix}/tests1.patch").upload_from_string(ensure_newline(task.tests1_patch))
-            bucket.blob(f"{prefix}/tests2.patch").upload_from_string(ensure_newline(task.tests2_patch))
-
-        # Upload manifest
-        manifest_path = f"{job_id}/manifest.json"
-        bucket.blob(manifest_path).upload_from_string(json.dumps(manifest, indent=2))
-
-        return manifest_path
+        Returns:
+            Manifest path and, per shard, the byte range of its lines ("start-end",
+            inclusive, as taken by ``gsutil cat -r``)
+        """
+        manifest_path = f"{job_id}/manifest.jsonl"
+        content, shard_ranges = _pack_manifest(tasks, tasks_per_shard)
+        bucket.blob(manifest_path).upload_from_string(content, content_type="application/x-ndjson")
+        return manifest_path, shard_ranges
 
     def _create_batch_job(
         self,
         job_id: str,
-        task_count: int,
+        shard_ranges: list[str],
         parallelism: int,
         timeout: int,
+        task_timeout: int,
         manifest_path: str,
     ):
         from google.cloud import batch_v1
@@ -593,8 +694,10 @@ echo "Task $TASK_INDEX completed"
         env.variables = {
             "MANIFEST_PATH": manifest_path,
             "BUCKET_NAME": self._bucket_name,
+            "TASK_TIMEOUT": str(task_timeout),
         }
         task_spec.environment = env
+        task_count = len(shard_ranges)
 
         # Compute resources
         resources = batch_v1.ComputeResource()
@@ -607,6 +710,8 @@ echo "Task $TASK_INDEX completed"
         task_group.task_spec = task_spec
         task_group.task_count = task_count
         task_group.parallelism = min(parallelism, task_count)
+        # Each Batch task reads only its shard's lines of the manifest
+        task_group.task_environments = [batch_v1.Environment(variables={"MANIFEST_RANGE": r}) for r in shard_ranges]
 
         job.task_groups = [task_group]
 
@@ -653,6 +758,7 @@ echo "Task $TASK_INDEX completed"
         max_wait: int,
         total_tasks: int = 0,
         on_progress: Callable | None = None,
+        tasks_per_shard: int = 1,
     ):
         from google.cloud import batch_v1
 
@@ -666,11 +772,12 @@ echo "Task $TASK_INDEX completed"
 
             self._logger.debug(f"Job state: {state.name}")
 
-            # Count completed tasks from task groups
+            # Count completed tasks from task groups (each Batch task is a shard)
             completed = 0
             if job.status.task_groups:
                 for tg in job.status.task_groups.values():
                     completed += tg.counts.get("SUCCEEDED", 0) + tg.counts.get("FAILED", 0)
+            completed = min(completed * tasks_per_shard, total_tasks)
 
             # Determine status string
             if state == batch_v1.JobStatus.State.QUEUED:
@@ -700,68 +807,40 @@ echo "Task $TASK_INDEX completed"
         raise TimeoutError(f"Job did not complete within {max_wait}s")
 
     def _collect_results(self, bucket, job_id: str, tasks: list[EvalTask]) -> list[EvalResult]:
-        results = []
-
-        for task in tasks:
-            result_blob = bucket.blob(f"{job_id}/results/{task.task_index}/result.json")
+        """Download the shard aggregates and match their results to tasks."""
+        try:
+            blobs = list(bucket.list_blobs(prefix=f"{job_id}/results/"))
+        except Exception as e:
+            return [_task_result(task, error=str(e)) for task in tasks]
 
+        def download(blob) -> str:
             try:
-                if result_blob.exists():
-                    data = json.loads(result_blob.download_as_text())
-                    results.append(
-                        EvalResult(
-                            task_index=task.task_index,
-                            repo_name=task.repo_name,
-                            task_id=task.task_id,
-                            features=[task.feature1_id, task.feature2_id],
-                            setting=task.setting,
-                            feature1_passed=data.get("feature1_passed", False),
-                            feature2_passed=data.get("feature2_passed", False),
-                            both_passed=data.get("feature1_passed", False) and data.get("feature2_passed", False),
-                            merge_status=data.get("merge_status"),
-                            merge_strategy=data.get("merge_strategy"),
-                            error=data.get("error"),
-                            feature1_output=data.get("feature1_output", ""),
-                            feature2_output=data.get("feature2_output", ""),
-                        )
-                    )
-                else:
-                    results.append(
-                        EvalResult(
-                            task_index=task.task_index,
-                            repo_name=task.repo_name,
-                            task_id=task.task_id,
-                            features=[task.feature1_id, task.feature2_id],
-                            setting=task.setting,
-                            feature1_passed=False,
-                            feature2_passed=False,
-                            both_passed=False,
-                            error="Result not found",
-                        )
-                    )
+                return blob.download_as_text()
             except Exception as e:
-                results.append(
-                    EvalResult(
-                        task_index=task.task_index,
-                        repo_name=task.repo_name,
-                        task_id=task.task_id,
-                        features=[task.feature1_id, task.feature2_id],
-                        setting=task.setting,
-                        feature1_passed=False,
-                        feature2_passed=False,
-                        both_passed=False,
-                        error=str(e),
-                    )
-                )
-
-        return results
+                self._logger.warning(f"Failed to download {blob.name}: {e}")
+                return ""
+
+        found: dict[int, dict] = {}
+        with ThreadPoolExecutor(max_workers=self._transfer_workers) as executor:
+            for text in executor.map(download, blobs):
+                for line in text.splitlines():
+                    try:
+                        data = json.loads(line)
+                        found[data["index"]] = data
+                    except (ValueError, KeyError, TypeError):
+                        continue
+
+        return [
+            _task_result(task, found[i]) if i in found else _task_result(task, error="Result not found")
+            for i, task in enumerate(tasks)
+        ]
 
     def _cleanup(self, bucket, job_id: str, client, job_name: str):
         """Clean up GCS data and delete job."""
         try:
             blobs = list(bucket.list_blobs(prefix=f"{job_id}/"))
-            for blob in blobs:
-                blob.delete()
+            with ThreadPoolExecutor(max_workers=self._transfer_workers) as executor:
+                list(executor.map(lambda blob: blob.delete(), blobs))
         except Exception as e:
             self._logger.warning(f"Failed to cleanup GCS: {e}")
 
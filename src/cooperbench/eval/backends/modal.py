@@ -5,6 +5,7 @@ from typing import Any
 import modal
 
 from cooperbench.eval.backends.base import ExecResult, Sandbox
+from cooperbench.infra.limiter import get_limiter
 
 
 class ModalExecResult:
@@ -68,12 +69,13 @@ class ModalBackend:
     ) -> Sandbox:
         """Create a Modal sandbox for evaluation."""
         modal_image = modal.Image.from_registry(image).entrypoint([])
-        sb = modal.Sandbox.create(
-            image=modal_image,
-            timeout=timeout,
-            workdir=workdir,
-            app=self._get_app(),
-        )
+        with get_limiter("modal").slot():
+            sb = modal.Sandbox.create(
+                image=modal_image,
+                timeout=timeout,
+                workdir=workdir,
+                app=self._get_app(),
+            )
 
         # Create patches directory
         result = sb.exec("mkdir", "-p", "/patches")
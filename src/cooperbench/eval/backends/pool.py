@@ -0,0 +1,331 @@
+"""Warm sandbox pool for evaluation backends.
+
+Wraps any EvalBackend so that sandboxes are reused across evaluations of the
+same task image instead of being created and terminated for every call.
+Returned sandboxes are reset to the image's base commit before reuse.
+"""
+
+import atexit
+import math
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+
+from cooperbench.eval.backends.base import EvalBackend, ExecResult, Sandbox
+
+REPO_DIR = "/workspace/repo"
+
+# Grace period before `timeout` escalates from SIGTERM to SIGKILL
+KILL_AFTER = 10
+
+
+@dataclass
+class _PoolEntry:
+    """A warm sandbox and the repo state it must be reset to."""
+
+    sandbox: Sandbox
+    base_sha: str
+    head_ref: str
+    branches: list[str]
+    expires_at: float
+    idle_since: float = field(default_factory=time.monotonic)
+    held_until: float = 0.0  # Kept past idle_timeout until then unless handed out (speculative prewarm)
+
+
+class PooledSandbox:
+    """Sandbox handle that returns its sandbox to the pool on terminate().
+
+    The pooled sandbox lives for the pool's ``max_lifetime``, so the caller's
+    ``timeout`` is enforced per handle instead: every command is run under
+    ``timeout`` with the time left until the handle's deadline.
+    """
+
+    def __init__(self, pool: "PooledBackend", image: str, entry: _PoolEntry, timeout: int):
+        self._pool = pool
+        self._image = image
+        self._entry = entry
+        self._deadline = time.monotonic() + timeout
+        self._released = False
+
+    @property
+    def base_sha(self) -> str:
+        """Commit the repo is reset to between uses."""
+        return self._entry.base_sha
+
+    def exec(self, *args: str) -> ExecResult:
+        """Execute a command in the underlying sandbox, bounded by the handle's deadline."""
+        remaining = max(1, math.ceil(self._deadline - time.monotonic()))
+        return self._entry.sandbox.exec("timeout", "-k", str(KILL_AFTER), str(remaining), *args)
+
+    def terminate(self) -> None:
+        """Release the sandbox back to the pool (reset happens on release)."""
+        if self._released:
+            return
+        self._released = True
+        self._pool._release(self._image, self._entry)
+
+
+class PooledBackend:
+    """EvalBackend wrapper keeping a per-image pool of warm sandboxes.
+
+    Sandboxes are created with a lifetime of ``max_lifetime`` seconds and
+    handed out again for the same image as long as enough lifetime remains
+    for the requested timeout. On release the repo is restored with
+    ``git reset --hard`` / ``git clean -fdx`` on the base SHA; sandboxes that
+    fail to reset are terminated instead of being pooled.
+
+    Callers that are about to evaluate an image can ``prewarm`` it in the
+    background; ``create_sandbox`` waits (up to ``prewarm_wait`` seconds) for a
+    sandbox that is still starting instead of creating a second one. A held
+    prewarm is only kept for ``hold_timeout`` seconds, in case the evaluation
+    it was started for never runs.
+
+    Note that anything installed outside the repo (e.g. packages installed by
+    runner.sh) survives the reset, so pooling trades strict isolation for speed.
+    """
+
+    def __init__(
+        self,
+        backend: EvalBackend,
+        max_size: int = 4,
+        idle_timeout: float = 300.0,
+        max_lifetime: int = 3600,
+        hold_timeout: float = 600.0,
+        prewarm_wait: float = 300.0,
+    ):
+        """Initialize the pool.
+
+        Args:
+            backend: Underlying backend used to create sandboxes
+            max_size: Max idle sandboxes kept per image
+            idle_timeout: Seconds an idle sandbox is kept before termination
+            max_lifetime: Lifetime requested for pooled sandboxes in seconds
+            hold_timeout: Seconds a held prewarmed sandbox is exempt from idle_timeout
+            prewarm_wait: Max seconds create_sandbox waits for a prewarm in progress
+        """
+        self._backend = backend
+        self._max_size = max_size
+        self._idle_timeout = idle_timeout
+        self._max_lifetime = max_lifetime
+        self._hold_timeout = hold_timeout
+        self._prewarm_wait = prewarm_wait
+        self._idle: dict[str, deque[_PoolEntry]] = {}
+        self._starting: dict[str, int] = {}  # Sandboxes being prewarmed per image
+        self._lock = threading.Lock()
+        self._prewarmed = threading.Condition(self._lock)
+        self._closed = False
+
+    def create_sandbox(
+        self,
+        image: str,
+        timeout: int = 600,
+        workdir: str = "/workspace",
+    ) -> Sandbox:
+        """Hand out a warm sandbox for ``image``, creating one if none is idle or being prewarmed."""
+        entry = self._acquire(image, timeout)
+        deadline = time.monotonic() + self._prewarm_wait
+        while entry is None and self._wait_for_prewarm(image, deadline):
+            entry = self._acquire(image, timeout)
+        if entry is None:
+            entry = self._create_entry(image, workdir, timeout)
+        return PooledSandbox(self, image, entry, timeout)
+
+    def prewarm(self, image: str, count: int = 1, workdir: str = "/workspace", hold: bool = False) -> None:
+        """Start ``count`` sandboxes for ``image`` and park them in the pool.
+
+        Args:
+            image: Docker image name
+            count: Number of sandboxes to start
+            workdir: Working directory inside container
+            hold: Keep the sandboxes past ``idle_timeout`` until they are handed
+                out or ``hold_timeout`` passes, for an evaluation that has not
+                started yet
+        """
+        for _ in range(count):
+            with self._lock:
+                self._starting[image] = self._starting.get(image, 0) + 1
+            try:
+                entry = self._create_entry(image, workdir, 0)
+                if hold:
+                    entry.held_until = time.monotonic() + self._hold_timeout
+                self._park(image, entry)
+                if hold:
+                    # Evict it when the hold runs out even if nothing else uses the pool
+                    reaper = threading.Timer(max(self._hold_timeout, self._idle_timeout), self._evict_idle)
+                    reaper.daemon = True
+                    reaper.start()
+            finally:
+                with self._prewarmed:
+                    self._starting[image] -= 1
+                    self._prewarmed.notify_all()
+
+    def shutdown(self) -> None:
+        """Terminate every idle sandbox and stop pooling new ones."""
+        with self._lock:
+            self._closed = True
+            entries = [e for q in self._idle.values() for e in q]
+            self._idle.clear()
+        for entry in entries:
+            _terminate_quietly(entry.sandbox)
+
+    def _acquire(self, image: str, timeout: int) -> _PoolEntry | None:
+        """Pop a usable idle sandbox for ``image`` (evicting stale ones)."""
+        stale = []
+        found = None
+        now = time.monotonic()
+        with self._lock:
+            queue = self._idle.get(image)
+            while queue:
+                entry = queue.pop()
+                if entry.expires_at - now < timeout:
+                    stale.append(entry)
+                    continue
+                found = entry
+                found.held_until = 0.0
+                break
+        for entry in stale:
+            _terminate_quietly(entry.sandbox)
+        self._evict_idle()
+        return found
+
+    def _wait_for_prewarm(self, image: str, deadline: float) -> bool:
+        """Block until a sandbox being prewarmed for ``image`` is ready.
+
+        Returns False if none is starting or it is not ready by ``deadline``
+        (a ``time.monotonic()`` value).
+        """
+        with self._prewarmed:
+            starting = self._starting.get(image, 0)
+            if not starting:
+                return False
+            return self._prewarmed.wait_for(
+                lambda: self._starting.get(image, 0) < starting,
+                timeout=max(0.0, deadline - time.monotonic()),
+            )
+
+    def _create_entry(self, image: str, workdir: str, timeout: int) -> _PoolEntry:
+        """Create a sandbox and record the repo state to restore between uses."""
+        lifetime = max(timeout, self._max_lifetime)
+        sandbox = self._backend.create_sandbox(image, lifetime, workdir)
+        expires_at = time.monotonic() + lifetime
+        try:
+            result = sandbox.exec(
+                "bash",
+                "-c",
+                f"cd {REPO_DIR} && git rev-parse HEAD && (git symbolic-ref -q --short HEAD || git rev-parse HEAD)"
+                " && git for-each-ref --format='%(refname:short)' refs/heads",
+            )
+            lines = result.stdout_read().split()
+            if result.returncode != 0 or len(lines) < 2:
+                raise RuntimeError(f"Failed to read base commit: {result.stdout_read()}{result.stderr_read()}")
+        except Exception:
+            _terminate_quietly(sandbox)
+            raise
+        return _PoolEntry(
+            sandbox=sandbox,
+            base_sha=lines[0],
+            head_ref=lines[1],
+            branches=lines[2:],
+            expires_at=expires_at,
+        )
+
+    def _release(self, image: str, entry: _PoolEntry) -> None:
+        """Reset a returned sandbox and park it, or terminate it if that fails."""
+        if self._closed or not self._reset(entry):
+            _terminate_quietly(entry.sandbox)
+            return
+        self._park(image, entry)
+
+    def _park(self, image: str, entry: _PoolEntry) -> None:
+        """Add an idle sandbox to the pool, respecting the size cap."""
+        entry.idle_since = time.monotonic()
+        with self._lock:
+            queue = self._idle.setdefault(image, deque())
+            if self._closed or len(queue) >= self._max_size:
+                overflow = entry
+            else:
+                queue.append(entry)
+                overflow = None
+        if overflow is not None:
+            _terminate_quietly(overflow.sandbox)
+        self._evict_idle()
+
+    def _reset(self, entry: _PoolEntry) -> bool:
+        """Restore the repo to its base commit and clear /patches."""
+        keep = " ".join(entry.branches)
+        commands = f"""
+cd {REPO_DIR} || exit 1
+git merge --abort 2>/dev/null
+git checkout --force {entry.head_ref} || exit 1
+git reset --hard {entry.base_sha} || exit 1
+git clean -fdx -q || exit 1
+for b in $(git for-each-ref --format='%(refname:short)' refs/heads); do
+    case " {keep} " in *" $b "*) ;; *) git branch -D "$b" >/dev/null ;; esac
+done
+git worktree prune
+rm -rf /patches && mkdir -p /patches
+echo RESET_OK
+"""
+        try:
+            result = entry.sandbox.exec("bash", "-c", commands)
+            return result.returncode == 0 and "RESET_OK" in result.stdout_read()
+        except Exception:
+            return False
+
+    def _evict_idle(self) -> None:
+        """Terminate sandboxes idle longer than idle_timeout or near expiry."""
+        now = time.monotonic()
+        evicted = []
+        with self._lock:
+            for queue in self._idle.values():
+                for entry in list(queue):
+                    idle_expired = now - entry.idle_since > self._idle_timeout and now >= entry.held_until
+                    if idle_expired or entry.expires_at <= now:
+                        queue.remove(entry)
+                        evicted.append(entry)
+        for entry in evicted:
+            _terminate_quietly(entry.sandbox)
+
+
+def _terminate_quietly(sandbox: Sandbox) -> None:
+    try:
+        sandbox.terminate()
+    except Exception:
+        pass
+
+
+# Process-wide pools, one per backend name (shared across eval threads)
+_pools: dict[str, PooledBackend] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pooled_backend(name: str = "modal") -> PooledBackend:
+    """Get the process-wide sandbox pool for a backend (thread-safe).
+
+    Args:
+        name: Backend name ("modal" or "docker")
+
+    Returns:
+        PooledBackend shared by all callers in this process
+    """
+    from cooperbench.eval.backends import get_backend
+
+    with _pools_lock:
+        if name not in _pools:
+            if name not in ("modal", "docker"):
+                raise ValueError(f"Sandbox pooling is not supported for backend: '{name}'. Available: docker, modal")
+            _pools[name] = PooledBackend(get_backend(name))
+        return _pools[name]
+
+
+def shutdown_pools() -> None:
+    """Terminate all pooled sandboxes (registered to run at exit)."""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.shutdown()
+
+
+atexit.register(shutdown_pools)
@@ -0,0 +1,197 @@
+"""Content-addressed cache of evaluation results.
+
+Results are keyed by the task image digest, the normalized agent patches, the
+test patches and the setting, so identical patch pairs (empty patches,
+gold-identical patches, re-runs) are evaluated once across runs and experiments.
+Only outcomes where both test suites actually reported results are stored.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import urllib.request
+from pathlib import Path
+
+from platformdirs import user_cache_dir
+
+from cooperbench.eval.sandbox import _filter_test_files, _parse_results, _sanitize_patch
+
+# Bump to invalidate all cached results (e.g., when evaluation semantics change)
+CACHE_VERSION = 1
+
+# Only the outcome is cached; run-specific fields are filled in by the caller
+CACHED_FIELDS = ("merge", "feature1", "feature2", "both_passed", "error")
+
+
+# Manifest media types accepted when resolving an image digest
+_MANIFEST_TYPES = (
+    "application/vnd.oci.image.index.v1+json",
+    "application/vnd.docker.distribution.manifest.list.v2+json",
+    "application/vnd.docker.distribution.manifest.v2+json",
+)
+
+# Resolved digests per image tag (None if the registry could not be reached)
+_digests: dict[str, str | None] = {}
+_digests_lock = threading.Lock()
+
+
+def resolve_image_digest(image: str) -> str | None:
+    """Resolve a Docker Hub image tag to the digest it currently points to.
+
+    Lookups are memoized for the lifetime of the process.
+
+    Args:
+        image: Image name such as ``akhatua/cooperbench-dspy:task8394``
+
+    Returns:
+        Manifest digest (``sha256:...``), or None if it could not be resolved
+    """
+    with _digests_lock:
+        if image in _digests:
+            return _digests[image]
+    digest = _fetch_digest(image)
+    with _digests_lock:
+        _digests[image] = digest
+    return digest
+
+
+def _fetch_digest(image: str) -> str | None:
+    name, _, tag = image.rpartition(":")
+    if not name or "/" in tag or "." in name.split("/")[0]:
+        return None  # Untagged or not a Docker Hub image
+    if "/" not in name:
+        name = f"library/{name}"
+    try:
+        token_url = f"https://auth.docker.io/token?service=registry.docker.io&scope=repository:{name}:pull"
+        with urllib.request.urlopen(token_url, timeout=10) as resp:
+            token = json.load(resp)["token"]
+        request = urllib.request.Request(
+            f"https://registry-1.docker.io/v2/{name}/manifests/{tag}",
+            method="HEAD",
+            headers={"Authorization": f"Bearer {token}", "Accept": ", ".join(_MANIFEST_TYPES)},
+        )
+        with urllib.request.urlopen(request, timeout=10) as resp:
+            return resp.headers.get("Docker-Content-Digest")
+    except Exception:
+        return None
+
+
+def is_cacheable(result: dict) -> bool:
+    """Whether an evaluation outcome can be reused for identical inputs.
+
+    Errors are usually infrastructure failures, and a failed feature whose
+    tests reported no counts was most likely killed by a timeout or broke
+    during setup; both are worth retrying instead of caching.
+    """
+    if result.get("error"):
+        return False
+    for feature in ("feature1", "feature2"):
+        test = result.get(feature) or {}
+        if test.get("passed"):
+            continue
+        counts = _parse_results(test.get("test_output") or "")
+        if counts["passed"] + counts["failed"] == 0:
+            return False
+    return True
+
+
+def normalize_patch(patch: str | None) -> str:
+    """Normalize a patch the same way the evaluator does before applying it."""
+    if not patch or not patch.strip():
+        return ""
+    return _filter_test_files(_sanitize_patch(patch))
+
+
+def eval_cache_key(
+    image: str,
+    patch1: str | None,
+    patch2: str | None,
+    tests1: str,
+    tests2: str,
+    setting: str,
+) -> str:
+    """Build the cache key for one evaluation.
+
+    Args:
+        image: Task Docker image pinned by digest (``name@sha256:...``)
+        patch1: First agent's patch (or the solo patch)
+        patch2: Second agent's patch ("" for solo)
+        tests1: Feature 1 tests.patch content
+        tests2: Feature 2 tests.patch content
+        setting: "coop" or "solo"
+
+    Returns:
+        Hex digest identifying the evaluation inputs
+    """
+    parts = [
+        str(CACHE_VERSION),
+        image,
+        setting,
+        _sha256(normalize_patch(patch1)),
+        _sha256(normalize_patch(patch2)),
+        _sha256(tests1),
+        _sha256(tests2),
+    ]
+    return _sha256("\0".join(parts))
+
+
+def _sha256(text: str) -> str:
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+class EvalCache:
+    """On-disk SQLite store of evaluation results (safe to share across threads)."""
+
+    def __init__(self, path: Path | None = None):
+        self.path = path or Path(user_cache_dir("cooperbench", appauthor=False)) / "eval_cache.sqlite"
+        self._lock = threading.Lock()
+        self._initialized = False
+
+    def _connect(self) -> sqlite3.Connection:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=30)
+        with self._lock:
+            if not self._initialized:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, result TEXT NOT NULL, created_at TEXT)"
+                )
+                conn.commit()
+                self._initialized = True
+        return conn
+
+    def get(self, key: str) -> dict | None:
+        """Return the cached result for ``key``, or None on a miss."""
+        if not self.path.exists():
+            return None
+        conn = self._connect()
+        try:
+            row = conn.execute("SELECT result FROM results WHERE key = ?", (key,)).fetchone()
+        finally:
+            conn.close()
+        return json.loads(row[0]) if row else None
+
+    def put(self, key: str, result: dict) -> None:
+        """Store the outcome fields of ``result`` under ``key``."""
+        value = json.dumps({k: result.get(k) for k in CACHED_FIELDS})
+        conn = self._connect()
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO results (key, result, created_at) VALUES (?, ?, datetime('now'))",
+                (key, value),
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+    def clear(self) -> None:
+        """Delete all cached results."""
+        if not self.path.exists():
+            return
+        conn = self._connect()
+        try:
+            conn.execute("DELETE FROM results")
+            conn.commit()
+        finally:
+            conn.close()
@@ -8,9 +8,11 @@ from pathlib import Path
 from rich.progress import BarColumn, Progress, SpinnerColumn, TaskProgressColumn, TextColumn
 from rich.table import Table
 
+from cooperbench.eval.cache import EvalCache, eval_cache_key, is_cacheable, resolve_image_digest
 from cooperbench.eval.runs import discover_runs
 from cooperbench.eval.sandbox import _sanitize_patch, test_merged, test_solo
-from cooperbench.utils import console
+from cooperbench.runner.index import get_run_index
+from cooperbench.utils import console, get_image_name
 
 
 def evaluate(
@@ -22,6 +24,10 @@ def evaluate(
     concurrency: int = 10,
     force: bool = False,
     backend: str = "modal",
+    pool: bool = False,
+    bundle: bool = False,
+    parallel_tests: bool = False,
+    cache: bool = True,
 ) -> None:
     """Evaluate completed runs.
 
@@ -32,8 +38,13 @@ def evaluate(
         task_id: Filter by task ID
         features: Specific feature pair to evaluate
         concurrency: Number of parallel evaluations
-        force: Force re-evaluation even if eval.json exists
+        force: Force re-evaluation even if eval.json exists or the result is cached
         backend: Execution backend ("modal", "docker", "gcp")
+        pool: Reuse warm sandboxes across runs sharing a task image (modal/docker)
+        bundle: Run coop merge evaluation as a single sandbox exec (modal/docker)
+        parallel_tests: Run both coop test suites concurrently in git worktrees
+            (suites still run one at a time if runner.sh installs packages)
+        cache: Reuse results of previously evaluated identical patch/test inputs
     """
     runs = discover_runs(
         run_name=run_name,
@@ -50,7 +61,12 @@ def evaluate(
     # Filter already-evaluated runs if not forcing
     if not force:
         original_count = len(runs)
-        runs = [r for r in runs if not (Path(r["log_dir"]) / "eval.json").exists()]
+        index = get_run_index(run_name)
+        if index.exists():
+            evaluated = {log_dir for log_dir, entry in index.entries().items() if "eval" in entry}
+            runs = [r for r in runs if r["log_dir"] not in evaluated]
+        else:
+            runs = [r for r in runs if not (Path(r["log_dir"]) / "eval.json").exists()]
         skipped_count = original_count - len(runs)
         if skipped_count > 0:
             console.print(f"[dim]skipping {skipped_count} already evaluated[/dim]")
@@ -69,7 +85,7 @@ def evaluate(
 
     # For GCP with multiple runs, use batch mode for efficiency
     if backend in ("gcp", "gcp_batch") and len(runs) > 1:
-        passed, failed, errors, skipped, results = _run_gcp_batch(runs, concurrency, force)
+        passed, failed, errors, skipped, results = _run_gcp_batch(runs, concurrency, force, cache)
     else:
         # Docker/Modal: run interactively
         results = []
@@ -79,7 +95,15 @@ def evaluate(
         skipped = 0
 
         def eval_run(run_info: dict) -> dict | None:
-            return _evaluate_single(run_info, force=force, backend=backend)
+            return _evaluate_single(
+                run_info,
+                force=force,
+                backend=backend,
+                pool=pool,
+                bundle=bundle,
+                parallel_tests=parallel_tests,
+                cache=cache,
+            )
 
         if is_single:
             # Single run - show detailed output
@@ -113,7 +137,7 @@ def evaluate(
     _print_summary(passed, failed, errors, skipped, len(runs))
 
 
-def _run_gcp_batch(runs: list[dict], parallelism: int, force: bool) -> tuple:
+def _run_gcp_batch(runs: list[dict], parallelism: int, force: bool, cache: bool = True) -> tuple:
     """Run evaluations using GCP Batch (all tasks submitted at once).
 
     This is much more efficient for large-scale evaluation because:
@@ -124,7 +148,8 @@ def _run_gcp_batch(runs: list[dict], parallelism: int, force: bool) -> tuple:
     Args:
         runs: List of run_info dicts from discover_runs
         parallelism: Max parallel tasks in batch job
-        force: Force re-evaluation (unused here, filtering done earlier)
+        force: Re-evaluate cache hits too (eval.json filtering is done earlier)
+        cache: Reuse cached results and only submit cache misses to the batch job
 
     Returns:
         Tuple of (passed, failed, errors, skipped, results)
@@ -133,9 +158,20 @@ def _run_gcp_batch(runs: list[dict], parallelism: int, force: bool) -> tuple:
     from cooperbench.eval.backends.gcp import EvalTask
     from cooperbench.eval.sandbox import _filter_test_files, _load_patch
 
-    # Convert runs to EvalTask objects
+    eval_cache = EvalCache() if cache else None
+    evaluated: list[tuple[dict, dict]] = []  # (run_info, eval_result)
+
+    # Convert runs to EvalTask objects, answering cache hits directly
     tasks = []
-    for i, run_info in enumerate(runs):
+    batch_runs = []
+    cache_keys = []
+    for run_info in runs:
+        cache_key = _eval_cache_key(run_info, *_read_run_patches(run_info)) if eval_cache else None
+        cached = eval_cache.get(cache_key) if eval_cache and cache_key and not force else None
+        if cached is not None:
+            evaluated.append((run_info, _build_eval_result(run_info, cached)))
+            continue
+
         task_dir = Path("dataset") / run_info["repo"] / f"task{run_info['task_id']}"
         f1, f2 = run_info["features"]
 
@@ -164,8 +200,9 @@ def _run_gcp_batch(runs: list[dict], parallelism: int, force: bool) -> tuple:
             patch1 = _filter_test_files(patch1) if patch1 else ""
             patch2 = _filter_test_files(patch2) if patch2 else ""
 
+        # Task indices must be contiguous - the batch script indexes the manifest with them
         task = EvalTask(
-            task_index=i,
+            task_index=len(tasks),
             repo_name=run_info["repo"],
             task_id=run_info["task_id"],
             feature1_id=f1,
@@ -178,33 +215,66 @@ def _run_gcp_batch(runs: list[dict], parallelism: int, force: bool) -> tuple:
             tests2_patch=tests2_patch,
         )
         tasks.append(task)
+        batch_runs.append(run_info)
+        cache_keys.append(cache_key)
+
+    if evaluated:
+        console.print(f"[dim]{len(evaluated)} result(s) reused from eval cache[/dim]")
+
+    if tasks:
+        # Submit batch job with progress display
+        evaluator = get_batch_evaluator("gcp")
+
+        with Progress(
+            SpinnerColumn(),
+            TextColumn("[progress.description]{task.description}"),
+            BarColumn(),
+            TextColumn("[dim]{task.completed}/{task.total}[/dim]"),
+            TaskProgressColumn(),
+            console=console,
+            transient=True,
+        ) as progress:
+            batch_task = progress.add_task("submitting", total=len(tasks))
+
+            def on_progress(status: str, completed: int, total: int):
+                status_text = {
+                    "submitting": "submitting to GCP Batch",
+                    "queued": "queued",
+                    "provisioning": "provisioning VMs",
+                    "running": "evaluating",
+                    "collecting": "collecting results",
+                }.get(status, status)
+                progress.update(batch_task, description=status_text, completed=completed)
+
+            batch_results = evaluator.run_batch(tasks, parallelism=parallelism, on_progress=on_progress)
+            progress.update(batch_task, completed=len(tasks))
+
+        for batch_result in batch_results:
+            run_info = batch_runs[batch_result.task_index]
+            result = {
+                "merge": {
+                    "status": batch_result.merge_status,
+                    "strategy": batch_result.merge_strategy,
+                }
+                if batch_result.setting == "coop"
+                else None,
+                "feature1": {
+                    "passed": batch_result.feature1_passed,
+                    "test_output": batch_result.feature1_output or "",
+                },
+                "feature2": {
+                    "passed": batch_result.feature2_passed,
+                    "test_output": batch_result.feature2_output or "",
+                },
+                "both_passed": batch_result.both_passed,
+                "error": batch_result.error,
+            }
 
-    # Submit batch job with progress display
-    evaluator = get_batch_evaluator("gcp")
-
-    with Progress(
-        SpinnerColumn(),
-        TextColumn("[progress.description]{task.description}"),
-        BarColumn(),
-        TextColumn("[dim]{task.completed}/{task.total}[/dim]"),
-        TaskProgressColumn(),
-        console=console,
-        transient=True,
-    ) as progress:
-        batch_task = progress.add_task("submitting", total=len(tasks))
-
-        def on_progress(status: str, completed: int, total: int):
-            status_text = {
-                "submitting": "submitting to GCP Batch",
-                "queued": "queued",
-                "provisioning": "provisioning VMs",
-                "running": "evaluating",
-                "collecting": "collecting results",
-            }.get(status, status)
-            progress.update(batch_task, description=status_text, completed=completed)
+            cache_key = cache_keys[batch_result.task_index]
+            if eval_cache and cache_key and is_cacheable(result):
+                eval_cache.put(cache_key, result)
 
-        batch_results = evaluator.run_batch(tasks, parallelism=parallelism, on_progress=on_progress)
-        progress.update(batch_task, completed=len(tasks))
+            evaluated.append((run_info, _build_eval_result(run_info, result)))
 
     # Process results
     passed = 0
@@ -213,55 +283,30 @@ def _run_gcp_batch(runs: list[dict], parallelism: int, force: bool) -> tuple:
     skipped = 0
     results = []
 
-    for batch_result in batch_results:
-        run_info = runs[batch_result.task_index]
+    for run_info, eval_result in evaluated:
         feat_str = ",".join(str(f) for f in run_info["features"])
         task_name = f"{run_info['repo']}/{run_info['task_id']}"
 
-        # Build eval_result for saving
-        eval_result = {
-            "repo": batch_result.repo_name,
-            "task_id": batch_result.task_id,
-            "features": batch_result.features,
-            "setting": batch_result.setting,
-            "merge": {
-                "status": batch_result.merge_status,
-                "strategy": batch_result.merge_strategy,
-            }
-            if batch_result.setting == "coop"
-            else None,
-            "feature1": {
-                "passed": batch_result.feature1_passed,
-                "test_output": batch_result.feature1_output or "",
-            },
-            "feature2": {
-                "passed": batch_result.feature2_passed,
-                "test_output": batch_result.feature2_output or "",
-            },
-            "both_passed": batch_result.both_passed,
-            "error": batch_result.error,
-            "evaluated_at": datetime.now().isoformat(),
-        }
-
         # Save eval.json
         log_dir = Path(run_info["log_dir"])
         with open(log_dir / "eval.json", "w") as f:
             json.dump(eval_result, f, indent=2)
+        _index_eval(run_info, eval_result)
 
         # Update counters
-        if batch_result.error:
+        if eval_result["error"]:
             errors += 1
             status = "error"
-            console.print(f"[yellow]✗ error[/yellow] {task_name} [dim]{batch_result.error}[/dim]")
-        elif batch_result.both_passed:
+            console.print(f"[yellow]✗ error[/yellow] {task_name} [dim]{eval_result['error']}[/dim]")
+        elif eval_result["both_passed"]:
             passed += 1
             status = "pass"
             console.print(f"[green]✓ pass[/green] {task_name} [dim][{feat_str}][/dim]")
         else:
             failed += 1
             status = "fail"
-            f1 = "[green]✓[/green]" if batch_result.feature1_passed else "[red]✗[/red]"
-            f2 = "[green]✓[/green]" if batch_result.feature2_passed else "[red]✗[/red]"
+            f1 = "[green]✓[/green]" if eval_result["feature1"].get("passed") else "[red]✗[/red]"
+            f2 = "[green]✓[/green]" if eval_result["feature2"].get("passed") else "[red]✗[/red]"
             console.print(f"[red]✗ fail[/red] {task_name} [dim][{feat_str}][/dim] f1:{f1} f2:{f2}")
 
         results.append({"run": f"{task_name}/{feat_str}", "status": status})
@@ -269,7 +314,15 @@ def _run_gcp_batch(runs: list[dict], parallelism: int, force: bool) -> tuple:
     return passed, failed, errors, skipped, results
 
 
-def _evaluate_single(run_info: dict, force: bool = False, backend: str = "modal") -> dict | None:
+def _evaluate_single(
+    run_info: dict,
+    force: bool = False,
+    backend: str = "modal",
+    pool: bool = False,
+    bundle: bool = False,
+    parallel_tests: bool = False,
+    cache: bool = True,
+) -> dict | None:
     """Evaluate a single run."""
     log_dir = Path(run_info["log_dir"])
     eval_file = log_dir / "eval.json"
@@ -283,71 +336,120 @@ def _evaluate_single(run_info: dict, force: bool = False, backend: str = "modal"
     task_id = run_info["task_id"]
     features = run_info["features"]
     f1, f2 = features[0], features[1]
+    patch1, patch2 = _read_run_patches(run_info)
 
-    if setting == "solo":
-        # Solo evaluation
-        patch_file = log_dir / "solo.patch"
-        patch = patch_file.read_text() if patch_file.exists() else ""
-
-        result = test_solo(
-            repo_name=repo,
-            task_id=task_id,
-            feature1_id=f1,
-            feature2_id=f2,
-            patch=patch,
-            backend=backend,
-        )
-
-        eval_result = {
-            "repo": repo,
-            "task_id": task_id,
-            "features": features,
-            "setting": "solo",
-            "merge": None,
-            "feature1": result.get("feature1", {}),
-            "feature2": result.get("feature2", {}),
-            "both_passed": result.get("both_passed", False),
-            "error": result.get("error"),
-            "evaluated_at": datetime.now().isoformat(),
-        }
-    else:
-        # Coop evaluation - merge two agent patches
-        patch1_file = log_dir / f"agent{f1}.patch"
-        patch2_file = log_dir / f"agent{f2}.patch"
-
-        patch1 = patch1_file.read_text() if patch1_file.exists() else ""
-        patch2 = patch2_file.read_text() if patch2_file.exists() else ""
-
-        result = test_merged(
-            repo_name=repo,
-            task_id=task_id,
-            feature1_id=f1,
-            feature2_id=f2,
-            patch1=patch1,
-            patch2=patch2,
-            backend=backend,
-        )
+    # Identical inputs were already evaluated (possibly by another run); force re-evaluates
+    # but still refreshes the cached result
+    eval_cache = EvalCache() if cache else None
+    cache_key = _eval_cache_key(run_info, patch1, patch2) if eval_cache else None
+    result = eval_cache.get(cache_key) if eval_cache and cache_key and not force else None
 
-        eval_result = {
-            "repo": repo,
-            "task_id": task_id,
-            "features": features,
-            "setting": "coop",
-            "merge": result.get("merge", {}),
-            "feature1": result.get("feature1", {}),
-            "feature2": result.get("feature2", {}),
-            "both_passed": result.get("both_passed", False),
-            "error": result.get("error"),
-            "evaluated_at": datetime.now().isoformat(),
-        }
+    if result is None:
+        if setting == "solo":
+            # Solo evaluation
+            result = test_solo(
+                repo_name=repo,
+                task_id=task_id,
+                feature1_id=f1,
+                feature2_id=f2,
+                patch=patch1,
+                backend=backend,
+                pool=pool,
+            )
+        else:
+            # Coop evaluation - merge two agent patches
+            result = test_merged(
+                repo_name=repo,
+                task_id=task_id,
+                feature1_id=f1,
+                feature2_id=f2,
+                patch1=patch1,
+                patch2=patch2,
+                backend=backend,
+                pool=pool,
+                bundle=bundle,
+                parallel_tests=parallel_tests,
+            )
+
+        # Don't cache errors or timeouts - they are usually infrastructure failures worth retrying
+        if eval_cache and cache_key and is_cacheable(result):
+            eval_cache.put(cache_key, result)
+
+    eval_result = _build_eval_result(run_info, result)
 
     # Save result
     with open(eval_file, "w") as f:
         json.dump(eval_result, f, indent=2)
+    _index_eval(run_info, eval_result)
 
     return eval_result
 
 
+def _index_eval(run_info: dict, eval_result: dict) -> None:
+    """Record a saved eval.json in its run's index."""
+    if run_name := run_info.get("run_name"):
+        get_run_index(run_name).add_eval(run_info["log_dir"], eval_result)
+
+
+def _build_eval_result(run_info: dict, result: dict) -> dict:
+    """Build the eval.json content for a run from a test_merged/test_solo style result."""
+    setting = run_info["setting"]
+    return {
+        "repo": run_info["repo"],
+        "task_id": run_info["task_id"],
+        "features": run_info["features"],
+        "setting": setting,
+        "merge": None if setting == "solo" else result.get("merge", {}),
+        "feature1": result.get("feature1", {}),
+        "feature2": result.get("feature2", {}),
+        "both_passed": result.get("both_passed", False),
+        "error": result.get("error"),
+        "evaluated_at": datetime.now().isoformat(),
+    }
+
+
+def _read_run_patches(run_info: dict) -> tuple[str, str]:
+    """Read a run's agent patches as (patch1, patch2); solo runs have an empty patch2."""
+    log_dir = Path(run_info["log_dir"])
+    f1, f2 = run_info["features"][0], run_info["features"][1]
+
+    if run_info["setting"] == "solo":
+        patch_file = log_dir / "solo.patch"
+        return (patch_file.read_text() if patch_file.exists() else ""), ""
+
+    patch1_file = log_dir / f"agent{f1}.patch"
+    patch2_file = log_dir / f"agent{f2}.patch"
+    patch1 = patch1_file.read_text() if patch1_file.exists() else ""
+    patch2 = patch2_file.read_text() if patch2_file.exists() else ""
+    return patch1, patch2
+
+
+def _eval_cache_key(run_info: dict, patch1: str, patch2: str) -> str | None:
+    """Get the eval cache key for a run, or None if its test patches or image digest are unavailable."""
+    task_dir = Path("dataset") / run_info["repo"] / f"task{run_info['task_id']}"
+    f1, f2 = run_info["features"][0], run_info["features"][1]
+    tests1_path = task_dir / f"feature{f1}" / "tests.patch"
+    tests2_path = task_dir / f"feature{f2}" / "tests.patch"
+
+    if not tests1_path.exists() or not tests2_path.exists():
+        return None
+
+    # Key on the digest so a re-pushed image tag is not served stale results
+    image = get_image_name(run_info["repo"], run_info["task_id"])
+    digest = resolve_image_digest(image)
+    if not digest:
+        return None
+
+    return eval_cache_key(
+        image=f"{image}@{digest}",
+        patch1=patch1,
+        patch2=patch2,
+        tests1=tests1_path.read_text(),
+        tests2=tests2_path.read_text(),
+        setting=run_info["setting"],
+    )
+
+
 def _run_with_progress(runs: list, eval_run, concurrency: int) -> tuple:
     """Run evaluations with progress display."""
     results = []
@@ -3,6 +3,7 @@
 import json
 from pathlib import Path
 
+from cooperbench.runner.index import get_run_index
 from cooperbench.runner.tasks import load_subset
 
 
@@ -16,7 +17,8 @@ def discover_runs(
     """Discover completed runs from logs/ directory.
 
     Supports both new structure (logs/{run_name}/{setting}/{repo}/)
-    and legacy structure (logs/{run_name}/{repo}/).
+    and legacy structure (logs/{run_name}/{repo}/). Runs with an index
+    (logs/{run_name}/index.jsonl) are listed from it without walking the tree.
 
     Args:
         run_name: Name of the run
@@ -39,6 +41,17 @@ def discover_runs(
     if subset:
         subset_data = load_subset(subset)
 
+    index = get_run_index(run_name)
+    if index.exists():
+        return _discover_runs_in_index(
+            index.entries(),
+            run_name=run_name,
+            subset_data=subset_data,
+            repo_filter=repo_filter,
+            task_filter=task_filter,
+            features_filter=features_filter,
+        )
+
     # Check for new structure (solo/, coop/)
     for setting in ["solo", "coop"]:
         setting_dir = log_dir / setting
@@ -67,9 +80,94 @@ def discover_runs(
             )
         )
 
+    for run in runs:
+        run["run_name"] = run_name
+    return runs
+
+
+def _discover_runs_in_index(
+    entries: dict[str, dict],
+    run_name: str,
+    subset_data: dict | None,
+    repo_filter: str | None,
+    task_filter: int | None,
+    features_filter: list[int] | None,
+) -> list[dict]:
+    """List runs from a run index, in the same order as the directory walk."""
+    runs = []
+
+    for log_dir, entry in entries.items():
+        result = entry.get("result")
+        if result is None:
+            continue
+
+        # Same {repo}/{task_id}/{features} layout rules as the directory walk
+        feature_dir = Path(log_dir)
+        repo = feature_dir.parent.parent.name
+        try:
+            task_id = int(feature_dir.parent.name)
+        except ValueError:
+            continue
+        features = _parse_features(feature_dir.name)
+        if not repo.endswith("_task") or features is None:
+            continue
+        if not _matches(repo, task_id, features, subset_data, repo_filter, task_filter, features_filter):
+            continue
+
+        runs.append(
+            {
+                "repo": repo,
+                "task_id": task_id,
+                "features": features,
+                "log_dir": log_dir,
+                "setting": result["setting"],
+                "run_name": run_name,
+            }
+        )
+
+    # Solo before coop, then sorted paths (the walk's order)
+    runs.sort(key=lambda r: (r["setting"] != "solo", Path(r["log_dir"]).parts))
     return runs
 
 
+def _parse_features(feature_dir_name: str) -> list[int] | None:
+    """Parse a feature dir name (f1_f2 or f1_f5); None if it isn't a feature pair."""
+    parts = feature_dir_name.split("_")
+    try:
+        features = [int(p[1:]) for p in parts if p.startswith("f")]
+    except ValueError:
+        return None
+    return features if len(features) >= 2 else None
+
+
+def _matches(
+    repo: str,
+    task_id: int,
+    features: list[int],
+    subset_data: dict | None,
+    repo_filter: str | None,
+    task_filter: int | None,
+    features_filter: list[int] | None,
+) -> bool:
+    """Check a run against the repo/task/feature/subset filters."""
+    if repo_filter and repo_filter != repo:
+        return False
+    if task_filter and task_filter != task_id:
+        return False
+
+    task_key = (repo, task_id)
+    if subset_data and task_key not in subset_data["tasks"]:
+        return False
+    if features_filter and set(features_filter) != set(features):
+        return False
+
+    # Filter by specific pairs if subset specifies them
+    if subset_data and task_key in subset_data["pairs"]:
+        if tuple(sorted(features)) not in subset_data["pairs"][task_key]:
+            return False
+    return True
+
+
 def _discover_runs_in_dir(
     base_dir: Path,
     setting: str | None,
@@ -106,26 +204,14 @@ def _discover_runs_in_dir(
                 if not feature_dir.is_dir():
                     continue
 
-                # Parse feature string: f1_f2 or f1_f5
-                parts = feature_dir.name.split("_")
-                try:
-                    features = [int(p[1:]) for p in parts if p.startswith("f")]
-                except ValueError:
+                features = _parse_features(feature_dir.name)
+                if features is None:
                     continue
-
-                if len(features) < 2:
+                if not _matches(
+                    repo_dir.name, task_id, features, subset_data, repo_filter, task_filter, features_filter
+                ):
                     continue
 
-                if features_filter:
-                    if set(features_filter) != set(features):
-                        continue
-
-                # Filter by specific pairs if subset specifies them
-                if subset_data and task_key in subset_data["pairs"]:
-                    pair_tuple = tuple(sorted(features))
-                    if pair_tuple not in subset_data["pairs"][task_key]:
-                        continue
-
                 result_file = feature_dir / "result.json"
                 if not result_file.exists():
                     continue
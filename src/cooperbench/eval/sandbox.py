@@ -1,13 +1,20 @@
 """Sandbox execution for patch testing."""
 
 import base64
+import io
+import json
+import logging
 import re
+import tarfile
 from pathlib import Path
 
 from cooperbench.eval.backends import get_backend
 from cooperbench.eval.backends.base import Sandbox
+from cooperbench.eval.backends.pool import KILL_AFTER, get_pooled_backend
 from cooperbench.utils import get_image_name
 
+logger = logging.getLogger("cooperbench.eval.sandbox")
+
 
 def run_patch_test(
     repo_name: str,
@@ -16,6 +23,7 @@ def run_patch_test(
     agent_patch: str | Path | None = None,
     timeout: int = 600,
     backend: str = "modal",
+    pool: bool = False,
 ) -> dict:
     """Test a single patch against one feature's tests.
 
@@ -26,6 +34,7 @@ def run_patch_test(
         agent_patch: Patch content (str) or path to .patch file
         timeout: Max seconds for sandbox execution
         backend: Evaluation backend ("modal", "docker", "gcp_batch")
+        pool: Reuse warm sandboxes from the per-image pool (modal/docker)
 
     Returns:
         Dict with keys: passed, tests_passed, tests_failed, output, error
@@ -54,8 +63,7 @@ def run_patch_test(
         return _error_result("Agent patch is empty")
 
     image = get_image_name(repo_name, task_id)
-    eval_backend = get_backend(backend)
-    sb = eval_backend.create_sandbox(image, timeout)
+    sb = _create_sandbox(image, timeout, backend, pool)
 
     try:
         _write_patch(sb, "tests.patch", tests_patch)
@@ -95,6 +103,9 @@ def test_merged(
     patch2: str | Path | None = None,
     timeout: int = 600,
     backend: str = "modal",
+    pool: bool = False,
+    bundle: bool = False,
+    parallel_tests: bool = False,
 ) -> dict:
     """Test merged patches from two agents (coop mode).
 
@@ -110,6 +121,15 @@ def test_merged(
         patch2: Second agent's patch
         timeout: Max seconds for sandbox execution
         backend: Evaluation backend
+        pool: Reuse warm sandboxes from the per-image pool (modal/docker)
+        bundle: Upload all patches as one payload and run setup, merge and
+            both test suites in a single sandbox exec. Each step is still
+            bounded by ``timeout``, as each exec is on the docker backend
+        parallel_tests: Run both test suites concurrently in separate git
+            worktrees, each bounded by a timeout just below ``timeout``. Only
+            takes effect when runner.sh installs no packages and the repo has
+            no gitignored build output; otherwise the suites run one at a time
+            (as for most Python repos, e.g. huggingface_datasets, llama_index)
 
     Returns:
         Dict with keys: merge (status/strategy/diff), feature1, feature2,
@@ -135,16 +155,37 @@ def test_merged(
     tests1_content = tests1_path.read_text()
     tests2_content = tests2_path.read_text()
 
+    patches = {
+        "patch1.patch": patch1_content,
+        "patch2.patch": patch2_content,
+        "tests1.patch": tests1_content,
+        "tests2.patch": tests2_content,
+    }
+
+    payload = None
+    if bundle:
+        payload = _bundle_files({**patches, **_merged_driver_scripts(parallel_tests, timeout)})
+        # Payload travels as a single exec argument; fall back to per-step writes if too large
+        if len(payload) > _MAX_BUNDLE_SIZE:
+            payload = None
+
     image = get_image_name(repo_name, task_id)
-    eval_backend = get_backend(backend)
-    sb = eval_backend.create_sandbox(image, timeout)
+    sandbox_timeout = timeout
+    if payload is not None and backend in _PER_EXEC_TIMEOUT_BACKENDS and not pool:
+        # The driver bounds each step itself; its single exec has to outlast all of them
+        sandbox_timeout = _bundled_exec_timeout(timeout)
+    sb = _create_sandbox(image, sandbox_timeout, backend, pool)
 
     try:
+        if payload is not None:
+            result = _test_merged_bundled(sb, payload, timeout)
+            if parallel_tests:
+                _log_parallel_tests_mode(result, repo_name, task_id)
+            return result
+
         # Write all patches
-        _write_patch(sb, "patch1.patch", patch1_content)
-        _write_patch(sb, "patch2.patch", patch2_content)
-        _write_patch(sb, "tests1.patch", tests1_content)
-        _write_patch(sb, "tests2.patch", tests2_content)
+        for filename, content in patches.items():
+            _write_patch(sb, filename, content)
 
         # Step 1: Apply patches to branches
         setup_result = _setup_branches(sb)
@@ -186,29 +227,22 @@ def test_merged(
         if verify.returncode != 0:
             return _merged_error_result(f"Failed to create merged.patch (strategy: {strategy_used})")
 
-        # Test feature 1
-        test1_result = _run_tests(sb, "tests1.patch", "merged.patch", base_sha)
+        if parallel_tests:
+            # Test both features at once, one worktree each
+            test1_result, test2_result = _run_tests_parallel(
+                sb, [("tests1.patch", "merged.patch"), ("tests2.patch", "merged.patch")], base_sha, timeout
+            )
+        else:
+            # Test feature 1
+            test1_result = _run_tests(sb, "tests1.patch", "merged.patch", base_sha)
 
-        # Test feature 2
-        test2_result = _run_tests(sb, "tests2.patch", "merged.patch", base_sha)
+            # Test feature 2
+            test2_result = _run_tests(sb, "tests2.patch", "merged.patch", base_sha)
 
-        return {
-            "merge": {
-                "status": merge_status,
-                "strategy": strategy_used,
-                "diff": merged_diff[:5000] if merged_diff else "",  # Truncate for storage
-            },
-            "feature1": {
-                "passed": test1_result["passed"],
-                "test_output": test1_result["output"],
-            },
-            "feature2": {
-                "passed": test2_result["passed"],
-                "test_output": test2_result["output"],
-            },
-            "both_passed": test1_result["passed"] and test2_result["passed"],
-            "error": None,
-        }
+        result = _merged_result(merge_status, strategy_used, merged_diff, test1_result, test2_result)
+        if parallel_tests:
+            _log_parallel_tests_mode(result, repo_name, task_id)
+        return result
     except Exception as e:
         return _merged_error_result(str(e))
     finally:
@@ -223,6 +257,7 @@ def test_solo(
     patch: str | Path | None = None,
     timeout: int = 600,
     backend: str = "modal",
+    pool: bool = False,
 ) -> dict:
     """Test a solo patch against both features' tests.
 
@@ -237,6 +272,7 @@ def test_solo(
         patch: The solo agent's combined patch
         timeout: Max seconds for sandbox execution
         backend: Evaluation backend
+        pool: Reuse warm sandboxes from the per-image pool (modal/docker)
 
     Returns:
         Dict with keys: setting, patch_lines, feature1, feature2,
@@ -261,8 +297,7 @@ def test_solo(
     tests2_content = tests2_path.read_text()
 
     image = get_image_name(repo_name, task_id)
-    eval_backend = get_backend(backend)
-    sb = eval_backend.create_sandbox(image, timeout)
+    sb = _create_sandbox(image, timeout, backend, pool)
 
     try:
         # Get base SHA
@@ -338,6 +373,13 @@ def evaluate_merge(
 # === Helper functions ===
 
 
+def _create_sandbox(image: str, timeout: int, backend: str, pool: bool) -> Sandbox:
+    """Create a sandbox, drawing from the warm pool when pooling is enabled."""
+    if pool:
+        return get_pooled_backend(backend).create_sandbox(image, timeout)
+    return get_backend(backend).create_sandbox(image, timeout)
+
+
 def _write_patch(sb: Sandbox, filename: str, content: str) -> None:
     """Write a patch file to the sandbox."""
     encoded = base64.b64encode(content.encode()).decode()
@@ -346,9 +388,7 @@ def _write_patch(sb: Sandbox, filename: str, content: str) -> None:
         raise RuntimeError(f"Failed to write {filename}: {result.stderr_read()}")
 
 
-def _setup_branches(sb: Sandbox) -> dict:
-    """Set up git branches for merge testing."""
-    commands = """
+_SETUP_BRANCHES_SCRIPT = """
 cd /workspace/repo
 git config user.email "eval@cooperbench.local"
 git config user.name "CooperBench Eval"
@@ -376,25 +416,10 @@ git commit -m "Agent 2 changes" --allow-empty 2>&1
 
 echo "SETUP_COMPLETE"
 """
-    result = sb.exec("bash", "-c", commands)
-    output = result.stdout_read() + result.stderr_read()
-
-    if "SETUP_COMPLETE" not in output:
-        return {"error": f"Branch setup failed: {output}"}
-
-    # Extract base SHA
-    base_sha = None
-    for line in output.split("\n"):
-        if line.startswith("BASE_SHA="):
-            base_sha = line.split("=")[1].strip()
-            break
-
-    return {"output": output, "error": None, "base_sha": base_sha}
 
 
-def _merge_naive(sb: Sandbox, base_sha: str) -> dict:
-    """Try naive git merge."""
-    commands = f"""
+def _merge_naive_script(base_sha: str) -> str:
+    return f"""
 cd /workspace/repo
 git checkout agent2 2>&1
 
@@ -410,23 +435,10 @@ else
     git merge --abort 2>/dev/null || true
 fi
 """
-    result = sb.exec("bash", "-c", commands)
-    output = result.stdout_read() + result.stderr_read()
-
-    conflict = "MERGE_STATUS=conflicts" in output
-
-    # Read diff from file if clean merge
-    diff = ""
-    if not conflict:
-        diff_result = sb.exec("cat", "/patches/naive_diff.patch")
-        diff = diff_result.stdout_read()
-
-    return {"conflict": conflict, "diff": diff, "output": output}
 
 
-def _merge_union(sb: Sandbox, base_sha: str) -> dict:
-    """Try union merge strategy."""
-    commands = f"""
+def _merge_union_script(base_sha: str) -> str:
+    return f"""
 cd /workspace/repo
 git checkout agent2 2>&1
 git reset --hard HEAD 2>&1
@@ -449,22 +461,10 @@ fi
 # Restore gitattributes
 git checkout .gitattributes 2>/dev/null || rm -f .gitattributes
 """
-    result = sb.exec("bash", "-c", commands)
-    output = result.stdout_read() + result.stderr_read()
 
-    if "UNION_STATUS=conflicts" in output:
-        return {"error": "Union merge still has conflicts", "diff": "", "output": output}
 
-    # Read diff from file
-    diff_result = sb.exec("cat", "/patches/union_diff.patch")
-    diff = diff_result.stdout_read()
-
-    return {"diff": diff, "output": output, "error": None}
-
-
-def _run_tests(sb: Sandbox, tests_patch: str, feature_patch: str, base_sha: str) -> dict:
-    """Run tests via runner.sh."""
-    commands = f"""
+def _run_tests_script(tests_patch: str, feature_patch: str, base_sha: str) -> str:
+    return f"""
 cd /workspace/repo
 
 # Reset to base commit
@@ -477,10 +477,171 @@ echo "Reset to base: $(git rev-parse HEAD)"
 # Run tests via runner.sh
 bash /usr/local/bin/runner.sh {tests_patch} {feature_patch}
 """
-    result = sb.exec("bash", "-c", commands)
+
+
+# runner.sh commands that change the interpreter or toolchain shared by all worktrees
+_INSTALL_PATTERN = r"\b(pip3?|npm|pnpm|yarn|cargo|gem|bundle|poetry|apt-get) +(install|uninstall|add|sync)\b"
+
+# First line of each suite's output when the parallel script falls back to one suite at a time
+_SERIAL_TESTS_NOTE = (
+    "Parallel tests skipped (runner.sh installs packages or the repo has gitignored build output); "
+    "running suites one at a time"
+)
+
+# Seconds a parallel suite leaves the sandbox to report results before it expires
+_SUITE_TIMEOUT_MARGIN = 60
+
+
+def _suite_timeout(timeout: int) -> int:
+    """Per-suite timeout for parallel tests, shorter than the sandbox's ``timeout``."""
+    return max(timeout // 2, timeout - _SUITE_TIMEOUT_MARGIN)
+
+
+def _run_tests_parallel_script(suites: list[tuple[str, str]], base_sha: str, timeout: int, out_dir: str) -> str:
+    """Run several runner.sh suites concurrently, each in its own git worktree.
+
+    runner.sh hardcodes /workspace/repo, so each suite gets a copy of it
+    pointed at its worktree. Suite i writes tests{i}.out/.err/.code to out_dir.
+
+    Worktrees share the system interpreter and only hold tracked files, so the
+    suites run one at a time in /workspace/repo instead when runner.sh installs
+    packages or the repo has gitignored build output. Each suite's output then
+    starts with ``_SERIAL_TESTS_NOTE``.
+    """
+    suite_timeout = _suite_timeout(timeout)
+    serial = []
+    parallel = []
+    for i, (tests_patch, feature_patch) in enumerate(suites, start=1):
+        wt = f"/workspace/.eval_wt{i}"
+        out = f"{out_dir}/tests{i}"
+        serial.append(
+            f"    {{ (echo '{_SERIAL_TESTS_NOTE}'; git checkout -q --force {base_sha} && git reset -q --hard {base_sha} && git clean -fdx -q; "
+            f'echo "Reset to base: $(git rev-parse HEAD)"; '
+            f"bash /usr/local/bin/runner.sh {tests_patch} {feature_patch}) > {out}.out 2> {out}.err; "
+            f"echo $? > {out}.code; }}"
+        )
+        parallel += [
+            f"    rm -rf {wt} {wt}.runner.sh",
+            f"    git worktree add --force --detach {wt} {base_sha} > /dev/null 2>&1",
+            f'    sed "s#/workspace/repo#{wt}#g" /usr/local/bin/runner.sh > {wt}.runner.sh',
+            f'    {{ (cd {wt} && echo "Reset to base: $(git rev-parse HEAD)" && '
+            f"timeout {suite_timeout} bash {wt}.runner.sh {tests_patch} {feature_patch}) > {out}.out 2> {out}.err; "
+            f"echo $? > {out}.code; }} &",
+        ]
+    parallel.append("    wait")
+    for i in range(1, len(suites) + 1):
+        parallel.append(f"    git worktree remove --force /workspace/.eval_wt{i} > /dev/null 2>&1")
+        parallel.append(f"    rm -f /workspace/.eval_wt{i}.runner.sh")
+    lines = [
+        "cd /workspace/repo",
+        "git worktree prune",
+        f"mkdir -p {out_dir}",
+        f"if grep -qE '{_INSTALL_PATTERN}' /usr/local/bin/runner.sh"
+        ' || [ -n "$(git ls-files --others --ignored --exclude-standard --directory | head -n 1)" ]; then',
+        *serial,
+        "else",
+        *parallel,
+        "fi",
+        "cd /workspace/repo",
+        "git worktree prune",
+    ]
+    return "\n".join(lines) + "\n"
+
+
+def _log_parallel_tests_mode(result: dict, repo_name: str, task_id: int) -> None:
+    """Log whether --parallel-tests actually ran the suites concurrently."""
+    if result.get("error"):
+        return
+    if result["feature1"]["test_output"].startswith(_SERIAL_TESTS_NOTE):
+        logger.info(f"{repo_name}/task{task_id}: {_SERIAL_TESTS_NOTE}")
+    else:
+        logger.debug(f"{repo_name}/task{task_id}: test suites ran concurrently in git worktrees")
+
+
+def _setup_branches(sb: Sandbox) -> dict:
+    """Set up git branches for merge testing."""
+    result = sb.exec("bash", "-c", _SETUP_BRANCHES_SCRIPT)
+    output = result.stdout_read() + result.stderr_read()
+
+    if "SETUP_COMPLETE" not in output:
+        return {"error": f"Branch setup failed: {output}"}
+
+    # Extract base SHA
+    base_sha = None
+    for line in output.split("\n"):
+        if line.startswith("BASE_SHA="):
+            base_sha = line.split("=")[1].strip()
+            break
+
+    return {"output": output, "error": None, "base_sha": base_sha}
+
+
+def _merge_naive(sb: Sandbox, base_sha: str) -> dict:
+    """Try naive git merge."""
+    result = sb.exec("bash", "-c", _merge_naive_script(base_sha))
+    output = result.stdout_read() + result.stderr_read()
+
+    conflict = "MERGE_STATUS=conflicts" in output
+
+    # Read diff from file if clean merge
+    diff = ""
+    if not conflict:
+        diff_result = sb.exec("cat", "/patches/naive_diff.patch")
+        diff = diff_result.stdout_read()
+
+    return {"conflict": conflict, "diff": diff, "output": output}
+
+
+def _merge_union(sb: Sandbox, base_sha: str) -> dict:
+    """Try union merge strategy."""
+    result = sb.exec("bash", "-c", _merge_union_script(base_sha))
+    output = result.stdout_read() + result.stderr_read()
+
+    if "UNION_STATUS=conflicts" in output:
+        return {"error": "Union merge still has conflicts", "diff": "", "output": output}
+
+    # Read diff from file
+    diff_result = sb.exec("cat", "/patches/union_diff.patch")
+    diff = diff_result.stdout_read()
+
+    return {"diff": diff, "output": output, "error": None}
+
+
+def _run_tests(sb: Sandbox, tests_patch: str, feature_patch: str, base_sha: str) -> dict:
+    """Run tests via runner.sh."""
+    result = sb.exec("bash", "-c", _run_tests_script(tests_patch, feature_patch, base_sha))
 
     output = result.stdout_read() + result.stderr_read()
-    exit_code = result.returncode
+    return _test_result(result.returncode, output)
+
+
+def _run_tests_parallel(sb: Sandbox, suites: list[tuple[str, str]], base_sha: str, timeout: int) -> list[dict]:
+    """Run test suites concurrently in git worktrees (one exec for all suites)."""
+    out_dir = "/patches/.parallel"
+    script = _run_tests_parallel_script(suites, base_sha, timeout, out_dir)
+    # Print each suite's exit code and base64 output so everything comes back in one exec
+    for i in range(1, len(suites) + 1):
+        out = f"{out_dir}/tests{i}"
+        script += (
+            f'echo "TESTS{i}_RESULT=$(cat {out}.code 2>/dev/null || echo 1) '
+            f"$(base64 < {out}.out | tr -d '\\n') $(base64 < {out}.err | tr -d '\\n')\"\n"
+        )
+    result = sb.exec("bash", "-c", script)
+    output = result.stdout_read()
+
+    results = []
+    for i in range(1, len(suites) + 1):
+        match = re.search(rf"^TESTS{i}_RESULT=(-?\d+) ?(\S*) ?(\S*)$", output, re.MULTILINE)
+        if not match:
+            results.append(_test_result(1, f"Parallel test run failed: {output}{result.stderr_read()}"))
+            continue
+        stdout, stderr = (base64.b64decode(g).decode("utf-8", errors="replace") for g in match.group(2, 3))
+        results.append(_test_result(int(match.group(1)), stdout + stderr))
+    return results
+
+
+def _test_result(exit_code: int, output: str) -> dict:
+    """Build a test result dict from runner.sh exit code and output."""
     parsed = _parse_results(output)
 
     return {
@@ -491,6 +652,193 @@ bash /usr/local/bin/runner.sh {tests_patch} {feature_patch}
     }
 
 
+# === Bundled merged evaluation ===
+
+# Base64 payload is passed as one exec argument (Linux caps a single argument at 128KiB)
+_MAX_BUNDLE_SIZE = 120_000
+
+_DRIVER_DIR = "/patches/.driver"
+
+# Backends whose sandbox timeout bounds each exec rather than the sandbox's lifetime
+_PER_EXEC_TIMEOUT_BACKENDS = {"docker"}
+
+# Driver steps that each get the sandbox timeout: setup, naive, union, tests1, tests2
+_DRIVER_STEPS = 5
+
+# Seconds the driver's exec gets on top of its steps (payload extraction, result output)
+_DRIVER_OVERHEAD = 60
+
+# Runs the same steps as the per-exec path of test_merged and prints one JSON line.
+# Step scripts are shipped in the payload; their outputs are returned base64-encoded.
+_MERGED_DRIVER_SCRIPT = """
+mkdir -p /patches
+echo '{payload}' | base64 -d | tar -xzf - -C /patches || {{ echo "BUNDLE_EXTRACT_FAILED"; exit 1; }}
+D={driver_dir}
+
+run_step() {{
+    timeout -k {kill_after} {step_timeout} bash "$D/$1.sh" > "$D/$1.out" 2> "$D/$1.err"
+    echo $? > "$D/$1.code"
+    cat "$D/$1.out" "$D/$1.err" > "$D/$1.log"
+}}
+b64() {{
+    if [ -f "$1" ]; then base64 < "$1" | tr -d '\\n'; fi
+}}
+code() {{
+    if [ -f "$D/$1.code" ]; then cat "$D/$1.code"; else echo null; fi
+}}
+
+SETUP=false
+BASE_SHA=""
+NAIVE=""
+UNION=""
+STRATEGY=""
+MERGED=false
+
+run_step setup
+grep -q "SETUP_COMPLETE" "$D/setup.log" && SETUP=true
+BASE_SHA=$(grep -m1 "^BASE_SHA=" "$D/setup.log" | cut -d= -f2 | tr -d '[:space:]')
+
+if $SETUP && [ -n "$BASE_SHA" ]; then
+    export BASE_SHA
+    run_step naive
+    if grep -q "MERGE_STATUS=conflicts" "$D/naive.log"; then
+        NAIVE=conflicts
+        run_step union
+        if grep -q "UNION_STATUS=conflicts" "$D/union.log"; then
+            UNION=conflicts
+        else
+            UNION=clean
+            STRATEGY=union
+        fi
+    else
+        NAIVE=clean
+        STRATEGY=naive
+    fi
+fi
+
+if [ -n "$STRATEGY" ]; then
+    cp "/patches/${{STRATEGY}}_diff.patch" /patches/merged.patch
+    if test -f /patches/merged.patch; then
+        MERGED=true
+        if [ -f "$D/tests.sh" ]; then
+            timeout -k {kill_after} {step_timeout} bash "$D/tests.sh"
+        else
+            run_step tests1
+            run_step tests2
+        fi
+    fi
+fi
+
+printf 'EVAL_RESULT={{"setup_complete": %s, "setup_output": "%s", "base_sha": "%s", "naive": "%s", "union": "%s", ' \\
+    "$SETUP" "$(b64 "$D/setup.log")" "$BASE_SHA" "$NAIVE" "$UNION"
+printf '"strategy": "%s", "merged_patch": %s, "diff": "%s", ' \\
+    "$STRATEGY" "$MERGED" "$(b64 "/patches/${{STRATEGY}}_diff.patch")"
+printf '"tests1": {{"exit_code": %s, "stdout": "%s", "stderr": "%s"}}, ' \\
+    "$(code tests1)" "$(b64 "$D/tests1.out")" "$(b64 "$D/tests1.err")"
+printf '"tests2": {{"exit_code": %s, "stdout": "%s", "stderr": "%s"}}}}\\n' \\
+    "$(code tests2)" "$(b64 "$D/tests2.out")" "$(b64 "$D/tests2.err")"
+"""
+
+
+def _bundle_files(files: dict[str, str]) -> str:
+    """Pack files into a base64-encoded tar.gz payload."""
+    buf = io.BytesIO()
+    with tarfile.open(fileobj=buf, mode="w:gz") as tar:
+        for name, content in files.items():
+            data = content.encode()
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            info.mode = 0o644
+            tar.addfile(info, io.BytesIO(data))
+    return base64.b64encode(buf.getvalue()).decode()
+
+
+def _merged_driver_scripts(parallel_tests: bool = False, timeout: int = 600) -> dict[str, str]:
+    """Step scripts for the bundled driver, keyed by path relative to /patches."""
+    driver_dir = _DRIVER_DIR.removeprefix("/patches/")
+    scripts = {
+        f"{driver_dir}/setup.sh": _SETUP_BRANCHES_SCRIPT,
+        f"{driver_dir}/naive.sh": _merge_naive_script("$BASE_SHA"),
+        f"{driver_dir}/union.sh": _merge_union_script("$BASE_SHA"),
+    }
+    if parallel_tests:
+        suites = [("tests1.patch", "merged.patch"), ("tests2.patch", "merged.patch")]
+        scripts[f"{driver_dir}/tests.sh"] = _run_tests_parallel_script(suites, "$BASE_SHA", timeout, _DRIVER_DIR)
+    else:
+        scripts[f"{driver_dir}/tests1.sh"] = _run_tests_script("tests1.patch", "merged.patch", "$BASE_SHA")
+        scripts[f"{driver_dir}/tests2.sh"] = _run_tests_script("tests2.patch", "merged.patch", "$BASE_SHA")
+    return scripts
+
+
+def _bundled_exec_timeout(timeout: int) -> int:
+    """Exec timeout for the driver when each of its steps may take ``timeout`` seconds."""
+    return _DRIVER_STEPS * (timeout + KILL_AFTER) + _DRIVER_OVERHEAD
+
+
+def _test_merged_bundled(sb: Sandbox, payload: str, timeout: int = 600) -> dict:
+    """Run the whole merged evaluation with a single sandbox exec, each step bounded by ``timeout``."""
+    script = _MERGED_DRIVER_SCRIPT.format(
+        payload=payload, driver_dir=_DRIVER_DIR, step_timeout=timeout, kill_after=KILL_AFTER
+    )
+    result = sb.exec("bash", "-c", script)
+    output = result.stdout_read()
+
+    data = None
+    for line in reversed(output.splitlines()):
+        if line.startswith("EVAL_RESULT="):
+            data = json.loads(line.removeprefix("EVAL_RESULT="))
+            break
+    if data is None:
+        return _merged_error_result(f"Bundled evaluation failed: {output}{result.stderr_read()}")
+
+    return _merged_result_from_driver(data)
+
+
+def _merged_result_from_driver(data: dict) -> dict:
+    """Convert the driver's JSON result into the test_merged result dict."""
+
+    def decode(value: str) -> str:
+        return base64.b64decode(value).decode("utf-8", errors="replace") if value else ""
+
+    if not data["setup_complete"]:
+        return _merged_error_result(f"Branch setup failed: {decode(data['setup_output'])}")
+    if not data["base_sha"]:
+        return _merged_error_result("Failed to get base commit SHA")
+    if data["union"] == "conflicts":
+        return _merged_error_result(
+            "Both naive and union merge strategies failed. Naive: conflicts. Union: Union merge still has conflicts"
+        )
+    if not data["merged_patch"]:
+        return _merged_error_result(f"Failed to create merged.patch (strategy: {data['strategy']})")
+
+    merge_status = "clean" if data["naive"] == "clean" else "conflicts"
+    tests = [
+        _test_result(data[key]["exit_code"], decode(data[key]["stdout"]) + decode(data[key]["stderr"]))
+        for key in ("tests1", "tests2")
+    ]
+    return _merged_result(merge_status, data["strategy"], decode(data["diff"]), tests[0], tests[1])
+
+
+def _merged_result(merge_status: str, strategy: str, merged_diff: str, test1: dict, test2: dict) -> dict:
+    return {
+        "merge": {
+            "status": merge_status,
+            "strategy": strategy,
+            "diff": merged_diff[:5000] if merged_diff else "",  # Truncate for storage
+        },
+        "feature1": {
+            "passed": test1["passed"],
+            "test_output": test1["output"],
+        },
+        "feature2": {
+            "passed": test2["passed"],
+            "test_output": test2["output"],
+        },
+        "both_passed": test1["passed"] and test2["passed"],
+        "error": None,
+    }
+
+
 def _parse_results(output: str) -> dict:
     """Parse test output to extract pass/fail counts.
 
@@ -1,5 +1,18 @@
-"""Infrastructure utilities - Redis, external services."""
+"""Infrastructure utilities - Redis, rate limits of external services, SSH sessions."""
 
-from cooperbench.infra.redis import ensure_redis
+from cooperbench.infra.limiter import AdaptiveLimiter, get_limiter, is_overload_error, limits_summary
+from cooperbench.infra.redis import RedisNamespace, close_redis_pool, ensure_redis, get_redis, split_redis_url
+from cooperbench.infra.ssh import SSHSession
 
-__all__ = ["ensure_redis"]
+__all__ = [
+    "AdaptiveLimiter",
+    "RedisNamespace",
+    "SSHSession",
+    "close_redis_pool",
+    "ensure_redis",
+    "get_limiter",
+    "get_redis",
+    "is_overload_error",
+    "limits_summary",
+    "split_redis_url",
+]
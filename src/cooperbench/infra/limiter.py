@@ -0,0 +1,262 @@
+"""Adaptive (AIMD) concurrency limits for rate-limited services.
+
+Every agent retries failed sandbox creations and LLM calls with its own
+exponential backoff, so when a service starts rejecting requests all callers
+back off and come back at roughly the same time. An :class:`AdaptiveLimiter`
+shared by all callers of one service bounds how many calls are in flight:
+
+- each successful call grows the limit by ``1 / limit`` (about +1 per round
+  of calls), as long as latency stays within ``latency_tolerance`` times the
+  best recent latency. The best latency slowly decays toward the current one,
+  so a single fast call doesn't freeze the limit forever. LLM limiters skip
+  this check: a completion's latency follows the length of its output, not
+  the load on the service;
+- an overload error (rate limit, 429/503, ``UNAVAILABLE``, ...) halves it, at
+  most once per round: calls that started before the last decrease don't
+  decrease it again.
+
+Limiters start unbounded (unless ``$COOPERBENCH_MAX_INFLIGHT`` caps them), so
+a healthy service runs exactly as it would without them; the first overload
+sets the limit to half the calls then in flight. Callers waiting for a slot are
+served in FIFO order,
+from threads (:meth:`AdaptiveLimiter.slot`) or coroutines
+(:meth:`AdaptiveLimiter.aslot`) alike.
+"""
+
+import asyncio
+import math
+import os
+import threading
+import time
+from collections import deque
+from collections.abc import AsyncIterator, Callable, Iterator
+from contextlib import asynccontextmanager, contextmanager
+
+# Optional upper bound for in-flight calls per limiter (unbounded if unset)
+MAX_INFLIGHT_ENV = "COOPERBENCH_MAX_INFLIGHT"
+
+# Error substrings that mean the service is overloaded (rather than the call being wrong)
+OVERLOAD_PATTERNS = [
+    "rate limit",
+    "RateLimit",
+    "RESOURCE_EXHAUSTED",
+    "UNAVAILABLE",
+    "DEADLINE_EXCEEDED",
+    "temporarily unavailable",
+    "Too Many Requests",
+]
+
+# HTTP statuses that mean the same (litellm exceptions carry a status_code)
+_OVERLOAD_STATUS = {429, 503, 529}
+
+
+def is_overload_error(error: BaseException) -> bool:
+    """Check whether an error signals that the service is overloaded."""
+    if getattr(error, "status_code", None) in _OVERLOAD_STATUS:
+        return True
+    error_str = str(error) + type(error).__name__
+    return any(p in error_str for p in OVERLOAD_PATTERNS)
+
+
+class _AsyncWaiter:
+    """A coroutine waiting for a slot (woken from any thread)."""
+
+    def __init__(self) -> None:
+        self.loop = asyncio.get_running_loop()
+        self.future: asyncio.Future[None] = self.loop.create_future()
+
+    def wake(self) -> None:
+        self.loop.call_soon_threadsafe(_resolve, self.future)
+
+
+def _resolve(future: asyncio.Future[None]) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+class AdaptiveLimiter:
+    """AIMD limit on the in-flight calls to one service (thread- and asyncio-safe)."""
+
+    def __init__(
+        self,
+        name: str,
+        max_limit: int | None = None,
+        min_limit: int = 1,
+        decrease_factor: float = 0.5,
+        latency_tolerance: float | None = 2.0,
+        latency_decay: float = 0.01,
+    ):
+        """Initialize the limiter at its maximum.
+
+        Args:
+            name: Service name shown in the progress display
+            max_limit: Upper bound for the limit (default: $COOPERBENCH_MAX_INFLIGHT, or unbounded)
+            min_limit: Lower bound for the limit
+            decrease_factor: Factor applied to the limit on overload
+            latency_tolerance: Latency (relative to the best recent) above which the limit stops
+                growing; None to grow on every success
+            latency_decay: Fraction of the gap to the current latency the best latency moves up
+                per successful call
+        """
+        if max_limit is None and os.environ.get(MAX_INFLIGHT_ENV):
+            max_limit = int(os.environ[MAX_INFLIGHT_ENV])
+        self.name = name
+        self.max_limit: float = math.inf if max_limit is None else max(max_limit, min_limit)
+        self.min_limit = min_limit
+        self.decrease_factor = decrease_factor
+        self.latency_tolerance = latency_tolerance
+        self.latency_decay = latency_decay
+        self._limit = float(self.max_limit)
+        self._in_flight = 0
+        self._waiters: deque[threading.Event | _AsyncWaiter] = deque()
+        self._last_decrease = 0.0
+        self._latency: float | None = None  # Moving average of successful calls
+        self._best_latency: float | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def limit(self) -> float:
+        """Current number of calls allowed in flight (``math.inf`` until the first overload if unbounded)."""
+        return self._limit if math.isinf(self._limit) else math.floor(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        """Number of calls currently holding a slot."""
+        return self._in_flight
+
+    @property
+    def waiting(self) -> int:
+        """Number of callers queued for a slot."""
+        return len(self._waiters)
+
+    @contextmanager
+    def slot(self, overloaded: Callable[[BaseException], bool] = is_overload_error) -> Iterator[None]:
+        """Hold a slot for the duration of the block (blocking the thread while full).
+
+        Args:
+            overloaded: Tells overload errors (which shrink the limit) from other errors
+        """
+        with self._lock:
+            if self._waiters or self._in_flight >= self.limit:
+                event = threading.Event()
+                self._waiters.append(event)
+            else:
+                self._in_flight += 1
+                event = None
+        if event is not None:
+            event.wait()
+        with self._track(overloaded):
+            yield
+
+    @asynccontextmanager
+    async def aslot(self, overloaded: Callable[[BaseException], bool] = is_overload_error) -> AsyncIterator[None]:
+        """Async variant of slot(): waits for a slot without blocking the event loop."""
+        with self._lock:
+            if self._waiters or self._in_flight >= self.limit:
+                waiter = _AsyncWaiter()
+                self._waiters.append(waiter)
+            else:
+                self._in_flight += 1
+                waiter = None
+        if waiter is not None:
+            try:
+                await waiter.future
+            except asyncio.CancelledError:
+                with self._lock:
+                    granted = waiter not in self._waiters
+                    if not granted:
+                        self._waiters.remove(waiter)
+                if granted:
+                    self._release()  # The slot was handed to us while we were being cancelled
+                raise
+        with self._track(overloaded):
+            yield
+
+    @contextmanager
+    def _track(self, overloaded: Callable[[BaseException], bool]) -> Iterator[None]:
+        """Release a granted slot at the end of the block, recording how the call went."""
+        start = time.monotonic()
+        try:
+            yield
+        except BaseException as e:
+            if isinstance(e, Exception) and overloaded(e):
+                self._on_overload(start)
+            self._release()
+            raise
+        self._on_success(time.monotonic() - start)
+        self._release()
+
+    def _on_success(self, latency: float) -> None:
+        with self._lock:
+            self._latency = latency if self._latency is None else 0.8 * self._latency + 0.2 * latency
+            if self._best_latency is None or self._latency < self._best_latency:
+                self._best_latency = self._latency
+            else:
+                self._best_latency += self.latency_decay * (self._latency - self._best_latency)
+            if self.latency_tolerance is None or self._latency <= self.latency_tolerance * self._best_latency:
+                self._limit = min(self._limit + 1 / self._limit, self.max_limit)
+            self._grant()
+
+    def _on_overload(self, start: float) -> None:
+        with self._lock:
+            # Calls already in flight when the limit was cut report the same congestion
+            if start < self._last_decrease:
+                return
+            # An unbounded limiter starts from the calls actually in flight
+            current = self._in_flight if math.isinf(self._limit) else self._limit
+            self._limit = max(current * self.decrease_factor, self.min_limit)
+            self._last_decrease = time.monotonic()
+
+    def _release(self) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            self._grant()
+
+    def _grant(self) -> None:
+        """Hand free slots to waiters in FIFO order (caller holds the lock)."""
+        while self._waiters and self._in_flight < self.limit:
+            self._in_flight += 1
+            waiter = self._waiters.popleft()
+            if isinstance(waiter, threading.Event):
+                waiter.set()
+            else:
+                waiter.wake()
+
+
+# Process-wide limiters, one per service (shared by agents and evaluations)
+_limiters: dict[str, AdaptiveLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_limiter(name: str) -> AdaptiveLimiter:
+    """Get the process-wide limiter for a service, creating it on first use (thread-safe).
+
+    Args:
+        name: Service name (e.g. "modal" for sandbox creation, "llm:<model>" for completions)
+
+    Returns:
+        AdaptiveLimiter shared by all callers in this process
+    """
+    with _limiters_lock:
+        if name not in _limiters:
+            # Completion latency follows output length, not load: only overload errors count
+            latency_tolerance = None if name.startswith("llm:") else 2.0
+            _limiters[name] = AdaptiveLimiter(name, latency_tolerance=latency_tolerance)
+        return _limiters[name]
+
+
+def limits_summary() -> str:
+    """Describe the limiters that are in use, e.g. ``modal 3/12 · llm:gpt-4o 40/64 (+5)``.
+
+    Each entry shows calls in flight / current limit, and queued callers if any.
+    """
+    with _limiters_lock:
+        limiters = list(_limiters.values())
+    parts = []
+    for limiter in limiters:
+        limit = "∞" if math.isinf(limiter.limit) else limiter.limit
+        part = f"{limiter.name} {limiter.in_flight}/{limit}"
+        if waiting := limiter.waiting:
+            part += f" (+{waiting})"
+        parts.append(part)
+    return " · ".join(parts)
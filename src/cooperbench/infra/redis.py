@@ -1,16 +1,118 @@
-"""Redis connection management."""
+"""Redis connection management.
 
+All Redis clients in a process share one connection pool per server URL, so
+concurrent agents reuse idle connections instead of each opening their own.
+Pools are capped at ``$COOPERBENCH_REDIS_MAX_CONNECTIONS`` connections; callers
+beyond the cap wait for a connection to be returned instead of opening more.
+Run namespaces are carried in the URL fragment (``redis://host:6379#run:abc``)
+and applied as key prefixes by :class:`RedisNamespace`.
+"""
+
+import os
 import subprocess
+import threading
 import time
+from typing import TYPE_CHECKING
 
 from cooperbench.utils import console
 
+if TYPE_CHECKING:
+    import redis as redis_lib
+
+# Seconds a pooled connection may sit idle before it is pinged on checkout
+HEALTH_CHECK_INTERVAL = 30
+
+# Max connections per server pool, and seconds to wait for a free one when all are in use
+DEFAULT_MAX_CONNECTIONS = 64
+POOL_TIMEOUT = 30
+
+_pools: dict[str, "redis_lib.ConnectionPool"] = {}
+_pools_lock = threading.Lock()
+
+
+def split_redis_url(url: str) -> tuple[str, str]:
+    """Split the optional ``#prefix`` namespace off a Redis URL.
+
+    Args:
+        url: URL like "redis://host:port" or "redis://host:port#run:abc123"
+
+    Returns:
+        Tuple of (server_url, prefix) where prefix includes a trailing colon if present
+    """
+    if "#" in url:
+        url, prefix = url.split("#", 1)
+        return url, prefix + ":"
+    return url, ""
+
+
+def get_redis(url: str) -> "redis_lib.Redis":
+    """Get a client backed by the process-wide connection pool for a server.
+
+    Args:
+        url: Redis URL (a ``#prefix`` namespace is ignored)
+
+    Returns:
+        Redis client sharing connections with every other client for the same server
+    """
+    import redis as redis_lib
+
+    server_url, _ = split_redis_url(url)
+    with _pools_lock:
+        pool = _pools.get(server_url)
+        if pool is None:
+            pool = redis_lib.BlockingConnectionPool.from_url(
+                server_url,
+                max_connections=_max_connections(),
+                timeout=POOL_TIMEOUT,
+                health_check_interval=HEALTH_CHECK_INTERVAL,
+            )
+            _pools[server_url] = pool
+    return redis_lib.Redis(connection_pool=pool)
+
+
+def _max_connections() -> int:
+    """Connection cap per pool ($COOPERBENCH_REDIS_MAX_CONNECTIONS, default 64)."""
+    try:
+        return max(1, int(os.environ.get("COOPERBENCH_REDIS_MAX_CONNECTIONS", DEFAULT_MAX_CONNECTIONS)))
+    except ValueError:
+        return DEFAULT_MAX_CONNECTIONS
+
+
+def close_redis_pool(url: str) -> None:
+    """Disconnect and forget the pool for a server that is going away.
+
+    Args:
+        url: Redis URL (a ``#prefix`` namespace is ignored)
+    """
+    server_url, _ = split_redis_url(url)
+    with _pools_lock:
+        pool = _pools.pop(server_url, None)
+    if pool is not None:
+        pool.disconnect()
+
+
+class RedisNamespace:
+    """Pooled Redis client plus the key prefix of a namespaced URL."""
+
+    def __init__(self, url: str):
+        """Initialize namespace.
+
+        Args:
+            url: Redis URL, optionally namespaced via #prefix (e.g., "redis://host:6379#run:abc")
+        """
+        server_url, self.prefix = split_redis_url(url)
+        self.client = get_redis(server_url)
+
+    def key(self, name: str) -> str:
+        """Return ``name`` qualified with this namespace's prefix."""
+        return f"{self.prefix}{name}"
+
 
 def ensure_redis(redis_url: str = "redis://localhost:6379") -> None:
     """Ensure Redis is running, auto-start via Docker if needed."""
     import redis as redis_lib
 
-    client = redis_lib.from_url(redis_url)
+    client = get_redis(redis_url)
     try:
         client.ping()
         console.print("  [dim]redis[/dim] [green]connected[/green]")
@@ -0,0 +1,227 @@
+"""Multiplexed SSH sessions for cloud VMs.
+
+Running every command as ``gcloud compute ssh VM --command=...`` starts the
+gcloud CLI, looks up keys and performs a full SSH handshake each time (often
+1-3 s per command). An :class:`SSHSession` resolves the ssh command line once
+(:meth:`SSHSession.from_gcloud`) and keeps one OpenSSH ControlMaster
+connection per host. Each command then opens a new channel on that
+connection, which takes milliseconds.
+
+Commands run with a real timeout: the remote side is wrapped in
+``timeout``, and the local ssh client is killed if the remote side does not
+return in time. If the master connection drops, commands fall back to a
+direct connection, and the master is re-established on the next command.
+"""
+
+import math
+import os
+import shlex
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+from collections.abc import Callable
+from typing import Any
+
+# Seconds the master connection stays open after its last command
+DEFAULT_PERSIST = 600
+
+# Exit status of ssh itself (connection or authentication failure)
+_SSH_ERROR = 255
+
+# Exit status of coreutils timeout when the command timed out
+_TIMEOUT_EXIT = 124
+
+# Grace period before the local client is killed after the remote timeout
+_KILL_GRACE = 10
+
+
+class SSHSession:
+    """Persistent, multiplexed SSH connection to one host (thread-safe)."""
+
+    def __init__(
+        self,
+        target: str,
+        options: list[str] | None = None,
+        *,
+        ssh: str = "ssh",
+        persist: int = DEFAULT_PERSIST,
+        connect_timeout: int = 30,
+    ):
+        """Initialize session; the master connection is opened by the first command.
+
+        Args:
+            target: Destination, e.g. "user@203.0.113.7"
+            options: Extra ssh arguments (identity file, -o options, port, ...)
+            ssh: ssh executable
+            persist: Seconds the master connection stays open when idle
+            connect_timeout: Seconds allowed for establishing a connection
+        """
+        self.target = target
+        self.options = list(options or [])
+        self.ssh = ssh
+        self.persist = persist
+        self.connect_timeout = connect_timeout
+        # Socket paths are limited to ~100 characters, so keep the directory short
+        self._control_dir = tempfile.mkdtemp(prefix="cb-ssh-")
+        self.control_path = os.path.join(self._control_dir, "%C")
+        self._master_started = False
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_gcloud(cls, vm_name: str, zone: str, project_id: str, **kwargs: Any) -> "SSHSession":
+        """Create a session using the ssh command ``gcloud compute ssh`` would run.
+
+        Call this once gcloud has connected to the VM at least once, so its key is
+        already in the VM's metadata.
+
+        Args:
+            vm_name: Compute Engine instance name
+            zone: Instance zone
+            project_id: GCP project ID
+            **kwargs: Passed to SSHSession
+
+        Raises:
+            RuntimeError: If gcloud cannot resolve the ssh command
+        """
+        result = subprocess.run(
+            [
+                "gcloud",
+                "compute",
+                "ssh",
+                vm_name,
+                f"--zone={zone}",
+                f"--project={project_id}",
+                "--dry-run",
+                "--quiet",
+                "--strict-host-key-checking=no",
+            ],
+            capture_output=True,
+            text=True,
+            timeout=60,
+        )
+        lines = result.stdout.strip().splitlines()
+        if result.returncode != 0 or not lines:
+            raise RuntimeError(f"Could not resolve ssh command for {vm_name}: {result.stderr.strip()}")
+
+        argv = shlex.split(lines[-1])
+        # Drop the executable, the destination and the pseudo-terminal flag
+        options = [arg for arg in argv[1:-1] if arg not in ("-t", "-T")]
+        return cls(argv[-1], options, ssh=argv[0], **kwargs)
+
+    def _args(self, *extra: str) -> list[str]:
+        return [
+            self.ssh,
+            *self.options,
+            "-o",
+            f"ControlPath={self.control_path}",
+            "-o",
+            "BatchMode=yes",
+            "-o",
+            f"ConnectTimeout={self.connect_timeout}",
+            *extra,
+            self.target,
+        ]
+
+    def _ensure_master(self) -> None:
+        """Open the master connection if it is not running (caller holds the lock)."""
+        if self._master_started:
+            return
+        # stderr goes to a file: the backgrounded master keeps it open, so a pipe
+        # would never reach EOF
+        with tempfile.TemporaryFile() as err:
+            result = subprocess.run(
+                self._args("-o", "ControlMaster=yes", "-o", f"ControlPersist={self.persist}", "-f", "-N"),
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                stderr=err,
+                timeout=self.connect_timeout + _KILL_GRACE,
+            )
+            if result.returncode != 0:
+                err.seek(0)
+                raise ConnectionError(f"SSH to {self.target} failed: {err.read().decode(errors='replace').strip()}")
+        self._master_started = True
+
+    def run(
+        self,
+        command: str,
+        timeout: float | None = None,
+        on_output: Callable[[str], None] | None = None,
+    ) -> dict[str, Any]:
+        """Run a shell command on the host.
+
+        Args:
+            command: Shell command to run
+            timeout: Seconds before the command is killed (None for no limit)
+            on_output: Called with each chunk of output as it arrives
+
+        Returns:
+            Dict with 'output' (stdout and stderr) and 'returncode' (-1 on timeout or failure)
+        """
+        with self._lock:
+            try:
+                self._ensure_master()
+            except Exception:
+                # Commands still connect directly (ControlMaster=no falls back); the
+                # master is retried after the next connection error
+                self._master_started = True
+
+        remote = command
+        if timeout is not None:
+            remote = f"timeout -k 5 {math.ceil(timeout)} sh -c {shlex.quote(command)}"
+
+        start = time.monotonic()
+        try:
+            proc = subprocess.Popen(
+                self._args("-o", "ControlMaster=no", "-T", "--") + [remote],
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                start_new_session=True,
+            )
+        except Exception as e:
+            return {"output": str(e), "returncode": -1}
+
+        chunks: list[bytes] = []
+
+        def read_output() -> None:
+            assert proc.stdout is not None
+            while data := proc.stdout.read1(65536):
+                chunks.append(data)
+                if on_output is not None:
+                    on_output(data.decode(errors="replace"))
+
+        reader = threading.Thread(target=read_output, daemon=True)
+        reader.start()
+        try:
+            returncode = proc.wait(timeout=None if timeout is None else timeout + _KILL_GRACE)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+            returncode = _TIMEOUT_EXIT
+        reader.join(timeout=5)
+
+        if timeout is not None and returncode == _TIMEOUT_EXIT and time.monotonic() - start >= timeout:
+            return {"output": f"Command timed out after {timeout}s", "returncode": -1}
+        if returncode == _SSH_ERROR:
+            # The master may have gone away; re-establish it on the next command
+            with self._lock:
+                self._master_started = False
+        return {"output": b"".join(chunks).decode(errors="replace"), "returncode": returncode}
+
+    def close(self) -> None:
+        """Stop the master connection and remove its socket."""
+        with self._lock:
+            if self._master_started:
+                try:
+                    subprocess.run(
+                        self._args("-O", "exit"),
+                        stdin=subprocess.DEVNULL,
+                        capture_output=True,
+                        timeout=10,
+                    )
+                except Exception:
+                    pass
+                self._master_started = False
+            shutil.rmtree(self._control_dir, ignore_errors=True)
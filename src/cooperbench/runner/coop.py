@@ -1,18 +1,22 @@
 """Coop mode execution - multiple agents collaborate on separate features."""
 
+import asyncio
 import json
 import re
 import threading
 import uuid
+from collections.abc import Callable
 from datetime import datetime
 from pathlib import Path
 
 import modal
 import yaml
 
-from cooperbench.agents import get_runner
+from cooperbench.agents import AgentResult, AgentRunner, accepts_message_callback, arun_agent, get_runner
 from cooperbench.agents.mini_swe_agent.connectors import create_git_server
 from cooperbench.config import ConfigManager
+from cooperbench.runner.index import get_run_index
+from cooperbench.runner.trajectory import TrajectoryStream, compact_trajectory
 from cooperbench.utils import console, get_image_name
 
 
@@ -30,11 +34,13 @@ def execute_coop(
     messaging_enabled: bool = True,
     backend: str = "modal",
     agent_config: str | None = None,
+    on_agent_done: Callable[[str], None] | None = None,
 ) -> dict | None:
     """Execute a cooperative task (two agents, separate features).
 
     Args:
         agent_config: Path to agent-specific configuration file (optional)
+        on_agent_done: Called with each agent's ID as soon as it finishes (optional)
     """
     n_agents = len(features)
     agents = [f"agent{i + 1}" for i in range(n_agents)]
@@ -43,47 +49,20 @@ def execute_coop(
 
     feature_str = "_".join(f"f{f}" for f in sorted(features))
     log_dir = Path("logs") / run_name / "coop" / repo_name / str(task_id) / feature_str
-    result_file = log_dir / "result.json"
 
-    if result_file.exists() and not force:
-        with open(result_file) as f:
-            prev_result = json.load(f)
-        # Re-run if any agent had an error
-        agents_had_error = any(a.get("status") == "Error" for a in prev_result.get("agents", {}).values())
-        if not agents_had_error:
-            return {"skipped": True, **prev_result}
+    if (prev_result := _previous_result(log_dir, run_name, force)) is not None:
+        return prev_result
 
     namespaced_redis = f"{redis_url}#run:{run_id}"
-
-    # Create git server if enabled
-    # Note: openhands_sdk manages its own git server internally, so we skip creation here
-    git_server = None
-    git_server_url = None
-    git_network = None
-    if git_enabled and agent_name != "openhands_sdk":
-        if not quiet:
-            console.print("  [dim]git[/dim] creating shared server...")
-        app = modal.App.lookup("cooperbench", create_if_missing=True) if backend == "modal" else None
-
-        # Build git server kwargs based on backend
-        git_server_kwargs = {"backend": backend, "run_id": run_id, "app": app}
-        if backend == "gcp":
-            config = ConfigManager()
-            if project_id := config.get("gcp_project_id"):
-                git_server_kwargs["project_id"] = project_id
-            if zone := config.get("gcp_zone"):
-                git_server_kwargs["zone"] = zone
-
-        git_server = create_git_server(**git_server_kwargs)
-        git_server_url = git_server.url
-        git_network = getattr(git_server, "network_name", None)
-        if not quiet:
-            console.print(f"  [dim]git[/dim] [green]ready[/green] {git_server_url}")
+    git_server = _create_git_server(agent_name, backend, run_id, git_enabled, quiet)
+    git_server_url = git_server.url if git_server else None
+    git_network = getattr(git_server, "network_name", None)
 
     results = {}
     threads = []
 
     def run_thread(agent_id: str, feature_id: int):
+        stream = TrajectoryStream(log_dir / f"agent{feature_id}_traj.json")
         try:
             results[agent_id] = _spawn_agent(
                 repo_name=repo_name,
@@ -101,18 +80,15 @@ def execute_coop(
                 quiet=quiet,
                 backend=backend,
                 agent_config=agent_config,
+                response_log=log_dir / f"agent{feature_id}_responses.jsonl.gz",
+                on_message=stream.append,
             )
         except Exception as e:
-            results[agent_id] = {
-                "feature_id": feature_id,
-                "agent_id": agent_id,
-                "status": "Error",
-                "patch": "",
-                "cost": 0,
-                "steps": 0,
-                "messages": [],
-                "error": str(e),
-            }
+            results[agent_id] = _agent_error(agent_id, feature_id, e)
+        finally:
+            stream.close()
+            if on_agent_done:
+                on_agent_done(agent_id)
 
     try:
         # Sort features to ensure agent assignment matches sorted directory name
@@ -129,6 +105,182 @@ def execute_coop(
         if git_server:
             git_server.cleanup()
 
+    return _save_coop_results(
+        log_dir, results, agents, repo_name, task_id, run_name, agent_name, model_name, run_id, start_time
+    )
+
+
+async def aexecute_coop(
+    repo_name: str,
+    task_id: int,
+    features: list[int],
+    run_name: str,
+    agent_name: str = "mini_swe_agent",
+    model_name: str = "vertex_ai/gemini-3-flash-preview",
+    redis_url: str = "redis://localhost:6379",
+    force: bool = False,
+    quiet: bool = False,
+    git_enabled: bool = False,
+    messaging_enabled: bool = True,
+    backend: str = "modal",
+    agent_config: str | None = None,
+    on_agent_done: Callable[[str], None] | None = None,
+) -> dict | None:
+    """Async variant of execute_coop() for the asyncio scheduler.
+
+    Agents run as coroutines on the caller's event loop instead of one thread
+    each; adapters without ``arun`` fall back to a worker thread.
+    """
+    n_agents = len(features)
+    agents = [f"agent{i + 1}" for i in range(n_agents)]
+    run_id = uuid.uuid4().hex[:8]
+    start_time = datetime.now()
+
+    feature_str = "_".join(f"f{f}" for f in sorted(features))
+    log_dir = Path("logs") / run_name / "coop" / repo_name / str(task_id) / feature_str
+
+    if (prev_result := _previous_result(log_dir, run_name, force)) is not None:
+        return prev_result
+
+    namespaced_redis = f"{redis_url}#run:{run_id}"
+    git_server = await asyncio.to_thread(_create_git_server, agent_name, backend, run_id, git_enabled, quiet)
+    git_server_url = git_server.url if git_server else None
+    git_network = getattr(git_server, "network_name", None)
+
+    async def run_agent(agent_id: str, feature_id: int) -> dict:
+        stream = TrajectoryStream(log_dir / f"agent{feature_id}_traj.json")
+        try:
+            runner, kwargs = _prepare_agent(
+                repo_name=repo_name,
+                task_id=task_id,
+                feature_id=feature_id,
+                agent_name=agent_name,
+                model_name=model_name,
+                agent_id=agent_id,
+                agents=agents,
+                redis_url=namespaced_redis if messaging_enabled and n_agents > 1 else None,
+                git_server_url=git_server_url,
+                git_enabled=git_enabled,
+                git_network=git_network,
+                messaging_enabled=messaging_enabled,
+                quiet=quiet,
+                backend=backend,
+                agent_config=agent_config,
+                response_log=log_dir / f"agent{feature_id}_responses.jsonl.gz",
+                on_message=stream.append,
+            )
+            result = await arun_agent(runner, **kwargs)
+            return _agent_result(agent_id, feature_id, result)
+        except Exception as e:
+            return _agent_error(agent_id, feature_id, e)
+        finally:
+            stream.close()
+            if on_agent_done:
+                on_agent_done(agent_id)
+
+    try:
+        # Sort features to ensure agent assignment matches sorted directory name
+        sorted_features = sorted(features)
+        agent_results = await asyncio.gather(
+            *(run_agent(agent_id, feature_id) for agent_id, feature_id in zip(agents, sorted_features))
+        )
+        results = dict(zip(agents, agent_results))
+    finally:
+        if git_server:
+            await asyncio.to_thread(git_server.cleanup)
+
+    return await asyncio.to_thread(
+        _save_coop_results,
+        log_dir,
+        results,
+        agents,
+        repo_name,
+        task_id,
+        run_name,
+        agent_name,
+        model_name,
+        run_id,
+        start_time,
+    )
+
+
+def _previous_result(log_dir: Path, run_name: str, force: bool) -> dict | None:
+    """Return the previous result marked as skipped, unless it must be re-run."""
+    if force:
+        return None
+
+    # The run index answers for tasks never run or run with an error without touching their dirs
+    index = get_run_index(run_name)
+    if index.exists():
+        indexed = index.get(log_dir).get("result")
+        if indexed is None or indexed["agent_error"]:
+            return None
+
+    result_file = log_dir / "result.json"
+    if not result_file.exists():
+        return None
+
+    with open(result_file) as f:
+        prev_result = json.load(f)
+    # Re-run if any agent had an error
+    agents_had_error = any(a.get("status") == "Error" for a in prev_result.get("agents", {}).values())
+    if agents_had_error:
+        return None
+    return {"skipped": True, **prev_result}
+
+
+def _create_git_server(agent_name: str, backend: str, run_id: str, git_enabled: bool, quiet: bool):
+    """Create the shared git server for a coop run, if git collaboration is enabled."""
+    # Note: openhands_sdk manages its own git server internally, so we skip creation here
+    if not git_enabled or agent_name == "openhands_sdk":
+        return None
+
+    if not quiet:
+        console.print("  [dim]git[/dim] creating shared server...")
+    app = modal.App.lookup("cooperbench", create_if_missing=True) if backend == "modal" else None
+
+    # Build git server kwargs based on backend
+    git_server_kwargs = {"backend": backend, "run_id": run_id, "app": app}
+    if backend == "gcp":
+        config = ConfigManager()
+        if project_id := config.get("gcp_project_id"):
+            git_server_kwargs["project_id"] = project_id
+        if zone := config.get("gcp_zone"):
+            git_server_kwargs["zone"] = zone
+
+    git_server = create_git_server(**git_server_kwargs)
+    if not quiet:
+        console.print(f"  [dim]git[/dim] [green]ready[/green] {git_server.url}")
+    return git_server
+
+
+def _agent_error(agent_id: str, feature_id: int, error: Exception) -> dict:
+    """Build the result dict for an agent that failed to run."""
+    return {
+        "feature_id": feature_id,
+        "agent_id": agent_id,
+        "status": "Error",
+        "patch": "",
+        "cost": 0,
+        "steps": 0,
+        "messages": [],
+        "error": str(error),
+    }
+
+
+def _save_coop_results(
+    log_dir: Path,
+    results: dict,
+    agents: list[str],
+    repo_name: str,
+    task_id: int,
+    run_name: str,
+    agent_name: str,
+    model_name: str,
+    run_id: str,
+    start_time: datetime,
+) -> dict:
+    """Write patches, trajectories, conversation and result.json for a coop run."""
     end_time = datetime.now()
     duration = (end_time - start_time).total_seconds()
 
@@ -156,29 +308,25 @@ def execute_coop(
         patch_file = log_dir / f"agent{fid}.patch"
         patch_file.write_text(r.get("patch", ""))
 
-        traj_file = log_dir / f"agent{fid}_traj.json"
-        with open(traj_file, "w") as f:
-            json.dump(
-                {
-                    "repo": repo_name,
-                    "task_id": task_id,
-                    "feature_id": fid,
-                    "agent_id": agent_id,
-                    "model": model_name,
-                    "status": r.get("status"),
-                    "cost": r.get("cost"),
-                    "steps": r.get("steps"),
-                    "messages": r.get("messages", []),
-                },
-                f,
-                indent=2,
-                default=str,
-            )
+        compact_trajectory(
+            log_dir / f"agent{fid}_traj.json",
+            {
+                "repo": repo_name,
+                "task_id": task_id,
+                "feature_id": fid,
+                "agent_id": agent_id,
+                "model": model_name,
+                "status": r.get("status"),
+                "cost": r.get("cost"),
+                "steps": r.get("steps"),
+            },
+            r.get("messages", []),
+        )
 
     result_data = {
         "repo": repo_name,
         "task_id": task_id,
-        "features": sorted_features,
+        "features": sorted(r["feature_id"] for r in results.values()),
         "setting": "coop",
         "run_id": run_id,
         "run_name": run_name,
@@ -206,6 +354,7 @@ def execute_coop(
 
     with open(log_dir / "result.json", "w") as f:
         json.dump(result_data, f, indent=2)
+    get_run_index(run_name).add_result(log_dir, result_data)
 
     return {
         "results": results,
@@ -233,12 +382,59 @@ def _spawn_agent(
     quiet: bool = False,
     backend: str = "modal",
     agent_config: str | None = None,
+    response_log: Path | None = None,
+    on_message: Callable[[dict], None] | None = None,
 ) -> dict:
     """Spawn a single agent on a feature using the agent framework adapter.
 
     Args:
         agent_config: Path to agent-specific configuration file (optional)
+        response_log: Sidecar file for the agent's raw LLM responses (optional)
+        on_message: Called with each trajectory message, if the adapter streams them (optional)
     """
+    runner, kwargs = _prepare_agent(
+        repo_name=repo_name,
+        task_id=task_id,
+        feature_id=feature_id,
+        agent_name=agent_name,
+        model_name=model_name,
+        agent_id=agent_id,
+        agents=agents,
+        redis_url=redis_url,
+        git_server_url=git_server_url,
+        git_enabled=git_enabled,
+        git_network=git_network,
+        messaging_enabled=messaging_enabled,
+        quiet=quiet,
+        backend=backend,
+        agent_config=agent_config,
+        response_log=response_log,
+        on_message=on_message,
+    )
+    result = runner.run(**kwargs)
+    return _agent_result(agent_id, feature_id, result)
+
+
+def _prepare_agent(
+    repo_name: str,
+    task_id: int,
+    feature_id: int,
+    agent_name: str,
+    model_name: str,
+    agent_id: str | None = None,
+    agents: list[str] | None = None,
+    redis_url: str | None = None,
+    git_server_url: str | None = None,
+    git_enabled: bool = False,
+    git_network: str | None = None,
+    messaging_enabled: bool = True,
+    quiet: bool = False,
+    backend: str = "modal",
+    agent_config: str | None = None,
+    response_log: Path | None = None,
+    on_message: Callable[[dict], None] | None = None,
+) -> tuple[AgentRunner, dict]:
+    """Resolve the adapter and run() arguments for one agent (shared by sync and async paths)."""
     task_dir = Path("dataset") / repo_name / f"task{task_id}"
     feature_file = task_dir / f"feature{feature_id}" / "feature.md"
 
@@ -256,6 +452,8 @@ def _spawn_agent(
     config = {"backend": backend, "run_id": redis_url.split("#run:")[1] if redis_url and "#run:" in redis_url else None}
     if git_network:
         config["git_network"] = git_network
+    if response_log:
+        config["response_log"] = str(response_log)
     if agent_config:
         config_path = Path(agent_config)
         if config_path.exists():
@@ -266,21 +464,26 @@ def _spawn_agent(
         else:
             raise FileNotFoundError(f"Agent config file not found: {agent_config}")
 
-    # Use the agent framework adapter
     runner = get_runner(agent_name)
-    result = runner.run(
-        task=task,
-        image=image,
-        agent_id=agent_id or "agent",
-        model_name=model_name,
-        agents=agents,
-        comm_url=redis_url,
-        git_server_url=git_server_url,
-        git_enabled=git_enabled,
-        messaging_enabled=messaging_enabled,
-        config=config,
-    )
+    kwargs = {
+        "task": task,
+        "image": image,
+        "agent_id": agent_id or "agent",
+        "model_name": model_name,
+        "agents": agents,
+        "comm_url": redis_url,
+        "git_server_url": git_server_url,
+        "git_enabled": git_enabled,
+        "messaging_enabled": messaging_enabled,
+        "config": config,
+    }
+    if on_message is not None and accepts_message_callback(runner):
+        kwargs["on_message"] = on_message
+    return runner, kwargs
+
 
+def _agent_result(agent_id: str | None, feature_id: int, result: AgentResult) -> dict:
+    """Convert an AgentResult into the per-agent result dict."""
     return {
         "feature_id": feature_id,
         "agent_id": agent_id,
@@ -1,8 +1,11 @@
 """Core runner for benchmark task execution."""
 
+import asyncio
 import json
 import os
+import threading
 import time
+from collections.abc import Callable
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
@@ -11,6 +14,7 @@ from dotenv import load_dotenv
 from rich.progress import (
     BarColumn,
     Progress,
+    ProgressColumn,
     SpinnerColumn,
     TaskProgressColumn,
     TextColumn,
@@ -18,7 +22,9 @@ from rich.progress import (
     TimeRemainingColumn,
 )
 from rich.table import Table
+from rich.text import Text
 
+from cooperbench.infra.limiter import limits_summary
 from cooperbench.infra.redis import ensure_redis
 
 # Optional import for cleanup handler (may not exist in all versions)
@@ -26,10 +32,11 @@ try:
     from cooperbench.agents.mini_swe_agent.environments.modal import install_cleanup_handler
 except ImportError:
     install_cleanup_handler = None
-from cooperbench.runner.coop import execute_coop
-from cooperbench.runner.solo import execute_solo
+from cooperbench.runner.coop import aexecute_coop, execute_coop
+from cooperbench.runner.scheduler import ConcurrencyLimits, install_worker_executor
+from cooperbench.runner.solo import aexecute_solo, execute_solo
 from cooperbench.runner.tasks import discover_tasks
-from cooperbench.utils import console
+from cooperbench.utils import console, get_image_name
 
 load_dotenv()
 
@@ -55,6 +62,9 @@ def run(
     eval_concurrency: int = 10,
     backend: str = "modal",
     agent_config: str | None = None,
+    scheduler: str = "threads",
+    image_concurrency: int = 0,
+    speculative_eval: bool = False,
 ) -> None:
     """Run benchmark tasks.
 
@@ -76,7 +86,17 @@ def run(
         eval_concurrency: Max parallel evaluations (default: 10)
         backend: Execution backend ("modal" or "docker")
         agent_config: Path to agent-specific configuration file (optional)
+        scheduler: "threads" (thread per task/agent) or "async" (asyncio event
+            loop; agents run as coroutines where the adapter supports it)
+        image_concurrency: Max parallel tasks per task image with the async
+            scheduler (0 = unlimited)
+        speculative_eval: Start each coop pair's eval sandbox as soon as its
+            first agent finishes and evaluate from the warm sandbox pool
+            (modal/docker only)
     """
+    if speculative_eval and backend not in ("modal", "docker"):
+        raise ValueError(f"Speculative eval is not supported for backend: '{backend}'. Available: docker, modal")
+
     # Install cleanup handler to terminate Modal sandboxes on Ctrl+C
     if install_cleanup_handler:
         install_cleanup_handler()
@@ -111,6 +131,10 @@ def run(
     skipped = 0
     total_cost = 0
 
+    speculate = speculative_eval and auto_eval and not is_solo
+    # With speculative eval, evaluations pick up the sandbox prewarmed for their pair
+    eval_options = {"backend": backend, "pool": True} if speculate else {}
+
     def execute_task(task_info):
         if is_solo:
             return execute_solo(
@@ -140,6 +164,39 @@ def run(
                 messaging_enabled=messaging_enabled,
                 backend=backend,
                 agent_config=agent_config,
+                on_agent_done=_speculative_prewarm(backend, task_info) if speculate else None,
+            )
+
+    async def aexecute_task(task_info):
+        if is_solo:
+            return await aexecute_solo(
+                repo_name=task_info["repo"],
+                task_id=task_info["task_id"],
+                features=task_info["features"],
+                run_name=run_name,
+                agent_name=agent,
+                model_name=model_name,
+                force=force,
+                quiet=True,
+                backend=backend,
+                agent_config=agent_config,
+            )
+        else:
+            return await aexecute_coop(
+                repo_name=task_info["repo"],
+                task_id=task_info["task_id"],
+                features=task_info["features"],
+                run_name=run_name,
+                agent_name=agent,
+                model_name=model_name,
+                redis_url=redis_url,
+                force=force,
+                quiet=True,
+                git_enabled=git_enabled,
+                messaging_enabled=messaging_enabled,
+                backend=backend,
+                agent_config=agent_config,
+                on_agent_done=_speculative_prewarm(backend, task_info) if speculate else None,
             )
 
     eval_stats = None
@@ -160,7 +217,7 @@ def run(
                 if run_info:
                     from cooperbench.eval.evaluate import _evaluate_single
 
-                    eval_result = _evaluate_single(run_info, force=force)
+                    eval_result = _evaluate_single(run_info, force=force, **eval_options)
                     if eval_result:
                         stats = _process_eval_result(eval_result, tasks[0])
                         if stats:
@@ -168,10 +225,27 @@ def run(
                             eval_stats = (eval_passed, eval_failed, eval_errors, eval_skipped, [])
                         else:
                             eval_stats = None
+    elif scheduler == "async":
+        # Multiple tasks on one event loop
+        limits = ConcurrencyLimits(concurrency, image_concurrency)
+        completed, skipped, failed, total_cost, results_list, eval_stats = asyncio.run(
+            _run_with_progress_async(
+                tasks,
+                aexecute_task,
+                limits,
+                backend,
+                auto_eval,
+                eval_concurrency,
+                setting,
+                run_name,
+                force,
+                eval_options,
+            )
+        )
     else:
         # Multiple tasks - show progress
         completed, skipped, failed, total_cost, results_list, eval_stats = _run_with_progress(
-            tasks, execute_task, concurrency, auto_eval, eval_concurrency, setting, run_name, force
+            tasks, execute_task, concurrency, auto_eval, eval_concurrency, setting, run_name, force, eval_options
         )
 
     # Summary
@@ -258,9 +332,47 @@ def _build_run_info(result: dict, task_info: dict, setting: str, run_name: str)
         "repo": task_info["repo"],
         "task_id": task_info["task_id"],
         "features": task_info["features"],
+        "run_name": run_name,
     }
 
 
+class _LimitsColumn(ProgressColumn):
+    """Progress column showing the adaptive in-flight limits (in flight/limit per service)."""
+
+    def render(self, task) -> Text:
+        summary = limits_summary()
+        return Text(f"[{summary}]" if summary else "", style="dim")
+
+
+def _speculative_prewarm(backend: str, task_info: dict) -> Callable[[str], None]:
+    """Build an on_agent_done hook that prewarms a coop pair's eval sandbox.
+
+    When the first agent of the pair finishes, a sandbox for the task image is
+    started in the background and held in the warm pool, so the sandbox cold
+    start overlaps with the remaining agents and the pool-backed evaluation only
+    has to apply, merge and test the patches. Whether the evaluation will run is
+    not known yet (it may hit the cache or never start), so the pool only holds
+    the sandbox for its ``hold_timeout``.
+    """
+    from cooperbench.eval.backends import get_pooled_backend
+
+    pool = get_pooled_backend(backend)
+    image = get_image_name(task_info["repo"], task_info["task_id"])
+    first = threading.Lock()  # Acquired (and never released) by the first agent to finish
+
+    def prewarm() -> None:
+        try:
+            pool.prewarm(image, hold=True)
+        except Exception:
+            pass  # The evaluation creates its own sandbox
+
+    def on_agent_done(agent_id: str) -> None:
+        if first.acquire(blocking=False):
+            threading.Thread(target=prewarm, daemon=True).start()
+
+    return on_agent_done
+
+
 def _process_eval_result(eval_result: dict | None, task_info: dict) -> tuple | None:
     """Process eval result and return stats tuple (passed, failed, errors, skipped).
 
@@ -333,6 +445,7 @@ def _run_with_progress(
     setting: str,
     run_name: str,
     force: bool,
+    eval_options: dict | None = None,
 ) -> tuple:
     """Run multiple tasks with progress display and optional inline evaluation."""
     from cooperbench.eval.evaluate import _evaluate_single
@@ -365,6 +478,7 @@ def _run_with_progress(
             TimeElapsedColumn(),
             TextColumn("[dim]eta[/dim]"),
             TimeRemainingColumn(),
+            _LimitsColumn(),
             console=console,
             transient=True,
         ) as progress:
@@ -406,7 +520,9 @@ def _run_with_progress(
                         if auto_eval and status in ("done", "skip") and eval_executor:
                             run_info = _build_run_info(result, task_info, setting, run_name)
                             if run_info:
-                                eval_future = eval_executor.submit(_evaluate_single, run_info, force)
+                                eval_future = eval_executor.submit(
+                                    _evaluate_single, run_info, force, **(eval_options or {})
+                                )
                                 eval_futures[eval_future] = (task_info, result, task_name, feat_str)
                             progress.console.print(f"{status_display} {task_name} [dim][{feat_str}][/dim]")
                         else:
@@ -509,6 +625,139 @@ def _run_with_progress(
     return completed, skipped, failed, total_cost, results_list, eval_stats
 
 
+async def _run_with_progress_async(
+    tasks: list,
+    aexecute_task,
+    limits: ConcurrencyLimits,
+    backend: str,
+    auto_eval: bool,
+    eval_concurrency: int,
+    setting: str,
+    run_name: str,
+    force: bool,
+    eval_options: dict | None = None,
+) -> tuple:
+    """Async counterpart of _run_with_progress: tasks are coroutines bounded by ``limits``."""
+    from cooperbench.eval.evaluate import _evaluate_single
+
+    # Sync-only adapters hold a worker per agent, evals hold one each
+    install_worker_executor(2 * limits.backend_limit + eval_concurrency)
+    eval_sem = asyncio.Semaphore(eval_concurrency)
+
+    results_list = []
+    completed = 0
+    failed = 0
+    skipped = 0
+    total_cost = 0
+    eval_passed = 0
+    eval_failed = 0
+    eval_errors = 0
+    eval_skipped = 0
+    eval_results = []
+
+    with Progress(
+        SpinnerColumn(),
+        TextColumn("[progress.description]{task.description}"),
+        BarColumn(),
+        TextColumn("[dim]{task.completed}/{task.total}[/dim]"),
+        TaskProgressColumn(),
+        TimeElapsedColumn(),
+        TextColumn("[dim]eta[/dim]"),
+        TimeRemainingColumn(),
+        _LimitsColumn(),
+        console=console,
+        transient=True,
+    ) as progress:
+        task_progress = progress.add_task("running", total=len(tasks))
+
+        async def evaluate_task(run_info: dict, task_info: dict, task_name: str, feat_str: str) -> None:
+            nonlocal eval_passed, eval_failed, eval_errors, eval_skipped
+            try:
+                async with eval_sem:
+                    eval_result = await asyncio.to_thread(_evaluate_single, run_info, force, **(eval_options or {}))
+            except Exception as e:
+                eval_errors += 1
+                progress.console.print(f"  → [yellow]✗ eval error[/yellow] {task_name} [dim]{e}[/dim]")
+                return
+
+            eval_stats = _process_eval_result(eval_result, task_info)
+            if not eval_stats:
+                return
+            ep, ef, ee, es = eval_stats[:4]
+            eval_passed += ep
+            eval_failed += ef
+            eval_errors += ee
+            eval_skipped += es
+
+            if eval_result.get("error"):
+                eval_status = "error"
+            elif eval_result.get("both_passed"):
+                eval_status = "pass"
+            else:
+                eval_status = "fail"
+            eval_results.append({"task": f"{task_name}/{feat_str}", "status": eval_status})
+
+            # For skipped evals (already existed), show actual result with dim indicator
+            is_skipped = eval_result.get("skipped", False)
+            eval_display = {
+                "error": "[yellow]✗ error[/yellow]",
+                "pass": "[dim]→ pass[/dim]" if is_skipped else "[green]✓ pass[/green]",
+                "fail": "[dim]→ fail[/dim]" if is_skipped else "[red]✗ fail[/red]",
+            }[eval_status]
+            progress.console.print(f"  {eval_display} {task_name} [dim][{feat_str}][/dim]")
+
+        async def run_task(task_info: dict) -> None:
+            nonlocal completed, failed, skipped, total_cost
+            feat_str = ",".join(str(f) for f in task_info["features"])
+            task_name = f"{task_info['repo']}/{task_info['task_id']}"
+            image = get_image_name(task_info["repo"], task_info["task_id"])
+
+            try:
+                async with limits.slot(backend, image):
+                    result = await aexecute_task(task_info)
+            except Exception as e:
+                failed += 1
+                results_list.append({"task": f"{task_name}/{feat_str}", "status": "error", "error": str(e)})
+                progress.console.print(f"[red]✗ error[/red] {task_name} [dim]{e}[/dim]")
+                progress.update(task_progress, advance=1)
+                return
+
+            if result is None:
+                failed += 1
+                status = "failed"
+                cost = 0
+            elif result.get("skipped"):
+                skipped += 1
+                status = "skip"
+                cost = result.get("total_cost", 0)
+            else:
+                completed += 1
+                cost = result.get("total_cost", 0)
+                status = "done"
+
+            total_cost += cost
+            results_list.append({"task": f"{task_name}/{feat_str}", "status": status, "cost": cost})
+
+            status_display = {
+                "done": "[green]✓ done[/green]",
+                "skip": "[dim]→ done[/dim]",
+                "failed": "[red]✗ failed[/red]",
+            }[status]
+            progress.console.print(f"{status_display} {task_name} [dim][{feat_str}][/dim]")
+            progress.update(task_progress, advance=1)
+
+            # Evaluate inline (for done or skipped - _evaluate_single handles existing evals)
+            if auto_eval and status in ("done", "skip"):
+                run_info = _build_run_info(result, task_info, setting, run_name)
+                if run_info:
+                    await evaluate_task(run_info, task_info, task_name, feat_str)
+
+        await asyncio.gather(*(run_task(t) for t in tasks))
+
+    eval_stats = (eval_passed, eval_failed, eval_errors, eval_skipped, eval_results) if auto_eval else None
+    return completed, skipped, failed, total_cost, results_list, eval_stats
+
+
 def _save_summary(
     log_dir: Path,
     run_name: str,
@@ -0,0 +1,213 @@
+"""Append-only index of the results and evaluations in a run directory.
+
+Every saved result.json and eval.json appends one line to
+``logs/<run_name>/index.jsonl``, so totals, run discovery and skip checks read
+a single file instead of walking (and parsing) every task directory. Lines are
+folded per log dir, later lines winning, and read incrementally: a process only
+parses the lines appended since its last read.
+
+An index that exists is assumed complete. It is built from disk the first time
+a run without one is written to, and ``cooperbench reindex`` rebuilds it after
+log directories are edited by hand.
+"""
+
+import json
+import os
+import threading
+from pathlib import Path
+
+from cooperbench.utils import console
+
+INDEX_FILE = "index.jsonl"
+
+_indexes: dict[Path, "RunIndex"] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_run_index(run_name: str) -> "RunIndex":
+    """Get the process-wide index for a run (thread-safe).
+
+    Args:
+        run_name: Name of the experiment run (indexes ``logs/<run_name>``)
+    """
+    run_dir = Path("logs") / run_name
+    key = run_dir.resolve()
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            index = _indexes[key] = RunIndex(run_dir)
+        return index
+
+
+def reindex(run_name: str | None = None) -> dict[str, int]:
+    """Rebuild run indexes from the files on disk.
+
+    Args:
+        run_name: Run to reindex (default: every run under logs/)
+
+    Returns:
+        Dict mapping run name to its number of indexed results
+    """
+    logs_dir = Path("logs")
+    if run_name:
+        run_names = [run_name]
+    else:
+        run_names = sorted(d.name for d in logs_dir.iterdir() if d.is_dir()) if logs_dir.exists() else []
+
+    counts = {}
+    for name in run_names:
+        if not (logs_dir / name).is_dir():
+            console.print(f"[yellow]no run found:[/yellow] {name}")
+            continue
+        counts[name] = get_run_index(name).rebuild()
+        console.print(f"[green]✓ indexed[/green] {name} [dim]{counts[name]} results[/dim]")
+    return counts
+
+
+def result_record(log_dir: Path | str, result: dict) -> dict:
+    """Build the index line for a result.json.
+
+    Args:
+        log_dir: Directory containing the result
+        result: result.json content
+    """
+    setting = result.get("setting")
+    if setting is None:
+        # Legacy results: infer from solo.patch presence (as discover_runs does)
+        setting = "solo" if (Path(log_dir) / "solo.patch").exists() else "coop"
+
+    if setting == "solo":
+        agent_error = result.get("agent", {}).get("status") == "Error"
+    else:
+        agent_error = any(a.get("status") == "Error" for a in result.get("agents", {}).values())
+
+    return {
+        "kind": "result",
+        "log_dir": str(log_dir),
+        "setting": setting,
+        "repo": result.get("repo"),
+        "task_id": result.get("task_id"),
+        "features": result.get("features"),
+        "agent_error": agent_error,
+        "total_cost": result.get("total_cost", 0),
+        "duration_seconds": result.get("duration_seconds", 0),
+        "started_at": result.get("started_at"),
+        "ended_at": result.get("ended_at"),
+    }
+
+
+def eval_record(log_dir: Path | str, eval_result: dict) -> dict:
+    """Build the index line for an eval.json.
+
+    Args:
+        log_dir: Directory containing the evaluation
+        eval_result: eval.json content
+    """
+    return {
+        "kind": "eval",
+        "log_dir": str(log_dir),
+        "both_passed": eval_result.get("both_passed", False),
+        "error": eval_result.get("error"),
+        "evaluated_at": eval_result.get("evaluated_at"),
+    }
+
+
+class RunIndex:
+    """Incrementally read, append-only index of one run directory (safe to share across threads)."""
+
+    def __init__(self, run_dir: Path):
+        """Initialize index.
+
+        Args:
+            run_dir: Run directory, as log dirs inside it are named (e.g., ``logs/<run_name>``)
+        """
+        self.run_dir = run_dir
+        self._root = run_dir.resolve()
+        self.path = self._root / INDEX_FILE
+        self._lock = threading.Lock()
+        self._entries: dict[str, dict[str, dict]] = {}
+        self._offset = 0
+
+    def exists(self) -> bool:
+        """Whether the run has an index (runs from older versions may not)."""
+        return self.path.exists()
+
+    def entries(self) -> dict[str, dict[str, dict]]:
+        """Return ``{log_dir: {"result": record, "eval": record}}`` for every indexed log dir."""
+        with self._lock:
+            self._refresh()
+            return {log_dir: dict(entry) for log_dir, entry in self._entries.items()}
+
+    def get(self, log_dir: Path | str) -> dict[str, dict]:
+        """Return the records indexed for one log dir (empty if none)."""
+        with self._lock:
+            self._refresh()
+            return dict(self._entries.get(str(log_dir), {}))
+
+    def add_result(self, log_dir: Path | str, result: dict) -> None:
+        """Index a result.json that was just written."""
+        self._append(result_record(log_dir, result))
+
+    def add_eval(self, log_dir: Path | str, eval_result: dict) -> None:
+        """Index an eval.json that was just written."""
+        self._append(eval_record(log_dir, eval_result))
+
+    def rebuild(self) -> int:
+        """Rebuild the index from the result.json and eval.json files on disk.
+
+        Returns:
+            Number of indexed results
+        """
+        with self._lock:
+            return self._rebuild()
+
+    def _append(self, record: dict) -> None:
+        with self._lock:
+            if not self.path.exists():
+                # First write to a run without an index: index what is already on disk
+                self._rebuild()
+            with open(self.path, "a") as f:
+                f.write(json.dumps(record) + "\n")
+
+    def _refresh(self) -> None:
+        """Fold lines appended since the last read into the in-memory entries."""
+        try:
+            with open(self.path, "rb") as f:
+                if os.fstat(f.fileno()).st_size < self._offset:
+                    # Rebuilt by another process; read it from the start
+                    self._entries, self._offset = {}, 0
+                f.seek(self._offset)
+                data = f.read()
+        except FileNotFoundError:
+            self._entries, self._offset = {}, 0
+            return
+
+        # Leave a partially written trailing line for the next read
+        end = data.rfind(b"\n") + 1
+        for line in data[:end].splitlines():
+            try:
+                record = json.loads(line)
+                self._entries.setdefault(record["log_dir"], {})[record["kind"]] = record
+            except (ValueError, KeyError):
+                continue
+        self._offset += end
+
+    def _rebuild(self) -> int:
+        records = []
+        for filename, make_record in (("result.json", result_record), ("eval.json", eval_record)):
+            for path in sorted(self._root.rglob(filename)):
+                log_dir = self.run_dir / path.parent.relative_to(self._root)
+                try:
+                    with open(path) as f:
+                        records.append(make_record(log_dir, json.load(f)))
+                except (OSError, ValueError):
+                    continue
+
+        self._root.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(f"{INDEX_FILE}.{os.getpid()}.tmp")
+        tmp.write_text("".join(json.dumps(r) + "\n" for r in records))
+        tmp.replace(self.path)
+
+        self._entries, self._offset = {}, 0
+        self._refresh()
+        return sum(1 for r in records if r["kind"] == "result")
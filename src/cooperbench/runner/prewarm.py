@@ -0,0 +1,87 @@
+"""Pre-warm Modal sandbox images before a sweep starts.
+
+Building task images lazily means the first wave of agents for every repo
+queues behind the same image build. ``prewarm`` hydrates every distinct task
+image up front, in parallel, and records the image IDs in the local image
+manifest so later runs load them by ID.
+"""
+
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from rich.progress import BarColumn, Progress, SpinnerColumn, TextColumn, TimeElapsedColumn
+
+from cooperbench.runner.tasks import discover_tasks
+from cooperbench.utils import console, get_image_name
+
+
+def prewarm(
+    subset: str | None = None,
+    repo: str | None = None,
+    task_id: int | None = None,
+    concurrency: int = 10,
+    force: bool = False,
+) -> dict[str, str]:
+    """Hydrate the Modal image of every selected task.
+
+    Args:
+        subset: Use a predefined subset (e.g., 'lite')
+        repo: Filter by repository name
+        task_id: Filter by task ID
+        concurrency: Number of parallel image builds
+        force: Re-hydrate images already recorded in the manifest
+
+    Returns:
+        Dict mapping image name to Modal image ID for every image that hydrated
+    """
+    from cooperbench.agents.mini_swe_agent.environments.modal import get_image_manifest, hydrate_image
+
+    tasks = discover_tasks(subset=subset, repo_filter=repo, task_filter=task_id)
+    images = sorted({get_image_name(t["repo"], t["task_id"]) for t in tasks})
+    if not images:
+        console.print("[yellow]no tasks found[/yellow]")
+        return {}
+
+    manifest = get_image_manifest()
+    hydrated: dict[str, str] = {}
+    pending = []
+    for image in images:
+        image_id = None if force else manifest.get(image)
+        if image_id:
+            hydrated[image] = image_id
+        else:
+            pending.append(image)
+
+    console.print()
+    console.print(f"[bold]cooperbench prewarm[/bold] [dim]images:[/dim] {len(images)}")
+    console.print(f"[dim]cached:[/dim] {len(hydrated)} [dim]to build:[/dim] {len(pending)}")
+    console.print()
+
+    failed = 0
+    if pending:
+        with Progress(
+            SpinnerColumn(),
+            TextColumn("[progress.description]{task.description}"),
+            BarColumn(),
+            TextColumn("[dim]{task.completed}/{task.total}[/dim]"),
+            TimeElapsedColumn(),
+            console=console,
+            transient=True,
+        ) as progress:
+            task_progress = progress.add_task("hydrating", total=len(pending))
+
+            with ThreadPoolExecutor(max_workers=concurrency) as executor:
+                futures = {executor.submit(hydrate_image, image, force): image for image in pending}
+                for future in as_completed(futures):
+                    image = futures[future]
+                    try:
+                        hydrated[image] = future.result()
+                        progress.console.print(f"[green]✓ ready[/green] {image}")
+                    except Exception as e:
+                        failed += 1
+                        progress.console.print(f"[red]✗ error[/red] {image} [dim]{e}[/dim]")
+                    progress.update(task_progress, advance=1)
+
+    console.print()
+    console.print(f"[green]{len(hydrated)} ready[/green]" + (f" [red]{failed} failed[/red]" if failed else ""))
+    console.print(f"[dim]manifest:[/dim] {manifest.path}")
+    return hydrated
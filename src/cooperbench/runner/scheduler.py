@@ -0,0 +1,65 @@
+"""Asyncio scheduling primitives for running many tasks from one process.
+
+The thread scheduler holds one OS thread per in-flight task plus one per agent.
+The async scheduler instead runs tasks as coroutines on a single event loop,
+bounded by semaphores per backend and per task image. Adapters and backends
+without native async support still run in worker threads, but only while they
+actually hold a slot.
+"""
+
+import asyncio
+from collections.abc import AsyncIterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+
+
+class ConcurrencyLimits:
+    """Semaphores bounding concurrent tasks per backend and per image.
+
+    Semaphores are created lazily on first use, so an instance must only be
+    used from a single event loop.
+    """
+
+    def __init__(self, backend_limit: int, image_limit: int = 0):
+        """Initialize limits.
+
+        Args:
+            backend_limit: Max concurrent tasks per backend
+            image_limit: Max concurrent tasks per task image (0 = unlimited)
+        """
+        self.backend_limit = backend_limit
+        self.image_limit = image_limit
+        self._backends: dict[str, asyncio.Semaphore] = {}
+        self._images: dict[str, asyncio.Semaphore] = {}
+
+    @asynccontextmanager
+    async def slot(self, backend: str, image: str) -> AsyncIterator[None]:
+        """Hold a backend slot (and an image slot, if limited) for the duration of the block."""
+        backend_sem = self._backends.setdefault(backend, asyncio.Semaphore(self.backend_limit))
+        if self.image_limit <= 0:
+            async with backend_sem:
+                yield
+            return
+
+        # Image slot first, so tasks queued behind a busy image don't hold backend slots
+        image_sem = self._images.setdefault(image, asyncio.Semaphore(self.image_limit))
+        async with image_sem, backend_sem:
+            yield
+
+
+def install_worker_executor(max_workers: int) -> ThreadPoolExecutor:
+    """Size the running loop's default executor for blocking fallbacks.
+
+    ``asyncio.to_thread`` uses the default executor, which is capped at
+    ``min(32, cpu_count + 4)`` workers; sync-only adapters need one worker
+    per running agent, so the executor is sized to the scheduler's limits.
+
+    Args:
+        max_workers: Max worker threads
+
+    Returns:
+        The installed executor (shut down by asyncio.run on exit)
+    """
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="cooperbench")
+    asyncio.get_running_loop().set_default_executor(executor)
+    return executor
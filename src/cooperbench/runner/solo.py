@@ -1,13 +1,17 @@
 """Solo mode execution - one agent implements multiple features."""
 
+import asyncio
 import json
 import uuid
+from collections.abc import Callable
 from datetime import datetime
 from pathlib import Path
 
 import yaml
 
-from cooperbench.agents import get_runner
+from cooperbench.agents import AgentResult, AgentRunner, accepts_message_callback, arun_agent, get_runner
+from cooperbench.runner.index import get_run_index
+from cooperbench.runner.trajectory import TrajectoryStream, compact_trajectory
 from cooperbench.utils import console, get_image_name
 
 
@@ -33,15 +37,11 @@ def execute_solo(
 
     feature_str = "_".join(f"f{f}" for f in sorted(features))
     log_dir = Path("logs") / run_name / "solo" / repo_name / str(task_id) / feature_str
-    result_file = log_dir / "result.json"
 
-    if result_file.exists() and not force:
-        with open(result_file) as f:
-            prev_result = json.load(f)
-        # Re-run if previous result was an error
-        if prev_result.get("agent", {}).get("status") != "Error":
-            return {"skipped": True, **prev_result}
+    if (prev_result := _previous_result(log_dir, run_name, force)) is not None:
+        return prev_result
 
+    stream = TrajectoryStream(log_dir / "solo_traj.json")
     try:
         result = _spawn_solo_agent(
             repo_name=repo_name,
@@ -52,19 +52,127 @@ def execute_solo(
             quiet=quiet,
             backend=backend,
             agent_config=agent_config,
+            response_log=log_dir / "solo_responses.jsonl.gz",
+            on_message=stream.append,
         )
     except Exception as e:
-        result = {
-            "features": features,
-            "agent_id": "solo",
-            "status": "Error",
-            "patch": "",
-            "cost": 0,
-            "steps": 0,
-            "messages": [],
-            "error": str(e),
-        }
+        result = _solo_error(features, e)
+    finally:
+        stream.close()
+
+    return _save_solo_results(
+        log_dir, result, repo_name, task_id, features, run_name, agent_name, model_name, run_id, start_time
+    )
+
+
+async def aexecute_solo(
+    repo_name: str,
+    task_id: int,
+    features: list[int],
+    run_name: str,
+    agent_name: str = "mini_swe_agent",
+    model_name: str = "vertex_ai/gemini-3-flash-preview",
+    force: bool = False,
+    quiet: bool = False,
+    backend: str = "modal",
+    agent_config: str | None = None,
+) -> dict | None:
+    """Async variant of execute_solo() for the asyncio scheduler."""
+    run_id = uuid.uuid4().hex[:8]
+    start_time = datetime.now()
+
+    feature_str = "_".join(f"f{f}" for f in sorted(features))
+    log_dir = Path("logs") / run_name / "solo" / repo_name / str(task_id) / feature_str
+
+    if (prev_result := _previous_result(log_dir, run_name, force)) is not None:
+        return prev_result
+
+    stream = TrajectoryStream(log_dir / "solo_traj.json")
+    try:
+        runner, kwargs = _prepare_solo_agent(
+            repo_name=repo_name,
+            task_id=task_id,
+            features=features,
+            agent_name=agent_name,
+            model_name=model_name,
+            quiet=quiet,
+            backend=backend,
+            agent_config=agent_config,
+            response_log=log_dir / "solo_responses.jsonl.gz",
+            on_message=stream.append,
+        )
+        result = _solo_result(features, await arun_agent(runner, **kwargs))
+    except Exception as e:
+        result = _solo_error(features, e)
+    finally:
+        stream.close()
+
+    return await asyncio.to_thread(
+        _save_solo_results,
+        log_dir,
+        result,
+        repo_name,
+        task_id,
+        features,
+        run_name,
+        agent_name,
+        model_name,
+        run_id,
+        start_time,
+    )
+
+
+def _previous_result(log_dir: Path, run_name: str, force: bool) -> dict | None:
+    """Return the previous result marked as skipped, unless it must be re-run."""
+    if force:
+        return None
+
+    # The run index answers for tasks never run or run with an error without touching their dirs
+    index = get_run_index(run_name)
+    if index.exists():
+        indexed = index.get(log_dir).get("result")
+        if indexed is None or indexed["agent_error"]:
+            return None
 
+    result_file = log_dir / "result.json"
+    if not result_file.exists():
+        return None
+
+    with open(result_file) as f:
+        prev_result = json.load(f)
+    # Re-run if previous result was an error
+    if prev_result.get("agent", {}).get("status") == "Error":
+        return None
+    return {"skipped": True, **prev_result}
+
+
+def _solo_error(features: list[int], error: Exception) -> dict:
+    """Build the result dict for a solo agent that failed to run."""
+    return {
+        "features": features,
+        "agent_id": "solo",
+        "status": "Error",
+        "patch": "",
+        "cost": 0,
+        "steps": 0,
+        "messages": [],
+        "error": str(error),
+    }
+
+
+def _save_solo_results(
+    log_dir: Path,
+    result: dict,
+    repo_name: str,
+    task_id: int,
+    features: list[int],
+    run_name: str,
+    agent_name: str,
+    model_name: str,
+    run_id: str,
+    start_time: datetime,
+) -> dict:
+    """Write the patch, trajectory and result.json for a solo run."""
     end_time = datetime.now()
     duration = (end_time - start_time).total_seconds()
 
@@ -76,24 +184,20 @@ def execute_solo(
     patch_file.write_text(result.get("patch", ""))
 
     # Save trajectory
-    traj_file = log_dir / "solo_traj.json"
-    with open(traj_file, "w") as f:
-        json.dump(
-            {
-                "repo": repo_name,
-                "task_id": task_id,
-                "features": features,
-                "agent_id": "solo",
-                "model": model_name,
-                "status": result.get("status"),
-                "cost": result.get("cost"),
-                "steps": result.get("steps"),
-                "messages": result.get("messages", []),
-            },
-            f,
-            indent=2,
-            default=str,
-        )
+    compact_trajectory(
+        log_dir / "solo_traj.json",
+        {
+            "repo": repo_name,
+            "task_id": task_id,
+            "features": features,
+            "agent_id": "solo",
+            "model": model_name,
+            "status": result.get("status"),
+            "cost": result.get("cost"),
+            "steps": result.get("steps"),
+        },
+        result.get("messages", []),
+    )
 
     result_data = {
         "repo": repo_name,
@@ -121,6 +225,7 @@ def execute_solo(
 
     with open(log_dir / "result.json", "w") as f:
         json.dump(result_data, f, indent=2)
+    get_run_index(run_name).add_result(log_dir, result_data)
 
     return {
         "result": result,
@@ -141,12 +246,44 @@ def _spawn_solo_agent(
     quiet: bool = False,
     backend: str = "modal",
     agent_config: str | None = None,
+    response_log: Path | None = None,
+    on_message: Callable[[dict], None] | None = None,
 ) -> dict:
     """Spawn a single agent on multiple features (solo mode).
 
     Args:
         agent_config: Path to agent-specific configuration file (optional)
+        response_log: Sidecar file for the agent's raw LLM responses (optional)
+        on_message: Called with each trajectory message, if the adapter streams them (optional)
     """
+    runner, kwargs = _prepare_solo_agent(
+        repo_name=repo_name,
+        task_id=task_id,
+        features=features,
+        agent_name=agent_name,
+        model_name=model_name,
+        quiet=quiet,
+        backend=backend,
+        agent_config=agent_config,
+        response_log=response_log,
+        on_message=on_message,
+    )
+    return _solo_result(features, runner.run(**kwargs))
+
+
+def _prepare_solo_agent(
+    repo_name: str,
+    task_id: int,
+    features: list[int],
+    agent_name: str,
+    model_name: str,
+    quiet: bool = False,
+    backend: str = "modal",
+    agent_config: str | None = None,
+    response_log: Path | None = None,
+    on_message: Callable[[dict], None] | None = None,
+) -> tuple[AgentRunner, dict]:
+    """Resolve the adapter and run() arguments for the solo agent."""
     task_dir = Path("dataset") / repo_name / f"task{task_id}"
 
     # Combine feature specs
@@ -165,6 +302,8 @@ def _spawn_solo_agent(
 
     # Load agent config file if provided
     config = {"backend": backend}
+    if response_log:
+        config["response_log"] = str(response_log)
     if agent_config:
         config_path = Path(agent_config)
         if config_path.exists():
@@ -175,22 +314,27 @@ def _spawn_solo_agent(
         else:
             raise FileNotFoundError(f"Agent config file not found: {agent_config}")
 
-    # Use the agent framework adapter
     runner = get_runner(agent_name)
-    result = runner.run(
-        task=task,
-        image=image,
-        agent_id="solo",
-        model_name=model_name,
+    kwargs = {
+        "task": task,
+        "image": image,
+        "agent_id": "solo",
+        "model_name": model_name,
         # Solo mode: no collaboration
-        agents=None,
-        comm_url=None,
-        git_server_url=None,
-        git_enabled=False,
-        messaging_enabled=False,
-        config=config,
-    )
+        "agents": None,
+        "comm_url": None,
+        "git_server_url": None,
+        "git_enabled": False,
+        "messaging_enabled": False,
+        "config": config,
+    }
+    if on_message is not None and accepts_message_callback(runner):
+        kwargs["on_message"] = on_message
+    return runner, kwargs
+
 
+def _solo_result(features: list[int], result: AgentResult) -> dict:
+    """Convert an AgentResult into the solo result dict."""
     return {
         "features": features,
         "agent_id": "solo",
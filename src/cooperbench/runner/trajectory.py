@@ -0,0 +1,110 @@
+"""Streaming trajectory files.
+
+While an agent runs, every message it adds is appended to a JSONL stream next to
+its trajectory file (``agent1_traj.jsonl``, or ``agent1_traj.jsonl.zst`` with
+``COOPERBENCH_TRAJ_COMPRESSION=zstd``), so a crash keeps everything up to the
+last step. When the run is saved, ``compact_trajectory`` writes the usual
+``*_traj.json`` from the stream and removes it.
+"""
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import IO, Any
+
+TRAJ_COMPRESSION_ENV = "COOPERBENCH_TRAJ_COMPRESSION"
+
+_SUFFIXES = {None: ".jsonl", "zstd": ".jsonl.zst"}
+
+
+def _stream_path(traj_file: Path, compression: str | None) -> Path:
+    return traj_file.with_name(traj_file.stem + _SUFFIXES[compression])
+
+
+def _zstd():
+    try:
+        import zstandard
+    except ImportError as e:
+        raise ImportError(
+            f"{TRAJ_COMPRESSION_ENV}=zstd requires the zstandard package: pip install 'cooperbench[zstd]'"
+        ) from e
+    return zstandard
+
+
+class TrajectoryStream:
+    """Append-only JSONL stream of one agent's messages (safe to share across threads)."""
+
+    def __init__(self, traj_file: Path, compression: str | None = None):
+        """Initialize stream, removing any stream left behind by an earlier run.
+
+        Args:
+            traj_file: Trajectory file the stream will be compacted into
+            compression: "zstd" to compress the stream (default: $COOPERBENCH_TRAJ_COMPRESSION)
+        """
+        if compression is None:
+            compression = os.environ.get(TRAJ_COMPRESSION_ENV) or None
+        if compression not in _SUFFIXES:
+            raise ValueError(f"Unknown trajectory compression: {compression}")
+        self.compression = compression
+        self.path = _stream_path(traj_file, compression)
+        self._lock = threading.Lock()
+        self._file: IO[bytes] | None = None
+        for stale in _SUFFIXES.values():
+            traj_file.with_name(traj_file.stem + stale).unlink(missing_ok=True)
+
+    def append(self, message: dict[str, Any]) -> None:
+        """Write one message and flush it to disk."""
+        line = json.dumps(message, default=str).encode() + b"\n"
+        with self._lock:
+            if self._file is None:
+                self._file = self._open()
+            self._file.write(line)
+            self._file.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def _open(self) -> IO[bytes]:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if self.compression == "zstd":
+            return _zstd().ZstdCompressor().stream_writer(open(self.path, "wb"))
+        return open(self.path, "wb")
+
+
+def read_trajectory_stream(path: Path) -> list[dict[str, Any]]:
+    """Read the messages of a stream, ignoring a partially written last line."""
+    with open(path, "rb") as f:
+        data = _zstd().ZstdDecompressor().stream_reader(f).read() if path.suffix == ".zst" else f.read()
+    messages = []
+    for line in data.splitlines():
+        try:
+            messages.append(json.loads(line))
+        except ValueError:
+            break
+    return messages
+
+
+def compact_trajectory(traj_file: Path, trajectory: dict[str, Any], messages: list[dict[str, Any]]) -> None:
+    """Write a trajectory file and remove its stream.
+
+    The streamed messages are used if the agent streamed any; adapters that do not
+    stream fall back to the messages they returned.
+
+    Args:
+        traj_file: Trajectory file to write
+        trajectory: Trajectory fields other than "messages"
+        messages: Messages returned by the agent
+    """
+    streams = [p for p in (_stream_path(traj_file, c) for c in _SUFFIXES) if p.exists()]
+    if streams and (streamed := read_trajectory_stream(streams[0])):
+        messages = streamed
+
+    with open(traj_file, "w") as f:
+        json.dump({**trajectory, "messages": messages}, f, default=str)
+
+    for stream in streams:
+        stream.unlink()
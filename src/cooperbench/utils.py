@@ -14,6 +14,7 @@ import signal
 import sys
 import threading
 from collections.abc import Callable
+from pathlib import Path
 from typing import Generic, TypeVar
 
 from rich.console import Console
@@ -99,7 +100,9 @@ def setup_cleanup_handlers(tracker: ResourceTracker) -> None:
 
 
 def get_run_totals(run_name: str, setting: str) -> dict:
-    """Get time metrics and cost from all result.json files.
+    """Get time metrics and cost from all results of a run.
+
+    Reads the run index when present, otherwise every result.json file.
 
     Returns both:
     - wall_time: elapsed time from earliest start to latest end
@@ -112,9 +115,9 @@ def get_run_totals(run_name: str, setting: str) -> dict:
     Returns:
         {"wall_time": float, "run_time": float, "total_cost": float, "task_count": int}
     """
-    import json
     from datetime import datetime
-    from pathlib import Path
+
+    from cooperbench.runner.index import get_run_index
 
     log_dir = Path("logs") / run_name / setting
     if not log_dir.exists():
@@ -126,10 +129,15 @@ def get_run_totals(run_name: str, setting: str) -> dict:
     earliest_start = None
     latest_end = None
 
-    for result_file in log_dir.rglob("result.json"):
+    index = get_run_index(run_name)
+    if index.exists():
+        # Indexed results carry the same timing and cost fields as result.json
+        results = [e["result"] for e in index.entries().values() if "result" in e and e["result"]["setting"] == setting]
+    else:
+        results = _load_results(log_dir)
+
+    for result in results:
         try:
-            with open(result_file) as f:
-                result = json.load(f)
             total_cost += result.get("total_cost", 0)
             run_time += result.get("duration_seconds", 0)
             task_count += 1
@@ -156,6 +164,20 @@ def get_run_totals(run_name: str, setting: str) -> dict:
     return {"wall_time": wall_time, "run_time": run_time, "total_cost": total_cost, "task_count": task_count}
 
 
+def _load_results(log_dir: Path) -> list[dict]:
+    """Load every result.json under a directory (runs without an index)."""
+    import json
+
+    results = []
+    for result_file in log_dir.rglob("result.json"):
+        try:
+            with open(result_file) as f:
+                results.append(json.load(f))
+        except Exception:
+            pass
+    return results
+
+
 __all__ = [
     "console",
     "REGISTRY",
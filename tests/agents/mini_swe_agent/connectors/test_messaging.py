@@ -1,5 +1,8 @@
 """Tests for cooperbench.agents.mini_swe_agent.connectors.messaging module."""
 
+import threading
+import time
+
 import pytest
 
 from cooperbench.agents.mini_swe_agent.connectors import MessagingConnector
@@ -112,3 +115,35 @@ class TestMessagingConnector:
             url=f"{redis_url}#namespace1",
         )
         assert conn_ns1_receiver.peek() == 0
+
+    def test_receive_preserves_order(self, connector, connector2):
+        """Test that a batched receive returns messages in send order."""
+        for i in range(50):
+            connector.send("agent2", f"Message {i}")
+
+        messages = connector2.receive()
+        assert [m["content"] for m in messages] == [f"Message {i}" for i in range(50)]
+        assert connector2.peek() == 0
+
+    def test_wait_for_message_drains_inbox(self, connector, connector2):
+        """Test that wait_for_message returns every queued message."""
+        connector.send("agent2", "Message 1")
+        connector.send("agent2", "Message 2")
+
+        messages = connector2.wait_for_message(timeout=1)
+        assert [m["content"] for m in messages] == ["Message 1", "Message 2"]
+        assert connector2.peek() == 0
+
+    def test_wait_for_message_wakes_on_send(self, connector, connector2):
+        """Test that a blocked wait returns as soon as a message is sent."""
+        timer = threading.Timer(0.2, connector.send, args=("agent2", "Wake up"))
+        timer.start()
+        start = time.monotonic()
+
+        messages = connector2.wait_for_message(timeout=5)
+        assert [m["content"] for m in messages] == ["Wake up"]
+        assert time.monotonic() - start < 5
+
+    def test_wait_for_message_timeout(self, connector2):
+        """Test that wait_for_message returns empty after the timeout."""
+        assert connector2.wait_for_message(timeout=0.1) == []
@@ -0,0 +1,78 @@
+"""Tests for mini_swe_agent cache control message processing."""
+
+import copy
+
+import pytest
+
+from cooperbench.agents.mini_swe_agent.models.utils.cache_control import MessageProjector, set_cache_control
+
+
+def _history() -> list[dict]:
+    return [
+        {"role": "system", "content": "system", "timestamp": 1.0},
+        {"role": "user", "content": "task", "timestamp": 2.0},
+        {"role": "assistant", "content": "thought", "timestamp": 3.0, "extra": {"response": {"id": "r1"}}},
+        {
+            "role": "tool",
+            "content": [{"type": "text", "text": "obs", "cache_control": {"type": "ephemeral"}}],
+            "timestamp": 4.0,
+        },
+        {"role": "user", "content": "observation", "timestamp": 5.0},
+    ]
+
+
+def _reference(messages: list[dict], mode) -> list[dict]:
+    if mode:
+        messages = set_cache_control(messages, mode=mode)
+    return [{"role": m["role"], "content": m["content"]} for m in messages]
+
+
+class TestMessageProjector:
+    """Tests for MessageProjector."""
+
+    @pytest.mark.parametrize("mode", ["default_end", None])
+    def test_matches_set_cache_control(self, mode):
+        """Test that every prefix of a growing history projects like set_cache_control."""
+        history = _history()
+        projector = MessageProjector(mode=mode)
+
+        for n in range(1, len(history) + 1):
+            assert projector(history[:n]) == _reference(history[:n], mode)
+
+    def test_history_is_not_modified(self):
+        """Test that projecting does not touch the agent's messages."""
+        history = _history()
+        expected = copy.deepcopy(history)
+
+        MessageProjector(mode="default_end")(history)
+
+        assert history == expected
+
+    def test_only_last_message_is_marked(self):
+        """Test that the previous last message loses its mark when the history grows."""
+        history = _history()[:2]
+        projector = MessageProjector(mode="default_end")
+
+        first = projector(history)
+        history.append({"role": "assistant", "content": "next"})
+        second = projector(history)
+
+        assert first[1]["content"][0]["cache_control"] == {"type": "ephemeral"}
+        assert second[1] == {"role": "user", "content": "task"}
+        assert second[2]["content"][0]["cache_control"] == {"type": "ephemeral"}
+
+    def test_reset_history(self):
+        """Test that a new conversation replaces the cached projections."""
+        projector = MessageProjector(mode="default_end")
+        projector(_history())
+
+        result = projector([{"role": "system", "content": "other"}])
+
+        assert result == [
+            {"role": "system", "content": [{"type": "text", "text": "other", "cache_control": {"type": "ephemeral"}}]}
+        ]
+
+    def test_invalid_mode(self):
+        """Test that unknown modes are rejected."""
+        with pytest.raises(ValueError):
+            MessageProjector(mode="everywhere")  # type: ignore[arg-type]
@@ -0,0 +1,174 @@
+"""Tests for the mini_swe_agent DefaultAgent control loop (sync and async)."""
+
+import threading
+
+import pytest
+from jinja2 import UndefinedError
+
+from cooperbench.agents.mini_swe_agent.agents.default import DefaultAgent, get_template
+
+AGENT_CONFIG = {
+    "system_template": "system",
+    "instance_template": "{{ task }}",
+    "timeout_template": "timeout: {{ output }}",
+    "format_error_template": "format error",
+    "action_observation_template": "{{ output.output }}",
+}
+
+
+class FakeModel:
+    def __init__(self, responses: list[str]):
+        self.responses = list(responses)
+        self.n_calls = 0
+        self.cost = 0.0
+
+    def query(self, messages: list[dict]) -> dict:
+        self.n_calls += 1
+        return {"content": self.responses.pop(0)}
+
+    def get_template_vars(self) -> dict:
+        return {}
+
+
+class AsyncFakeModel(FakeModel):
+    async def aquery(self, messages: list[dict]) -> dict:
+        return self.query(messages)
+
+
+class FakeEnv:
+    def __init__(self):
+        self.commands: list[str] = []
+
+    def execute(self, command: str) -> dict:
+        self.commands.append(command)
+        if command.startswith("echo COMPLETE"):
+            return {"output": "COMPLETE_TASK_AND_SUBMIT_FINAL_OUTPUT\ndone", "returncode": 0}
+        if command == "boom":
+            raise RuntimeError("encoding issue")
+        return {"output": f"ran {command}", "returncode": 0}
+
+    def get_template_vars(self) -> dict:
+        return {}
+
+
+class AsyncFakeEnv(FakeEnv):
+    async def aexecute(self, command: str) -> dict:
+        return self.execute(command)
+
+
+class FakeComm:
+    def __init__(self):
+        self.sent: list[tuple[str, str]] = []
+
+    def send(self, recipient: str, content: str) -> None:
+        self.sent.append((recipient, content))
+
+    def receive(self) -> list[dict]:
+        return []
+
+
+RESPONSES = [
+    "```bash\nls\n```",
+    "no action here",
+    "```bash\nboom\n```",
+    '```bash\nsend_message agent2 "hi" && pwd\n```',
+    "```bash\necho COMPLETE\n```",
+]
+
+
+def _agent(model_cls, env_cls) -> DefaultAgent:
+    return DefaultAgent(model=model_cls(RESPONSES), env=env_cls(), comm=FakeComm(), **AGENT_CONFIG)
+
+
+class TestDefaultAgent:
+    """Tests for DefaultAgent.run / arun."""
+
+    def test_run(self):
+        """Test the sync loop handles actions, format errors, failures and messages."""
+        agent = _agent(FakeModel, FakeEnv)
+        status, message = agent.run(task="do it")
+
+        assert (status, message) == ("Submitted", "done")
+        assert agent.env.commands == ["ls", "boom", "pwd", "echo COMPLETE"]
+        assert agent.comm.sent == [("agent2", "hi")]
+
+    @pytest.mark.parametrize(
+        "model_cls,env_cls",
+        [(AsyncFakeModel, AsyncFakeEnv), (FakeModel, FakeEnv)],
+        ids=["native", "thread-fallback"],
+    )
+    async def test_arun_matches_run(self, model_cls, env_cls):
+        """Test that arun produces the same trajectory as run."""
+        sync_agent = _agent(FakeModel, FakeEnv)
+        sync_agent.run(task="do it")
+
+        agent = _agent(model_cls, env_cls)
+        result = await agent.arun(task="do it")
+
+        assert result == ("Submitted", "done")
+        strip = [{k: v for k, v in m.items() if k != "timestamp"} for m in agent.messages]
+        expected = [{k: v for k, v in m.items() if k != "timestamp"} for m in sync_agent.messages]
+        assert strip == expected
+
+    async def test_arun_blocking_io_off_event_loop(self):
+        """Test that messaging and on_message callbacks don't run on the event loop thread."""
+        loop_thread = threading.get_ident()
+        threads = set()
+
+        class RecordingComm(FakeComm):
+            def send(self, recipient: str, content: str) -> None:
+                threads.add(threading.get_ident())
+                super().send(recipient, content)
+
+            def receive(self) -> list[dict]:
+                threads.add(threading.get_ident())
+                return []
+
+        agent = DefaultAgent(model=AsyncFakeModel(RESPONSES), env=AsyncFakeEnv(), comm=RecordingComm(), **AGENT_CONFIG)
+        streamed = []
+        agent.on_message = lambda message: (threads.add(threading.get_ident()), streamed.append(message))
+
+        await agent.arun(task="do it")
+
+        assert streamed == agent.messages
+        assert agent.comm.sent == [("agent2", "hi")]
+        assert threads and loop_thread not in threads
+
+
+class TestRenderTemplate:
+    """Tests for DefaultAgent.render_template."""
+
+    def test_compiled_template_is_shared(self):
+        """Test that a template string is compiled once for all agents."""
+        assert get_template("{{ task }} {{ n }}") is get_template("{{ task }} {{ n }}")
+
+    def test_model_vars_are_current(self):
+        """Test that model template vars are re-read on every render."""
+        agent = _agent(FakeModel, FakeEnv)
+        agent.model.get_template_vars = lambda: {"n_model_calls": agent.model.n_calls}
+        template = "{{ step_limit }} {{ n_model_calls }} {{ output }}"
+
+        assert agent.render_template(template, output="a") == "50 0 a"
+        agent.model.n_calls = 3
+        assert agent.render_template(template, output="b") == "50 3 b"
+
+    def test_undefined_variable_raises(self):
+        """Test that templates still render with StrictUndefined."""
+        with pytest.raises(UndefinedError):
+            _agent(FakeModel, FakeEnv).render_template("{{ missing }}")
+
+
+class TestOnMessage:
+    """Tests for streaming messages through DefaultAgent.on_message."""
+
+    def test_every_message_is_streamed(self):
+        """Test that on_message sees each message as it is added, in order."""
+        agent = _agent(FakeModel, FakeEnv)
+        streamed = []
+        agent.on_message = streamed.append
+
+        agent.add_message("system", "s")
+        agent.add_message("user", "u", extra={"n": 1})
+
+        assert streamed == agent.messages
+        assert streamed[1]["extra"] == {"n": 1}
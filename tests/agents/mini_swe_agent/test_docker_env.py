@@ -0,0 +1,143 @@
+"""Tests for the mini_swe_agent DockerEnvironment shell worker.
+
+A local bash process stands in for the container; its output is framed like
+Docker's multiplexed exec stream, so no Docker daemon is required.
+"""
+
+import socket
+import struct
+import subprocess
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from cooperbench.agents.mini_swe_agent.environments.docker import DockerEnvironment
+
+
+def _attach_local_shell() -> socket.socket:
+    """Start a local bash and return a socket speaking Docker's exec stream protocol."""
+    ours, theirs = socket.socketpair()
+    proc = subprocess.Popen(
+        ["bash", "--noprofile", "--norc"],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        start_new_session=True,
+    )
+
+    def pump_stdin():
+        while data := theirs.recv(65536):
+            proc.stdin.write(data)
+            proc.stdin.flush()
+        proc.stdin.close()
+
+    def pump_output(stream, stream_id: int):
+        while data := stream.read1(65536):
+            try:
+                theirs.sendall(struct.pack(">BxxxL", stream_id, len(data)) + data)
+            except OSError:
+                return
+        if stream_id == 1:
+            theirs.close()
+
+    for target, args in [(pump_stdin, ()), (pump_output, (proc.stdout, 1)), (pump_output, (proc.stderr, 2))]:
+        threading.Thread(target=target, args=args, daemon=True).start()
+    return ours
+
+
+@pytest.fixture
+def env(tmp_path):
+    """DockerEnvironment whose worker is a local bash."""
+    client = MagicMock()
+    client.api.exec_start.side_effect = lambda *a, **k: _attach_local_shell()
+    with (
+        patch.object(DockerEnvironment, "_start_container", lambda self: setattr(self, "container", MagicMock())),
+        patch.object(DockerEnvironment, "_get_client", return_value=client),
+    ):
+        environment = DockerEnvironment(image="img", cwd=str(tmp_path), timeout=30)
+        yield environment
+        environment._close_worker()
+
+
+class TestDockerEnvironmentWorker:
+    """Tests for command execution through the persistent shell worker."""
+
+    def test_output_and_exit_code(self, env):
+        """Test that stdout, stderr and the exit code are returned."""
+        result = env.execute("echo out; echo err >&2; exit 3")
+
+        assert result["returncode"] == 3
+        assert "out" in result["output"]
+        assert "err" in result["output"]
+
+    def test_worker_is_reused(self, env):
+        """Test that consecutive commands share one worker exec."""
+        env.execute("true")
+        env.execute("true")
+
+        assert env._get_client().api.exec_create.call_count == 1
+
+    def test_commands_are_isolated(self, env):
+        """Test that each command runs in a fresh shell in the working directory."""
+        env.execute("cd / && export FOO=1")
+        result = env.execute("pwd; echo ${FOO:-unset}")
+
+        # Login shells may print profile noise first; check the command's own output
+        assert result["output"].split()[-2:] == [env.config.cwd, "unset"]
+
+    def test_quoting_and_no_trailing_newline(self, env):
+        """Test that commands are passed verbatim and output is not altered."""
+        result = env.execute("""printf '%s' "a'b \\"c\\" $((1+1))" """)
+
+        assert result["output"].endswith('a\'b "c" 2')
+
+    def test_timeout_kills_process_group(self, env):
+        """Test that a timed-out command and its children are killed."""
+        start = time.monotonic()
+        result = env.execute("(sleep 31.25 && true) & sleep 31.25", timeout=1)
+
+        assert result["returncode"] == -1
+        assert "timed out" in result["output"]
+        assert time.monotonic() - start < 20
+
+        # The background child was killed with the group and the worker survives
+        assert subprocess.run(["pgrep", "-f", "^sleep 31.25"], capture_output=True).returncode == 1
+        assert env.execute("echo alive")["output"].endswith("alive\n")
+        assert env._get_client().api.exec_create.call_count == 1
+
+    def test_worker_restarts_after_exit(self, env):
+        """Test that a worker killed by a command is replaced transparently."""
+        env.execute("true")
+        env._worker._sock.shutdown(socket.SHUT_RDWR)
+        result = env.execute("echo ok")
+
+        assert result["output"].endswith("ok\n")
+        assert env._get_client().api.exec_create.call_count == 2
+
+    def test_command_not_rerun_when_worker_dies(self, env, tmp_path):
+        """Test that a command interrupted by the worker exiting is reported, not run again."""
+        runs = tmp_path / "runs"
+
+        def kill_worker():
+            while not runs.exists():
+                time.sleep(0.01)
+            env._worker._sock.shutdown(socket.SHUT_RDWR)
+
+        killer = threading.Thread(target=kill_worker)
+        killer.start()
+        result = env.execute(f"echo run >> {runs}; sleep 2")
+        killer.join()
+
+        assert result["returncode"] == -1
+        assert "shell worker exited" in result["output"]
+        assert runs.read_text() == "run\n"
+        assert env.execute("echo ok")["output"].endswith("ok\n")
+        assert env._get_client().api.exec_create.call_count == 2
+
+    def test_large_output(self, env):
+        """Test that output spanning many stream frames is reassembled."""
+        result = env.execute("head -c 3000000 /dev/zero | tr '\\0' a")
+
+        assert result["output"].endswith("a" * 3_000_000)
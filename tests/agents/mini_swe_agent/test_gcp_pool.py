@@ -0,0 +1,255 @@
+"""Tests for pooled GCP VMs (bin-packing agent containers onto shared VMs).
+
+VMs are stand-ins that record the commands they are given, so no GCP project
+is required (see tests/integration/test_gcp_pool.py for containers on the
+local Docker daemon).
+"""
+
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from cooperbench.agents.mini_swe_agent.connectors.git_servers import GCPSidecarGitServer, create_git_server
+from cooperbench.agents.mini_swe_agent.environments import gcp_pool
+from cooperbench.agents.mini_swe_agent.environments.gcp import GCPEnvironment
+from cooperbench.agents.mini_swe_agent.environments.gcp_pool import VMHost, VMPool, machine_memory_gb
+
+
+class FakeVMs:
+    """Provider booting fake VMs; each records the commands run on it."""
+
+    def __init__(self, boot_delay: float = 0.0):
+        self.boot_delay = boot_delay
+        self.booted: list[VMHost] = []
+        self.closed: list[str] = []
+        self.commands: dict[str, list[str]] = {}
+
+    def __call__(self, host: VMHost) -> None:
+        time.sleep(self.boot_delay)
+        host.name = f"vm-{len(self.booted)}"
+        self.booted.append(host)
+        commands = self.commands.setdefault(host.name, [])
+
+        def run(command, timeout=None):
+            commands.append(command)
+            if command.startswith("docker inspect"):
+                # Containers are running once started
+                name = command.split()[-1]
+                started = any(c.startswith(f"docker run -d --name {name} ") for c in commands)
+                return {"output": "true" if started else "", "returncode": 0 if started else 1}
+            # /proc/1/cmdline of a started git daemon
+            return {"output": "git\0daemon\0", "returncode": 0}
+
+        host.attach(run, lambda: self.closed.append(host.name))
+
+
+@pytest.fixture(autouse=True)
+def _fresh_pools(monkeypatch):
+    """Isolate the process-wide pool registry."""
+    monkeypatch.setattr(gcp_pool, "_pools", {})
+
+
+class TestVMPool:
+    """Tests for placing containers on pooled VMs."""
+
+    def test_packs_until_full(self):
+        """Test that containers share a VM until its memory is used up."""
+        vms = FakeVMs()
+        pool = VMPool(vms, capacity_gb=7)
+
+        hosts = [pool.acquire("img", 2) for _ in range(4)]
+
+        assert hosts[0] is hosts[1] is hosts[2]
+        assert hosts[3] is not hosts[0]
+        assert len(vms.booted) == 2
+
+    def test_prefers_vm_with_image(self):
+        """Test that a VM that already pulled the image is preferred."""
+        pool = VMPool(FakeVMs(), capacity_gb=4)
+        a = pool.acquire("a", 3)
+        b = pool.acquire("b", 3)
+        pool.mark_pulled(a, "a")
+        pool.mark_pulled(b, "b")
+        pool.release(a, 3)
+        pool.release(b, 3)
+
+        assert pool.acquire("b", 2) is b
+        assert pool.acquire("a", 2) is a
+
+    def test_best_fit(self):
+        """Test that the fullest VM with room is used."""
+        pool = VMPool(FakeVMs(), capacity_gb=8)
+        a = pool.acquire("img", 6)
+        b = pool.acquire("img", 6)
+        pool.release(b, 6)
+        pool.acquire("img", 4)  # b now has 4 GB left, a has 2 GB
+
+        assert pool.acquire("img", 2) is a
+
+    def test_group_is_co_located(self):
+        """Test that a group reserves room for all members on one VM."""
+        vms = FakeVMs()
+        pool = VMPool(vms, capacity_gb=6)
+
+        first = pool.acquire("img", 2, group="run", group_memory_gb=4)
+        other = pool.acquire("img", 2)
+        second = pool.acquire("img", 2, group="run", group_memory_gb=4)
+        third = pool.acquire("img", 2)
+
+        assert first is second is other
+        assert third is not first
+
+    def test_release_reports_last_member(self):
+        """Test that release tells when the group's last member leaves."""
+        pool = VMPool(FakeVMs(), capacity_gb=8)
+        a = pool.acquire("img", 2, group="run", group_memory_gb=4)
+        b = pool.acquire("img", 2, group="run", group_memory_gb=4)
+
+        assert pool.release(a, 2, "run") is False
+        assert a.used_gb == 4
+        assert pool.release(b, 2, "run") is True
+        assert a.used_gb == 0
+
+    def test_concurrent_acquire_boots_once(self):
+        """Test that containers arriving while a VM boots wait for it instead of booting more."""
+        vms = FakeVMs(boot_delay=0.2)
+        pool = VMPool(vms, capacity_gb=8)
+        hosts = []
+
+        threads = [threading.Thread(target=lambda: hosts.append(pool.acquire("img", 2))) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert len(vms.booted) == 1
+        assert len({id(h) for h in hosts}) == 1
+
+    def test_boot_failure(self):
+        """Test that a VM that fails to boot is dropped from the pool."""
+
+        def provider(host):
+            raise RuntimeError("quota exceeded")
+
+        pool = VMPool(provider, capacity_gb=8)
+
+        with pytest.raises(RuntimeError, match="quota exceeded"):
+            pool.acquire("img", 2)
+        assert pool.hosts == []
+
+    def test_idle_vms_deleted(self):
+        """Test that VMs empty past the idle timeout are deleted."""
+        vms = FakeVMs()
+        pool = VMPool(vms, capacity_gb=8, idle_timeout=0)
+        host = pool.acquire("img", 2)
+
+        pool.release(host, 2)
+        for _ in range(50):
+            if vms.closed:
+                break
+            time.sleep(0.01)
+
+        assert vms.closed == [host.name]
+        assert pool.hosts == []
+
+    def test_too_large(self):
+        """Test that containers larger than a VM are rejected."""
+        pool = VMPool(FakeVMs(), capacity_gb=3)
+
+        with pytest.raises(ValueError):
+            pool.acquire("img", 4)
+
+    def test_machine_memory(self):
+        """Test memory lookup of machine types."""
+        assert machine_memory_gb("e2-standard-4") == 16
+        assert machine_memory_gb("e2-custom-4-8192") == 8
+        with pytest.raises(ValueError):
+            machine_memory_gb("a2-ultragpu-1g")
+
+
+@pytest.fixture
+def fake_vms():
+    """Boot pooled VMs as fakes instead of Compute Engine instances."""
+    vms = FakeVMs()
+    with patch.object(GCPEnvironment, "_boot_pool_vm", lambda config, logger, host: vms(host)):
+        yield vms
+
+
+def _pooled_env(**kwargs) -> GCPEnvironment:
+    return GCPEnvironment(
+        image="img",
+        project_id="proj",
+        machine_type="e2-standard-4",
+        cwd="/workspace",
+        vm_pool=True,
+        **kwargs,
+    )
+
+
+class TestPooledGCPEnvironment:
+    """Tests for GCPEnvironment on pooled VMs."""
+
+    def test_pair_shares_vm(self, fake_vms):
+        """Test that both agents of a run get their own container on one VM."""
+        a = _pooled_env(vm_group="run", vm_group_size=2)
+        b = _pooled_env(vm_group="run", vm_group_size=2)
+
+        assert len(fake_vms.booted) == 1
+        assert a._container_name != b._container_name
+        runs = [c for c in fake_vms.commands["vm-0"] if c.startswith("docker run")]
+        assert len(runs) == 2
+        assert all("--memory 2048m" in c for c in runs)
+
+    def test_execute_targets_own_container(self, fake_vms):
+        """Test that commands run in the environment's container."""
+        env = _pooled_env()
+
+        env.execute("ls")
+
+        assert fake_vms.commands["vm-0"][-1].startswith(f"docker exec -w /workspace {env._container_name} ")
+
+    def test_git_sidecar_started_once(self, fake_vms):
+        """Test that the run's git server starts once and the agents join its network."""
+        sidecar = "cooperbench-git-run"
+
+        _pooled_env(vm_group="run", vm_group_size=2, git_sidecar=sidecar)
+        _pooled_env(vm_group="run", vm_group_size=2, git_sidecar=sidecar)
+
+        commands = fake_vms.commands["vm-0"]
+        sidecar_runs = [c for c in commands if c.startswith(f"docker run -d --name {sidecar} ")]
+        agent_runs = [c for c in commands if c.startswith("docker run -d --name agent-")]
+        assert len(sidecar_runs) == 1
+        assert len(agent_runs) == 2
+        assert all(f"--network {sidecar}" in c for c in agent_runs)
+
+    def test_cleanup_keeps_vm(self, fake_vms):
+        """Test that cleanup removes the container but keeps the VM for reuse."""
+        a = _pooled_env(vm_group="run", vm_group_size=2, git_sidecar="cooperbench-git-run")
+        b = _pooled_env(vm_group="run", vm_group_size=2, git_sidecar="cooperbench-git-run")
+
+        a.cleanup()
+        assert not any("network rm" in c for c in fake_vms.commands["vm-0"])
+        b.cleanup()
+
+        assert fake_vms.closed == []
+        assert f"docker rm -f {a._container_name}" in fake_vms.commands["vm-0"]
+        assert "docker network rm cooperbench-git-run" in fake_vms.commands["vm-0"][-1]
+        c = _pooled_env()
+        assert len(fake_vms.booted) == 1
+        c.cleanup()
+
+
+class TestSidecarGitServer:
+    """Tests for the git server of pooled runs."""
+
+    def test_create_git_server_uses_sidecar(self, monkeypatch):
+        """Test that the gcp backend describes a sidecar when VMs are pooled."""
+        monkeypatch.setenv("COOPERBENCH_GCP_VM_POOL", "1")
+
+        server = create_git_server("gcp", run_id="abc")
+
+        assert isinstance(server, GCPSidecarGitServer)
+        assert server.url == "git://cooperbench-git-abc:9418/repo.git"
+        assert server.network_name == "cooperbench-git-abc"
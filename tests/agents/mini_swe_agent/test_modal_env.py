@@ -0,0 +1,150 @@
+"""Tests for the mini_swe_agent Modal image cache and manifest (no Modal access)."""
+
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from cooperbench.agents.mini_swe_agent.environments import modal as modal_env
+from cooperbench.agents.mini_swe_agent.environments.modal import IMAGE_SPEC_VERSION, ImageManifest
+
+
+@pytest.fixture
+def manifest(tmp_path, monkeypatch):
+    """Fresh manifest installed as the process-wide one, with an empty image cache."""
+    manifest = ImageManifest(tmp_path / "modal_images.json")
+    monkeypatch.setattr(modal_env, "_manifest", manifest)
+    monkeypatch.setattr(modal_env, "_image_cache", {})
+    monkeypatch.setattr(modal_env, "_manifest_images", {})
+    return manifest
+
+
+class TestImageManifest:
+    """Tests for ImageManifest persistence."""
+
+    def test_put_and_get_across_instances(self, tmp_path):
+        """Test that recorded image IDs are visible to a new process."""
+        path = tmp_path / "modal_images.json"
+        ImageManifest(path).put("repo/img:1", "im-123")
+
+        assert ImageManifest(path).get("repo/img:1") == "im-123"
+        assert ImageManifest(path).get("repo/img:2") is None
+
+    def test_discard(self, tmp_path):
+        """Test that discarded entries are removed from disk."""
+        path = tmp_path / "modal_images.json"
+        ImageManifest(path).put("repo/img:1", "im-123")
+        ImageManifest(path).discard("repo/img:1")
+
+        assert ImageManifest(path).get("repo/img:1") is None
+
+    def test_spec_version_mismatch_ignored(self, tmp_path):
+        """Test that a manifest from another image spec version is ignored."""
+        path = tmp_path / "modal_images.json"
+        path.write_text(json.dumps({"spec": "old", "images": {"repo/img:1": "im-123"}}))
+
+        assert ImageManifest(path).get("repo/img:1") is None
+
+    def test_corrupt_file_ignored(self, tmp_path):
+        """Test that an unreadable manifest behaves as empty."""
+        path = tmp_path / "modal_images.json"
+        path.write_text("{not json")
+        manifest = ImageManifest(path)
+        manifest.put("repo/img:1", "im-123")
+
+        assert json.loads(path.read_text()) == {"spec": IMAGE_SPEC_VERSION, "images": {"repo/img:1": "im-123"}}
+
+
+class TestGetOrBuildImage:
+    """Tests for _get_or_build_image manifest lookups."""
+
+    def test_uses_manifest_image_id(self, manifest):
+        """Test that a recorded image is loaded by ID instead of from the registry."""
+        manifest.put("repo/img:1", "im-123")
+        with (
+            patch.object(modal_env.modal.Image, "from_id") as from_id,
+            patch.object(modal_env.modal.Image, "from_registry") as from_registry,
+        ):
+            image = modal_env._get_or_build_image("repo/img:1")
+
+        from_id.assert_called_once_with("im-123")
+        from_registry.assert_not_called()
+        assert image is from_id.return_value
+
+    def test_stale_image_id_falls_back_to_registry(self, manifest):
+        """Test that a sandbox whose manifest image no longer resolves is started from the registry."""
+        manifest.put("repo/img:1", "im-gone")
+        stale, rebuilt = MagicMock(name="stale"), MagicMock(name="rebuilt", object_id="im-new")
+        created = []
+
+        def create(image, **kwargs):
+            created.append(image)
+            if image is stale:
+                raise Exception("NOT_FOUND: Image im-gone not found")
+            return MagicMock(object_id="sb-1")
+
+        with (
+            patch.object(modal_env.modal.Image, "from_id", return_value=stale),
+            patch.object(modal_env.modal.Image, "from_registry") as from_registry,
+            patch.object(modal_env.modal.Sandbox, "create", side_effect=create),
+            patch.object(modal_env, "_get_global_app"),
+        ):
+            from_registry.return_value.entrypoint.return_value.env.return_value = rebuilt
+            env = modal_env.ModalEnvironment(image="repo/img:1", max_retries=1)
+
+        from_registry.assert_called_once_with("repo/img:1")
+        assert created == [stale, rebuilt]
+        assert env.sb.object_id == "sb-1"
+        assert manifest.get("repo/img:1") == "im-new"
+
+    def test_non_manifest_failure_not_retried_from_registry(self, manifest):
+        """Test that sandbox failures with a registry image are left to the normal retry logic."""
+        with (
+            patch.object(modal_env.modal.Image, "from_registry") as from_registry,
+            patch.object(modal_env.modal.Sandbox, "create", side_effect=ValueError("bad config")),
+            patch.object(modal_env, "_get_global_app"),
+            pytest.raises(ValueError),
+        ):
+            modal_env.ModalEnvironment(image="repo/img:1", max_retries=1)
+
+        from_registry.assert_called_once_with("repo/img:1")
+
+    def test_hydrate_force_bypasses_manifest(self, manifest):
+        """Test that a forced hydrate resolves the image from the registry again."""
+        manifest.put("repo/img:1", "im-old")
+        with (
+            patch.object(modal_env.modal.Image, "from_id") as from_id,
+            patch.object(modal_env.modal.Image, "from_registry") as from_registry,
+            patch.object(modal_env, "_get_global_app"),
+        ):
+            from_registry.return_value.entrypoint.return_value.env.return_value = MagicMock(object_id="im-new")
+            assert modal_env.hydrate_image("repo/img:1", force=True) == "im-new"
+
+        from_id.assert_not_called()
+        assert manifest.get("repo/img:1") == "im-new"
+
+    def test_hydrate_stale_manifest_id_rebuilds(self, manifest):
+        """Test that hydrating a manifest image whose ID no longer resolves rebuilds it."""
+        manifest.put("repo/img:1", "im-gone")
+        with (
+            patch.object(modal_env.modal.Image, "from_id") as from_id,
+            patch.object(modal_env.modal.Image, "from_registry") as from_registry,
+            patch.object(modal_env, "_get_global_app"),
+        ):
+            from_id.return_value.build.side_effect = Exception("NOT_FOUND")
+            from_registry.return_value.entrypoint.return_value.env.return_value = MagicMock(object_id="im-new")
+            assert modal_env.hydrate_image("repo/img:1") == "im-new"
+
+        assert manifest.get("repo/img:1") == "im-new"
+
+    def test_hydrate_image_records_id(self, manifest):
+        """Test that hydrate_image builds the image and records its ID."""
+        image = MagicMock(object_id="im-456")
+        with (
+            patch.object(modal_env, "_get_or_build_image", return_value=image),
+            patch.object(modal_env, "_get_global_app"),
+        ):
+            assert modal_env.hydrate_image("repo/img:1") == "im-456"
+
+        image.build.assert_called_once()
+        assert manifest.get("repo/img:1") == "im-456"
@@ -0,0 +1,76 @@
+"""Tests for storing raw LLM responses outside the mini_swe_agent messages."""
+
+import gzip
+
+from cooperbench.agents.mini_swe_agent.models.litellm_model import LitellmModel
+from cooperbench.agents.mini_swe_agent.models.utils.response_log import ResponseLog, read_responses
+
+
+class FakeResponse:
+    def __init__(self, n: int):
+        self.n = n
+
+    def model_dump(self) -> dict:
+        return {"id": f"resp-{self.n}", "usage": {"total_tokens": self.n}}
+
+
+class TestResponseLog:
+    """Tests for the compressed response sidecar."""
+
+    def test_append_and_read(self, tmp_path):
+        """Test that responses are written in order and referenced by index."""
+        log = ResponseLog(tmp_path / "agent1_responses.jsonl.gz")
+
+        refs = [log.append({"n": i}) for i in range(3)]
+        log.close()
+
+        assert refs[2] == {"file": "agent1_responses.jsonl.gz", "index": 2}
+        assert read_responses(log.path) == [{"n": 0}, {"n": 1}, {"n": 2}]
+
+    def test_readable_before_close(self, tmp_path):
+        """Test that responses are readable if the writer never closes the file."""
+        log = ResponseLog(tmp_path / "r.jsonl.gz")
+        log.append({"n": 0})
+        log.append({"n": 1})
+
+        assert read_responses(log.path) == [{"n": 0}, {"n": 1}]
+        log.close()
+
+    def test_truncates_previous_run(self, tmp_path):
+        """Test that a new log replaces the file of an earlier run."""
+        path = tmp_path / "r.jsonl.gz"
+        with gzip.open(path, "wt") as f:
+            f.write('{"old": true}\n')
+
+        log = ResponseLog(path)
+        log.append({"n": 0})
+        log.close()
+
+        assert read_responses(path) == [{"n": 0}]
+
+
+class TestLitellmModelResponseStorage:
+    """Tests for LitellmModel response_storage modes."""
+
+    def test_sidecar(self, tmp_path):
+        """Test that sidecar mode keeps only a reference in the message."""
+        model = LitellmModel(model_name="gpt-4o", response_log=str(tmp_path / "r.jsonl.gz"))
+
+        extra = model._store_response(FakeResponse(1))
+        model.close()
+
+        assert extra == {"response_ref": {"file": "r.jsonl.gz", "index": 0}}
+        assert read_responses(tmp_path / "r.jsonl.gz") == [FakeResponse(1).model_dump()]
+
+    def test_sidecar_without_path_is_inline(self):
+        """Test that responses stay inline when no sidecar file is configured."""
+        model = LitellmModel(model_name="gpt-4o", response_storage="sidecar")
+
+        assert model._store_response(FakeResponse(1)) == {"response": FakeResponse(1).model_dump()}
+
+    def test_drop(self, tmp_path):
+        """Test that drop mode stores nothing."""
+        model = LitellmModel(model_name="gpt-4o", response_storage="drop", response_log=str(tmp_path / "r.jsonl.gz"))
+
+        assert model._store_response(FakeResponse(1)) == {}
+        assert not (tmp_path / "r.jsonl.gz").exists()
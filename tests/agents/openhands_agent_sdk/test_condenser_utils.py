@@ -0,0 +1,158 @@
+"""Tests for the cached token counts in the OpenHands SDK condenser utils (requires the openhands extra).
+
+Prefix counts are checked against tokenizing the whole prefix with
+LLM.get_token_count, which is what the utils did before counts were cached.
+"""
+
+import random
+
+import pytest
+
+pytest.importorskip("openhands.sdk")
+
+from openhands.sdk import LLM, Message, MessageEvent, TextContent  # noqa: E402
+from openhands.sdk.context.condenser import utils  # noqa: E402
+from openhands.sdk.event import ActionEvent, LLMConvertibleEvent, ObservationEvent  # noqa: E402
+from openhands.sdk.llm import MessageToolCall  # noqa: E402
+from openhands.sdk.tool.builtins.think import ThinkAction, ThinkObservation  # noqa: E402
+
+WORDS = ["alpha", "beta", "gamma", "delta", "épsilon", "漢字", "{}", "\n"]
+
+
+@pytest.fixture(autouse=True)
+def clear_token_counts():
+    utils._token_counts.clear()
+    yield
+    utils._token_counts.clear()
+
+
+@pytest.fixture
+def llm():
+    return LLM(model="gpt-4o", usage_id="test")
+
+
+def _text(rng: random.Random) -> str:
+    return " ".join(rng.choices(WORDS, k=rng.randint(1, 30)))
+
+
+def _history(n: int, seed: int) -> list[LLMConvertibleEvent]:
+    """Messages, batches of parallel actions and their observations."""
+    rng = random.Random(seed)
+    events: list[LLMConvertibleEvent] = []
+    while len(events) < n:
+        kind = rng.choice(["message", "actions"])
+        if kind == "message":
+            source = rng.choice(["user", "agent"])
+            events.append(
+                MessageEvent(source=source, llm_message=Message(role="user", content=[TextContent(text=_text(rng))]))
+            )
+            continue
+        response_id = f"resp{len(events)}"
+        calls = [f"call{len(events)}_{k}" for k in range(rng.randint(1, 3))]
+        for k, call in enumerate(calls):
+            events.append(
+                ActionEvent(
+                    # Only the first action of a batch carries the thought
+                    thought=[] if k else [TextContent(text=_text(rng))],
+                    action=ThinkAction(thought=_text(rng)),
+                    tool_name="think",
+                    tool_call_id=call,
+                    tool_call=MessageToolCall(id=call, name="think", arguments='{"thought": "x"}', origin="completion"),
+                    llm_response_id=response_id,
+                )
+            )
+        for call in calls:
+            events.append(
+                ObservationEvent(
+                    observation=ThinkObservation.from_text(_text(rng)),
+                    action_id=call,
+                    tool_name="think",
+                    tool_call_id=call,
+                )
+            )
+    return events[:n]
+
+
+def _whole_count(events, llm) -> int:
+    return llm.get_token_count(LLMConvertibleEvent.events_to_messages(list(events)))
+
+
+def _whole_shortest_prefix(events, llm, token_count) -> int:
+    """Binary search over whole-prefix counts, as before caching."""
+    if _whole_count(events, llm) <= token_count:
+        return len(events)
+    left, right = 1, len(events)
+    while left < right:
+        mid = (left + right) // 2
+        if _whole_count(events[:mid], llm) > token_count:
+            right = mid
+        else:
+            left = mid + 1
+    return left
+
+
+class TestPrefixTokenCounter:
+    """Tests for _PrefixTokenCounter against whole-prefix get_token_count."""
+
+    @pytest.mark.parametrize("seed", range(3))
+    def test_every_prefix_matches(self, llm, seed):
+        """Test that every prefix count, including ones ending inside an action batch, matches."""
+        events = _history(40, seed)
+        counter = utils._PrefixTokenCounter(events, llm)
+
+        assert [counter.count(k) for k in range(len(events) + 1)] == [
+            _whole_count(events[:k], llm) for k in range(len(events) + 1)
+        ]
+
+    @pytest.mark.parametrize("seed", range(3))
+    def test_shortest_prefix_matches(self, llm, seed):
+        """Test that get_shortest_prefix_above_token_count agrees with the whole-prefix search."""
+        events = _history(40, seed)
+        total = _whole_count(events, llm)
+
+        for token_count in [0, 5, total // 3, total // 2, total - 1, total, total + 10]:
+            assert utils.get_shortest_prefix_above_token_count(events, llm, token_count) == _whole_shortest_prefix(
+                events, llm, token_count
+            )
+
+    def test_total_matches(self, llm):
+        """Test that get_total_token_count matches whole-conversation counts, including empty."""
+        events = _history(25, seed=4)
+
+        assert utils.get_total_token_count(events, llm) == _whole_count(events, llm)
+        assert utils.get_total_token_count([], llm) == _whole_count([], llm)
+
+    def test_appending_counts_only_new_message(self, llm, monkeypatch):
+        """Test that after a first count, appending an event tokenizes just that event's message."""
+        events = _history(30, seed=5)
+        utils.get_total_token_count(events, llm)
+        calls = []
+        original = LLM.get_token_count
+        monkeypatch.setattr(
+            LLM, "get_token_count", lambda self, messages: calls.append(messages) or original(self, messages)
+        )
+
+        extra = MessageEvent(source="user", llm_message=Message(role="user", content=[TextContent(text="more")]))
+        total = utils.get_total_token_count([*events, extra], llm)
+
+        assert len(calls) == 1 and len(calls[0]) == 1
+        monkeypatch.undo()
+        assert total == _whole_count([*events, extra], llm)
+
+    def test_failed_count_not_cached(self, llm, monkeypatch):
+        """Test that a count from a failing tokenizer (which returns 0) is recounted later."""
+        events = _history(20, seed=7)
+        monkeypatch.setattr(LLM, "get_token_count", lambda self, messages: 0)
+        assert utils.get_total_token_count(events, llm) == 0
+
+        monkeypatch.undo()
+
+        assert utils.get_total_token_count(events, llm) == _whole_count(events, llm)
+
+    def test_tokenizers_cached_separately(self, llm):
+        """Test that counts cached for one model are not reused for another."""
+        events = _history(20, seed=6)
+        other = LLM(model="anthropic/claude-3-5-sonnet-20240620", usage_id="test")
+        utils.get_total_token_count(events, llm)
+
+        assert utils.get_total_token_count(events, other) == _whole_count(events, other)
@@ -0,0 +1,197 @@
+"""Tests for the OpenHands SDK segmented event log (requires the openhands extra).
+
+The segmented layout is checked against the one-file-per-event EventLog on
+generated histories, including reopening, migration and torn-append repair.
+"""
+
+import random
+
+import pytest
+
+pytest.importorskip("openhands.sdk")
+
+from openhands.sdk import LocalFileStore, Message, MessageEvent, TextContent  # noqa: E402
+from openhands.sdk.conversation.event_store import (  # noqa: E402
+    EVENT_LOG_FORMAT_ENV,
+    EventLog,
+    SegmentedEventLog,
+    _segment_index_path,
+    _segment_path,
+    migrate_event_log,
+    open_event_log,
+)
+
+# Characters str.splitlines() treats as line breaks but JSON leaves unescaped
+LINE_BREAKS = "\u2028\u2029\x85\x1c\x1d\x1e\x0b\x0c"
+
+
+def _history(n: int, seed: int = 0) -> list[MessageEvent]:
+    rng = random.Random(seed)
+    alphabet = "abc xyz\n\t\"'\\{}é漢" + LINE_BREAKS
+    return [
+        MessageEvent(
+            source=rng.choice(["user", "agent"]),
+            llm_message=Message(
+                role="user",
+                content=[TextContent(text="".join(rng.choices(alphabet, k=rng.randint(0, 40))))],
+            ),
+        )
+        for _ in range(n)
+    ]
+
+
+def _dump(events) -> list[str]:
+    return [e.model_dump_json() for e in events]
+
+
+class TestSegmentedEventLog:
+    """Tests for SegmentedEventLog against EventLog."""
+
+    @pytest.mark.parametrize("seed", range(5))
+    def test_matches_event_log(self, tmp_path, seed):
+        """Test that both layouts return the same events, IDs and indices, before and after reopening."""
+        events = _history(40, seed)
+        files = EventLog(LocalFileStore(str(tmp_path / "files")))
+        segmented = SegmentedEventLog(LocalFileStore(str(tmp_path / "segmented")), segment_size=7)
+        for event in events:
+            files.append(event)
+            segmented.append(event)
+
+        reopened = SegmentedEventLog(LocalFileStore(str(tmp_path / "segmented")))
+        for log in (segmented, reopened):
+            assert len(log) == len(files) == 40
+            assert _dump(log) == _dump(files) == _dump(events)
+            assert _dump(log[5:33:3]) == _dump(files[5:33:3])
+            assert log[-1].id == files[-1].id
+            assert [log.get_index(e.id) for e in events] == list(range(40))
+            assert [log.get_id(i) for i in range(40)] == [files.get_id(i) for i in range(40)]
+
+    def test_unicode_line_separators_round_trip(self, tmp_path):
+        """Test that events containing U+2028 and friends survive append, reopen and read."""
+        events = [
+            MessageEvent(source="user", llm_message=Message(role="user", content=[TextContent(text=f"a{c}b")]))
+            for c in LINE_BREAKS
+        ]
+        log = SegmentedEventLog(LocalFileStore(str(tmp_path)), segment_size=4)
+        for event in events:
+            log.append(event)
+
+        reopened = SegmentedEventLog(LocalFileStore(str(tmp_path)))
+
+        assert len(reopened) == len(events)
+        assert _dump(reopened) == _dump(events)
+        assert [e.llm_message.content[0].text for e in reopened] == [f"a{c}b" for c in LINE_BREAKS]
+
+    def test_duplicate_id_rejected(self, tmp_path):
+        """Test that appending an event ID twice raises like EventLog does."""
+        event = _history(1)[0]
+        log = SegmentedEventLog(LocalFileStore(str(tmp_path)))
+        log.append(event)
+
+        with pytest.raises(ValueError, match="already exists"):
+            log.append(event)
+
+
+class TestTornAppendRepair:
+    """Tests for repairing a crash between the segment and index appends."""
+
+    def _log_with_torn_append(self, tmp_path, torn_line: str) -> list[MessageEvent]:
+        events = _history(10, seed=7)
+        fs = LocalFileStore(str(tmp_path))
+        log = SegmentedEventLog(fs, segment_size=4)
+        for event in events:
+            log.append(event)
+        fs.append(_segment_path("events", 2), torn_line)
+        return events
+
+    def test_event_without_index_entry_dropped(self, tmp_path):
+        """Test that an event line written without its index entry is discarded on reopen."""
+        events = self._log_with_torn_append(tmp_path, _history(1, seed=99)[0].model_dump_json() + "\n")
+
+        reopened = SegmentedEventLog(LocalFileStore(str(tmp_path)))
+
+        assert _dump(reopened) == _dump(events)
+
+    def test_partial_line_dropped(self, tmp_path):
+        """Test that a half-written event line is discarded and later appends stay aligned."""
+        events = self._log_with_torn_append(tmp_path, '{"id": "torn", "kind": "Mess')
+        extra = _history(3, seed=11)
+
+        reopened = SegmentedEventLog(LocalFileStore(str(tmp_path)))
+        for event in extra:
+            reopened.append(event)
+
+        assert _dump(SegmentedEventLog(LocalFileStore(str(tmp_path)))) == _dump(events + extra)
+
+    @pytest.mark.parametrize("n", [0, 4, 8])
+    def test_unindexed_new_segment_dropped(self, tmp_path, n):
+        """Test that an event line starting a segment whose index was never written is discarded."""
+        events = _history(n, seed=7)
+        fs = LocalFileStore(str(tmp_path))
+        log = SegmentedEventLog(fs, segment_size=4)
+        for event in events:
+            log.append(event)
+        fs.append(_segment_path("events", n // 4), _history(1, seed=99)[0].model_dump_json() + "\n")
+        extra = _history(3, seed=11)
+
+        reopened = SegmentedEventLog(LocalFileStore(str(tmp_path)), segment_size=4)
+        for event in extra:
+            reopened.append(event)
+
+        assert _dump(SegmentedEventLog(LocalFileStore(str(tmp_path)))) == _dump(events + extra)
+
+    def test_valid_events_with_line_separators_kept(self, tmp_path):
+        """Test that events containing U+2028 don't look like a torn append."""
+        events = _history(10, seed=3) + [
+            MessageEvent(source="agent", llm_message=Message(role="user", content=[TextContent(text=f"x{c}y")]))
+            for c in LINE_BREAKS
+        ]
+        fs = LocalFileStore(str(tmp_path))
+        log = SegmentedEventLog(fs, segment_size=10)
+        for event in events:
+            log.append(event)
+        assert "\u2028" in fs.read(_segment_path("events", 1))
+
+        reopened = SegmentedEventLog(LocalFileStore(str(tmp_path)))
+
+        assert _dump(reopened) == _dump(events)
+        assert fs.read(_segment_index_path("events", 1)).split() == [e.id for e in events[10:]]
+
+
+class TestMigration:
+    """Tests for migrating one-file-per-event logs to segments."""
+
+    def test_migrated_log_matches(self, tmp_path):
+        """Test that a migrated log has the same events and leaves no per-event files."""
+        events = _history(30, seed=5)
+        fs = LocalFileStore(str(tmp_path))
+        files = EventLog(fs)
+        for event in events:
+            files.append(event)
+
+        assert migrate_event_log(fs, segment_size=8) == 30
+
+        migrated = SegmentedEventLog(LocalFileStore(str(tmp_path)))
+        assert _dump(migrated) == _dump(events)
+        assert not any(name.rsplit("/", 1)[-1].startswith("event-") for name in fs.list("events"))
+
+    def test_open_event_log_migrates_when_segmented(self, tmp_path, monkeypatch):
+        """Test that opening an old log with the segmented format migrates it."""
+        events = _history(6, seed=9)
+        files = EventLog(LocalFileStore(str(tmp_path)))
+        for event in events:
+            files.append(event)
+
+        monkeypatch.setenv(EVENT_LOG_FORMAT_ENV, "segmented")
+        log = open_event_log(LocalFileStore(str(tmp_path)))
+
+        assert isinstance(log, SegmentedEventLog)
+        assert _dump(log) == _dump(events)
+
+    def test_files_layout_kept_by_default(self, tmp_path, monkeypatch):
+        """Test that the default format leaves one-file-per-event logs alone."""
+        monkeypatch.delenv(EVENT_LOG_FORMAT_ENV, raising=False)
+        files = EventLog(LocalFileStore(str(tmp_path)))
+        files.append(_history(1)[0])
+
+        assert isinstance(open_event_log(LocalFileStore(str(tmp_path))), EventLog)
@@ -0,0 +1,107 @@
+"""Tests for deferred log formatting and sampled payload capture (requires the openhands extra)."""
+
+import gzip
+import logging
+
+import pytest
+
+pytest.importorskip("openhands.sdk")
+
+from openhands.sdk.logger import Lazy, capture_payload, configure_payload_capture  # noqa: E402
+from openhands.sdk.logger import payload as payload_module  # noqa: E402
+from openhands.sdk.logger.payload import _parse_sample_rate, read_payloads  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def restore_capture_config(monkeypatch):
+    monkeypatch.setattr(payload_module, "_sample_rate", payload_module._sample_rate)
+    monkeypatch.setattr(payload_module, "_path", payload_module._path)
+
+
+class TestLazy:
+    """Tests for Lazy log arguments."""
+
+    def test_not_built_when_level_disabled(self):
+        """Test that the payload is never built for a record below the logger level."""
+        calls = []
+        logger = logging.getLogger("test_payload.disabled")
+        logger.setLevel(logging.INFO)
+
+        logger.debug("payload: %s", Lazy(lambda: calls.append(1) or "big"))
+
+        assert calls == []
+
+    def test_built_once_when_formatted(self, caplog):
+        """Test that the payload is built when the record is formatted, and only once."""
+        calls = []
+        value = Lazy(lambda: calls.append(1) or {"a": 1})
+
+        with caplog.at_level(logging.DEBUG, logger="test_payload.enabled"):
+            logging.getLogger("test_payload.enabled").debug("payload: %s", value)
+
+        assert "payload: {'a': 1}" in caplog.text
+        assert str(value) == repr(value) == "{'a': 1}"
+        assert calls == [1]
+
+
+class TestCapturePayload:
+    """Tests for capture_payload and read_payloads."""
+
+    def test_off_by_default(self, tmp_path):
+        """Test that with a zero rate nothing is built or written."""
+        path = tmp_path / "payloads.jsonl.gz"
+        configure_payload_capture(0, str(path))
+
+        capture_payload("prompt", lambda: pytest.fail("payload built"))
+
+        assert not path.exists()
+
+    def test_sampled_payloads_round_trip(self, tmp_path):
+        """Test that captured records are appended and read back in order."""
+        path = tmp_path / "nested" / "payloads.jsonl.gz"
+        configure_payload_capture(1, str(path))
+
+        capture_payload("prompt", lambda: {"messages": ["héllo"]})
+        capture_payload("response", lambda: "done")
+
+        records = read_payloads(str(path))
+        assert [(r["kind"], r["payload"]) for r in records] == [
+            ("prompt", {"messages": ["héllo"]}),
+            ("response", "done"),
+        ]
+
+    def test_truncated_last_record_ignored(self, tmp_path):
+        """Test that a record cut off by a crash doesn't hide the complete ones."""
+        path = tmp_path / "payloads.jsonl.gz"
+        configure_payload_capture(1, str(path))
+        capture_payload("event", lambda: {"i": 1})
+        capture_payload("event", lambda: {"i": 2})
+        torn = gzip.compress(b'{"kind": "event", "payload": {"i": 3}}\n')
+
+        with open(path, "ab") as f:
+            f.write(torn[: len(torn) // 2])
+
+        assert [r["payload"] for r in read_payloads(str(path))] == [{"i": 1}, {"i": 2}]
+
+    def test_failing_payload_does_not_raise(self, tmp_path):
+        """Test that an error while building a payload is swallowed."""
+        configure_payload_capture(1, str(tmp_path / "payloads.jsonl.gz"))
+
+        capture_payload("event", lambda: 1 / 0)
+
+
+class TestParseSampleRate:
+    """Tests for parsing LOG_PAYLOAD_SAMPLE_RATE."""
+
+    @pytest.mark.parametrize("value, expected", [("0", 0.0), ("0.25", 0.25), ("1", 1.0), (" 0.5 ", 0.5)])
+    def test_valid(self, value, expected):
+        """Test that numeric values are used as given."""
+        assert _parse_sample_rate(value) == expected
+
+    @pytest.mark.parametrize("value", ["", "abc", "10%", "nan"])
+    def test_invalid_disables_capture(self, value, caplog):
+        """Test that a malformed value turns capture off with a warning instead of failing import."""
+        with caplog.at_level(logging.WARNING, logger=payload_module.logger.name):
+            assert _parse_sample_rate(value) == 0.0
+
+        assert "LOG_PAYLOAD_SAMPLE_RATE" in caplog.text
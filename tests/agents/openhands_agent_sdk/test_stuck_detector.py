@@ -0,0 +1,171 @@
+"""Tests for the incremental OpenHands SDK StuckDetector (requires the openhands extra).
+
+The detector is checked after every appended event against a full-history scan,
+the algorithm it replaced, on generated conversations.
+"""
+
+import random
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("openhands.sdk")
+
+from openhands.sdk import LocalFileStore, Message, MessageEvent, TextContent  # noqa: E402
+from openhands.sdk.conversation.event_store import EventLog  # noqa: E402
+from openhands.sdk.conversation.stuck_detector import StuckDetector  # noqa: E402
+from openhands.sdk.conversation.types import StuckDetectionThresholds  # noqa: E402
+from openhands.sdk.event import (  # noqa: E402
+    ActionEvent,
+    AgentErrorEvent,
+    CondensationSummaryEvent,
+    ObservationBaseEvent,
+    ObservationEvent,
+)
+from openhands.sdk.llm import MessageToolCall  # noqa: E402
+from openhands.sdk.tool.builtins.think import ThinkAction, ThinkObservation  # noqa: E402
+
+
+def _full_scan_is_stuck(detector: StuckDetector, events: list) -> bool:
+    """The detection as it was before it became incremental: rescan the whole history."""
+    last_user = next(
+        (i for i in reversed(range(len(events))) if isinstance(events[i], MessageEvent) and events[i].source == "user"),
+        -1,
+    )
+    if last_user == -1:
+        return False
+    events = events[last_user + 1 :]
+    if len(events) < min(
+        detector.action_observation_threshold, detector.action_error_threshold, detector.monologue_threshold
+    ):
+        return False
+
+    max_needed = max(detector.action_observation_threshold, detector.action_error_threshold)
+    actions: list = []
+    observations: list = []
+    for event in reversed(events):
+        if isinstance(event, ActionEvent) and len(actions) < max_needed:
+            actions.append(event)
+        elif isinstance(event, ObservationBaseEvent) and len(observations) < max_needed:
+            observations.append(event)
+        if len(actions) >= max_needed and len(observations) >= max_needed:
+            break
+    if detector._is_stuck_repeating_action_observation(actions, observations):
+        return True
+    if detector._is_stuck_repeating_action_error(actions, observations):
+        return True
+
+    monologue = 0
+    for event in reversed(events):
+        if isinstance(event, MessageEvent):
+            monologue += event.source == "agent"
+        elif not isinstance(event, CondensationSummaryEvent):
+            break
+    if len(events) >= detector.monologue_threshold and monologue >= detector.monologue_threshold:
+        return True
+
+    threshold = detector.alternating_pattern_threshold
+    if len(events) >= threshold:
+        actions, observations = [], []
+        for event in reversed(events):
+            if isinstance(event, ActionEvent) and len(actions) < threshold:
+                actions.append(event)
+            elif isinstance(event, (ObservationEvent, AgentErrorEvent)) and len(observations) < threshold:
+                observations.append(event)
+            if len(actions) == threshold and len(observations) == threshold:
+                break
+        if len(actions) == threshold and len(observations) == threshold:
+            if all(detector._event_eq(actions[i], actions[i + 2]) for i in range(threshold - 2)) and all(
+                detector._event_eq(observations[i], observations[i + 2]) for i in range(threshold - 2)
+            ):
+                return True
+    return False
+
+
+def _event(rng: random.Random, i: int):
+    variant = rng.randint(0, 1)
+    kind = rng.choices(["user", "agent", "action", "observation", "error", "summary"], [1, 4, 8, 6, 3, 1])[0]
+    if kind in ("user", "agent"):
+        return MessageEvent(source=kind, llm_message=Message(role="user", content=[TextContent(text=f"m{variant}")]))
+    if kind == "action":
+        return ActionEvent(
+            thought=[TextContent(text=f"t{variant}")],
+            action=ThinkAction(thought=f"a{variant}"),
+            tool_name="think",
+            tool_call_id=f"call{i}",
+            tool_call=MessageToolCall(id=f"call{i}", name="think", arguments="{}", origin="completion"),
+            llm_response_id=f"resp{i}",
+        )
+    if kind == "observation":
+        return ObservationEvent(
+            observation=ThinkObservation.from_text(f"o{variant}"),
+            action_id=f"action{i}",
+            tool_name="think",
+            tool_call_id=f"call{i}",
+        )
+    if kind == "error":
+        return AgentErrorEvent(error=f"e{variant}", tool_name="think", tool_call_id=f"call{i}")
+    return CondensationSummaryEvent(summary=f"s{variant}")
+
+
+def _history(n: int, seed: int) -> list:
+    rng = random.Random(seed)
+    return [_event(rng, i) for i in range(n)]
+
+
+THRESHOLDS = [
+    StuckDetectionThresholds(),
+    StuckDetectionThresholds(action_observation=2, action_error=2, monologue=2, alternating_pattern=4),
+    StuckDetectionThresholds(action_observation=3, action_error=5, monologue=4, alternating_pattern=3),
+]
+
+
+class TestStuckDetector:
+    """Tests for StuckDetector against the full-history scan."""
+
+    @pytest.mark.parametrize("thresholds", THRESHOLDS)
+    @pytest.mark.parametrize("seed", range(4))
+    def test_matches_full_scan(self, tmp_path, seed, thresholds):
+        """Test that checking after every append agrees with rescanning the whole history."""
+        log = EventLog(LocalFileStore(str(tmp_path)))
+        detector = StuckDetector(SimpleNamespace(events=log), thresholds)
+        history = _history(300, seed)
+
+        results = []
+        for event in history:
+            log.append(event)
+            results.append(detector.is_stuck())
+            assert results[-1] == _full_scan_is_stuck(detector, history[: len(results)])
+        assert any(results) and not all(results)
+
+    def test_checks_can_be_skipped(self, tmp_path):
+        """Test that events appended between checks are all taken into account."""
+        log = EventLog(LocalFileStore(str(tmp_path)))
+        detector = StuckDetector(SimpleNamespace(events=log), THRESHOLDS[1])
+        history = _history(300, seed=21)
+        rng = random.Random(0)
+
+        for i, event in enumerate(history, 1):
+            log.append(event)
+            if rng.random() < 0.3:
+                assert detector.is_stuck() == _full_scan_is_stuck(detector, history[:i])
+
+    def test_replaced_event_log_rescanned(self, tmp_path):
+        """Test that swapping the state's event log starts over from the new history."""
+        first, second = _history(120, seed=1), _history(80, seed=2)
+        state = SimpleNamespace(events=first)
+        detector = StuckDetector(state, THRESHOLDS[1])
+        detector.is_stuck()
+
+        state.events = second
+
+        assert detector.is_stuck() == _full_scan_is_stuck(detector, second)
+        state.events = second[:40]
+        assert detector.is_stuck() == _full_scan_is_stuck(detector, second[:40])
+
+    def test_no_user_message(self):
+        """Test that a history without a user message is never stuck."""
+        agent = MessageEvent(source="agent", llm_message=Message(role="user", content=[TextContent(text="m")]))
+        detector = StuckDetector(SimpleNamespace(events=[agent] * 10))
+
+        assert not detector.is_stuck()
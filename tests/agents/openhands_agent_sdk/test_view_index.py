@@ -0,0 +1,207 @@
+"""Tests for the incremental OpenHands SDK ViewIndex (requires the openhands extra).
+
+After every appended event the index is compared with View.from_events and
+ConversationState.get_unmatched_actions over the whole log, on generated
+histories with parallel action batches, pending and rejected actions,
+condensation requests and condensations that break batches.
+"""
+
+import random
+
+import pytest
+
+pytest.importorskip("openhands.sdk")
+
+from openhands.sdk import Message, MessageEvent, TextContent  # noqa: E402
+from openhands.sdk.context.view import View, ViewIndex  # noqa: E402
+from openhands.sdk.conversation.state import ConversationState  # noqa: E402
+from openhands.sdk.event import (  # noqa: E402
+    ActionEvent,
+    AgentErrorEvent,
+    Condensation,
+    CondensationRequest,
+    LLMConvertibleEvent,
+    ObservationEvent,
+    UserRejectObservation,
+)
+from openhands.sdk.llm import MessageToolCall  # noqa: E402
+from openhands.sdk.tool.builtins.think import ThinkAction, ThinkObservation  # noqa: E402
+
+
+class _HistoryGenerator:
+    """Random conversation histories; observations may arrive late or never."""
+
+    def __init__(self, seed: int) -> None:
+        self.rng = random.Random(seed)
+        self.events: list = []
+        self.waiting: list[ActionEvent] = []
+
+    def _message(self) -> MessageEvent:
+        source = self.rng.choice(["user", "agent"])
+        text = f"{source} {len(self.events)}"
+        return MessageEvent(source=source, llm_message=Message(role="user", content=[TextContent(text=text)]))
+
+    def _batch(self) -> list[ActionEvent]:
+        response_id = f"resp{len(self.events)}"
+        actions = []
+        for k in range(self.rng.choice([1, 1, 2, 3])):
+            call = f"call{len(self.events)}_{k}"
+            actions.append(
+                ActionEvent(
+                    thought=[] if k else [TextContent(text="thinking")],
+                    # Non-executable actions are never pending
+                    action=None if self.rng.random() < 0.1 else ThinkAction(thought=call),
+                    tool_name="think",
+                    tool_call_id=call,
+                    tool_call=MessageToolCall(id=call, name="think", arguments="{}", origin="completion"),
+                    llm_response_id=response_id,
+                )
+            )
+        self.waiting.extend(actions)
+        return actions
+
+    def _observation(self, action: ActionEvent):
+        kind = self.rng.choice(["observation", "observation", "reject", "error"])
+        if kind == "observation":
+            return ObservationEvent(
+                observation=ThinkObservation.from_text("done"),
+                action_id=action.id,
+                tool_name="think",
+                tool_call_id=action.tool_call_id,
+            )
+        if kind == "reject":
+            return UserRejectObservation(
+                rejection_reason="no",
+                action_id=action.id,
+                tool_name="think",
+                tool_call_id=action.tool_call_id,
+            )
+        return AgentErrorEvent(error="failed", tool_name="think", tool_call_id=action.tool_call_id)
+
+    def _condensation(self) -> Condensation:
+        convertible = [e.id for e in self.events if isinstance(e, LLMConvertibleEvent)]
+        forgotten = self.rng.sample(convertible, k=self.rng.randint(0, len(convertible) // 2))
+        summarize = self.rng.random() < 0.5
+        return Condensation(
+            forgotten_event_ids=forgotten,
+            summary="summary" if summarize else None,
+            summary_offset=self.rng.randint(0, 2) if summarize else None,
+            llm_response_id=f"condense{len(self.events)}",
+        )
+
+    def next_events(self) -> list:
+        roll = self.rng.random()
+        if roll < 0.25:
+            return [self._message()]
+        if roll < 0.5:
+            return self._batch()
+        if roll < 0.8 and self.waiting:
+            action = self.waiting.pop(self.rng.randrange(len(self.waiting)))
+            return [self._observation(action)]
+        if roll < 0.85:
+            # Observation whose action never made it into the log
+            return [AgentErrorEvent(error="orphan", tool_name="think", tool_call_id=f"orphan{len(self.events)}")]
+        if roll < 0.92:
+            return [CondensationRequest()]
+        return [self._condensation()]
+
+    def generate(self, n: int):
+        """Yield events one at a time until n have been produced."""
+        while len(self.events) < n:
+            for event in self.next_events():
+                self.events.append(event)
+                yield event
+
+
+def _ids(events) -> list:
+    return [e.id for e in events]
+
+
+def _assert_matches(index: ViewIndex, events: list) -> None:
+    view, expected = index.view(), View.from_events(events)
+    assert _ids(view.events) == _ids(expected.events)
+    assert view.unhandled_condensation_request == expected.unhandled_condensation_request
+    assert _ids(view.condensations) == _ids(expected.condensations)
+    assert _ids(index.unmatched_actions()) == _ids(ConversationState.get_unmatched_actions(events))
+    users = [e for e in events if isinstance(e, MessageEvent) and e.source == "user"]
+    assert index.last_user_message() is (users[-1] if users else None)
+
+
+class TestViewIndex:
+    """Tests for ViewIndex against the static full-history scans."""
+
+    @pytest.mark.parametrize("seed", range(6))
+    def test_matches_static_scans(self, seed):
+        """Test that the view, pending actions and last user message match after every append."""
+        log: list = []
+        index = ViewIndex(log)
+        broken_batch = False
+
+        for event in _HistoryGenerator(seed).generate(250):
+            log.append(event)
+            _assert_matches(index, log)
+            if isinstance(event, Condensation):
+                forgotten = set(event.forgotten_event_ids)
+                batches: dict = {}
+                for e in log:
+                    if isinstance(e, ActionEvent):
+                        batches.setdefault(e.llm_response_id, []).append(e.id in forgotten)
+                broken_batch |= any(any(b) and not all(b) for b in batches.values())
+        assert broken_batch
+
+    def test_condensation_breaking_a_batch(self):
+        """Test that forgetting one action of a batch drops the batch and its observations."""
+        generator = _HistoryGenerator(0)
+        log: list = [generator._message()]
+        actions = []
+        while len(actions) < 3:
+            actions = generator._batch()
+        observations = [
+            ObservationEvent(
+                observation=ThinkObservation.from_text("done"),
+                action_id=a.id,
+                tool_name="think",
+                tool_call_id=a.tool_call_id,
+            )
+            for a in actions
+        ]
+        log += [*actions, *observations, generator._message()]
+        index = ViewIndex(log)
+        _assert_matches(index, log)
+
+        log.append(Condensation(forgotten_event_ids=[actions[1].id], llm_response_id="condense"))
+
+        _assert_matches(index, log)
+        assert not set(_ids(actions + observations)) & set(_ids(index.view().events))
+
+    def test_checks_can_be_skipped(self):
+        """Test that events appended between checks are all observed."""
+        log: list = []
+        index = ViewIndex(log)
+        rng = random.Random(0)
+
+        for event in _HistoryGenerator(11).generate(250):
+            log.append(event)
+            if rng.random() < 0.2:
+                _assert_matches(index, log)
+        _assert_matches(index, log)
+
+    def test_shorter_log_starts_over(self):
+        """Test that a log that shrank (e.g. reloaded) is re-read from the start."""
+        log = list(_HistoryGenerator(3).generate(120))
+        index = ViewIndex(log)
+        _assert_matches(index, log)
+
+        del log[60:]
+
+        _assert_matches(index, log)
+
+    def test_to_messages_matches_events_to_messages(self):
+        """Test that cached message conversion matches converting the view from scratch."""
+        log: list = []
+        index = ViewIndex(log)
+
+        for event in _HistoryGenerator(5).generate(150):
+            log.append(event)
+            view_events = index.view().events
+            assert index.to_messages(view_events) == LLMConvertibleEvent.events_to_messages(list(view_events))
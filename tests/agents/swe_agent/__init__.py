@@ -0,0 +1 @@
+"""Tests for cooperbench.agents.swe_agent module."""
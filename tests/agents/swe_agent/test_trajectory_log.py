@@ -0,0 +1,123 @@
+"""Tests for the append-only SWE-agent trajectory log and recovering unfinished runs from it."""
+
+import os
+
+from cooperbench.agents.swe_agent.adapter import _load_partial_trajectory, _trajectory_messages
+from cooperbench.agents.swe_agent.utils.trajectory_log import (
+    TrajectoryLog,
+    find_trajectory_log,
+    get_trajectory_log_path,
+    load_trajectory_log,
+)
+
+
+def _step(i: int) -> dict:
+    return {"thought": f"thought {i}", "action": f"ls {i}", "response": "", "observation": f"out {i}"}
+
+
+def _run_steps(log: TrajectoryLog, n: int) -> dict:
+    """Append n steps the way DefaultAgent.run does; returns the final .traj data."""
+    history: list[dict] = [{"role": "system", "content": "sys"}]
+    trajectory: list[dict] = []
+    info: dict = {}
+    for i in range(n):
+        history += [{"role": "assistant", "content": f"a{i}"}, {"role": "user", "content": f"o{i} "}]
+        trajectory.append(_step(i))
+        info = {"model_stats": {"instance_cost": 0.1 * (i + 1), "api_calls": i + 1}}
+        log.append(history=history, trajectory=trajectory, info=info, environment="main", replay_config=None)
+    return {"trajectory": trajectory, "history": history, "info": info, "replay_config": None, "environment": "main"}
+
+
+class TestTrajectoryLog:
+    """Tests for TrajectoryLog and load_trajectory_log."""
+
+    def test_round_trip(self, tmp_path):
+        """Test that the log rebuilds the same data the .traj file would hold."""
+        traj_path = tmp_path / "task.traj"
+        expected = _run_steps(TrajectoryLog(traj_path), 5)
+
+        assert load_trajectory_log(traj_path) == expected
+
+    def test_only_new_entries_appended(self, tmp_path):
+        """Test that each step writes its new entries, and nothing when nothing changed."""
+        traj_path = tmp_path / "task.traj"
+        log = TrajectoryLog(traj_path)
+        data = _run_steps(log, 3)
+        lines = get_trajectory_log_path(traj_path).read_text().splitlines()
+
+        log.append(
+            history=data["history"],
+            trajectory=data["trajectory"],
+            info=data["info"],
+            environment="main",
+            replay_config=None,
+        )
+
+        # 1 meta + 7 history + 3 steps + 3 info
+        assert len(lines) == 14
+        assert get_trajectory_log_path(traj_path).read_text().splitlines() == lines
+
+    def test_torn_last_line_ignored(self, tmp_path):
+        """Test that a line cut off by a crash is dropped and earlier steps kept."""
+        traj_path = tmp_path / "task.traj"
+        expected = _run_steps(TrajectoryLog(traj_path), 4)
+        with open(get_trajectory_log_path(traj_path), "a") as f:
+            f.write('{"type": "step", "step": {"thou')
+
+        assert load_trajectory_log(traj_path) == expected
+
+    def test_new_attempt_starts_empty(self, tmp_path):
+        """Test that a new log replaces the one of an earlier run."""
+        traj_path = tmp_path / "task.traj"
+        _run_steps(TrajectoryLog(traj_path), 3)
+
+        TrajectoryLog(traj_path)
+
+        assert load_trajectory_log(traj_path)["trajectory"] == []
+
+
+class TestFindTrajectoryLog:
+    """Tests for find_trajectory_log."""
+
+    def test_none_when_finalized(self, tmp_path):
+        """Test that a deleted (finalized) log isn't found."""
+        log = TrajectoryLog(tmp_path / "task.traj")
+        _run_steps(log, 2)
+        log.delete()
+
+        assert find_trajectory_log(tmp_path) is None
+
+    def test_latest_attempt(self, tmp_path):
+        """Test that the most recently written log among retry attempts is returned."""
+        first = TrajectoryLog(tmp_path / "attempt_0" / "task.traj")
+        second = TrajectoryLog(tmp_path / "attempt_1" / "task.traj")
+        _run_steps(second, 1)
+        _run_steps(first, 2)
+        os.utime(second.path, (first.path.stat().st_mtime + 10,) * 2)
+
+        assert find_trajectory_log(tmp_path) == tmp_path / "attempt_1" / "task.traj"
+
+
+class TestPartialTrajectory:
+    """Tests for the adapter's recovery of a run that raised."""
+
+    def test_messages_from_unfinished_run(self, tmp_path):
+        """Test that the steps and stats of an unfinished attempt are recovered."""
+        _run_steps(TrajectoryLog(tmp_path / "task.traj"), 3)
+
+        partial = _load_partial_trajectory(tmp_path)
+
+        assert partial is not None
+        assert partial["info"]["model_stats"]["api_calls"] == 3
+        assert _trajectory_messages(partial["trajectory"]) == [
+            message
+            for i in range(3)
+            for message in (
+                {"role": "assistant", "content": f"thought {i}\nls {i}"},
+                {"role": "user", "content": f"out {i}"},
+            )
+        ]
+
+    def test_nothing_to_recover(self, tmp_path):
+        """Test that a directory without a step log yields None."""
+        assert _load_partial_trajectory(tmp_path) is None
@@ -0,0 +1,231 @@
+"""Unit tests for cooperbench.eval.cache module."""
+
+import importlib
+import io
+from unittest.mock import patch
+
+import pytest
+
+from cooperbench.eval.cache import CACHED_FIELDS, EvalCache, _fetch_digest, eval_cache_key, is_cacheable
+from cooperbench.eval.evaluate import _evaluate_single
+
+# The cooperbench.eval package re-exports the evaluate() function under the module's name
+evaluate_module = importlib.import_module("cooperbench.eval.evaluate")
+
+PATCH = """diff --git a/src/app.py b/src/app.py
+--- a/src/app.py
++++ b/src/app.py
+@@ -1 +1 @@
+-old
++new
+"""
+
+TEST_HUNK = """diff --git a/tests/test_app.py b/tests/test_app.py
+--- a/tests/test_app.py
++++ b/tests/test_app.py
+@@ -1 +1 @@
+-old
++new
+"""
+
+
+def _key(**overrides) -> str:
+    args = {
+        "image": "img:1",
+        "patch1": PATCH,
+        "patch2": "",
+        "tests1": "t1",
+        "tests2": "t2",
+        "setting": "coop",
+    }
+    args.update(overrides)
+    return eval_cache_key(**args)
+
+
+class TestEvalCacheKey:
+    """Tests for eval_cache_key."""
+
+    def test_key_is_stable(self):
+        """Test that identical inputs produce identical keys."""
+        assert _key() == _key()
+
+    def test_key_depends_on_inputs(self):
+        """Test that changing any input changes the key."""
+        base = _key()
+        assert _key(image="img:2") != base
+        assert _key(patch2=PATCH) != base
+        assert _key(tests1="other") != base
+        assert _key(setting="solo") != base
+
+    def test_blank_patches_are_equivalent(self):
+        """Test that empty and whitespace-only patches share a key."""
+        assert _key(patch1="") == _key(patch1="  \n\n") == _key(patch1=None)
+
+    def test_test_file_hunks_ignored(self):
+        """Test that hunks touching test files don't affect the key."""
+        assert _key(patch1=PATCH + TEST_HUNK) == _key()
+
+
+class TestEvalCache:
+    """Tests for the SQLite-backed EvalCache."""
+
+    def test_roundtrip_stores_outcome_only(self, tmp_path):
+        """Test that put/get roundtrips only the cached outcome fields."""
+        cache = EvalCache(tmp_path / "cache.sqlite")
+        result = {"both_passed": True, "feature1": {"passed": True}, "evaluated_at": "now"}
+
+        cache.put("k", result)
+        cached = cache.get("k")
+
+        assert set(cached) == set(CACHED_FIELDS)
+        assert cached["both_passed"] is True
+        assert cached["feature1"] == {"passed": True}
+
+    def test_missing_db_is_miss(self, tmp_path):
+        """Test that get on a missing database returns None without creating it."""
+        cache = EvalCache(tmp_path / "missing.sqlite")
+
+        assert cache.get("k") is None
+        assert not cache.path.exists()
+
+    def test_clear(self, tmp_path):
+        """Test that clear removes cached results."""
+        cache = EvalCache(tmp_path / "cache.sqlite")
+        cache.put("k", {"both_passed": False})
+        cache.clear()
+
+        assert cache.get("k") is None
+
+
+class TestResolveImageDigest:
+    """Tests for resolve_image_digest."""
+
+    def test_reads_registry_digest(self):
+        """Test that the digest comes from the registry's manifest response."""
+
+        class Response(io.BytesIO):
+            headers = {"Docker-Content-Digest": "sha256:abc"}
+
+        requests = []
+
+        def urlopen(request, timeout):
+            requests.append(request)
+            return Response(b'{"token": "t"}')
+
+        with patch("urllib.request.urlopen", urlopen):
+            assert _fetch_digest("akhatua/cooperbench-dspy:task1") == "sha256:abc"
+
+        assert requests[1].full_url == "https://registry-1.docker.io/v2/akhatua/cooperbench-dspy/manifests/task1"
+        assert requests[1].get_method() == "HEAD"
+
+    def test_non_hub_images_unresolved(self):
+        """Test that untagged and non-Docker Hub images have no digest."""
+        with patch("urllib.request.urlopen", side_effect=AssertionError):
+            assert _fetch_digest("ghcr.io/org/img:1") is None
+            assert _fetch_digest("img") is None
+
+
+class TestIsCacheable:
+    """Tests for is_cacheable."""
+
+    def test_completed_outcome(self):
+        """Test that outcomes where both suites reported counts are cached."""
+        result = {
+            "feature1": {"passed": True, "test_output": "3 passed in 1.2s"},
+            "feature2": {"passed": False, "test_output": "1 failed, 2 passed in 1.0s"},
+            "error": None,
+        }
+        assert is_cacheable(result)
+
+    def test_error_not_cacheable(self):
+        """Test that errored evaluations are not cached."""
+        assert not is_cacheable({"error": "sandbox died"})
+
+    def test_timed_out_suite_not_cacheable(self):
+        """Test that a failed suite without test counts (timeout, setup failure) is not cached."""
+        result = {
+            "feature1": {"passed": True, "test_output": "3 passed in 1.2s"},
+            "feature2": {"passed": False, "test_output": "Command timed out after 600 seconds"},
+            "error": None,
+        }
+        assert not is_cacheable(result)
+
+
+COMPLETED = {
+    "merge": {"status": "clean"},
+    "feature1": {"passed": True, "test_output": "2 passed in 0.1s"},
+    "feature2": {"passed": False, "test_output": "1 failed in 0.1s"},
+    "both_passed": False,
+    "error": None,
+}
+
+
+class TestEvaluateSingleCache:
+    """Tests for eval cache use in _evaluate_single."""
+
+    @pytest.fixture(autouse=True)
+    def _cache(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setattr(evaluate_module, "EvalCache", lambda: EvalCache(tmp_path / "cache.sqlite"))
+        self.digest = "sha256:aaa"
+        monkeypatch.setattr(evaluate_module, "resolve_image_digest", lambda image: self.digest)
+
+    def _setup_run(self, tmp_path, run: str = "run") -> dict:
+        task_dir = tmp_path / "dataset" / "repo" / "task1"
+        for fid in (1, 2):
+            (task_dir / f"feature{fid}").mkdir(parents=True, exist_ok=True)
+            (task_dir / f"feature{fid}" / "tests.patch").write_text(f"tests{fid}")
+        log_dir = tmp_path / "logs" / run / "coop" / "repo" / "1" / "f1_f2"
+        log_dir.mkdir(parents=True)
+        (log_dir / "agent1.patch").write_text(PATCH)
+        return {"repo": "repo", "task_id": 1, "features": [1, 2], "setting": "coop", "log_dir": str(log_dir)}
+
+    def test_identical_inputs_evaluated_once(self, tmp_path):
+        """Test that another run with identical patches reuses the cached result."""
+        with patch("cooperbench.eval.evaluate.test_merged", return_value=COMPLETED) as mock_merged:
+            first = _evaluate_single(self._setup_run(tmp_path, "run1"))
+            second = _evaluate_single(self._setup_run(tmp_path, "run2"))
+
+        assert mock_merged.call_count == 1
+        assert first["merge"] == second["merge"] == {"status": "clean"}
+        assert second["setting"] == "coop"
+
+    def test_force_skips_lookup_but_refreshes(self, tmp_path):
+        """Test that force re-evaluates a cached run and stores the new outcome."""
+        run_info = self._setup_run(tmp_path)
+        fixed = {**COMPLETED, "feature2": {"passed": True, "test_output": "1 passed"}, "both_passed": True}
+
+        with patch("cooperbench.eval.evaluate.test_merged", side_effect=[COMPLETED, fixed, fixed]) as mock_merged:
+            _evaluate_single(run_info)
+            forced = _evaluate_single(run_info, force=True)
+            cached = _evaluate_single(self._setup_run(tmp_path, "run2"))
+
+        assert mock_merged.call_count == 2
+        assert forced["both_passed"] and cached["both_passed"]
+
+    def test_new_image_digest_misses(self, tmp_path):
+        """Test that a re-pushed image tag is evaluated again."""
+        with patch("cooperbench.eval.evaluate.test_merged", return_value=COMPLETED) as mock_merged:
+            _evaluate_single(self._setup_run(tmp_path, "run1"))
+            self.digest = "sha256:bbb"
+            _evaluate_single(self._setup_run(tmp_path, "run2"))
+
+        assert mock_merged.call_count == 2
+
+    def test_unresolved_digest_not_cached(self, tmp_path):
+        """Test that the cache is bypassed when the image digest can't be resolved."""
+        self.digest = None
+        with patch("cooperbench.eval.evaluate.test_merged", return_value=COMPLETED) as mock_merged:
+            _evaluate_single(self._setup_run(tmp_path, "run1"))
+            _evaluate_single(self._setup_run(tmp_path, "run2"))
+
+        assert mock_merged.call_count == 2
+        assert not (tmp_path / "cache.sqlite").exists()
+
+    def test_errors_not_cached(self, tmp_path):
+        """Test that errored evaluations are retried instead of cached."""
+        with patch("cooperbench.eval.evaluate.test_merged", return_value={"error": "sandbox died"}) as mock_merged:
+            _evaluate_single(self._setup_run(tmp_path, "run1"))
+            _evaluate_single(self._setup_run(tmp_path, "run2"))
+
+        assert mock_merged.call_count == 2
@@ -0,0 +1,273 @@
+"""Unit tests for GCS transfers of cooperbench.eval.backends.gcp.GCPBatchEvaluator.
+
+The bucket is a local directory: the evaluator sees it through an in-memory
+stand-in for the GCS client, and the Batch task script through a stand-in
+``docker`` executable (serving ``gsutil`` and the eval containers). So each
+shard's script really runs, without GCP or Docker (see
+tests/integration/eval/test_gcs_emulator.py for a GCS emulator).
+"""
+
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+from cooperbench.eval.backends.gcp import EvalTask, GCPBatchEvaluator, _pack_manifest
+
+# Seconds per simulated GCS request
+LATENCY = 0.1
+
+FAKE_DOCKER = """\
+import json, os, sys, time
+args = sys.argv[1:]
+with open(os.environ["FAKE_DOCKER_LOG"], "a") as log:
+    log.write(" ".join(args[:3]) + "\\n")
+if args[0] != "run":
+    sys.exit(0)  # pull / image inspect
+bucket = os.environ["FAKE_BUCKET_DIR"]
+if "gsutil" in args:
+    gsutil = args[args.index("gsutil") + 1:]
+    if gsutil[0] == "cat":
+        start, end = map(int, gsutil[2].split("-"))
+        with open(os.path.join(bucket, gsutil[3][len("gs://"):].split("/", 1)[1]), "rb") as f:
+            sys.stdout.buffer.write(f.read()[start:end + 1])
+    elif gsutil[0] == "cp":
+        dest = os.path.join(bucket, gsutil[2][len("gs://"):].split("/", 1)[1])
+        os.makedirs(os.path.dirname(dest), exist_ok=True)
+        with open(gsutil[1], "rb") as src, open(dest, "wb") as f:
+            f.write(src.read())
+    sys.exit(0)
+# Eval container: the result says whether feature 1's patch was mounted
+mounts = dict(reversed(args[i + 1].split(":")) for i, a in enumerate(args) if a == "-v")
+with open(mounts["/patches/patch1.patch"]) as f:
+    patch1 = f.read()
+if patch1 == "crash\\n":
+    sys.exit(1)
+if patch1 == "hang\\n":
+    time.sleep(60)
+with open(mounts["/output"] + "/result.json", "w") as f:
+    json.dump({"feature1_passed": patch1 == "fix\\n", "feature2_passed": True, "merge_status": "clean"}, f)
+"""
+
+
+class DirBlob:
+    """GCS blob stand-in stored as a file."""
+
+    def __init__(self, root: Path, name: str, calls: list):
+        self.root, self.name, self._calls = root, name, calls
+
+    @property
+    def _path(self) -> Path:
+        return self.root / self.name
+
+    def upload_from_string(self, data, content_type=None):
+        self._calls.append(("upload", self.name))
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._path.write_bytes(data if isinstance(data, bytes) else data.encode())
+
+    def download_as_text(self):
+        self._calls.append(("download", self.name))
+        time.sleep(LATENCY)
+        return self._path.read_text()
+
+    def delete(self):
+        self._calls.append(("delete", self.name))
+        time.sleep(LATENCY)
+        self._path.unlink()
+
+
+class DirBucket:
+    """GCS bucket stand-in backed by a directory; records requests."""
+
+    def __init__(self, root: Path):
+        self.root = root
+        self.calls: list[tuple[str, str]] = []
+
+    def blob(self, name: str) -> DirBlob:
+        return DirBlob(self.root, name, self.calls)
+
+    def list_blobs(self, prefix: str = ""):
+        self.calls.append(("list", prefix))
+        names = sorted(str(p.relative_to(self.root)) for p in self.root.rglob("*") if p.is_file())
+        return [self.blob(n) for n in names if n.startswith(prefix)]
+
+
+def _task(index: int, patch1: str = "fix") -> EvalTask:
+    return EvalTask(
+        task_index=100 + index,
+        repo_name="repo_task",
+        task_id=1,
+        feature1_id=1,
+        feature2_id=2,
+        setting="solo",
+        log_dir=f"/logs/{index}",
+        patch1=patch1,
+        tests1_patch="tests1",
+        tests2_patch="tests2",
+    )
+
+
+@pytest.fixture
+def bucket(tmp_path):
+    root = tmp_path / "bucket"
+    root.mkdir()
+    return DirBucket(root)
+
+
+@pytest.fixture
+def evaluator():
+    return GCPBatchEvaluator(project_id="test-project", bucket_name="test-bucket", transfer_workers=4)
+
+
+def _run_shard(
+    tmp_path: Path, bucket: DirBucket, manifest_path: str, shard: int, byte_range: str, task_timeout: int = 30
+):
+    """Run the Batch task script for one shard with the stand-in docker."""
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir(exist_ok=True)
+    docker = bin_dir / "docker"
+    docker.write_text(f"#!{sys.executable}\n{FAKE_DOCKER}")
+    docker.chmod(0o755)
+    env = {
+        **os.environ,
+        "PATH": f"{bin_dir}:{os.environ['PATH']}",
+        "FAKE_BUCKET_DIR": str(bucket.root),
+        "WORKSPACE_ROOT": str(tmp_path / f"workspace{shard}"),
+        "BATCH_TASK_INDEX": str(shard),
+        "BUCKET_NAME": "test-bucket",
+        "MANIFEST_PATH": manifest_path,
+        "MANIFEST_RANGE": byte_range,
+        "TASK_TIMEOUT": str(task_timeout),
+        "FAKE_DOCKER_LOG": str(tmp_path / "docker.log"),
+    }
+    result = subprocess.run(
+        ["bash", "-c", GCPBatchEvaluator.EVAL_SCRIPT], env=env, capture_output=True, text=True, timeout=60
+    )
+    assert result.returncode == 0, result.stdout + result.stderr
+
+
+class TestManifest:
+    """Tests for packing a job's tasks into one manifest object."""
+
+    def test_single_object(self, evaluator, bucket):
+        """Test that all tasks and patches are uploaded as one object."""
+        tasks = [_task(i) for i in range(5)]
+
+        manifest_path, ranges = evaluator._upload_manifest(bucket, "job", tasks, tasks_per_shard=2)
+
+        assert bucket.calls == [("upload", "job/manifest.jsonl")]
+        assert manifest_path == "job/manifest.jsonl"
+        assert len(ranges) == 3
+
+    def test_shard_ranges(self):
+        """Test that each shard's byte range holds exactly its tasks."""
+        tasks = [_task(i, patch1="x" * i) for i in range(7)]
+
+        content, ranges = _pack_manifest(tasks, tasks_per_shard=3)
+
+        shards = []
+        for byte_range in ranges:
+            start, end = map(int, byte_range.split("-"))
+            shards.append([json.loads(line)["index"] for line in content[start : end + 1].splitlines()])
+        assert shards == [[0, 1, 2], [3, 4, 5], [6]]
+
+    def test_patches_end_with_newline(self):
+        """Test that patches are stored with the trailing newline git needs."""
+        content, _ = _pack_manifest([_task(0, patch1="fix")], tasks_per_shard=1)
+
+        entry = json.loads(content)
+        assert entry["patch1"] == "fix\n"
+        assert entry["patch2"] == ""
+        assert entry["tests1"] == "tests1\n"
+
+
+class TestShardScript:
+    """Tests for the Batch task script and result collection."""
+
+    def test_end_to_end(self, tmp_path, evaluator, bucket):
+        """Test that shards evaluate their tasks and results map back to tasks."""
+        tasks = [_task(0), _task(1, patch1=""), _task(2, patch1="crash"), _task(3), _task(4)]
+        manifest_path, ranges = evaluator._upload_manifest(bucket, "job", tasks, tasks_per_shard=2)
+
+        for shard, byte_range in enumerate(ranges[:2]):  # The last shard never ran
+            _run_shard(tmp_path, bucket, manifest_path, shard, byte_range)
+        results = evaluator._collect_results(bucket, "job", tasks)
+
+        assert [r.task_index for r in results] == [100, 101, 102, 103, 104]
+        assert [r.feature1_passed for r in results] == [True, False, False, True, False]
+        assert results[0].both_passed and results[0].merge_status == "clean"
+        assert "No result" in results[2].error
+        assert results[4].error == "Result not found"
+        result_objects = [name for op, name in bucket.calls if op == "download"]
+        assert result_objects == ["job/results/shard_0.jsonl", "job/results/shard_1.jsonl"]
+
+    def test_hung_task_times_out(self, tmp_path, evaluator, bucket):
+        """Test that a hung task is stopped after TASK_TIMEOUT and the rest of the shard still runs."""
+        tasks = [_task(0, patch1="hang"), _task(1)]
+        manifest_path, ranges = evaluator._upload_manifest(bucket, "job", tasks, tasks_per_shard=2)
+
+        start = time.monotonic()
+        _run_shard(tmp_path, bucket, manifest_path, 0, ranges[0], task_timeout=1)
+        elapsed = time.monotonic() - start
+        results = evaluator._collect_results(bucket, "job", tasks)
+
+        assert elapsed < 30
+        assert results[0].error == "Timed out after 1s"
+        assert results[1].both_passed
+        docker_calls = (tmp_path / "docker.log").read_text().splitlines()
+        assert "rm -f cooperbench_eval_0" in docker_calls
+
+
+class TestTransfers:
+    """Tests for concurrent downloads and cleanup."""
+
+    def test_collect_downloads_concurrently(self, evaluator, bucket):
+        """Test that shard aggregates are downloaded by the thread pool."""
+        tasks = [_task(i) for i in range(16)]
+        for i in range(16):
+            line = json.dumps({"index": i, "feature1_passed": True, "feature2_passed": True})
+            bucket.blob(f"job/results/shard_{i}.jsonl").upload_from_string(line + "\n")
+
+        start = time.monotonic()
+        results = evaluator._collect_results(bucket, "job", tasks)
+        elapsed = time.monotonic() - start
+
+        assert all(r.both_passed for r in results)
+        assert elapsed < 16 * LATENCY / 2
+
+    def test_collect_skips_bad_lines(self, evaluator, bucket):
+        """Test that a malformed line does not lose the rest of a shard."""
+        bucket.blob("job/results/shard_0.jsonl").upload_from_string(
+            '{"index": 0, "feature1_passed": true}\n{truncated\n{"index": 1, "feature2_passed": true}\n'
+        )
+
+        results = evaluator._collect_results(bucket, "job", [_task(0), _task(1)])
+
+        assert results[0].feature1_passed and results[1].feature2_passed
+        assert results[0].error is None
+
+    def test_cleanup_deletes_all(self, evaluator, bucket):
+        """Test that cleanup deletes every object of the job and the Batch job."""
+        evaluator._upload_manifest(bucket, "job", [_task(0)])
+        for i in range(8):
+            bucket.blob(f"job/results/shard_{i}.jsonl").upload_from_string("")
+        bucket.blob("other/keep.txt").upload_from_string("")
+
+        class BatchClient:
+            deleted = []
+
+            def delete_job(self, name):
+                self.deleted.append(name)
+
+        client = BatchClient()
+        start = time.monotonic()
+        evaluator._cleanup(bucket, "job", client, "jobs/job")
+        elapsed = time.monotonic() - start
+
+        assert [p.name for p in bucket.root.rglob("*") if p.is_file()] == ["keep.txt"]
+        assert client.deleted == ["jobs/job"]
+        assert elapsed < 9 * LATENCY / 2
@@ -0,0 +1,281 @@
+"""Unit tests for cooperbench.eval.backends.pool module.
+
+Uses an in-memory fake backend, so no Modal or Docker is required.
+"""
+
+import threading
+import time
+
+import pytest
+
+from cooperbench.eval.backends.pool import PooledBackend, get_pooled_backend
+
+
+class FakeResult:
+    def __init__(self, returncode: int = 0, stdout: str = ""):
+        self.returncode = returncode
+        self._stdout = stdout
+
+    def stdout_read(self) -> str:
+        return self._stdout
+
+    def stderr_read(self) -> str:
+        return ""
+
+
+class FakeSandbox:
+    def __init__(self, reset_ok: bool = True):
+        self.commands: list[tuple[str, ...]] = []
+        self.terminated = False
+        self.reset_ok = reset_ok
+
+    def exec(self, *args: str) -> FakeResult:
+        self.commands.append(args)
+        script = args[-1]
+        if "rev-parse HEAD" in script and "symbolic-ref" in script:
+            return FakeResult(0, "abc123\nmain\nmain\n")
+        if "RESET_OK" in script:
+            return FakeResult(0, "RESET_OK\n") if self.reset_ok else FakeResult(1, "")
+        return FakeResult(0, "")
+
+    def terminate(self) -> None:
+        self.terminated = True
+
+
+class FakeBackend:
+    def __init__(self, reset_ok: bool = True):
+        self.created: list[FakeSandbox] = []
+        self.reset_ok = reset_ok
+
+    def create_sandbox(self, image: str, timeout: int = 600, workdir: str = "/workspace") -> FakeSandbox:
+        sb = FakeSandbox(self.reset_ok)
+        self.created.append(sb)
+        return sb
+
+
+class TestPooledBackend:
+    """Tests for PooledBackend reuse and eviction."""
+
+    def test_reuses_sandbox_for_same_image(self):
+        """Test that a released sandbox is handed out again for the same image."""
+        backend = FakeBackend()
+        pool = PooledBackend(backend)
+
+        sb = pool.create_sandbox("img:1")
+        sb.terminate()
+        sb2 = pool.create_sandbox("img:1")
+
+        assert len(backend.created) == 1
+        assert sb2.base_sha == "abc123"
+        assert not backend.created[0].terminated
+
+    def test_separate_pools_per_image(self):
+        """Test that sandboxes are not shared across images."""
+        backend = FakeBackend()
+        pool = PooledBackend(backend)
+
+        pool.create_sandbox("img:1").terminate()
+        pool.create_sandbox("img:2")
+
+        assert len(backend.created) == 2
+
+    def test_reset_runs_on_release(self):
+        """Test that the repo is reset to the base SHA on release."""
+        backend = FakeBackend()
+        pool = PooledBackend(backend)
+
+        pool.create_sandbox("img:1").terminate()
+
+        reset_script = backend.created[0].commands[-1][-1]
+        assert "git reset --hard abc123" in reset_script
+        assert "git clean -fdx" in reset_script
+
+    def test_failed_reset_terminates_sandbox(self):
+        """Test that a sandbox which fails to reset is not pooled."""
+        backend = FakeBackend(reset_ok=False)
+        pool = PooledBackend(backend)
+
+        pool.create_sandbox("img:1").terminate()
+        pool.create_sandbox("img:1")
+
+        assert backend.created[0].terminated
+        assert len(backend.created) == 2
+
+    def test_max_size_caps_idle_sandboxes(self):
+        """Test that idle sandboxes beyond max_size are terminated."""
+        backend = FakeBackend()
+        pool = PooledBackend(backend, max_size=1)
+
+        sb1 = pool.create_sandbox("img:1")
+        sb2 = pool.create_sandbox("img:1")
+        sb1.terminate()
+        sb2.terminate()
+
+        assert not backend.created[0].terminated
+        assert backend.created[1].terminated
+
+    def test_idle_timeout_evicts(self):
+        """Test that sandboxes idle longer than idle_timeout are terminated."""
+        backend = FakeBackend()
+        pool = PooledBackend(backend, idle_timeout=0)
+
+        pool.create_sandbox("img:1").terminate()
+        pool.create_sandbox("img:1")
+
+        assert backend.created[0].terminated
+        assert len(backend.created) == 2
+
+    def test_insufficient_lifetime_not_reused(self):
+        """Test that a sandbox is not reused if its remaining lifetime is too short."""
+        backend = FakeBackend()
+        pool = PooledBackend(backend, max_lifetime=100)
+
+        pool.create_sandbox("img:1", timeout=10).terminate()
+        pool.create_sandbox("img:1", timeout=600)
+
+        assert len(backend.created) == 2
+
+    def test_exec_bounded_by_timeout(self):
+        """Test that commands run under the caller's timeout, not the sandbox lifetime."""
+        backend = FakeBackend()
+        pool = PooledBackend(backend, max_lifetime=3600)
+
+        sb = pool.create_sandbox("img:1", timeout=120)
+        sb.exec("bash", "/usr/local/bin/runner.sh", "tests.patch")
+
+        command = backend.created[0].commands[-1]
+        assert command[:3] == ("timeout", "-k", "10")
+        assert 119 <= int(command[3]) <= 120
+        assert command[4:] == ("bash", "/usr/local/bin/runner.sh", "tests.patch")
+
+    def test_double_terminate_is_noop(self):
+        """Test that terminating a pooled handle twice only releases once."""
+        backend = FakeBackend()
+        pool = PooledBackend(backend)
+
+        sb = pool.create_sandbox("img:1")
+        sb.terminate()
+        sb.terminate()
+
+        assert sum("RESET_OK" in c[-1] for c in backend.created[0].commands) == 1
+
+    def test_shutdown_terminates_idle(self):
+        """Test that shutdown terminates idle sandboxes and stops pooling."""
+        backend = FakeBackend()
+        pool = PooledBackend(backend)
+
+        sb = pool.create_sandbox("img:1")
+        pool.prewarm("img:1")
+        pool.shutdown()
+        sb.terminate()
+
+        assert all(s.terminated for s in backend.created)
+
+    def test_held_prewarm_survives_idle_timeout(self):
+        """Test that a held prewarmed sandbox outlives idle_timeout while its hold lasts."""
+        backend = FakeBackend()
+        pool = PooledBackend(backend, idle_timeout=0)
+
+        pool.prewarm("img:1", hold=True)
+        pool.create_sandbox("img:2")
+        pool.create_sandbox("img:1")
+
+        assert not backend.created[0].terminated
+        assert len(backend.created) == 2
+
+    def test_held_prewarm_released_after_hold_timeout(self):
+        """Test that a held sandbox whose evaluation never ran is evicted once the hold runs out."""
+        backend = FakeBackend()
+        pool = PooledBackend(backend, idle_timeout=0, hold_timeout=0.05)
+
+        pool.prewarm("img:1", hold=True)
+        time.sleep(0.1)
+        pool.create_sandbox("img:2")
+
+        assert backend.created[0].terminated
+
+    def test_held_prewarm_reaped_without_pool_activity(self):
+        """Test that an expired hold is evicted even if nothing else uses the pool."""
+        backend = FakeBackend()
+        pool = PooledBackend(backend, idle_timeout=0, hold_timeout=0.05)
+
+        pool.prewarm("img:1", hold=True)
+        for _ in range(100):
+            if backend.created[0].terminated:
+                break
+            time.sleep(0.01)
+
+        assert backend.created[0].terminated
+        assert not pool._idle["img:1"]
+
+    def test_waits_for_prewarm_in_progress(self):
+        """Test that create_sandbox picks up a sandbox that is still being prewarmed."""
+        release = threading.Event()
+
+        class SlowBackend(FakeBackend):
+            def create_sandbox(self, image: str, timeout: int = 600, workdir: str = "/workspace") -> FakeSandbox:
+                release.wait(5)
+                return super().create_sandbox(image, timeout, workdir)
+
+        backend = SlowBackend()
+        pool = PooledBackend(backend)
+        prewarm = threading.Thread(target=pool.prewarm, args=("img:1",), kwargs={"hold": True})
+        prewarm.start()
+        while not pool._starting.get("img:1"):
+            pass
+
+        threading.Timer(0.05, release.set).start()
+        sb = pool.create_sandbox("img:1")
+        prewarm.join()
+
+        assert len(backend.created) == 1
+        assert sb.base_sha == "abc123"
+
+    def test_failed_prewarm_does_not_block(self):
+        """Test that a failed prewarm is not waited for."""
+
+        class BrokenBackend(FakeBackend):
+            def create_sandbox(self, image: str, timeout: int = 600, workdir: str = "/workspace") -> FakeSandbox:
+                raise RuntimeError("image pull failed")
+
+        pool = PooledBackend(BrokenBackend())
+
+        with pytest.raises(RuntimeError):
+            pool.prewarm("img:1", hold=True)
+
+        assert not pool._wait_for_prewarm("img:1", time.monotonic() + 5)
+
+    def test_stuck_prewarm_not_waited_for_past_prewarm_wait(self):
+        """Test that create_sandbox creates its own sandbox when a prewarm takes too long."""
+        release = threading.Event()
+
+        class StuckBackend(FakeBackend):
+            calls = 0
+
+            def create_sandbox(self, image: str, timeout: int = 600, workdir: str = "/workspace") -> FakeSandbox:
+                self.calls += 1
+                if self.calls == 1:  # The prewarm
+                    release.wait(5)
+                return super().create_sandbox(image, timeout, workdir)
+
+        backend = StuckBackend()
+        pool = PooledBackend(backend, prewarm_wait=0.05)
+        prewarm = threading.Thread(target=pool.prewarm, args=("img:1",), kwargs={"hold": True})
+        prewarm.start()
+        while not pool._starting.get("img:1"):
+            pass
+
+        start = time.monotonic()
+        sb = pool.create_sandbox("img:1")
+        waited = time.monotonic() - start
+        release.set()
+        prewarm.join()
+
+        assert waited < 2
+        assert len(backend.created) == 2
+        assert sb._entry.sandbox is backend.created[0]
+
+    def test_unsupported_backend(self):
+        """Test that pooling rejects batch backends."""
+        with pytest.raises(ValueError, match="not supported"):
+            get_pooled_backend("gcp")
@@ -4,17 +4,32 @@ These are pure function tests that don't require Modal.
 For integration tests, see tests/integration/eval/test_sandbox.py
 """
 
+import base64
+import io
+import logging
+import tarfile
 import tempfile
 from pathlib import Path
+from unittest.mock import MagicMock, patch
 
+from cooperbench.eval import sandbox
 from cooperbench.eval.sandbox import (
+    _SERIAL_TESTS_NOTE,
+    _bundle_files,
+    _bundled_exec_timeout,
     _error_result,
     _filter_test_files,
     _load_patch,
+    _log_parallel_tests_mode,
+    _merged_driver_scripts,
     _merged_error_result,
+    _merged_result,
+    _merged_result_from_driver,
     _parse_results,
+    _run_tests_parallel_script,
     _sanitize_patch,
     _solo_error_result,
+    _test_merged_bundled,
 )
 
 
@@ -389,3 +404,168 @@ class TestErrorResults:
         assert result["feature2"]["passed"] is False
         assert result["both_passed"] is False
         assert result["error"] == "Solo agent failed"
+
+
+def _b64(text: str) -> str:
+    return base64.b64encode(text.encode()).decode()
+
+
+def _driver_data(**overrides) -> dict:
+    data = {
+        "setup_complete": True,
+        "setup_output": _b64("BASE_SHA=abc\nSETUP_COMPLETE\n"),
+        "base_sha": "abc",
+        "naive": "clean",
+        "union": "",
+        "strategy": "naive",
+        "merged_patch": True,
+        "diff": _b64("diff --git a/f b/f\n"),
+        "tests1": {"exit_code": 0, "stdout": _b64("3 passed in 1s\n"), "stderr": ""},
+        "tests2": {"exit_code": 1, "stdout": _b64("1 passed, 1 failed\n"), "stderr": _b64("err\n")},
+    }
+    data.update(overrides)
+    return data
+
+
+class TestBundledMerge:
+    """Tests for the bundled (single-exec) merged evaluation helpers."""
+
+    def test_bundle_files_roundtrip(self):
+        """Test that bundled files extract to the original contents."""
+        payload = _bundle_files({"patch1.patch": "a\n", ".driver/setup.sh": "echo hi\n"})
+        with tarfile.open(fileobj=io.BytesIO(base64.b64decode(payload)), mode="r:gz") as tar:
+            contents = {m.name: tar.extractfile(m).read().decode() for m in tar.getmembers()}
+        assert contents == {"patch1.patch": "a\n", ".driver/setup.sh": "echo hi\n"}
+
+    def test_driver_scripts_use_shell_base_sha(self):
+        """Test that step scripts read the base SHA from the driver's environment."""
+        scripts = _merged_driver_scripts()
+        assert "git diff $BASE_SHA HEAD" in scripts[".driver/naive.sh"]
+        assert "runner.sh tests2.patch merged.patch" in scripts[".driver/tests2.sh"]
+
+    def test_driver_scripts_parallel_tests(self):
+        """Test that parallel mode ships one combined test script instead of two."""
+        scripts = _merged_driver_scripts(parallel_tests=True, timeout=120)
+        assert ".driver/tests.sh" in scripts
+        assert ".driver/tests1.sh" not in scripts
+
+    def test_driver_bounds_each_step(self):
+        """Test that every driver step runs under its own timeout."""
+        sb = MagicMock()
+        sb.exec.return_value.stdout_read.return_value = ""
+
+        _test_merged_bundled(sb, "payload", timeout=300)
+
+        script = sb.exec.call_args.args[2]
+        assert 'timeout -k 10 300 bash "$D/$1.sh"' in script
+        assert 'timeout -k 10 300 bash "$D/tests.sh"' in script
+
+    def test_docker_exec_outlasts_steps(self):
+        """Test that a bundled docker exec gets room for every step, other sandboxes keep the timeout."""
+        assert _bundled_exec_timeout(600) >= 5 * 600
+
+        timeouts = {}
+        for backend, pool, bundle in [
+            ("docker", False, True),
+            ("docker", True, True),
+            ("modal", False, True),
+            ("docker", False, False),
+        ]:
+            with (
+                patch("cooperbench.eval.sandbox._create_sandbox") as create,
+                patch("cooperbench.eval.sandbox._test_merged_bundled", return_value={"error": None}),
+            ):
+                create.return_value.exec.return_value.stdout_read.return_value = ""
+                sandbox.test_merged(
+                    "go_chi_task", 26, 1, 2, "", "", timeout=600, backend=backend, pool=pool, bundle=bundle
+                )
+            timeouts[backend, pool, bundle] = create.call_args.args[1]
+
+        assert timeouts == {
+            ("docker", False, True): _bundled_exec_timeout(600),
+            ("docker", True, True): 600,
+            ("modal", False, True): 600,
+            ("docker", False, False): 600,
+        }
+
+    def test_result_clean_merge(self):
+        """Test conversion of a clean naive merge result."""
+        result = _merged_result_from_driver(_driver_data())
+        assert result["merge"] == {"status": "clean", "strategy": "naive", "diff": "diff --git a/f b/f\n"}
+        assert result["feature1"]["passed"] is True
+        assert result["feature2"]["passed"] is False
+        assert result["feature2"]["test_output"] == "1 passed, 1 failed\nerr\n"
+        assert result["both_passed"] is False
+        assert result["error"] is None
+
+    def test_result_union_merge(self):
+        """Test that a union fallback reports conflicts with the union strategy."""
+        result = _merged_result_from_driver(_driver_data(naive="conflicts", union="clean", strategy="union"))
+        assert result["merge"]["status"] == "conflicts"
+        assert result["merge"]["strategy"] == "union"
+
+    def test_result_both_strategies_fail(self):
+        """Test the error when naive and union merges both conflict."""
+        result = _merged_result_from_driver(_driver_data(naive="conflicts", union="conflicts", strategy=""))
+        assert result["error"].startswith("Both naive and union merge strategies failed")
+        assert result["merge"]["status"] == "error"
+
+    def test_result_setup_failed(self):
+        """Test the error when branch setup did not complete."""
+        result = _merged_result_from_driver(_driver_data(setup_complete=False, setup_output=_b64("boom")))
+        assert result["error"] == "Branch setup failed: boom"
+
+
+class TestRunTestsParallelScript:
+    """Tests for the git worktree based parallel test script."""
+
+    def test_one_worktree_per_suite(self):
+        """Test that each suite gets its own worktree, runner copy and timeout."""
+        script = _run_tests_parallel_script(
+            [("tests1.patch", "merged.patch"), ("tests2.patch", "merged.patch")], "abc", 300, "/out"
+        )
+        assert "git worktree add --force --detach /workspace/.eval_wt1 abc" in script
+        assert "git worktree add --force --detach /workspace/.eval_wt2 abc" in script
+        assert "bash /workspace/.eval_wt1.runner.sh tests1.patch merged.patch" in script
+        assert "> /out/tests2.out 2> /out/tests2.err" in script
+        assert script.index("wait") < script.index("git worktree remove --force /workspace/.eval_wt1")
+
+    def test_suite_timeout_below_sandbox_timeout(self):
+        """Test that a hung suite times out before the sandbox does."""
+        script = _run_tests_parallel_script([("tests1.patch", "merged.patch")], "abc", 600, "/out")
+        assert "timeout 540 bash /workspace/.eval_wt1.runner.sh" in script
+        assert "timeout 50 bash" in _run_tests_parallel_script([("tests1.patch", "merged.patch")], "abc", 100, "/out")
+
+    def test_serial_fallback_for_installing_runners(self):
+        """Test that runners installing packages run one suite at a time in the repo."""
+        script = _run_tests_parallel_script(
+            [("tests1.patch", "merged.patch"), ("tests2.patch", "merged.patch")], "abc", 300, "/out"
+        )
+        serial, parallel = script.split("\nelse\n")
+        assert "pip3?" in serial.splitlines()[3]
+        assert "git ls-files --others --ignored" in serial.splitlines()[3]
+        assert "bash /usr/local/bin/runner.sh tests1.patch merged.patch) > /out/tests1.out" in serial
+        assert "&" not in serial.split("then", 1)[1].replace("&&", "")
+        assert "git worktree add" not in serial
+        assert parallel.count(" &\n") == 2
+
+    def test_serial_fallback_noted_in_output(self):
+        """Test that suites run one at a time say so at the top of their output."""
+        script = _run_tests_parallel_script(
+            [("tests1.patch", "merged.patch"), ("tests2.patch", "merged.patch")], "abc", 300, "/out"
+        )
+        serial, parallel = script.split("\nelse\n")
+        assert serial.count(f"(echo '{_SERIAL_TESTS_NOTE}'; git checkout") == 2
+        assert _SERIAL_TESTS_NOTE not in parallel
+
+    def test_mode_logged(self, caplog):
+        """Test that the fallback to one suite at a time is logged."""
+        serial = _merged_result("clean", "naive", "", *[{"passed": True, "output": f"{_SERIAL_TESTS_NOTE}\nok"}] * 2)
+        parallel = _merged_result("clean", "naive", "", *[{"passed": True, "output": "ok"}] * 2)
+
+        with caplog.at_level(logging.INFO, logger="cooperbench.eval.sandbox"):
+            _log_parallel_tests_mode(parallel, "repo", 1)
+            assert caplog.text == ""
+            _log_parallel_tests_mode(serial, "repo", 1)
+
+        assert f"repo/task1: {_SERIAL_TESTS_NOTE}" in caplog.text
@@ -0,0 +1 @@
+"""Tests for cooperbench.infra package."""
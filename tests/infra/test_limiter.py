@@ -0,0 +1,250 @@
+"""Unit tests for cooperbench.infra.limiter module."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from cooperbench.infra.limiter import AdaptiveLimiter, get_limiter, is_overload_error, limits_summary
+
+
+class RateLimitError(Exception):
+    status_code = 429
+
+
+def _fail(limiter: AdaptiveLimiter, error: Exception) -> None:
+    with pytest.raises(type(error)):
+        with limiter.slot():
+            raise error
+
+
+class TestIsOverloadError:
+    """Tests for is_overload_error."""
+
+    def test_status_code(self):
+        """Test that 429 responses count as overload."""
+        assert is_overload_error(RateLimitError("slow down"))
+
+    def test_message_pattern(self):
+        """Test that gRPC-style errors count as overload."""
+        assert is_overload_error(RuntimeError("StatusCode.UNAVAILABLE"))
+
+    def test_other_errors(self):
+        """Test that ordinary failures do not count as overload."""
+        assert not is_overload_error(ValueError("bad request"))
+
+
+class TestAdaptiveLimiter:
+    """Tests for AIMD behaviour of AdaptiveLimiter."""
+
+    def test_starts_at_max(self):
+        """Test that a fresh limiter allows max_limit calls."""
+        assert AdaptiveLimiter("svc", max_limit=8).limit == 8
+
+    def test_unbounded_by_default(self, monkeypatch):
+        """Test that without a max_limit or $COOPERBENCH_MAX_INFLIGHT calls are never queued."""
+        monkeypatch.delenv("COOPERBENCH_MAX_INFLIGHT", raising=False)
+        limiter = AdaptiveLimiter("svc")
+        slots = [limiter.slot() for _ in range(1000)]
+
+        for slot in slots:
+            slot.__enter__()
+
+        assert limiter.in_flight == 1000
+        assert limiter.waiting == 0
+        for slot in slots:
+            slot.__exit__(None, None, None)
+
+    def test_max_from_env(self, monkeypatch):
+        """Test that $COOPERBENCH_MAX_INFLIGHT caps limiters without an explicit max_limit."""
+        monkeypatch.setenv("COOPERBENCH_MAX_INFLIGHT", "16")
+
+        assert AdaptiveLimiter("svc").limit == 16
+        assert AdaptiveLimiter("svc", max_limit=8).limit == 8
+
+    def test_unbounded_overload_halves_in_flight(self, monkeypatch):
+        """Test that the first overload of an unbounded limiter halves the calls then in flight."""
+        monkeypatch.delenv("COOPERBENCH_MAX_INFLIGHT", raising=False)
+        limiter = AdaptiveLimiter("svc")
+        slots = [limiter.slot() for _ in range(10)]
+        for slot in slots:
+            slot.__enter__()
+
+        slots[0].__exit__(RateLimitError, RateLimitError(), None)
+
+        assert limiter.limit == 5
+        for slot in slots[1:]:
+            slot.__exit__(None, None, None)
+
+    def test_overload_halves_limit(self):
+        """Test that an overload error halves the limit."""
+        limiter = AdaptiveLimiter("svc", max_limit=8)
+
+        _fail(limiter, RateLimitError())
+
+        assert limiter.limit == 4
+        assert limiter.in_flight == 0
+
+    def test_other_errors_keep_limit(self):
+        """Test that non-overload errors only release the slot."""
+        limiter = AdaptiveLimiter("svc", max_limit=8)
+
+        _fail(limiter, ValueError("bad request"))
+
+        assert limiter.limit == 8
+        assert limiter.in_flight == 0
+
+    def test_one_decrease_per_round(self):
+        """Test that calls already in flight when the limit was cut don't cut it again."""
+        limiter = AdaptiveLimiter("svc", max_limit=8)
+        a, b = limiter.slot(), limiter.slot()
+        a.__enter__()
+        b.__enter__()
+
+        for slot in (a, b):
+            error = RateLimitError()
+            assert not slot.__exit__(RateLimitError, error, None)
+
+        assert limiter.limit == 4
+        _fail(limiter, RateLimitError())
+        assert limiter.limit == 2
+
+    def test_min_limit(self):
+        """Test that the limit never drops below min_limit."""
+        limiter = AdaptiveLimiter("svc", max_limit=2, min_limit=1)
+
+        for _ in range(5):
+            _fail(limiter, RateLimitError())
+
+        assert limiter.limit == 1
+
+    def test_additive_increase(self):
+        """Test that a round of successful calls grows the limit by about one."""
+        limiter = AdaptiveLimiter("svc", max_limit=8)
+        _fail(limiter, RateLimitError())
+
+        for _ in range(5):
+            with limiter.slot():
+                pass
+
+        assert limiter.limit == 5
+
+    def test_slow_calls_hold_limit(self):
+        """Test that the limit stops growing while latency is well above the best seen."""
+        limiter = AdaptiveLimiter("svc", max_limit=8, latency_tolerance=1.5)
+        _fail(limiter, RateLimitError())
+        limiter._on_success(0.01)
+        limit = limiter._limit
+
+        limiter._on_success(10.0)
+
+        assert limiter._limit == limit
+
+    def test_best_latency_decays(self):
+        """Test that one fast call doesn't stop growth for good once latency settles higher."""
+        limiter = AdaptiveLimiter("svc", max_limit=64, latency_tolerance=1.5)
+        _fail(limiter, RateLimitError())
+        limiter._on_success(0.01)
+
+        for _ in range(500):
+            limiter._on_success(1.0)
+        limit = limiter._limit
+        limiter._on_success(1.0)
+
+        assert limiter._limit > limit
+
+    def test_latency_gate_disabled(self):
+        """Test that without a latency tolerance every success grows the limit."""
+        limiter = AdaptiveLimiter("svc", max_limit=8, latency_tolerance=None)
+        _fail(limiter, RateLimitError())
+        limiter._on_success(0.01)
+        limit = limiter._limit
+
+        limiter._on_success(10.0)
+
+        assert limiter._limit > limit
+
+    def test_blocks_when_full(self):
+        """Test that callers wait while the limit is reached and are served in order."""
+        limiter = AdaptiveLimiter("svc", max_limit=1)
+        order = []
+        holder = limiter.slot()
+        holder.__enter__()
+
+        def worker(i: int):
+            with limiter.slot():
+                order.append(i)
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(3)]
+        for t in threads:
+            t.start()
+            while limiter.waiting < len(order) + threads.index(t) + 1:
+                time.sleep(0.001)
+
+        assert order == []
+        holder.__exit__(None, None, None)
+        for t in threads:
+            t.join()
+
+        assert order == [0, 1, 2]
+        assert limiter.in_flight == 0
+
+    def test_async_slots(self):
+        """Test that coroutines share the limit without blocking the event loop."""
+        limiter = AdaptiveLimiter("svc", max_limit=2)
+        peak = 0
+
+        async def job():
+            nonlocal peak
+            async with limiter.aslot():
+                peak = max(peak, limiter.in_flight)
+                await asyncio.sleep(0.01)
+
+        async def main():
+            await asyncio.gather(*(job() for _ in range(6)))
+
+        asyncio.run(main())
+
+        assert peak == 2
+        assert limiter.in_flight == 0
+
+    def test_cancelled_waiter_leaves_queue(self):
+        """Test that a coroutine cancelled while waiting gives up its place."""
+        limiter = AdaptiveLimiter("svc", max_limit=1)
+
+        async def main():
+            async with limiter.aslot():
+                waiter = asyncio.ensure_future(limiter.aslot().__aenter__())
+                await asyncio.sleep(0)
+                waiter.cancel()
+                with pytest.raises(asyncio.CancelledError):
+                    await waiter
+
+        asyncio.run(main())
+
+        assert limiter.waiting == 0
+        assert limiter.in_flight == 0
+
+
+class TestRegistry:
+    """Tests for the process-wide limiter registry."""
+
+    def test_shared_per_name(self):
+        """Test that callers of the same service share one limiter."""
+        assert get_limiter("test:shared") is get_limiter("test:shared")
+
+    def test_llm_limiters_not_latency_gated(self):
+        """Test that LLM limiters ignore latency (it follows output length) while others use it."""
+        assert get_limiter("llm:test-model").latency_tolerance is None
+        assert get_limiter("test:gated").latency_tolerance is not None
+
+    def test_summary(self, monkeypatch):
+        """Test that the progress summary lists in-flight calls and limits."""
+        monkeypatch.delenv("COOPERBENCH_MAX_INFLIGHT", raising=False)
+        limiter = get_limiter("test:summary")
+
+        with limiter.slot():
+            summary = limits_summary()
+
+        assert "test:summary 1/∞" in summary
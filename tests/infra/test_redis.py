@@ -0,0 +1,93 @@
+"""Unit tests for cooperbench.infra.redis module."""
+
+import redis
+
+from cooperbench.infra.redis import (
+    DEFAULT_MAX_CONNECTIONS,
+    RedisNamespace,
+    close_redis_pool,
+    get_redis,
+    split_redis_url,
+)
+
+
+class TestSplitRedisUrl:
+    """Tests for split_redis_url function."""
+
+    def test_plain_url(self):
+        """Test that a URL without a namespace has an empty prefix."""
+        assert split_redis_url("redis://host:6379") == ("redis://host:6379", "")
+
+    def test_namespaced_url(self):
+        """Test that the #prefix fragment becomes a colon-terminated prefix."""
+        assert split_redis_url("redis://host:6379#run:abc") == ("redis://host:6379", "run:abc:")
+
+
+class TestGetRedis:
+    """Tests for the process-wide connection pool registry."""
+
+    def test_same_server_shares_pool(self):
+        """Test that clients for one server share a pool, whatever their namespace."""
+        a = get_redis("redis://pool-test:6379#run:a")
+        b = get_redis("redis://pool-test:6379#run:b")
+
+        assert a is not b
+        assert a.connection_pool is b.connection_pool
+        close_redis_pool("redis://pool-test:6379")
+
+    def test_different_servers_have_separate_pools(self):
+        """Test that each server URL gets its own pool."""
+        a = get_redis("redis://pool-test-a:6379")
+        b = get_redis("redis://pool-test-b:6379")
+
+        assert a.connection_pool is not b.connection_pool
+        close_redis_pool("redis://pool-test-a:6379")
+        close_redis_pool("redis://pool-test-b:6379")
+
+    def test_close_redis_pool(self):
+        """Test that a closed pool is replaced on next use."""
+        pool = get_redis("redis://pool-test:6379").connection_pool
+        close_redis_pool("redis://pool-test:6379#run:x")
+
+        assert get_redis("redis://pool-test:6379").connection_pool is not pool
+        close_redis_pool("redis://pool-test:6379")
+
+    def test_health_checks_enabled(self):
+        """Test that pooled connections are health-checked."""
+        client = get_redis("redis://pool-test:6379")
+
+        assert client.connection_pool.connection_kwargs["health_check_interval"] > 0
+        close_redis_pool("redis://pool-test:6379")
+
+    def test_pool_is_capped(self, monkeypatch):
+        """Test that pools are bounded and callers wait for a free connection beyond the cap."""
+        monkeypatch.setenv("COOPERBENCH_REDIS_MAX_CONNECTIONS", "8")
+        pool = get_redis("redis://pool-test:6379").connection_pool
+
+        assert isinstance(pool, redis.BlockingConnectionPool)
+        assert pool.max_connections == 8
+        close_redis_pool("redis://pool-test:6379")
+
+    def test_invalid_cap_uses_default(self, monkeypatch):
+        """Test that a malformed cap falls back to the default."""
+        monkeypatch.setenv("COOPERBENCH_REDIS_MAX_CONNECTIONS", "lots")
+
+        assert get_redis("redis://pool-test:6379").connection_pool.max_connections == DEFAULT_MAX_CONNECTIONS
+        close_redis_pool("redis://pool-test:6379")
+
+
+class TestRedisNamespace:
+    """Tests for RedisNamespace wrapper."""
+
+    def test_key_prefix(self):
+        """Test that keys are qualified with the URL namespace."""
+        namespace = RedisNamespace("redis://pool-test:6379#run:abc")
+
+        assert namespace.key("agent1:inbox") == "run:abc:agent1:inbox"
+        assert namespace.client.connection_pool is get_redis("redis://pool-test:6379").connection_pool
+        close_redis_pool("redis://pool-test:6379")
+
+    def test_no_namespace(self):
+        """Test that keys are unchanged without a namespace."""
+        assert RedisNamespace("redis://pool-test:6379").key("agent1:inbox") == "agent1:inbox"
+        close_redis_pool("redis://pool-test:6379")
@@ -0,0 +1,139 @@
+"""Unit tests for cooperbench.infra.ssh module.
+
+A stand-in ``ssh`` executable runs commands with the local shell and records how
+it was called, so no sshd is required (see tests/integration/test_ssh.py for
+tests against a real sshd).
+"""
+
+import os
+import subprocess
+import sys
+import time
+from unittest.mock import patch
+
+import pytest
+
+from cooperbench.infra.ssh import SSHSession
+
+FAKE_SSH = """\
+import os, sys
+args = sys.argv[1:]
+with open(os.environ["FAKE_SSH_LOG"], "a") as log:
+    if "-O" in args:
+        log.write("exit\\n")
+        sys.exit(0)
+    if "-N" in args:
+        log.write("master\\n")
+        sys.exit(int(os.environ.get("FAKE_SSH_MASTER_EXIT", "0")))
+    log.write("command\\n")
+command = args[args.index("--") + 2]
+os.execvp("sh", ["sh", "-c", command])
+"""
+
+
+@pytest.fixture
+def fake_ssh(tmp_path, monkeypatch):
+    """Path of the stand-in ssh; returns a reader for its call log."""
+    script = tmp_path / "ssh"
+    script.write_text(f"#!{sys.executable}\n{FAKE_SSH}")
+    script.chmod(0o755)
+    log = tmp_path / "ssh.log"
+    log.touch()
+    monkeypatch.setenv("FAKE_SSH_LOG", str(log))
+    return str(script), lambda: log.read_text().split()
+
+
+class TestSSHSession:
+    """Tests for running commands over a multiplexed session."""
+
+    def test_run(self, fake_ssh):
+        """Test that output and exit status are returned."""
+        ssh, _ = fake_ssh
+        session = SSHSession("user@host", ssh=ssh)
+
+        result = session.run("echo out; echo err >&2; exit 3")
+        session.close()
+
+        assert result == {"output": "out\nerr\n", "returncode": 3}
+
+    def test_master_opened_once(self, fake_ssh):
+        """Test that commands share one master connection."""
+        ssh, calls = fake_ssh
+        session = SSHSession("user@host", ssh=ssh)
+
+        for _ in range(3):
+            assert session.run("true")["returncode"] == 0
+        session.close()
+
+        assert calls() == ["master", "command", "command", "command", "exit"]
+
+    def test_streams_output(self, fake_ssh):
+        """Test that output is passed to on_output as it arrives."""
+        ssh, _ = fake_ssh
+        session = SSHSession("user@host", ssh=ssh)
+        chunks = []
+
+        result = session.run("echo a; sleep 0.2; echo b", on_output=chunks.append)
+        session.close()
+
+        assert "".join(chunks) == result["output"] == "a\nb\n"
+        assert len(chunks) == 2
+
+    def test_timeout(self, fake_ssh):
+        """Test that commands are killed when they exceed the timeout."""
+        ssh, _ = fake_ssh
+        session = SSHSession("user@host", ssh=ssh)
+
+        start = time.monotonic()
+        result = session.run("sleep 30", timeout=1)
+        session.close()
+
+        assert result == {"output": "Command timed out after 1s", "returncode": -1}
+        assert time.monotonic() - start < 10
+
+    def test_master_failure_falls_back(self, fake_ssh, monkeypatch):
+        """Test that commands still run when the master connection cannot be opened."""
+        ssh, calls = fake_ssh
+        monkeypatch.setenv("FAKE_SSH_MASTER_EXIT", "255")
+        session = SSHSession("user@host", ssh=ssh)
+
+        assert session.run("echo hi")["output"] == "hi\n"
+        assert session.run("echo hi")["output"] == "hi\n"
+        assert calls() == ["master", "command", "command"]
+
+    def test_close_removes_socket_dir(self, fake_ssh):
+        """Test that close stops the master and removes the control directory."""
+        ssh, _ = fake_ssh
+        session = SSHSession("user@host", ssh=ssh)
+        session.run("true")
+
+        session.close()
+
+        assert not os.path.exists(os.path.dirname(session.control_path))
+
+
+class TestFromGcloud:
+    """Tests for resolving the ssh command of a GCP VM."""
+
+    def test_parses_dry_run(self):
+        """Test that options and destination are taken from gcloud's dry run."""
+        dry_run = subprocess.CompletedProcess(
+            args=[],
+            returncode=0,
+            stdout="/usr/bin/ssh -t -i /home/u/.ssh/google_compute_engine -o StrictHostKeyChecking=no u@203.0.113.7\n",
+            stderr="",
+        )
+        with patch("cooperbench.infra.ssh.subprocess.run", return_value=dry_run):
+            session = SSHSession.from_gcloud("vm", "us-central1-a", "proj")
+
+        assert session.ssh == "/usr/bin/ssh"
+        assert session.target == "u@203.0.113.7"
+        assert session.options == ["-i", "/home/u/.ssh/google_compute_engine", "-o", "StrictHostKeyChecking=no"]
+        session.close()
+
+    def test_failure(self):
+        """Test that a failed dry run raises."""
+        failed = subprocess.CompletedProcess(args=[], returncode=1, stdout="", stderr="no such instance")
+        with patch("cooperbench.infra.ssh.subprocess.run", return_value=failed):
+            with pytest.raises(RuntimeError, match="no such instance"):
+                SSHSession.from_gcloud("vm", "us-central1-a", "proj")
@@ -0,0 +1,102 @@
+"""Integration tests for pooled GCP VMs, with the local Docker daemon as the VM.
+
+Pooled VMs are stand-ins that run their commands with the local shell, so the
+containers, the git sidecar and its network are real, but no GCP project is
+required.
+
+These tests require Docker to be running locally.
+Run with: pytest tests/integration/test_gcp_pool.py --run-docker
+"""
+
+import subprocess
+import uuid
+from unittest.mock import patch
+
+import pytest
+
+from cooperbench.agents.mini_swe_agent.connectors.git_servers import GCPSidecarGitServer
+from cooperbench.agents.mini_swe_agent.environments import gcp_pool
+from cooperbench.agents.mini_swe_agent.environments.gcp import GCPEnvironment
+
+# Mark all tests in this module as requiring Docker
+pytestmark = pytest.mark.docker
+
+IMAGE = "python:3.11-slim"
+
+
+def _local_vm(config, logger, host):
+    """Attach the local Docker host as a pooled VM."""
+
+    def run(command, timeout=None):
+        try:
+            result = subprocess.run(["sh", "-c", command], capture_output=True, text=True, timeout=timeout)
+        except subprocess.TimeoutExpired:
+            return {"output": f"Command timed out after {timeout}s", "returncode": -1}
+        return {"output": result.stdout + result.stderr, "returncode": result.returncode}
+
+    host.name = "local"
+    host.attach(run, lambda: None)
+
+
+@pytest.fixture
+def local_pool(monkeypatch):
+    """Pool whose VMs are the local Docker host."""
+    monkeypatch.setattr(gcp_pool, "_pools", {})
+    with patch.object(GCPEnvironment, "_boot_pool_vm", _local_vm):
+        yield
+
+
+def _env(**kwargs) -> GCPEnvironment:
+    return GCPEnvironment(
+        image=IMAGE,
+        project_id="local",
+        machine_type="e2-standard-4",
+        cwd="/workspace",
+        vm_pool=True,
+        **kwargs,
+    )
+
+
+class TestPooledContainers:
+    """Tests for agent containers sharing a (local) VM."""
+
+    def test_containers_are_isolated(self, local_pool):
+        """Test that each environment runs in its own memory-limited container."""
+        a, b = _env(), _env()
+        try:
+            a.execute("echo a > /workspace/marker")
+            result = b.execute("cat /workspace/marker")
+            memory = subprocess.run(
+                ["docker", "inspect", "-f", "{{.HostConfig.Memory}}", a._container_name],
+                capture_output=True,
+                text=True,
+            )
+        finally:
+            a.cleanup()
+            b.cleanup()
+
+        assert result["returncode"] != 0
+        assert memory.stdout.strip() == str(2048 * 1024 * 1024)
+
+    def test_pair_collaborates_through_sidecar(self, local_pool):
+        """Test that a pair reaches the git sidecar started on their shared VM."""
+        run_id = uuid.uuid4().hex[:8]
+        server = GCPSidecarGitServer.create(run_id=run_id)
+        kwargs = {"vm_group": run_id, "vm_group_size": 2, "git_sidecar": server.network_name}
+        a, b = _env(**kwargs), _env(**kwargs)
+        try:
+            for env in (a, b):
+                assert env.execute("apt-get update -qq && apt-get install -y -qq git", timeout=300)["returncode"] == 0
+            push = a.execute(
+                "git init -q . && git -c user.email=a@x -c user.name=a commit -q --allow-empty -m hello"
+                f" && git push -q {server.url} HEAD:refs/heads/main"
+            )
+            log = b.execute(f"git clone -q {server.url} clone && git -C clone log --format=%s origin/main")
+        finally:
+            a.cleanup()
+            b.cleanup()
+        sidecar = subprocess.run(["docker", "inspect", server.network_name], capture_output=True)
+
+        assert push["returncode"] == 0, push["output"]
+        assert log["output"].strip() == "hello"
+        assert sidecar.returncode != 0  # Removed with the last agent
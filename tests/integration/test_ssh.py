@@ -0,0 +1,98 @@
+"""Integration tests for multiplexed SSH sessions against a local sshd container.
+
+These tests require Docker to be running locally.
+Run with: pytest tests/integration/test_ssh.py --run-docker
+"""
+
+import subprocess
+import time
+
+import pytest
+
+from cooperbench.infra.ssh import SSHSession
+
+# Mark all tests in this module as requiring Docker
+pytestmark = pytest.mark.docker
+
+SSHD_IMAGE = "lscr.io/linuxserver/openssh-server:latest"
+
+
+@pytest.fixture(scope="module")
+def sshd(tmp_path_factory):
+    """Run an sshd container; yields (target, ssh options)."""
+    import docker
+
+    key = tmp_path_factory.mktemp("ssh") / "id_ed25519"
+    subprocess.run(["ssh-keygen", "-q", "-t", "ed25519", "-N", "", "-f", str(key)], check=True)
+
+    client = docker.from_env()
+    container = client.containers.run(
+        SSHD_IMAGE,
+        detach=True,
+        environment={"PUBLIC_KEY": key.with_suffix(".pub").read_text().strip(), "USER_NAME": "cooperbench"},
+        ports={"2222/tcp": None},
+    )
+    try:
+        container.reload()
+        port = container.ports["2222/tcp"][0]["HostPort"]
+        options = [
+            "-p",
+            port,
+            "-i",
+            str(key),
+            "-o",
+            "StrictHostKeyChecking=no",
+            "-o",
+            "UserKnownHostsFile=/dev/null",
+        ]
+        probe = SSHSession("cooperbench@127.0.0.1", options, connect_timeout=5)
+        for _ in range(60):
+            if probe.run("true", timeout=10)["returncode"] == 0:
+                break
+            time.sleep(1)
+        probe.close()
+        yield "cooperbench@127.0.0.1", options
+    finally:
+        container.remove(force=True)
+
+
+class TestSSHSessionWithSshd:
+    """Tests for SSHSession against a real sshd."""
+
+    def test_run(self, sshd):
+        """Test that commands run on the remote host."""
+        session = SSHSession(*sshd)
+        try:
+            result = session.run("echo $USER; exit 2")
+        finally:
+            session.close()
+
+        assert result == {"output": "cooperbench\n", "returncode": 2}
+
+    def test_multiplexed_commands_are_fast(self, sshd):
+        """Test that commands after the first reuse the master connection."""
+        session = SSHSession(*sshd)
+        try:
+            session.run("true")
+            start = time.monotonic()
+            for _ in range(10):
+                assert session.run("true")["returncode"] == 0
+            elapsed = time.monotonic() - start
+            check = subprocess.run(session._args("-O", "check"), capture_output=True, text=True)
+        finally:
+            session.close()
+
+        assert check.returncode == 0
+        assert elapsed < 5
+
+    def test_timeout(self, sshd):
+        """Test that remote commands are killed at the timeout."""
+        session = SSHSession(*sshd)
+        try:
+            result = session.run("sleep 30", timeout=2)
+            leftover = session.run("pgrep -x sleep")
+        finally:
+            session.close()
+
+        assert result["returncode"] == -1
+        assert leftover["returncode"] != 0
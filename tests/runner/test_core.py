@@ -94,3 +94,25 @@ class TestRunOutputStructure:
         assert "agent_framework" in loaded
         assert "model" in loaded
         assert "setting" in loaded
+
+
+class TestSpeculativeEval:
+    """Tests for prewarming eval sandboxes while a coop pair is still running."""
+
+    def test_prewarms_once_per_pair(self):
+        """Test that only the first agent to finish starts a sandbox."""
+        from cooperbench.runner.core import _speculative_prewarm
+
+        with patch("cooperbench.eval.backends.get_pooled_backend") as get_pool:
+            on_agent_done = _speculative_prewarm("docker", {"repo": "test_repo", "task_id": 1})
+            with patch("threading.Thread") as thread:
+                on_agent_done("agent1")
+                on_agent_done("agent2")
+
+        get_pool.assert_called_once_with("docker")
+        thread.assert_called_once()
+
+    def test_rejects_batch_backend(self):
+        """Test that speculative eval requires a backend with sandbox pooling."""
+        with pytest.raises(ValueError, match="not supported"):
+            run(run_name="test", backend="gcp", speculative_eval=True)
@@ -0,0 +1,115 @@
+"""Unit tests for cooperbench.runner.index module."""
+
+import json
+import os
+from pathlib import Path
+
+from cooperbench.eval.runs import discover_runs
+from cooperbench.runner.coop import _previous_result
+from cooperbench.runner.index import get_run_index, reindex
+from cooperbench.utils import get_run_totals
+
+
+def _write_result(tmp_path, run_name, setting, repo, task_id, feature_dir, **fields):
+    """Write a result.json like execute_coop/execute_solo and return its log dir (relative)."""
+    log_dir = os.path.join("logs", run_name, setting, repo, str(task_id), feature_dir)
+    (tmp_path / log_dir).mkdir(parents=True)
+    result = {"repo": repo, "task_id": task_id, "setting": setting, "total_cost": 1.0, **fields}
+    (tmp_path / log_dir / "result.json").write_text(json.dumps(result))
+    return log_dir, result
+
+
+class TestRunIndex:
+    """Tests for RunIndex."""
+
+    def test_first_append_indexes_existing_results(self, tmp_path):
+        """Test that a run without an index is indexed from disk on first write."""
+        os.chdir(tmp_path)
+        old_dir, _ = _write_result(tmp_path, "idx-run", "coop", "dspy_task", 1, "f1_f2")
+        new_dir, new_result = _write_result(tmp_path, "idx-run", "coop", "dspy_task", 1, "f1_f3")
+
+        index = get_run_index("idx-run")
+        assert not index.exists()
+        index.add_result(new_dir, new_result)
+
+        assert set(index.entries()) == {old_dir, new_dir}
+
+    def test_reads_appends_from_other_writers(self, tmp_path):
+        """Test that lines appended to the file after the first read are picked up."""
+        os.chdir(tmp_path)
+        log_dir, result = _write_result(tmp_path, "idx-run", "solo", "dspy_task", 2, "f1_f2")
+        index = get_run_index("idx-run")
+        index.rebuild()
+        assert index.get(log_dir)["result"]["agent_error"] is False
+
+        with open(index.path, "a") as f:
+            f.write(json.dumps({"kind": "eval", "log_dir": log_dir, "both_passed": True}) + "\n")
+            f.write('{"kind": "eval", "log_dir": "partial')
+
+        entry = index.get(log_dir)
+        assert entry["eval"]["both_passed"] is True
+        assert len(index.entries()) == 1
+
+    def test_later_lines_win(self, tmp_path):
+        """Test that a re-run's result replaces the previous one."""
+        os.chdir(tmp_path)
+        log_dir, result = _write_result(tmp_path, "idx-run", "solo", "dspy_task", 3, "f1_f2", agent={"status": "Error"})
+        index = get_run_index("idx-run")
+        index.add_result(log_dir, result)
+        assert index.get(log_dir)["result"]["agent_error"] is True
+
+        index.add_result(log_dir, {**result, "agent": {"status": "Submitted"}})
+        assert index.get(log_dir)["result"]["agent_error"] is False
+
+    def test_reindex_all_runs(self, tmp_path):
+        """Test that reindex rebuilds every run under logs/."""
+        os.chdir(tmp_path)
+        _write_result(tmp_path, "run-a", "coop", "dspy_task", 1, "f1_f2")
+        _write_result(tmp_path, "run-b", "solo", "dspy_task", 1, "f1_f2")
+        _write_result(tmp_path, "run-b", "solo", "dspy_task", 1, "f2_f3")
+
+        assert reindex() == {"run-a": 1, "run-b": 2}
+        assert (tmp_path / "logs" / "run-b" / "index.jsonl").exists()
+
+
+class TestIndexConsumers:
+    """Tests for totals, discovery and skip checks reading the index."""
+
+    def test_discover_runs_matches_directory_walk(self, tmp_path):
+        """Test that index-based discovery returns what the walk returns."""
+        os.chdir(tmp_path)
+        _write_result(tmp_path, "idx-run", "coop", "llama_index_task", 17244, "f1_f2")
+        _write_result(tmp_path, "idx-run", "coop", "dspy_task", 8394, "f2_f5")
+        _write_result(tmp_path, "idx-run", "solo", "dspy_task", 8394, "f1_f2")
+
+        walked = discover_runs(run_name="idx-run")
+        get_run_index("idx-run").rebuild()
+        indexed = discover_runs(run_name="idx-run")
+
+        assert indexed == walked
+        assert discover_runs(run_name="idx-run", repo_filter="dspy_task", features_filter=[2, 5]) == [walked[1]]
+
+    def test_get_run_totals_from_index(self, tmp_path):
+        """Test that totals come from the index, not the result files."""
+        os.chdir(tmp_path)
+        log_dir, result = _write_result(tmp_path, "idx-run", "coop", "dspy_task", 1, "f1_f2", duration_seconds=5)
+        get_run_index("idx-run").rebuild()
+        (tmp_path / log_dir / "result.json").unlink()
+
+        totals = get_run_totals("idx-run", "coop")
+        assert totals["task_count"] == 1
+        assert totals["total_cost"] == 1.0
+        assert totals["run_time"] == 5
+
+    def test_previous_result_uses_index(self, tmp_path):
+        """Test that skip checks follow the indexed agent status."""
+        os.chdir(tmp_path)
+        log_dir, result = _write_result(tmp_path, "idx-run", "coop", "dspy_task", 1, "f1_f2", agents={})
+        index = get_run_index("idx-run")
+        index.rebuild()
+
+        assert _previous_result(Path(log_dir), "idx-run", force=False)["skipped"] is True
+        assert _previous_result(Path(log_dir).with_name("f1_f3"), "idx-run", force=False) is None
+
+        index.add_result(log_dir, {**result, "agents": {"agent1": {"status": "Error"}}})
+        assert _previous_result(Path(log_dir), "idx-run", force=False) is None
@@ -0,0 +1,67 @@
+"""Unit tests for cooperbench.runner.prewarm module."""
+
+from unittest.mock import patch
+
+from cooperbench.agents.mini_swe_agent.environments import modal as modal_env
+from cooperbench.agents.mini_swe_agent.environments.modal import ImageManifest
+from cooperbench.runner.prewarm import prewarm
+from cooperbench.utils import get_image_name
+
+TASKS = [
+    {"repo": "repo_a_task", "task_id": 1, "features": [1, 2]},
+    {"repo": "repo_a_task", "task_id": 1, "features": [1, 3]},
+    {"repo": "repo_b_task", "task_id": 7, "features": [1, 2]},
+]
+IMAGE_A = get_image_name("repo_a_task", 1)
+IMAGE_B = get_image_name("repo_b_task", 7)
+
+
+class TestPrewarm:
+    """Tests for prewarm function."""
+
+    def test_hydrates_each_distinct_image_once(self, tmp_path, monkeypatch):
+        """Test that tasks sharing an image trigger a single build."""
+        monkeypatch.setattr(modal_env, "_manifest", ImageManifest(tmp_path / "modal_images.json"))
+        with (
+            patch("cooperbench.runner.prewarm.discover_tasks", return_value=TASKS),
+            patch.object(modal_env, "hydrate_image", side_effect=lambda name, force: f"id:{name}") as hydrate,
+        ):
+            result = prewarm(concurrency=4)
+
+        assert hydrate.call_count == 2
+        assert set(result) == {IMAGE_A, IMAGE_B}
+
+    def test_skips_images_in_manifest(self, tmp_path, monkeypatch):
+        """Test that recorded images are not rebuilt unless forced."""
+        manifest = ImageManifest(tmp_path / "modal_images.json")
+        manifest.put(IMAGE_A, "im-cached")
+        monkeypatch.setattr(modal_env, "_manifest", manifest)
+
+        with (
+            patch("cooperbench.runner.prewarm.discover_tasks", return_value=TASKS),
+            patch.object(modal_env, "hydrate_image", side_effect=lambda name, force: f"id:{name}") as hydrate,
+        ):
+            result = prewarm()
+            hydrate.assert_called_once_with(IMAGE_B, False)
+            assert result[IMAGE_A] == "im-cached"
+
+            prewarm(force=True)
+            assert hydrate.call_count == 3
+            assert hydrate.call_args.args[1] is True
+
+    def test_failed_image_is_omitted(self, tmp_path, monkeypatch):
+        """Test that a failing build is reported without aborting the others."""
+        monkeypatch.setattr(modal_env, "_manifest", ImageManifest(tmp_path / "modal_images.json"))
+
+        def hydrate(name, force):
+            if name == IMAGE_A:
+                raise RuntimeError("Image build failed")
+            return "im-ok"
+
+        with (
+            patch("cooperbench.runner.prewarm.discover_tasks", return_value=TASKS),
+            patch.object(modal_env, "hydrate_image", side_effect=hydrate),
+        ):
+            result = prewarm()
+
+        assert result == {IMAGE_B: "im-ok"}
@@ -0,0 +1,85 @@
+"""Unit tests for cooperbench.runner.scheduler module."""
+
+import asyncio
+
+from cooperbench.agents import AgentResult, arun_agent
+from cooperbench.runner.scheduler import ConcurrencyLimits
+
+
+async def _peak_concurrency(limits: ConcurrencyLimits, jobs: list[tuple[str, str]]) -> dict:
+    """Run jobs through ``limits`` and record peak concurrency per backend/image."""
+    running: dict[str, int] = {}
+    peak: dict[str, int] = {}
+
+    async def job(backend: str, image: str) -> None:
+        async with limits.slot(backend, image):
+            for key in (backend, image):
+                running[key] = running.get(key, 0) + 1
+                peak[key] = max(peak.get(key, 0), running[key])
+            await asyncio.sleep(0.01)
+            for key in (backend, image):
+                running[key] -= 1
+
+    await asyncio.gather(*(job(b, i) for b, i in jobs))
+    return peak
+
+
+class TestConcurrencyLimits:
+    """Tests for ConcurrencyLimits semaphores."""
+
+    async def test_backend_limit(self):
+        """Test that at most backend_limit tasks run per backend."""
+        limits = ConcurrencyLimits(backend_limit=3)
+        peak = await _peak_concurrency(limits, [("modal", f"img:{i}") for i in range(10)])
+
+        assert peak["modal"] == 3
+
+    async def test_backends_limited_independently(self):
+        """Test that each backend has its own semaphore."""
+        limits = ConcurrencyLimits(backend_limit=2)
+        jobs = [("modal", "img:1")] * 4 + [("docker", "img:2")] * 4
+        peak = await _peak_concurrency(limits, jobs)
+
+        assert peak["modal"] == 2
+        assert peak["docker"] == 2
+
+    async def test_image_limit(self):
+        """Test that image_limit bounds tasks sharing an image."""
+        limits = ConcurrencyLimits(backend_limit=10, image_limit=1)
+        jobs = [("modal", "img:1")] * 3 + [("modal", "img:2")] * 3
+        peak = await _peak_concurrency(limits, jobs)
+
+        assert peak["img:1"] == 1
+        assert peak["img:2"] == 1
+        assert peak["modal"] == 2
+
+    async def test_image_limit_zero_is_unlimited(self):
+        """Test that image_limit=0 leaves images unbounded."""
+        limits = ConcurrencyLimits(backend_limit=5)
+        peak = await _peak_concurrency(limits, [("modal", "img:1")] * 5)
+
+        assert peak["img:1"] == 5
+
+
+class SyncRunner:
+    def run(self, task: str, image: str, **kwargs) -> AgentResult:
+        return AgentResult(status="Submitted", patch=f"sync:{task}", cost=0.0, steps=1)
+
+
+class AsyncRunner(SyncRunner):
+    async def arun(self, task: str, image: str, **kwargs) -> AgentResult:
+        return AgentResult(status="Submitted", patch=f"async:{task}", cost=0.0, steps=1)
+
+
+class TestArunAgent:
+    """Tests for arun_agent dispatch."""
+
+    async def test_uses_native_arun(self):
+        """Test that adapters with arun() are awaited directly."""
+        result = await arun_agent(AsyncRunner(), task="t", image="img")
+        assert result.patch == "async:t"
+
+    async def test_falls_back_to_thread(self):
+        """Test that sync-only adapters run in a worker thread."""
+        result = await arun_agent(SyncRunner(), task="t", image="img", agent_id="a1")
+        assert result.patch == "sync:t"
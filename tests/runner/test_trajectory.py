@@ -0,0 +1,136 @@
+"""Tests for cooperbench.runner.trajectory module."""
+
+import json
+import threading
+
+import pytest
+
+from cooperbench.agents import AgentResult, accepts_message_callback
+from cooperbench.runner.trajectory import TrajectoryStream, compact_trajectory, read_trajectory_stream
+
+
+class TestTrajectoryStream:
+    """Tests for the JSONL trajectory stream."""
+
+    def test_append_and_compact(self, tmp_path):
+        """Test that streamed messages end up in the trajectory file and the stream is removed."""
+        traj_file = tmp_path / "agent1_traj.json"
+        stream = TrajectoryStream(traj_file)
+        stream.append({"role": "system", "content": "s"})
+        stream.append({"role": "user", "content": "u"})
+        stream.close()
+
+        compact_trajectory(traj_file, {"agent_id": "agent1", "steps": 1}, [])
+
+        assert json.loads(traj_file.read_text()) == {
+            "agent_id": "agent1",
+            "steps": 1,
+            "messages": [{"role": "system", "content": "s"}, {"role": "user", "content": "u"}],
+        }
+        assert not stream.path.exists()
+
+    def test_readable_before_close(self, tmp_path):
+        """Test that appended messages are on disk before the stream is closed."""
+        stream = TrajectoryStream(tmp_path / "solo_traj.json")
+        stream.append({"n": 0})
+
+        assert stream.path.name == "solo_traj.jsonl"
+        assert read_trajectory_stream(stream.path) == [{"n": 0}]
+        stream.close()
+
+    def test_concurrent_appends(self, tmp_path):
+        """Test that appends from several threads produce whole lines."""
+        stream = TrajectoryStream(tmp_path / "agent1_traj.json")
+
+        def worker(i: int):
+            for j in range(50):
+                stream.append({"thread": i, "n": j, "content": "x" * 100})
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        stream.close()
+
+        assert len(read_trajectory_stream(stream.path)) == 200
+
+    def test_removes_stale_stream(self, tmp_path):
+        """Test that a stream left behind by an earlier run is not reused."""
+        traj_file = tmp_path / "agent1_traj.json"
+        (tmp_path / "agent1_traj.jsonl").write_text('{"old": true}\n')
+
+        TrajectoryStream(traj_file)
+        compact_trajectory(traj_file, {}, [{"new": True}])
+
+        assert json.loads(traj_file.read_text())["messages"] == [{"new": True}]
+
+    def test_truncated_last_line(self, tmp_path):
+        """Test that a partially written last message is ignored."""
+        path = tmp_path / "agent1_traj.jsonl"
+        path.write_text('{"n": 0}\n{"n": 1}\n{"n": ')
+
+        assert read_trajectory_stream(path) == [{"n": 0}, {"n": 1}]
+
+    def test_unknown_compression(self, tmp_path):
+        """Test that unsupported compression values are rejected."""
+        with pytest.raises(ValueError):
+            TrajectoryStream(tmp_path / "agent1_traj.json", compression="lz4")
+
+    def test_zstd(self, tmp_path):
+        """Test that zstd streams round-trip through compaction."""
+        pytest.importorskip("zstandard")
+        traj_file = tmp_path / "agent1_traj.json"
+        stream = TrajectoryStream(traj_file, compression="zstd")
+        stream.append({"n": 0})
+        stream.close()
+
+        assert stream.path.name == "agent1_traj.jsonl.zst"
+        compact_trajectory(traj_file, {}, [])
+        assert json.loads(traj_file.read_text())["messages"] == [{"n": 0}]
+        assert not stream.path.exists()
+
+
+class TestCompactTrajectory:
+    """Tests for compact_trajectory."""
+
+    def test_falls_back_to_returned_messages(self, tmp_path):
+        """Test that adapters which do not stream keep their returned messages."""
+        traj_file = tmp_path / "agent1_traj.json"
+
+        compact_trajectory(traj_file, {"status": "Submitted"}, [{"role": "user", "content": "u"}])
+
+        assert json.loads(traj_file.read_text()) == {
+            "status": "Submitted",
+            "messages": [{"role": "user", "content": "u"}],
+        }
+
+    def test_empty_stream_falls_back(self, tmp_path):
+        """Test that an agent which failed before its first message keeps the returned messages."""
+        traj_file = tmp_path / "agent1_traj.json"
+        (tmp_path / "agent1_traj.jsonl").write_text("")
+
+        compact_trajectory(traj_file, {}, [{"n": 0}])
+
+        assert json.loads(traj_file.read_text())["messages"] == [{"n": 0}]
+        assert not (tmp_path / "agent1_traj.jsonl").exists()
+
+
+class TestAcceptsMessageCallback:
+    """Tests for accepts_message_callback."""
+
+    def test_streaming_adapter(self):
+        """Test that adapters taking on_message are detected."""
+
+        class Streaming:
+            def run(self, task, image, *, on_message=None, **kwargs) -> AgentResult: ...
+
+        assert accepts_message_callback(Streaming())
+
+    def test_plain_adapter(self):
+        """Test that adapters without on_message are not passed one."""
+
+        class Plain:
+            def run(self, task, image, *, config=None) -> AgentResult: ...
+
+        assert not accepts_message_callback(Plain())
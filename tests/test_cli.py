@@ -98,3 +98,21 @@ class TestCLI:
             with pytest.raises(SystemExit) as exc_info:
                 main()
             assert exc_info.value.code == 0
+
+    def test_cli_prewarm_subcommand_exists(self):
+        """Test prewarm subcommand exists."""
+        from cooperbench.cli import main
+
+        with patch.object(sys, "argv", ["cooperbench", "prewarm", "--help"]):
+            with pytest.raises(SystemExit) as exc_info:
+                main()
+            assert exc_info.value.code == 0
+
+    def test_cli_reindex_subcommand_exists(self):
+        """Test reindex subcommand exists."""
+        from cooperbench.cli import main
+
+        with patch.object(sys, "argv", ["cooperbench", "reindex", "--help"]):
+            with pytest.raises(SystemExit) as exc_info:
+                main()
+            assert exc_info.value.code == 0